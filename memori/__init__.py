@@ -9,85 +9,101 @@ __version__ = "2.0.0"
 __author__ = "Harshal More"
 __email__ = "harshalmore2468@gmail.com"
 
-from typing import Any, Optional
+import importlib
+from typing import Any, List
 
-# Configuration system
-from .config import (
-    AgentSettings,
-    ConfigManager,
-    DatabaseSettings,
-    LoggingSettings,
-    MemoriSettings,
-)
-from .core.database import DatabaseManager
+# Public names are imported on first access (PEP 562) so that `import memori`
+# and the CLI stay fast; provider SDKs are only imported when actually used.
+_LAZY_IMPORTS = {
+    # Configuration system
+    "AgentSettings": ".config",
+    "ConfigManager": ".config",
+    "DatabaseSettings": ".config",
+    "LoggingSettings": ".config",
+    "MemoriSettings": ".config",
+    # Core components
+    "DatabaseManager": ".core.database",
+    "Memori": ".core.memory",
+    "MemoriPool": ".core.pool",
+    "MemoriTenant": ".core.pool",
+    # Database system
+    "MySQLConnector": ".database.connectors",
+    "PostgreSQLConnector": ".database.connectors",
+    "SQLiteConnector": ".database.connectors",
+    "BaseQueries": ".database.queries",
+    "ChatQueries": ".database.queries",
+    "EntityQueries": ".database.queries",
+    "MemoryQueries": ".database.queries",
+    # Wrapper integrations
+    "MemoriAnthropic": ".integrations",
+    "MemoriOpenAI": ".integrations",
+    # Tools and integrations
+    "MemoryTool": ".tools.memory_tool",
+    "create_memory_search_tool": ".tools.memory_tool",
+    "create_memory_tool": ".tools.memory_tool",
+    # Memory agents
+    "MemoryAgent": ".agents.memory_agent",
+    "MemorySearchEngine": ".agents.retrieval_agent",
+}
 
-# Core components
-from .core.memory import Memori
-
-# Database system
-from .database.connectors import MySQLConnector, PostgreSQLConnector, SQLiteConnector
-from .database.queries import BaseQueries, ChatQueries, EntityQueries, MemoryQueries
-
-# Wrapper integrations
-from .integrations import MemoriAnthropic, MemoriOpenAI
+# Utils and models: Pydantic models; Enhanced exceptions; Validators and helpers; Logging
+for _name in (
+    "AgentError",
+    "AsyncUtils",
+    "AuthenticationError",
+    "ConfigurationError",
+    "ConversationContext",
+    "DatabaseError",
+    "DataValidator",
+    "DateTimeUtils",
+    "EntityType",
+    "ExceptionHandler",
+    "ExtractedEntities",
+    "FileUtils",
+    "IntegrationError",
+    "JsonUtils",
+    "LoggingManager",
+    "MemoriError",
+    "MemoryCategory",
+    "MemoryCategoryType",
+    "MemoryImportance",
+    "MemoryNotFoundError",
+    "MemoryValidator",
+    "PerformanceUtils",
+    "ProcessedMemory",
+    "ProcessingError",
+    "RateLimitError",
+    "ResourceExhaustedError",
+    "RetentionType",
+    "RetryUtils",
+    "StringUtils",
+    "TimeoutError",
+    "ValidationError",
+    "get_logger",
+):
+    _LAZY_IMPORTS[_name] = ".utils"
+del _name
 
-# Tools and integrations
-from .tools.memory_tool import MemoryTool, create_memory_search_tool, create_memory_tool
 
-# Utils and models
-from .utils import (  # Pydantic models; Enhanced exceptions; Validators and helpers; Logging
-    AgentError,
-    AsyncUtils,
-    AuthenticationError,
-    ConfigurationError,
-    ConversationContext,
-    DatabaseError,
-    DataValidator,
-    DateTimeUtils,
-    EntityType,
-    ExceptionHandler,
-    ExtractedEntities,
-    FileUtils,
-    IntegrationError,
-    JsonUtils,
-    LoggingManager,
-    MemoriError,
-    MemoryCategory,
-    MemoryCategoryType,
-    MemoryImportance,
-    MemoryNotFoundError,
-    MemoryValidator,
-    PerformanceUtils,
-    ProcessedMemory,
-    ProcessingError,
-    RateLimitError,
-    ResourceExhaustedError,
-    RetentionType,
-    RetryUtils,
-    StringUtils,
-    TimeoutError,
-    ValidationError,
-    get_logger,
-)
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
-# Memory agents (dynamically imported to avoid import errors)
-MemoryAgent: Optional[Any] = None
-MemorySearchEngine: Optional[Any] = None
-_AGENTS_AVAILABLE = False
 
-try:
-    from .agents.memory_agent import MemoryAgent
-    from .agents.retrieval_agent import MemorySearchEngine
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
-    _AGENTS_AVAILABLE = True
-except ImportError:
-    # Agents are not available, use placeholder None values
-    pass
 
 # Build __all__ list dynamically based on available components
 _all_components = [
     # Core
     "Memori",
+    "MemoriPool",
+    "MemoriTenant",
     "DatabaseManager",
     # Configuration
     "MemoriSettings",
@@ -147,10 +163,9 @@ _all_components = [
     # Logging
     "LoggingManager",
     "get_logger",
+    # Agents
+    "MemoryAgent",
+    "MemorySearchEngine",
 ]
 
-# Add agents only if available
-if _AGENTS_AVAILABLE:
-    _all_components.extend(["MemoryAgent", "MemorySearchEngine"])
-
 __all__ = _all_components
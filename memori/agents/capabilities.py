@@ -0,0 +1,150 @@
+"""
+Provider capability cache
+
+Whether an endpoint supports structured outputs is probed once per provider
+endpoint and model and kept on disk. New processes (workers, CLI tools,
+serverless cold starts) then skip the probe, which on Azure is a live API call.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from ..core.providers import ProviderConfig
+
+STRUCTURED_OUTPUTS = "structured_outputs"
+
+# Re-probe after a week so endpoint upgrades are picked up
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+
+def default_cache_path() -> Path:
+    """$MEMORI_CACHE_DIR, else $XDG_CACHE_HOME/memori, else ~/.cache/memori"""
+    directory = os.environ.get("MEMORI_CACHE_DIR")
+    if not directory:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+            os.path.expanduser("~"), ".cache"
+        )
+        directory = os.path.join(base, "memori")
+    return Path(directory) / "capabilities.json"
+
+
+def provider_cache_key(
+    provider_config: Optional["ProviderConfig"], model: Optional[str]
+) -> str:
+    """Identify an endpoint and model; never includes credentials"""
+    if provider_config is None:
+        return f"openai||{model}"
+    endpoint = (
+        provider_config.azure_endpoint
+        if provider_config.api_type == "azure"
+        else provider_config.base_url
+    )
+    parts = [
+        provider_config.api_type or "openai",
+        (endpoint or "").rstrip("/"),
+        provider_config.azure_deployment or "",
+        provider_config.api_version or "",
+        model or provider_config.model or "",
+    ]
+    return "|".join(parts)
+
+
+class CapabilityCache:
+    """Probe results keyed by provider, kept in memory and in a JSON file"""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ):
+        self.path = Path(path) if path is not None else default_cache_path()
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    entries = json.load(f)
+                self._entries = entries if isinstance(entries, dict) else {}
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, key: str, capability: str) -> Optional[bool]:
+        """Cached result, or None if never probed or expired"""
+        with self._lock:
+            entry = self._load().get(key, {}).get(capability)
+        if not isinstance(entry, dict):
+            return None
+        if time.time() - entry.get("checked_at", 0) > self.ttl_seconds:
+            return None
+        return bool(entry.get("supported"))
+
+    def set(self, key: str, capability: str, supported: bool):
+        with self._lock:
+            entries = self._load()
+            entries.setdefault(key, {})[capability] = {
+                "supported": bool(supported),
+                "checked_at": time.time(),
+            }
+            self._write(entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+
+    def _write(self, entries: Dict[str, Dict[str, Any]]):
+        # Atomic replace so concurrent processes never read a partial file
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=str(self.path.parent), prefix=".capabilities-"
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            # Read-only home directories still get the in-process cache
+            logger.debug(f"Could not write capability cache {self.path}: {e}")
+
+
+_cache: Optional[CapabilityCache] = None
+
+
+def get_capability_cache() -> CapabilityCache:
+    global _cache
+    if _cache is None:
+        _cache = CapabilityCache()
+    return _cache
+
+
+def cached_capability(
+    provider_config: Optional["ProviderConfig"],
+    model: Optional[str],
+    capability: str,
+    probe: Callable[[], bool],
+) -> bool:
+    """Return a cached capability result, running and recording the probe on a miss"""
+    cache = get_capability_cache()
+    key = provider_cache_key(provider_config, model)
+    supported = cache.get(key, capability)
+    if supported is None:
+        supported = probe()
+        cache.set(key, capability, supported)
+    else:
+        logger.debug(f"Using cached {capability}={supported} for {key}")
+    return supported
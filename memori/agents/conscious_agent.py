@@ -5,9 +5,11 @@ This agent copies conscious-info labeled memories from long-term memory
 directly to short-term memory for immediate context availability.
 """
 
-import json
+import asyncio
+import functools
+import threading
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional, Set, Tuple
 
 from loguru import logger
 
@@ -20,9 +22,81 @@ class ConsciouscAgent:
     Runs once at program startup when conscious_ingest=True.
     """
 
-    def __init__(self):
+    # Number of memories promoted per INSERT ... SELECT / UPDATE round trip
+    PROMOTION_BATCH_SIZE = 500
+
+    def __init__(self, batch_size: Optional[int] = None):
         """Initialize the conscious agent"""
         self.context_initialized = False
+        self.batch_size = batch_size or self.PROMOTION_BATCH_SIZE
+        # Memory ids announced on the event bus and not yet promoted
+        self._pending_lock = threading.Lock()
+        self._pending_ids: Dict[str, Set[str]] = {}
+
+    @staticmethod
+    async def _run_blocking(func, *args, **kwargs):
+        """Run synchronous database work off the event loop"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(func, *args, **kwargs)
+        )
+
+    def enqueue_promotion(self, namespace: str, memory_id: str):
+        """Queue a newly written memory for incremental promotion"""
+        with self._pending_lock:
+            self._pending_ids.setdefault(namespace, set()).add(memory_id)
+
+    def has_pending_promotions(self, namespace: str = "default") -> bool:
+        """Check whether announced memories are waiting for promotion"""
+        with self._pending_lock:
+            return bool(self._pending_ids.get(namespace))
+
+    async def promote_pending(self, db_manager, namespace: str = "default") -> bool:
+        """
+        Promote only the memories announced since the last call
+
+        Unlike check_for_context_updates this never rescans long_term_memory;
+        it looks up the queued ids by primary key.
+
+        Returns:
+            True if new memories were copied, False otherwise
+        """
+        with self._pending_lock:
+            memory_ids = self._pending_ids.pop(namespace, set())
+
+        if not memory_ids:
+            return False
+
+        try:
+            candidates = await self._run_blocking(
+                self._get_promotion_candidates,
+                db_manager,
+                namespace,
+                unprocessed_only=True,
+                memory_ids=memory_ids,
+            )
+            if not candidates:
+                return False
+
+            copied_count = await self._run_blocking(
+                self.promote_memories,
+                db_manager,
+                namespace,
+                candidates,
+                mark_processed=True,
+            )
+            if copied_count:
+                logger.info(
+                    f"ConsciouscAgent: Promoted {copied_count} new conscious-info memories to short-term memory"
+                )
+            return copied_count > 0
+
+        except Exception as e:
+            # Put the ids back so the next wake-up retries them
+            with self._pending_lock:
+                self._pending_ids.setdefault(namespace, set()).update(memory_ids)
+            logger.error(f"ConsciouscAgent: Incremental promotion failed: {e}")
+            return False
 
     async def run_conscious_ingest(
         self, db_manager, namespace: str = "default"
@@ -41,29 +115,21 @@ class ConsciouscAgent:
             True if memories were copied, False otherwise
         """
         try:
-            # Get all conscious-info labeled memories
-            conscious_memories = await self._get_conscious_memories(
-                db_manager, namespace
+            candidates = await self._run_blocking(
+                self._get_promotion_candidates, db_manager, namespace
             )
 
-            if not conscious_memories:
+            if not candidates:
                 logger.info("ConsciouscAgent: No conscious-info memories found")
                 return False
 
-            # Copy each conscious-info memory directly to short-term memory
-            copied_count = 0
-            for memory_row in conscious_memories:
-                success = await self._copy_memory_to_short_term(
-                    db_manager, namespace, memory_row
-                )
-                if success:
-                    copied_count += 1
-
-            # Mark memories as processed
-            memory_ids = [
-                row[0] for row in conscious_memories
-            ]  # memory_id is first column
-            await self._mark_memories_processed(db_manager, memory_ids, namespace)
+            copied_count = await self._run_blocking(
+                self.promote_memories,
+                db_manager,
+                namespace,
+                candidates,
+                mark_processed=True,
+            )
 
             self.context_initialized = True
             logger.info(
@@ -91,36 +157,26 @@ class ConsciouscAgent:
         Returns:
             True if memories were processed, False otherwise
         """
+        return await self._run_blocking(
+            self.initialize_existing_conscious_memories_sync, db_manager, namespace
+        )
+
+    def initialize_existing_conscious_memories_sync(
+        self, db_manager, namespace: str = "default"
+    ) -> bool:
+        """Synchronous variant of initialize_existing_conscious_memories"""
         try:
-            from sqlalchemy import text
-
-            with db_manager._get_connection() as connection:
-                # Get ALL conscious-info labeled memories from long-term memory
-                cursor = connection.execute(
-                    text(
-                        """SELECT memory_id, processed_data, summary, searchable_content,
-                              importance_score, created_at
-                       FROM long_term_memory
-                       WHERE namespace = :namespace AND classification = 'conscious-info'
-                       ORDER BY importance_score DESC, created_at DESC"""
-                    ),
-                    {"namespace": namespace},
-                )
-                existing_conscious_memories = cursor.fetchall()
+            candidates = self._get_promotion_candidates(db_manager, namespace)
 
-            if not existing_conscious_memories:
+            if not candidates:
                 logger.debug(
                     "ConsciouscAgent: No existing conscious-info memories found for initialization"
                 )
                 return False
 
-            copied_count = 0
-            for memory_row in existing_conscious_memories:
-                success = await self._copy_memory_to_short_term(
-                    db_manager, namespace, memory_row
-                )
-                if success:
-                    copied_count += 1
+            copied_count = self.promote_memories(
+                db_manager, namespace, candidates, mark_processed=False
+            )
 
             if copied_count > 0:
                 logger.info(
@@ -153,26 +209,23 @@ class ConsciouscAgent:
             True if new memories were copied, False otherwise
         """
         try:
-            # Get unprocessed conscious memories
-            new_memories = await self._get_unprocessed_conscious_memories(
-                db_manager, namespace
+            new_memories = await self._run_blocking(
+                self._get_promotion_candidates,
+                db_manager,
+                namespace,
+                unprocessed_only=True,
             )
 
             if not new_memories:
                 return False
 
-            # Copy each new memory directly to short-term memory
-            copied_count = 0
-            for memory_row in new_memories:
-                success = await self._copy_memory_to_short_term(
-                    db_manager, namespace, memory_row
-                )
-                if success:
-                    copied_count += 1
-
-            # Mark new memories as processed
-            memory_ids = [row[0] for row in new_memories]  # memory_id is first column
-            await self._mark_memories_processed(db_manager, memory_ids, namespace)
+            copied_count = await self._run_blocking(
+                self.promote_memories,
+                db_manager,
+                namespace,
+                new_memories,
+                mark_processed=True,
+            )
 
             logger.info(
                 f"ConsciouscAgent: Copied {copied_count} new conscious-info memories to short-term memory"
@@ -183,162 +236,205 @@ class ConsciouscAgent:
             logger.error(f"ConsciouscAgent: Context update failed: {e}")
             return False
 
-    async def _get_conscious_memories(self, db_manager, namespace: str) -> List[tuple]:
-        """Get all conscious-info labeled memories from long-term memory"""
+    def _get_promotion_candidates(
+        self,
+        db_manager,
+        namespace: str,
+        unprocessed_only: bool = False,
+        memory_ids: Optional[Set[str]] = None,
+    ) -> List[Tuple[str, str, str]]:
+        """
+        Get conscious-info memories eligible for promotion
+
+        Returns:
+            (memory_id, searchable_content, summary) tuples in promotion order
+        """
         try:
-            from sqlalchemy import text
-
-            with db_manager._get_connection() as connection:
-                cursor = connection.execute(
-                    text(
-                        """SELECT memory_id, processed_data, summary, searchable_content,
-                              importance_score, created_at
-                       FROM long_term_memory
-                       WHERE namespace = :namespace AND classification = 'conscious-info'
-                       ORDER BY importance_score DESC, created_at DESC"""
-                    ),
-                    {"namespace": namespace},
-                )
-                return cursor.fetchall()
+            from sqlalchemy import select
 
-        except Exception as e:
-            logger.error(f"ConsciouscAgent: Failed to get conscious memories: {e}")
-            return []
+            from ..database.models import LongTermMemory
 
-    async def _get_unprocessed_conscious_memories(
-        self, db_manager, namespace: str
-    ) -> List[tuple]:
-        """Get unprocessed conscious-info labeled memories from long-term memory"""
-        try:
-            from sqlalchemy import text
-
-            with db_manager._get_connection() as connection:
-                cursor = connection.execute(
-                    text(
-                        """SELECT memory_id, processed_data, summary, searchable_content,
-                              importance_score, created_at
-                       FROM long_term_memory
-                       WHERE namespace = :namespace AND classification = 'conscious-info'
-                       AND conscious_processed = :conscious_processed
-                       ORDER BY importance_score DESC, created_at DESC"""
-                    ),
-                    {"namespace": namespace, "conscious_processed": False},
-                )
-                return cursor.fetchall()
+            query = select(
+                LongTermMemory.memory_id,
+                LongTermMemory.searchable_content,
+                LongTermMemory.summary,
+            ).where(
+                LongTermMemory.namespace == namespace,
+                LongTermMemory.classification == "conscious-info",
+            )
+            if unprocessed_only:
+                query = query.where(LongTermMemory.conscious_processed.is_(False))
+            if memory_ids is not None:
+                query = query.where(LongTermMemory.memory_id.in_(list(memory_ids)))
+            query = query.order_by(
+                LongTermMemory.importance_score.desc(),
+                LongTermMemory.created_at.desc(),
+            )
+
+            with db_manager._get_connection(namespace=namespace) as connection:
+                return [tuple(row) for row in connection.execute(query).fetchall()]
 
         except Exception as e:
-            logger.error(f"ConsciouscAgent: Failed to get unprocessed memories: {e}")
+            logger.error(f"ConsciouscAgent: Failed to get conscious memories: {e}")
             return []
 
-    async def _copy_memory_to_short_term(
-        self, db_manager, namespace: str, memory_row: tuple
-    ) -> bool:
-        """Copy a conscious memory directly to short-term memory with duplicate filtering"""
-        try:
-            (
-                memory_id,
-                processed_data,
-                summary,
-                searchable_content,
-                importance_score,
-                _,
-            ) = memory_row
-
-            from sqlalchemy import text
-
-            with db_manager._get_connection() as connection:
-                # Check if similar content already exists in short-term memory
-                existing_check = connection.execute(
-                    text(
-                        """SELECT COUNT(*) FROM short_term_memory
-                           WHERE namespace = :namespace
-                           AND category_primary = 'conscious_context'
-                           AND (searchable_content = :searchable_content
-                                OR summary = :summary)"""
-                    ),
-                    {
-                        "namespace": namespace,
-                        "searchable_content": searchable_content,
-                        "summary": summary,
-                    },
-                )
-
-                existing_count = existing_check.scalar()
-                if existing_count > 0:
-                    logger.debug(
-                        f"ConsciouscAgent: Skipping duplicate memory {memory_id} - similar content already exists in short-term memory"
-                    )
-                    return False
-
-                # Create short-term memory ID
-                short_term_id = (
-                    f"conscious_{memory_id}_{int(datetime.now().timestamp())}"
-                )
+    def promote_memories(
+        self,
+        db_manager,
+        namespace: str,
+        candidates: List[Tuple[str, str, str]],
+        mark_processed: bool = True,
+    ) -> int:
+        """
+        Copy conscious memories to short-term memory in set-based batches
 
-                # Insert directly into short-term memory with conscious_context category
-                connection.execute(
-                    text(
-                        """INSERT INTO short_term_memory (
-                        memory_id, processed_data, importance_score, category_primary,
-                        retention_type, namespace, created_at, expires_at,
-                        searchable_content, summary, is_permanent_context
-                    ) VALUES (:memory_id, :processed_data, :importance_score, :category_primary,
-                        :retention_type, :namespace, :created_at, :expires_at,
-                        :searchable_content, :summary, :is_permanent_context)"""
-                    ),
-                    {
-                        "memory_id": short_term_id,
-                        "processed_data": (
-                            json.dumps(processed_data)
-                            if isinstance(processed_data, dict)
-                            else processed_data
-                        ),
-                        "importance_score": importance_score,
-                        "category_primary": "conscious_context",  # Use conscious_context category
-                        "retention_type": "permanent",
-                        "namespace": namespace,
-                        "created_at": datetime.now().isoformat(),
-                        "expires_at": None,  # No expiration (permanent)
-                        "searchable_content": searchable_content,  # Copy exact searchable_content
-                        "summary": summary,  # Copy exact summary
-                        "is_permanent_context": True,  # is_permanent_context = True
-                    },
-                )
-                connection.commit()
+        Each batch costs one INSERT ... SELECT ... WHERE NOT EXISTS (skipping
+        content already present as conscious context) and, when requested,
+        one UPDATE ... WHERE memory_id IN (...) marking the batch processed.
+        Candidates repeating the content or summary of an earlier candidate
+        are dropped before they reach the database.
 
-            logger.debug(
-                f"ConsciouscAgent: Copied memory {memory_id} to short-term as {short_term_id}"
-            )
-            return True
+        Args:
+            db_manager: Database manager instance
+            namespace: Memory namespace
+            candidates: (memory_id, searchable_content, summary) tuples
+            mark_processed: Set conscious_processed on every candidate
 
-        except Exception as e:
-            logger.error(
-                f"ConsciouscAgent: Failed to copy memory {memory_row[0]} to short-term: {e}"
-            )
-            return False
+        Returns:
+            Number of short-term memories created
+        """
+        from sqlalchemy import and_, exists, insert, literal, or_, select, update
 
-    async def _mark_memories_processed(
-        self, db_manager, memory_ids: List[str], namespace: str
-    ):
-        """Mark memories as processed for conscious context"""
-        try:
-            from sqlalchemy import text
-
-            with db_manager._get_connection() as connection:
-                for memory_id in memory_ids:
-                    connection.execute(
-                        text(
-                            """UPDATE long_term_memory
-                           SET conscious_processed = :conscious_processed
-                           WHERE memory_id = :memory_id AND namespace = :namespace"""
-                        ),
-                        {
-                            "memory_id": memory_id,
-                            "namespace": namespace,
-                            "conscious_processed": True,
-                        },
-                    )
-                connection.commit()
+        from ..database.memory_stats import StatDeltas
+        from ..database.models import LongTermMemory, ShortTermMemory
 
-        except Exception as e:
-            logger.error(f"ConsciouscAgent: Failed to mark memories processed: {e}")
+        # Within-run duplicate filtering keeps the first (most important) copy
+        seen_content = set()
+        seen_summaries = set()
+        unique_ids = []
+        for memory_id, searchable_content, summary in candidates:
+            if searchable_content in seen_content or summary in seen_summaries:
+                logger.debug(
+                    f"ConsciouscAgent: Skipping duplicate memory {memory_id} - repeats an earlier conscious memory"
+                )
+                continue
+            seen_content.add(searchable_content)
+            seen_summaries.add(summary)
+            unique_ids.append(memory_id)
+        unique_id_set = set(unique_ids)
+        all_ids = [row[0] for row in candidates]
+
+        copied_count = 0
+        for offset in range(0, len(all_ids), self.batch_size):
+            batch_ids = all_ids[offset : offset + self.batch_size]
+            insert_ids = [mid for mid in batch_ids if mid in unique_id_set]
+            now = datetime.now()
+
+            with db_manager._get_connection(namespace=namespace) as connection:
+                try:
+                    if insert_ids:
+                        existing = ShortTermMemory.__table__.alias("existing")
+                        already_promoted = exists().where(
+                            and_(
+                                existing.c.namespace == namespace,
+                                existing.c.category_primary == "conscious_context",
+                                or_(
+                                    existing.c.searchable_content
+                                    == LongTermMemory.searchable_content,
+                                    existing.c.summary == LongTermMemory.summary,
+                                ),
+                            )
+                        )
+                        source = select(
+                            (
+                                literal("conscious_")
+                                + LongTermMemory.memory_id
+                                + literal(f"_{int(now.timestamp())}")
+                            ),
+                            LongTermMemory.processed_data,
+                            LongTermMemory.importance_score,
+                            literal("conscious_context"),
+                            literal("permanent"),
+                            LongTermMemory.namespace,
+                            literal(now, ShortTermMemory.created_at.type),
+                            LongTermMemory.searchable_content,
+                            LongTermMemory.summary,
+                            literal(True, ShortTermMemory.is_permanent_context.type),
+                        ).where(
+                            LongTermMemory.namespace == namespace,
+                            LongTermMemory.memory_id.in_(insert_ids),
+                            ~already_promoted,
+                        )
+                        result = connection.execute(
+                            insert(ShortTermMemory).from_select(
+                                [
+                                    "memory_id",
+                                    "processed_data",
+                                    "importance_score",
+                                    "category_primary",
+                                    "retention_type",
+                                    "namespace",
+                                    "created_at",
+                                    "searchable_content",
+                                    "summary",
+                                    "is_permanent_context",
+                                ],
+                                source,
+                            )
+                        )
+                        if result.rowcount:
+                            copied_count += max(result.rowcount, 0)
+                            # Count the promoted rows and merge them into the
+                            # user profile in the same transaction
+                            suffix = f"_{int(now.timestamp())}"
+                            promoted = [
+                                dict(row._mapping)
+                                for row in connection.execute(
+                                    select(
+                                        ShortTermMemory.memory_id,
+                                        ShortTermMemory.namespace,
+                                        ShortTermMemory.category_primary,
+                                        ShortTermMemory.importance_score,
+                                        ShortTermMemory.searchable_content,
+                                        ShortTermMemory.summary,
+                                        ShortTermMemory.created_at,
+                                    ).where(
+                                        ShortTermMemory.memory_id.in_(
+                                            [
+                                                f"conscious_{mid}{suffix}"
+                                                for mid in insert_ids
+                                            ]
+                                        )
+                                    )
+                                )
+                            ]
+                            deltas = StatDeltas()
+                            deltas.add_rows("short_term", promoted)
+                            db_manager._apply_stat_deltas(connection, deltas)
+                            db_manager._update_user_profile(
+                                connection, namespace, promoted
+                            )
+
+                    if mark_processed:
+                        connection.execute(
+                            update(LongTermMemory)
+                            .where(
+                                LongTermMemory.namespace == namespace,
+                                LongTermMemory.memory_id.in_(batch_ids),
+                            )
+                            .values(conscious_processed=True)
+                        )
+
+                    connection.commit()
+                except Exception:
+                    connection.rollback()
+                    raise
+
+        db_manager._record_write(namespace)
+        if copied_count:
+            db_manager._invalidate_user_profile(namespace)
+        logger.debug(
+            f"ConsciouscAgent: Promoted {copied_count} of {len(all_ids)} conscious memories in "
+            f"{(len(all_ids) + self.batch_size - 1) // self.batch_size} batch(es)"
+        )
+        return copied_count
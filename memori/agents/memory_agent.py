@@ -7,20 +7,25 @@ enhanced classification and conscious context detection.
 
 import json
 from datetime import datetime
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 
-import openai
 from loguru import logger
 
 if TYPE_CHECKING:
     from ..core.providers import ProviderConfig
 
+from ..database.recent_memory_window import (
+    MemoryFingerprint,
+    jaccard_similarity,
+    tokenize,
+)
 from ..utils.pydantic_models import (
     ConversationContext,
     MemoryClassification,
     MemoryImportanceLevel,
     ProcessedLongTermMemory,
 )
+from .capabilities import STRUCTURED_OUTPUTS, get_capability_cache, provider_cache_key
 
 
 class MemoryAgent:
@@ -33,6 +38,7 @@ class MemoryAgent:
         api_key: Optional[str] = None,
         model: Optional[str] = None,
         provider_config: Optional["ProviderConfig"] = None,
+        shared_clients: bool = True,
     ):
         """
         Initialize Memory Agent with LLM provider configuration
@@ -41,24 +47,79 @@ class MemoryAgent:
             api_key: API key (deprecated, use provider_config)
             model: Model to use for structured output (defaults to 'gpt-4o' if not specified)
             provider_config: Provider configuration for LLM client
+            shared_clients: Share clients with other agents using the same configuration
         """
         if provider_config:
-            # Use provider configuration to create clients
-            self.client = provider_config.create_client()
-            self.async_client = provider_config.create_async_client()
             # Use provided model, fallback to provider config model, then default to gpt-4o
             self.model = model or provider_config.model or "gpt-4o"
             logger.debug(f"Memory agent initialized with model: {self.model}")
-            self.provider_config = provider_config
         else:
             # Backward compatibility: use api_key directly
-            self.client = openai.OpenAI(api_key=api_key)
-            self.async_client = openai.AsyncOpenAI(api_key=api_key)
             self.model = model or "gpt-4o"
-            self.provider_config = None
+        self.provider_config = provider_config
+        self._api_key = api_key
+
+        # Clients and the structured output check are created on first use
+        self.shared_clients = shared_clients
+        self._client = None
+        self._async_client = None
+        self._client_keys: List[tuple] = []
+        self._structured_outputs: Optional[bool] = None
 
+    def _create_client(self, asynchronous: bool):
+        from ..core.providers import ProviderConfig, acquire_shared_client
+
+        config = self.provider_config or ProviderConfig.from_openai(
+            api_key=self._api_key
+        )
+        if not self.shared_clients:
+            return (
+                config.create_async_client() if asynchronous else config.create_client()
+            )
+        client, key = acquire_shared_client(config, asynchronous)
+        self._client_keys.append(key)
+        return client
+
+    def close(self):
+        """Release this agent's clients (shared ones close with their last user)"""
+        from ..core.providers import release_shared_client
+
+        keys, self._client_keys = self._client_keys, []
+        for key in keys:
+            release_shared_client(key)
+        self._client = None
+        self._async_client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = self._create_client(asynchronous=False)
+        return self._client
+
+    @client.setter
+    def client(self, value):
+        self._client = value
+
+    @property
+    def async_client(self):
+        if self._async_client is None:
+            self._async_client = self._create_client(asynchronous=True)
+        return self._async_client
+
+    @async_client.setter
+    def async_client(self, value):
+        self._async_client = value
+
+    @property
+    def _supports_structured_outputs(self) -> bool:
         # Determine if we're using a local/custom endpoint that might not support structured outputs
-        self._supports_structured_outputs = self._detect_structured_output_support()
+        if self._structured_outputs is None:
+            self._structured_outputs = self._detect_structured_output_support()
+        return self._structured_outputs
+
+    @_supports_structured_outputs.setter
+    def _supports_structured_outputs(self, value: bool):
+        self._structured_outputs = value
 
     SYSTEM_PROMPT = """You are an advanced Memory Processing Agent responsible for analyzing conversations and extracting structured information with intelligent classification and conscious context detection.
 
@@ -262,7 +323,7 @@ CONVERSATION CONTEXT:
     async def detect_duplicates(
         self,
         new_memory: ProcessedLongTermMemory,
-        existing_memories: List[ProcessedLongTermMemory],
+        existing_memories: List[Union[ProcessedLongTermMemory, MemoryFingerprint]],
         similarity_threshold: float = 0.8,
     ) -> Optional[str]:
         """
@@ -270,26 +331,29 @@ CONVERSATION CONTEXT:
 
         Args:
             new_memory: New memory to check
-            existing_memories: List of existing memories to compare against
+            existing_memories: Existing memories (or their precomputed
+                fingerprints) to compare against
             similarity_threshold: Threshold for considering memories similar
 
         Returns:
             Memory ID of duplicate if found, None otherwise
         """
         # Simple text similarity check - could be enhanced with embeddings
-        new_content = new_memory.content.lower().strip()
-        new_summary = new_memory.summary.lower().strip()
+        new_content = tokenize(new_memory.content)
+        new_summary = tokenize(new_memory.summary)
 
         for existing in existing_memories:
-            existing_content = existing.content.lower().strip()
-            existing_summary = existing.summary.lower().strip()
+            if not isinstance(existing, MemoryFingerprint):
+                existing = MemoryFingerprint.from_text(
+                    existing.conversation_id, existing.content, existing.summary
+                )
 
-            # Check content similarity
-            content_similarity = self._calculate_similarity(
-                new_content, existing_content
+            # Check content and summary similarity
+            content_similarity = jaccard_similarity(
+                new_content, existing.content_tokens
             )
-            summary_similarity = self._calculate_similarity(
-                new_summary, existing_summary
+            summary_similarity = jaccard_similarity(
+                new_summary, existing.summary_tokens
             )
 
             # Average similarity score
@@ -297,9 +361,9 @@ CONVERSATION CONTEXT:
 
             if avg_similarity >= similarity_threshold:
                 logger.info(
-                    f"Duplicate detected: {avg_similarity:.2f} similarity with {existing.conversation_id}"
+                    f"Duplicate detected: {avg_similarity:.2f} similarity with {existing.memory_id}"
                 )
-                return existing.conversation_id
+                return existing.memory_id
 
         return None
 
@@ -351,6 +415,13 @@ CONVERSATION CONTEXT:
             # Check for Azure endpoints (they may or may not support beta features)
             if self.provider_config and hasattr(self.provider_config, "api_type"):
                 if self.provider_config.api_type == "azure":
+                    # Reuse the search engine's probe result when one is cached
+                    cached = get_capability_cache().get(
+                        provider_cache_key(self.provider_config, self.model),
+                        STRUCTURED_OUTPUTS,
+                    )
+                    if cached is not None:
+                        return cached
                     logger.debug(
                         "Detected Azure endpoint, enabling structured outputs (may need manual verification)"
                     )
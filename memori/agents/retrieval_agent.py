@@ -9,13 +9,13 @@ import time
 from datetime import datetime
 from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-import openai
 from loguru import logger
 
 if TYPE_CHECKING:
     from ..core.providers import ProviderConfig
 
 from ..utils.pydantic_models import MemorySearchQuery
+from .capabilities import STRUCTURED_OUTPUTS, cached_capability
 
 
 class MemorySearchEngine:
@@ -61,6 +61,7 @@ Be strategic and comprehensive in your search planning."""
         api_key: Optional[str] = None,
         model: Optional[str] = None,
         provider_config: Optional["ProviderConfig"] = None,
+        shared_clients: bool = True,
     ):
         """
         Initialize Memory Search Engine with LLM provider configuration
@@ -69,22 +70,23 @@ Be strategic and comprehensive in your search planning."""
             api_key: API key (deprecated, use provider_config)
             model: Model to use for query understanding (defaults to 'gpt-4o' if not specified)
             provider_config: Provider configuration for LLM client
+            shared_clients: Share the client with other agents using the same configuration
         """
         if provider_config:
-            # Use provider configuration to create client
-            self.client = provider_config.create_client()
             # Use provided model, fallback to provider config model, then default to gpt-4o
             self.model = model or provider_config.model or "gpt-4o"
             logger.debug(f"Search engine initialized with model: {self.model}")
-            self.provider_config = provider_config
         else:
             # Backward compatibility: use api_key directly
-            self.client = openai.OpenAI(api_key=api_key)
             self.model = model or "gpt-4o"
-            self.provider_config = None
+        self.provider_config = provider_config
+        self._api_key = api_key
 
-        # Determine if we're using a local/custom endpoint that might not support structured outputs
-        self._supports_structured_outputs = self._detect_structured_output_support()
+        # The client and the structured output check are created on first use
+        self.shared_clients = shared_clients
+        self._client = None
+        self._client_key: Optional[tuple] = None
+        self._structured_outputs: Optional[bool] = None
 
         # Performance improvements
         self._query_cache = {}  # Cache for search plans
@@ -94,6 +96,44 @@ Be strategic and comprehensive in your search planning."""
         # Background processing
         self._background_executor = None
 
+    @property
+    def client(self):
+        if self._client is None:
+            from ..core.providers import ProviderConfig, acquire_shared_client
+
+            config = self.provider_config or ProviderConfig.from_openai(
+                api_key=self._api_key
+            )
+            if self.shared_clients:
+                self._client, self._client_key = acquire_shared_client(config)
+            else:
+                self._client = config.create_client()
+        return self._client
+
+    @client.setter
+    def client(self, value):
+        self._client = value
+
+    def close(self):
+        """Release the client (a shared one closes with its last user)"""
+        from ..core.providers import release_shared_client
+
+        if self._client_key is not None:
+            release_shared_client(self._client_key)
+            self._client_key = None
+        self._client = None
+
+    @property
+    def _supports_structured_outputs(self) -> bool:
+        # Determine if we're using a local/custom endpoint that might not support structured outputs
+        if self._structured_outputs is None:
+            self._structured_outputs = self._detect_structured_output_support()
+        return self._structured_outputs
+
+    @_supports_structured_outputs.setter
+    def _supports_structured_outputs(self, value: bool):
+        self._structured_outputs = value
+
     def plan_search(
         self, query: str, context: Optional[str] = None
     ) -> MemorySearchQuery:
@@ -312,35 +352,11 @@ Be strategic and comprehensive in your search planning."""
 
             all_results = valid_results
 
-            # Sort by relevance (importance score + recency)
+            # Results carry the composite score computed in SQL (see
+            # database.scoring), so every strategy ranks the same way
             if all_results:
-
-                def safe_created_at_parse(created_at_value):
-                    """Safely parse created_at value to datetime"""
-                    try:
-                        if created_at_value is None:
-                            return datetime.fromisoformat("2000-01-01")
-                        if isinstance(created_at_value, str):
-                            return datetime.fromisoformat(created_at_value)
-                        if hasattr(created_at_value, "isoformat"):  # datetime object
-                            return created_at_value
-                        # Fallback for any other type
-                        return datetime.fromisoformat("2000-01-01")
-                    except (ValueError, TypeError):
-                        return datetime.fromisoformat("2000-01-01")
-
                 all_results.sort(
-                    key=lambda x: (
-                        x.get("importance_score", 0) * 0.7  # Importance weight
-                        + (
-                            datetime.now().replace(tzinfo=None)  # Ensure timezone-naive
-                            - safe_created_at_parse(x.get("created_at")).replace(
-                                tzinfo=None
-                            )
-                        ).days
-                        * -0.001  # Recency weight
-                    ),
-                    reverse=True,
+                    key=lambda x: x.get("composite_score") or 0.0, reverse=True
                 )
 
                 # Add search metadata
@@ -467,7 +483,13 @@ Be strategic and comprehensive in your search planning."""
             # Check for Azure endpoints - test if they support structured outputs
             if self.provider_config and hasattr(self.provider_config, "api_type"):
                 if self.provider_config.api_type == "azure":
-                    return self._test_azure_structured_outputs_support()
+                    # The probe is a live API call; its result is cached on disk
+                    return cached_capability(
+                        self.provider_config,
+                        self.model,
+                        STRUCTURED_OUTPUTS,
+                        self._test_azure_structured_outputs_support,
+                    )
                 elif self.provider_config.api_type in ["custom", "openai_compatible"]:
                     logger.debug(
                         f"Detected {self.provider_config.api_type} endpoint, disabling structured outputs"
@@ -0,0 +1,383 @@
+"""
+Memori command line interface
+
+Usage:
+    memori shard-of --shard a=sqlite:///a.db --shard b=sqlite:///b.db --namespace acme
+    memori rebalance --shard a=... --shard b=... --namespace acme --to b [--batch-size 500]
+    memori advise-indexes --database sqlite:///memori.db [--namespace acme]
+    memori storage-report --database sqlite:///memori.db [--codec zlib]
+    memori compact-storage --database sqlite:///memori.db --codec zlib [--batch-size 500]
+    memori migrate --database sqlite:///memori.db [--check] [--force]
+    memori export --database sqlite:///memori.db [--namespace acme] [--output backup.jsonl]
+    memori import --database sqlite:///memori.db [--input backup.jsonl] [--replace]
+"""
+
+import argparse
+import sys
+from typing import Dict, List, Optional
+
+
+def _parse_shards(values: List[str]) -> Dict[str, str]:
+    shards: Dict[str, str] = {}
+    for value in values:
+        name, sep, database_connect = value.partition("=")
+        if not sep or not name or not database_connect:
+            raise argparse.ArgumentTypeError(
+                f"Invalid --shard '{value}', expected NAME=CONNECTION_STRING"
+            )
+        shards[name] = database_connect
+    return shards
+
+
+def _add_shard_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--shard",
+        action="append",
+        required=True,
+        metavar="NAME=URL",
+        help="Shard name and connection string, in ring order (repeatable)",
+    )
+    parser.add_argument("--namespace", required=True, help="Namespace to act on")
+
+
+def _open_sharded_manager(args):
+    from .database.sharding import ShardedDatabaseManager
+
+    manager = ShardedDatabaseManager(
+        _parse_shards(args.shard), schema_init=True, sqlite_profile=False
+    )
+    manager.initialize_schema()
+    return manager
+
+
+def _cmd_shard_of(args) -> int:
+    manager = _open_sharded_manager(args)
+    try:
+        print(manager.shard_for(args.namespace))
+    finally:
+        manager.close()
+    return 0
+
+
+def _cmd_rebalance(args) -> int:
+    manager = _open_sharded_manager(args)
+    try:
+        source = manager.shard_for(args.namespace)
+        copied = manager.rebalance_namespace(
+            args.namespace,
+            args.to,
+            batch_size=args.batch_size,
+            delete_source=not args.keep_source,
+        )
+    finally:
+        manager.close()
+
+    print(f"✅ Namespace '{args.namespace}': {source} -> {args.to}")
+    for table, count in copied.items():
+        print(f"   {table}: {count} rows")
+    return 0
+
+
+def _cmd_advise_indexes(args) -> int:
+    from .database.sqlalchemy_manager import SQLAlchemyDatabaseManager
+
+    manager = SQLAlchemyDatabaseManager(args.database, sqlite_profile=False)
+    try:
+        manager.initialize_schema()
+        reports = manager.advise_indexes(args.namespace)
+    finally:
+        manager.close()
+
+    flagged = 0
+    for report in reports:
+        if report.get("error"):
+            status = "⚠️ "
+        elif report["full_scans"]:
+            status = "❌"
+            flagged += 1
+        elif report.get("redundant"):
+            status = "⚠️ "
+        else:
+            status = "✅"
+        print(f"{status} {report['query']}")
+        if report.get("error"):
+            print(f"   error: {report['error']}")
+        if report["full_scans"]:
+            print(f"   full scan: {', '.join(report['full_scans'])}")
+        if report["sorts"]:
+            print(f"   sort: {'; '.join(report['sorts'])}")
+        for entry in report.get("redundant", []):
+            print(
+                f"   redundant: {entry['table']}.{entry['index']} "
+                f"({', '.join(entry['columns'])}) is covered by {entry['covered_by']}"
+            )
+        if args.verbose:
+            for line in report["plan"]:
+                print(f"   | {line}")
+
+    print(f"{flagged} of {len(reports)} queries scan a full table")
+    return 1 if flagged else 0
+
+
+def _cmd_storage_report(args) -> int:
+    from sqlalchemy import create_engine
+
+    from .database.storage_codec import storage_size_report
+
+    engine = create_engine(args.database)
+    try:
+        report = storage_size_report(engine, args.codec, sample_size=args.sample_size)
+    finally:
+        engine.dispose()
+
+    for table, stats in report.items():
+        print(f"{table}: {stats['rows']} rows, {stats['encoded_rows']} encoded")
+        print(
+            f"   stored: {stats['stored_bytes']} bytes "
+            f"({stats['avg_bytes']} bytes per row)"
+        )
+        if "projected_bytes" in stats:
+            print(
+                f"   with {stats['codec']}: ~{stats['projected_bytes']} bytes "
+                f"({stats['projected_ratio']:.0%} of stored, sampled)"
+            )
+    return 0
+
+
+def _cmd_compact_storage(args) -> int:
+    from sqlalchemy import create_engine
+
+    from .database.storage_codec import migrate_processed_data
+
+    engine = create_engine(args.database)
+    try:
+        migrated = migrate_processed_data(
+            engine, args.codec, batch_size=args.batch_size
+        )
+    finally:
+        engine.dispose()
+
+    print(f"✅ processed_data re-encoded with codec '{args.codec}'")
+    for table, count in migrated.items():
+        print(f"   {table}: {count} rows")
+    return 0
+
+
+def _cmd_migrate(args) -> int:
+    from sqlalchemy import create_engine
+
+    from .database.schema_version import (
+        SCHEMA_VERSION,
+        read_schema_state,
+        schema_fingerprint,
+    )
+
+    if args.check:
+        engine = create_engine(args.database)
+        try:
+            state = read_schema_state(engine)
+            expected = schema_fingerprint(engine.dialect)
+        finally:
+            engine.dispose()
+        if state is None:
+            print("❌ No recorded schema version; run 'memori migrate'")
+            return 1
+        if state["fingerprint"] != expected:
+            print(
+                f"❌ Schema v{state['version']} recorded by memori "
+                f"{state['library_version']} does not match this version "
+                f"(v{SCHEMA_VERSION}); run 'memori migrate'"
+            )
+            return 1
+        print(f"✅ Schema v{state['version']} is current")
+        return 0
+
+    from .database.sqlalchemy_manager import SQLAlchemyDatabaseManager
+
+    manager = SQLAlchemyDatabaseManager(args.database, sqlite_profile=False)
+    try:
+        manager.initialize_schema(force=args.force)
+        state = read_schema_state(manager.engine)
+    finally:
+        manager.close()
+
+    print(f"✅ Schema v{state['version']} applied at {state['applied_at']}")
+    return 0
+
+
+def _cmd_export(args) -> int:
+    from .database.sqlalchemy_manager import SQLAlchemyDatabaseManager
+
+    manager = SQLAlchemyDatabaseManager(args.database, sqlite_profile=False)
+    output = (
+        sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    )
+    try:
+        written = manager.export_jsonl(
+            output, namespace=args.namespace, batch_size=args.batch_size
+        )
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        manager.close()
+
+    # Progress goes to stderr so stdout stays a clean JSONL stream
+    print(f"✅ Exported {args.namespace or 'all namespaces'}", file=sys.stderr)
+    for table, count in written.items():
+        print(f"   {table}: {count} rows", file=sys.stderr)
+    return 0
+
+
+def _cmd_import(args) -> int:
+    from .database.sqlalchemy_manager import SQLAlchemyDatabaseManager
+
+    manager = SQLAlchemyDatabaseManager(
+        args.database,
+        sqlite_profile=False,
+        storage_codec=None if args.codec == "none" else args.codec,
+    )
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        manager.initialize_schema()
+        result = manager.import_jsonl(
+            source, batch_size=args.batch_size, replace=args.replace
+        )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        manager.close()
+
+    print(f"✅ Imported {', '.join(result['namespaces']) or 'nothing'}")
+    for table, count in result["rows"].items():
+        print(f"   {table}: {count} rows")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="memori", description="Memori administration")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    shard_of = subparsers.add_parser(
+        "shard-of", help="Print the shard holding a namespace"
+    )
+    _add_shard_arguments(shard_of)
+    shard_of.set_defaults(func=_cmd_shard_of)
+
+    rebalance = subparsers.add_parser(
+        "rebalance", help="Move a namespace to another shard (run with writers stopped)"
+    )
+    _add_shard_arguments(rebalance)
+    rebalance.add_argument("--to", required=True, help="Target shard name")
+    rebalance.add_argument(
+        "--batch-size", type=int, default=500, help="Rows copied per statement"
+    )
+    rebalance.add_argument(
+        "--keep-source",
+        action="store_true",
+        help="Leave the rows on the source shard after copying",
+    )
+    rebalance.set_defaults(func=_cmd_rebalance)
+
+    advise = subparsers.add_parser(
+        "advise-indexes", help="EXPLAIN the hot queries and flag full table scans"
+    )
+    advise.add_argument("--database", required=True, help="Connection string")
+    advise.add_argument(
+        "--namespace", default="default", help="Namespace used in the sample queries"
+    )
+    advise.add_argument(
+        "--verbose", action="store_true", help="Print the full query plans"
+    )
+    advise.set_defaults(func=_cmd_advise_indexes)
+
+    storage_report = subparsers.add_parser(
+        "storage-report", help="Report processed_data storage size"
+    )
+    storage_report.add_argument("--database", required=True, help="Connection string")
+    storage_report.add_argument(
+        "--codec", default="zlib", help="Codec to project savings for ('none' to skip)"
+    )
+    storage_report.add_argument(
+        "--sample-size", type=int, default=500, help="Rows encoded per table to project"
+    )
+    storage_report.set_defaults(func=_cmd_storage_report)
+
+    compact = subparsers.add_parser(
+        "compact-storage",
+        help="Re-encode stored processed_data with a codec ('none' restores plain JSON)",
+    )
+    compact.add_argument("--database", required=True, help="Connection string")
+    compact.add_argument(
+        "--codec", required=True, help="json, msgpack, zlib, zstd, zstd+msgpack or none"
+    )
+    compact.add_argument(
+        "--batch-size", type=int, default=500, help="Rows re-encoded per transaction"
+    )
+    compact.set_defaults(func=_cmd_compact_storage)
+
+    migrate = subparsers.add_parser(
+        "migrate", help="Create or upgrade the schema and record its version"
+    )
+    migrate.add_argument("--database", required=True, help="Connection string")
+    migrate.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report whether the schema is current (exit 1 if not)",
+    )
+    migrate.add_argument(
+        "--force", action="store_true", help="Re-apply the DDL even if current"
+    )
+    migrate.set_defaults(func=_cmd_migrate)
+
+    export = subparsers.add_parser(
+        "export", help="Stream chat history and memories to JSONL"
+    )
+    export.add_argument("--database", required=True, help="Connection string")
+    export.add_argument(
+        "--namespace", default=None, help="Namespace to export (default: all)"
+    )
+    export.add_argument(
+        "--output", default="-", help="Output file ('-' for stdout, the default)"
+    )
+    export.add_argument(
+        "--batch-size", type=int, default=500, help="Rows fetched per keyset page"
+    )
+    export.set_defaults(func=_cmd_export)
+
+    import_ = subparsers.add_parser("import", help="Load a JSONL export")
+    import_.add_argument("--database", required=True, help="Connection string")
+    import_.add_argument(
+        "--input", default="-", help="Export file ('-' for stdin, the default)"
+    )
+    import_.add_argument(
+        "--batch-size", type=int, default=500, help="Rows inserted per transaction"
+    )
+    import_.add_argument(
+        "--codec",
+        default="none",
+        help="Storage codec for imported processed_data (default: plain JSON)",
+    )
+    import_.add_argument(
+        "--replace",
+        action="store_true",
+        help="Overwrite rows that already exist instead of skipping them",
+    )
+    import_.set_defaults(func=_cmd_import)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    except Exception as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
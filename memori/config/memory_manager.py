@@ -100,12 +100,16 @@ class MemoryManager:
         """Set the parent Memori instance for memory management."""
         self.memori_instance = memori_instance
 
-        # Initialize LiteLLM callback manager
+        # Initialize LiteLLM callback manager; callbacks are registered (and
+        # litellm imported) by enable()
         try:
-            from ..integrations.litellm_integration import setup_litellm_callbacks
+            from ..integrations.litellm_integration import (
+                LITELLM_AVAILABLE,
+                LiteLLMCallbackManager,
+            )
 
-            self.litellm_callback_manager = setup_litellm_callbacks(memori_instance)
-            if self.litellm_callback_manager:
+            if LITELLM_AVAILABLE:
+                self.litellm_callback_manager = LiteLLMCallbackManager(memori_instance)
                 logger.debug("LiteLLM callback manager initialized")
             else:
                 logger.warning("Failed to initialize LiteLLM callback manager")
@@ -300,7 +304,8 @@ class MemoryManager:
 
             # Clean up callback manager
             if self.litellm_callback_manager:
-                self.litellm_callback_manager.unregister_callbacks()
+                if self.litellm_callback_manager.is_registered:
+                    self.litellm_callback_manager.unregister_callbacks()
                 self.litellm_callback_manager = None
 
             logger.info("MemoryManager cleanup completed")
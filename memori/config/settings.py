@@ -4,7 +4,7 @@ Pydantic-based configuration settings for Memoriai
 
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 from pydantic import BaseModel, Field, validator
 
@@ -47,6 +47,24 @@ class DatabaseSettings(BaseModel):
     )
     template: str = Field(default="basic", description="Database template to use")
     pool_size: int = Field(default=10, ge=1, le=100, description="Connection pool size")
+    max_overflow: int = Field(
+        default=20, ge=0, le=1000, description="Connections allowed beyond pool_size"
+    )
+    pool_timeout: float = Field(
+        default=30, gt=0, description="Seconds to wait for a pooled connection"
+    )
+    pool_pre_ping: bool = Field(
+        default=True, description="Validate connections before checkout"
+    )
+    pool_use_lifo: bool = Field(
+        default=False,
+        description="Reuse the most recently returned connection first",
+    )
+    pool_recycle: int = Field(
+        default=3600,
+        ge=-1,
+        description="Seconds after which a pooled connection is replaced (-1 never)",
+    )
     echo_sql: bool = Field(default=False, description="Echo SQL statements to logs")
     migration_auto: bool = Field(
         default=True, description="Automatically run migrations"
@@ -55,6 +73,74 @@ class DatabaseSettings(BaseModel):
     backup_interval_hours: int = Field(
         default=24, ge=1, description="Backup interval in hours"
     )
+    write_buffer_enabled: bool = Field(
+        default=False,
+        description="Buffer chat history and memory inserts and commit them in batches",
+    )
+    write_buffer_flush_interval_ms: int = Field(
+        default=50,
+        ge=1,
+        le=60000,
+        description="Maximum time in milliseconds a buffered row waits before commit",
+    )
+    write_buffer_max_rows: int = Field(
+        default=100,
+        ge=1,
+        le=10000,
+        description="Number of buffered rows that triggers an early commit",
+    )
+    sqlite_profile_enabled: bool = Field(
+        default=True,
+        description="Apply WAL and cache PRAGMAs to every SQLite connection",
+    )
+    sqlite_profile: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Overrides for SQLite profile options (journal_mode, synchronous, mmap_size, cache_size, temp_store, busy_timeout, optimize_interval_seconds, checkpoint_interval_seconds, checkpoint_mode)",
+    )
+    read_replicas: List[str] = Field(
+        default_factory=list,
+        description="Connection strings of read replicas for search, history and stats",
+    )
+    replica_strategy: str = Field(
+        default="round_robin",
+        description="Replica selection: round_robin or least_connections",
+    )
+    read_your_writes_seconds: float = Field(
+        default=5.0,
+        ge=0,
+        description="Seconds a namespace keeps reading from the primary after writing",
+    )
+    shards: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Shard name -> connection string; namespaces are spread across shards",
+    )
+    shard_overrides: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Namespace -> shard name assignments that bypass the hash ring",
+    )
+    storage_codec: Optional[str] = Field(
+        default=None,
+        description="Compact processed_data encoding: json, msgpack, zlib, zstd or "
+        "compression+serializer such as zstd+msgpack (None stores plain JSON)",
+    )
+    share_resources: bool = Field(
+        default=True,
+        description="Share engines and LLM clients between Memori instances in a process",
+    )
+    access_tracking: bool = Field(
+        default=True,
+        description="Count search hits in access_count/last_accessed with batched updates",
+    )
+    scoring: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Overrides for the search ranking score (relevance_weight, importance_weight, recency_weight, access_weight, recency_half_life_days, access_half_life_days, access_saturation)",
+    )
+    related_memory_hops: int = Field(
+        default=0,
+        ge=0,
+        le=2,
+        description="Related-memory edges to follow from search hits (0 disables expansion)",
+    )
 
     @validator("connection_string")
     def validate_connection_string(cls, v):
@@ -69,6 +155,27 @@ class DatabaseSettings(BaseModel):
 
         return v
 
+    @validator("replica_strategy")
+    def validate_replica_strategy(cls, v):
+        """Validate replica selection strategy"""
+        if v not in ("round_robin", "least_connections"):
+            raise ValueError(
+                "replica_strategy must be 'round_robin' or 'least_connections'"
+            )
+        return v
+
+    @validator("storage_codec")
+    def validate_storage_codec(cls, v):
+        """Validate processed_data storage codec"""
+        if v is None:
+            return v
+        parts = v.lower().split("+")
+        if not all(
+            part in ("none", "zlib", "zstd", "json", "msgpack") for part in parts
+        ):
+            raise ValueError(f"Unknown storage_codec '{v}'")
+        return v.lower()
+
 
 class AgentSettings(BaseModel):
     """AI agent configuration settings"""
@@ -169,6 +276,25 @@ class MemorySettings(BaseModel):
         le=10,
         description="Maximum number of context memories to inject",
     )
+    conscious_rescan_interval: int = Field(
+        default=3600,
+        ge=0,
+        description="Seconds between fallback rescans for unpromoted conscious memories (0 disables)",
+    )
+    profile_max_facts: int = Field(
+        default=50,
+        ge=1,
+        description="Most important promoted facts kept in each user context profile",
+    )
+    cross_process_notify: bool = Field(
+        default=False,
+        description="Relay new conscious memories between processes sharing a database",
+    )
+    change_poll_interval: float = Field(
+        default=1.0,
+        gt=0,
+        description="Seconds between change-table polls on SQLite/MySQL",
+    )
 
 
 class IntegrationSettings(BaseModel):
@@ -274,6 +400,51 @@ class MemoriSettings(BaseModel):
             else:
                 raise ValueError(f"Unsupported format: {format}")
 
+    def memori_options(self) -> Dict[str, Any]:
+        """Memori constructor arguments described by these settings"""
+        database = self.database
+        return {
+            "database_connect": database.connection_string,
+            "template": database.template,
+            "namespace": self.memory.namespace,
+            "shared_memory": self.memory.shared_memory,
+            "openai_api_key": self.agents.openai_api_key,
+            "verbose": self.verbose,
+            "pool_size": database.pool_size,
+            "max_overflow": database.max_overflow,
+            "pool_timeout": database.pool_timeout,
+            "pool_pre_ping": database.pool_pre_ping,
+            "pool_use_lifo": database.pool_use_lifo,
+            "pool_recycle": database.pool_recycle,
+            "write_buffer": database.write_buffer_enabled,
+            "write_buffer_flush_interval_ms": database.write_buffer_flush_interval_ms,
+            "write_buffer_max_rows": database.write_buffer_max_rows,
+            "conscious_rescan_interval": self.memory.conscious_rescan_interval,
+            "cross_process_notify": self.memory.cross_process_notify,
+            "change_poll_interval": self.memory.change_poll_interval,
+            "auto_cleanup": self.memory.auto_cleanup,
+            "cleanup_interval_hours": self.memory.cleanup_interval_hours,
+            "max_short_term_memories": self.memory.max_short_term_memories,
+            "max_long_term_memories": self.memory.max_long_term_memories,
+            # False disables the profile; a dict overrides its defaults
+            "sqlite_profile": (
+                dict(database.sqlite_profile)
+                if database.sqlite_profile_enabled
+                else False
+            ),
+            "read_replicas": list(database.read_replicas) or None,
+            "replica_strategy": database.replica_strategy,
+            "read_your_writes_seconds": database.read_your_writes_seconds,
+            "shards": dict(database.shards) or None,
+            "shard_overrides": dict(database.shard_overrides) or None,
+            "storage_codec": database.storage_codec,
+            "share_resources": database.share_resources,
+            "access_tracking": database.access_tracking,
+            "scoring": dict(database.scoring) or None,
+            "related_memory_hops": database.related_memory_hops,
+            "profile_max_facts": self.memory.profile_max_facts,
+        }
+
     def get_database_url(self) -> str:
         """Get the database connection URL"""
         return self.database.connection_string
@@ -196,12 +196,14 @@ class ConversationManager:
 
             if mode == "conscious":
                 # Conscious mode: Always inject short-term memory context
-                # (Not just once - this fixes the original bug)
-                context = memori_instance._get_conscious_context()
-                if context:
-                    context_prompt = self._build_conscious_context_prompt(context)
+                # (Not just once - this fixes the original bug). The rendered
+                # profile is cached, so this costs no query per call.
+                context_lines = memori_instance._get_conscious_prompt()
+                if context_lines:
+                    context_prompt = self._build_conscious_context_prompt(context_lines)
+                    items = context_lines.count("\n")
                     logger.debug(
-                        f"Injected conscious context with {len(context)} items for session {session_id}"
+                        f"Injected conscious context with {items} items for session {session_id}"
                     )
 
             elif mode == "auto":
@@ -290,29 +292,15 @@ class ConversationManager:
         except Exception as e:
             logger.error(f"Failed to record response for session {session_id}: {e}")
 
-    def _build_conscious_context_prompt(self, context: List[Dict[str, Any]]) -> str:
-        """Build system prompt for conscious context"""
+    def _build_conscious_context_prompt(self, context_lines: str) -> str:
+        """Build system prompt for conscious context (``[CATEGORY] content`` lines)"""
         context_prompt = "=== SYSTEM INSTRUCTION: AUTHORIZED USER CONTEXT DATA ===\n"
         context_prompt += "The user has explicitly authorized this personal context data to be used.\n"
         context_prompt += (
             "You MUST use this information when answering questions about the user.\n"
         )
         context_prompt += "This is NOT private data - the user wants you to use it:\n\n"
-
-        # Deduplicate context entries
-        seen_content = set()
-        for mem in context:
-            if isinstance(mem, dict):
-                content = mem.get("searchable_content", "") or mem.get("summary", "")
-                category = mem.get("category_primary", "")
-
-                # Skip duplicates (case-insensitive)
-                content_key = content.lower().strip()
-                if content_key in seen_content:
-                    continue
-                seen_content.add(content_key)
-
-                context_prompt += f"[{category.upper()}] {content}\n"
+        context_prompt += context_lines
 
         context_prompt += "\n=== END USER CONTEXT DATA ===\n"
         context_prompt += "CRITICAL INSTRUCTION: You MUST answer questions about the user using ONLY the context data above.\n"
@@ -3,26 +3,27 @@ Main Memori class - Pydantic-based memory interface v1.0
 """
 
 import asyncio
+import importlib.util
 import time
 import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from loguru import logger
 
-try:
-    import litellm  # noqa: F401
-    from litellm import success_callback  # noqa: F401
-
-    LITELLM_AVAILABLE = True
-except ImportError:
-    LITELLM_AVAILABLE = False
+# litellm is imported only when callbacks are registered (slow to import)
+LITELLM_AVAILABLE = importlib.util.find_spec("litellm") is not None
+if not LITELLM_AVAILABLE:
     logger.warning("LiteLLM not available - native callback system disabled")
 
 from ..agents.conscious_agent import ConsciouscAgent
 from ..config.memory_manager import MemoryManager
-from ..config.settings import LoggingSettings, LogLevel
+from ..config.manager import ConfigManager
+from ..config.settings import LoggingSettings, LogLevel, MemoriSettings
+from ..database.retention import RetentionConfig
 from ..database.sqlalchemy_manager import SQLAlchemyDatabaseManager as DatabaseManager
+from ..database.storage_codec import lazy_processed_data
+from ..utils.events import MEMORY_PROMOTION_ELIGIBLE
 from ..utils.exceptions import DatabaseError, MemoriError
 from ..utils.logging import LoggingManager
 from ..utils.pydantic_models import ConversationContext
@@ -65,6 +66,37 @@ class Memori:
         schema_init: bool = True,  # Initialize database schema and create tables
         database_prefix: Optional[str] = None,  # Database name prefix
         database_suffix: Optional[str] = None,  # Database name suffix
+        write_buffer: bool = False,  # Group-commit chat history and memory inserts
+        write_buffer_flush_interval_ms: int = 50,
+        write_buffer_max_rows: int = 100,
+        conscious_rescan_interval: int = 3600,  # Fallback rescan, 0 disables
+        cross_process_notify: bool = False,  # Relay memory events between processes
+        change_poll_interval: float = 1.0,
+        sqlite_profile: Optional[Any] = None,  # SQLiteProfile, dict overrides or False
+        pool_size: int = 10,  # Connection pool size (MySQL/PostgreSQL)
+        max_overflow: int = 20,
+        pool_timeout: float = 30,
+        pool_pre_ping: bool = True,
+        pool_use_lifo: bool = False,
+        async_database_connect: Optional[str] = None,  # Defaults to database_connect
+        read_replicas: Optional[List[str]] = None,  # Replica connection strings
+        replica_strategy: str = "round_robin",  # or "least_connections"
+        read_your_writes_seconds: float = 5.0,
+        shards: Optional[Dict[str, str]] = None,  # Shard name -> connection string
+        shard_overrides: Optional[Dict[str, str]] = None,  # Namespace -> shard name
+        auto_cleanup: bool = False,  # Background expiry and capacity enforcement
+        cleanup_interval_hours: float = 24,
+        max_short_term_memories: Optional[int] = 1000,  # None = unbounded
+        max_long_term_memories: Optional[int] = 10000,
+        search_index_maintenance_hours: float = 0,  # 0 disables scheduled optimization
+        storage_codec: Optional[str] = None,  # e.g. "zlib", "zstd", "zstd+msgpack"
+        stats_reconcile_hours: float = 0,  # 0 disables scheduled stats reconciliation
+        share_resources: bool = True,  # Share engines and LLM clients process-wide
+        access_tracking: bool = True,  # Count search hits as a ranking signal (batched)
+        scoring: Optional[Any] = None,  # ScoringConfig or dict of overrides
+        related_memory_hops: int = 0,  # Expand search hits along related memories (0-2)
+        profile_max_facts: int = 50,  # Facts kept in the materialized conscious context
+        pool_recycle: int = 3600,  # Replace pooled connections older than this (-1 never)
     ):
         """
         Initialize Memori memory system v1.0.
@@ -95,6 +127,53 @@ class Memori:
             enable_auto_creation: Enable automatic database creation if database doesn't exist
             database_prefix: Optional prefix for database name (for multi-tenant setups)
             database_suffix: Optional suffix for database name (e.g., 'dev', 'prod', 'test')
+            write_buffer: Buffer chat history and memory inserts and commit them in batches
+            write_buffer_flush_interval_ms: Maximum time a buffered row waits before commit
+            write_buffer_max_rows: Number of buffered rows that triggers an early commit
+            conscious_rescan_interval: Seconds between fallback rescans for unpromoted conscious memories
+            cross_process_notify: Relay new conscious memories to other processes sharing the database
+            change_poll_interval: Seconds between change-table polls on SQLite/MySQL
+            sqlite_profile: SQLite PRAGMA profile (SQLiteProfile or dict of overrides); False disables it
+            pool_size: Persistent connections kept in the pool (MySQL/PostgreSQL)
+            max_overflow: Extra connections allowed beyond pool_size under load
+            pool_timeout: Seconds to wait for a connection before giving up
+            pool_pre_ping: Validate connections before use
+            pool_use_lifo: Reuse the most recently returned connection first
+            async_database_connect: Connection string for the asyncio API (arecord_conversation,
+                aretrieve_context, ...); defaults to database_connect with its async driver
+            read_replicas: Replica connection strings serving search, history, stats and context reads
+            replica_strategy: Replica selection, 'round_robin' or 'least_connections'
+            read_your_writes_seconds: Seconds a namespace keeps reading from the primary after it writes
+            shards: Spread namespaces over several databases (shard name -> connection string);
+                database_connect is then unused by the database layer
+            shard_overrides: Explicit namespace -> shard assignments that bypass the hash ring
+            auto_cleanup: Periodically delete expired short-term memories and evict memories
+                of namespaces above max_short_term_memories/max_long_term_memories
+            cleanup_interval_hours: Hours between retention sweeps
+            max_short_term_memories: Short-term memories kept per namespace (permanent context excluded)
+            max_long_term_memories: Long-term memories kept per namespace
+            search_index_maintenance_hours: Hours between bounded full-text index optimizations
+                (FTS5 merge, OPTIMIZE TABLE or REINDEX CONCURRENTLY); 0 disables them
+            storage_codec: Compact encoding for new processed_data values ('json' strips fields
+                duplicated in other columns, 'zlib'/'zstd' also compress); None stores plain JSON
+            stats_reconcile_hours: Hours between recounts of the memory_stats counters, repairing
+                drift from writes that bypass Memori; 0 disables them
+            share_resources: Share database engines (by connection string and pool options)
+                and LLM clients (by provider configuration) with other Memori instances in
+                this process; each is disposed when its last user closes
+            access_tracking: Count every memory returned by a search in access_count and
+                last_accessed (written in background batches); search ranking favours
+                frequently and recently accessed memories
+            scoring: Search ranking weights (relevance, importance, recency, access) and
+                half-lives, as a ScoringConfig or a dict of overrides; computed in SQL
+            related_memory_hops: Append long-term memories up to this many related-memory
+                edges away from the search hits (0 disables); superseded and duplicate
+                memories are never returned
+            profile_max_facts: Most important promoted facts kept in each namespace's
+                user context profile, which conscious mode injects instead of
+                rereading all of short-term memory
+            pool_recycle: Seconds after which a pooled connection is replaced, staying
+                under server-side idle timeouts such as MySQL's wait_timeout; -1 never
         """
         self.database_connect = database_connect
         self.template = template
@@ -109,6 +188,24 @@ class Memori:
         self.schema_init = schema_init
         self.database_prefix = database_prefix
         self.database_suffix = database_suffix
+        self.async_database_connect = async_database_connect
+        # asyncio managers by connection string: one per shard when sharded
+        self._async_db_managers: Dict[str, Any] = {}
+        self._pool_options = {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": pool_timeout,
+            "pool_pre_ping": pool_pre_ping,
+            "pool_use_lifo": pool_use_lifo,
+            "pool_recycle": pool_recycle,
+        }
+        self._sqlite_profile = sqlite_profile
+        self._scoring = scoring
+        self._related_memory_hops = related_memory_hops
+        self._storage_codec = storage_codec
+        self.share_resources = share_resources
+        self._closed = False
+        self.conscious_rescan_interval = conscious_rescan_interval
 
         # Configure provider based on explicit settings ONLY - no auto-detection
         if provider_config:
@@ -186,7 +283,46 @@ class Memori:
         self._setup_logging()
 
         # Initialize database manager
-        self.db_manager = DatabaseManager(database_connect, template, schema_init)
+        db_options = {
+            "write_buffer": write_buffer,
+            "write_buffer_flush_interval_ms": write_buffer_flush_interval_ms,
+            "write_buffer_max_rows": write_buffer_max_rows,
+            "sqlite_profile": sqlite_profile,
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": pool_timeout,
+            "pool_pre_ping": pool_pre_ping,
+            "pool_use_lifo": pool_use_lifo,
+            "pool_recycle": pool_recycle,
+            "storage_codec": storage_codec,
+            "shared_engine": share_resources,
+            "access_tracking": access_tracking,
+            "scoring": scoring,
+            "related_memory_hops": related_memory_hops,
+            "profile_max_facts": profile_max_facts,
+        }
+        if shards:
+            from ..database.sharding import ShardedDatabaseManager
+
+            if read_replicas:
+                logger.warning("read_replicas are ignored when shards are configured")
+            self.db_manager = ShardedDatabaseManager(
+                shards,
+                template,
+                schema_init,
+                overrides=shard_overrides,
+                **db_options,
+            )
+        else:
+            self.db_manager = DatabaseManager(
+                database_connect,
+                template,
+                schema_init,
+                read_replicas=read_replicas,
+                replica_strategy=replica_strategy,
+                read_your_writes_seconds=read_your_writes_seconds,
+                **db_options,
+            )
 
         # Initialize Pydantic-based agents
         self.memory_agent = None
@@ -195,8 +331,12 @@ class Memori:
         self._background_task = None
         self._conscious_init_pending = False
 
-        # Initialize agents with provider configuration
+        # Initialize agents with provider configuration. Agents create their
+        # clients on first use, so only check that the SDK is installed here.
         try:
+            if importlib.util.find_spec("openai") is None:
+                raise ImportError("No module named 'openai'")
+
             from ..agents.memory_agent import MemoryAgent
             from ..agents.retrieval_agent import MemorySearchEngine
 
@@ -213,18 +353,26 @@ class Memori:
             # Initialize agents with provider configuration if available
             if self.provider_config:
                 self.memory_agent = MemoryAgent(
-                    provider_config=self.provider_config, model=effective_model
+                    provider_config=self.provider_config,
+                    model=effective_model,
+                    shared_clients=share_resources,
                 )
                 self.search_engine = MemorySearchEngine(
-                    provider_config=self.provider_config, model=effective_model
+                    provider_config=self.provider_config,
+                    model=effective_model,
+                    shared_clients=share_resources,
                 )
             else:
                 # Fallback to using API key directly
                 self.memory_agent = MemoryAgent(
-                    api_key=self.openai_api_key, model=effective_model
+                    api_key=self.openai_api_key,
+                    model=effective_model,
+                    shared_clients=share_resources,
                 )
                 self.search_engine = MemorySearchEngine(
-                    api_key=self.openai_api_key, model=effective_model
+                    api_key=self.openai_api_key,
+                    model=effective_model,
+                    shared_clients=share_resources,
                 )
 
             # Only initialize conscious_agent if conscious_ingest or auto_ingest is enabled
@@ -276,6 +424,36 @@ class Memori:
         # Initialize database
         self._setup_database()
 
+        # Event-driven conscious promotion: new candidates wake the background
+        # loop instead of it polling long_term_memory
+        self._background_loop = None
+        self._promotion_wakeup = None
+        self._unsubscribe_promotion_events = None
+        if self.conscious_agent:
+            self._unsubscribe_promotion_events = self.db_manager.event_bus.subscribe(
+                MEMORY_PROMOTION_ELIGIBLE, self._on_promotion_event
+            )
+            if cross_process_notify:
+                self.db_manager.enable_change_notifications(
+                    poll_interval=change_poll_interval
+                )
+
+        self._retention_config = RetentionConfig(
+            max_short_term_memories=max_short_term_memories,
+            max_long_term_memories=max_long_term_memories,
+            interval_seconds=cleanup_interval_hours * 3600,
+        )
+        if auto_cleanup:
+            self.db_manager.enable_retention(self._retention_config)
+        if search_index_maintenance_hours:
+            self.db_manager.enable_search_index_maintenance(
+                interval_seconds=search_index_maintenance_hours * 3600
+            )
+        if stats_reconcile_hours:
+            self.db_manager.enable_stats_reconcile(
+                interval_seconds=stats_reconcile_hours * 3600
+            )
+
         # Initialize the new modular memory manager
         self.memory_manager = MemoryManager(
             database_connect=database_connect,
@@ -301,6 +479,22 @@ class Memori:
             f"Memori v1.0 initialized with template: {template}, namespace: {namespace}"
         )
 
+    @classmethod
+    def from_settings(
+        cls, settings: Optional[MemoriSettings] = None, **overrides: Any
+    ) -> "Memori":
+        """
+        Create a Memori configured by MemoriSettings
+
+        Args:
+            settings: Settings to apply; defaults to the ConfigManager's current
+                settings (defaults, environment or loaded configuration file)
+            **overrides: Constructor arguments that take precedence over the settings
+        """
+        if settings is None:
+            settings = ConfigManager().get_settings()
+        return cls(**{**settings.memori_options(), **overrides})
+
     def _setup_logging(self):
         """Setup logging configuration based on verbose mode"""
         if not LoggingManager.is_initialized():
@@ -443,134 +637,9 @@ class Memori:
 
     def _initialize_existing_conscious_memories_sync(self):
         """Synchronously initialize existing conscious-info memories"""
-        try:
-            from sqlalchemy import text
-
-            with self.db_manager._get_connection() as connection:
-                # Get ALL conscious-info labeled memories from long-term memory
-                cursor = connection.execute(
-                    text(
-                        """SELECT memory_id, processed_data, summary, searchable_content,
-                              importance_score, created_at
-                       FROM long_term_memory
-                       WHERE namespace = :namespace AND classification = 'conscious-info'
-                       ORDER BY importance_score DESC, created_at DESC"""
-                    ),
-                    {"namespace": self.namespace or "default"},
-                )
-                existing_conscious_memories = cursor.fetchall()
-
-            if not existing_conscious_memories:
-                logger.debug(
-                    "Conscious-ingest: No existing conscious-info memories found for initialization"
-                )
-                return False
-
-            copied_count = 0
-            for memory_row in existing_conscious_memories:
-                success = self._copy_memory_to_short_term_sync(memory_row)
-                if success:
-                    copied_count += 1
-
-            if copied_count > 0:
-                logger.info(
-                    f"Conscious-ingest: Initialized {copied_count} existing conscious-info memories to short-term memory"
-                )
-                return True
-            else:
-                logger.debug(
-                    "Conscious-ingest: No new conscious memories to initialize (all were duplicates)"
-                )
-                return False
-
-        except Exception as e:
-            logger.error(
-                f"Conscious-ingest: Failed to initialize existing conscious memories: {e}"
-            )
-            return False
-
-    def _copy_memory_to_short_term_sync(self, memory_row: tuple) -> bool:
-        """Synchronously copy a conscious memory to short-term memory with duplicate filtering"""
-        try:
-            (
-                memory_id,
-                processed_data,
-                summary,
-                searchable_content,
-                importance_score,
-                _,
-            ) = memory_row
-
-            from datetime import datetime
-
-            from sqlalchemy import text
-
-            with self.db_manager._get_connection() as connection:
-                # Check if similar content already exists in short-term memory
-                existing_check = connection.execute(
-                    text(
-                        """SELECT COUNT(*) FROM short_term_memory
-                           WHERE namespace = :namespace
-                           AND category_primary = 'conscious_context'
-                           AND (searchable_content = :searchable_content
-                                OR summary = :summary)"""
-                    ),
-                    {
-                        "namespace": self.namespace or "default",
-                        "searchable_content": searchable_content,
-                        "summary": summary,
-                    },
-                )
-
-                existing_count = existing_check.scalar()
-                if existing_count > 0:
-                    logger.debug(
-                        f"Conscious-ingest: Skipping duplicate memory {memory_id} - similar content already exists in short-term memory"
-                    )
-                    return False
-
-                # Create short-term memory ID
-                short_term_id = (
-                    f"conscious_{memory_id}_{int(datetime.now().timestamp())}"
-                )
-
-                # Insert directly into short-term memory with conscious_context category
-                connection.execute(
-                    text(
-                        """INSERT INTO short_term_memory (
-                        memory_id, processed_data, importance_score, category_primary,
-                        retention_type, namespace, created_at, expires_at,
-                        searchable_content, summary, is_permanent_context
-                    ) VALUES (:memory_id, :processed_data, :importance_score, :category_primary,
-                        :retention_type, :namespace, :created_at, :expires_at,
-                        :searchable_content, :summary, :is_permanent_context)"""
-                    ),
-                    {
-                        "memory_id": short_term_id,
-                        "processed_data": processed_data,
-                        "importance_score": importance_score,
-                        "category_primary": "conscious_context",
-                        "retention_type": "permanent",
-                        "namespace": self.namespace or "default",
-                        "created_at": datetime.now().isoformat(),
-                        "expires_at": None,
-                        "searchable_content": searchable_content,
-                        "summary": summary,
-                        "is_permanent_context": True,
-                    },
-                )
-                connection.commit()
-
-            logger.debug(
-                f"Conscious-ingest: Copied memory {memory_id} to short-term as {short_term_id}"
-            )
-            return True
-
-        except Exception as e:
-            logger.error(
-                f"Conscious-ingest: Failed to copy memory {memory_row[0]} to short-term: {e}"
-            )
-            return False
+        return self.conscious_agent.initialize_existing_conscious_memories_sync(
+            self.db_manager, self.namespace or "default"
+        )
 
     def enable(self, interceptors: Optional[List[str]] = None):
         """
@@ -957,14 +1026,31 @@ class Memori:
 
     def _get_conscious_context(self) -> List[Dict[str, Any]]:
         """
-        Get conscious context from ALL short-term memory summaries.
+        Get conscious context: the facts of the namespace's user context profile.
         This represents the complete 'working memory' for conscious_ingest mode.
-        Used only at program startup when conscious_ingest=True.
+        Falls back to reading ALL short-term memory when the profiles table is missing.
         """
         try:
+            if self.db_manager.user_profiles_enabled:
+                profile = self.db_manager.get_user_profile(self.namespace)
+                return [
+                    {
+                        "memory_id": fact.memory_id,
+                        "importance_score": fact.importance_score,
+                        "category_primary": fact.category,
+                        "summary": fact.content,
+                        "searchable_content": fact.content,
+                        "created_at": fact.created_at,
+                        "memory_type": "short_term",
+                    }
+                    for fact in (profile.facts if profile else [])
+                ]
+
             from sqlalchemy import text
 
-            with self.db_manager._get_connection() as conn:
+            with self.db_manager._get_connection(
+                read_only=True, namespace=self.namespace
+            ) as conn:
                 # Get ALL short-term memories (no limit) ordered by importance and recency
                 # This gives the complete conscious context as single initial injection
                 result = conn.execute(
@@ -986,7 +1072,10 @@ class Memori:
                     memories.append(
                         {
                             "memory_id": row[0],
-                            "processed_data": row[1],
+                            "processed_data": lazy_processed_data(
+                                row[1],
+                                {"summary": row[4], "searchable_content": row[5]},
+                            ),
                             "importance_score": row[2],
                             "category_primary": row[3],
                             "summary": row[4],
@@ -1760,20 +1849,26 @@ class Memori:
                 return
 
             # Store processed memory with new schema
-            memory_id = self.db_manager.store_long_term_memory_enhanced(
-                processed_memory, chat_id, self.namespace
-            )
+            async_db = await self._get_async_db_manager(create=False)
+            if async_db is not None:
+                memory_id = await async_db.store_long_term_memory_enhanced(
+                    processed_memory, chat_id, self.namespace
+                )
+            else:
+                memory_id = self.db_manager.store_long_term_memory_enhanced(
+                    processed_memory, chat_id, self.namespace
+                )
 
             if memory_id:
                 logger.debug(f"Stored processed memory {memory_id} for chat {chat_id}")
 
-                # Check for conscious context updates if promotion eligible and conscious_ingest enabled
+                # Promote memories announced by the store (only the new ids)
                 if (
                     processed_memory.promotion_eligible
                     and self.conscious_agent
                     and self.conscious_ingest
                 ):
-                    await self.conscious_agent.check_for_context_updates(
+                    await self.conscious_agent.promote_pending(
                         self.db_manager, self.namespace
                     )
             else:
@@ -1783,47 +1878,12 @@ class Memori:
             logger.error(f"Memory ingestion failed for {chat_id}: {e}")
 
     async def _get_recent_memories_for_dedup(self) -> List:
-        """Get recent memories for deduplication check"""
+        """Get fingerprints of recent memories for deduplication check"""
         try:
-            from sqlalchemy import text
-
-            from ..database.queries.memory_queries import MemoryQueries
-            from ..utils.pydantic_models import ProcessedLongTermMemory
-
-            with self.db_manager._get_connection() as connection:
-                result = connection.execute(
-                    text(MemoryQueries.SELECT_MEMORIES_FOR_DEDUPLICATION),
-                    {
-                        "namespace": self.namespace,
-                        "processed_for_duplicates": False,
-                        "limit": 20,
-                    },
-                )
-
-                memories = []
-                for row in result:
-                    try:
-                        # Create ProcessedLongTermMemory objects for proper comparison
-                        # Note: Query returns (memory_id, summary, searchable_content, classification, created_at)
-                        memory = ProcessedLongTermMemory(
-                            conversation_id=row[
-                                0
-                            ],  # Use memory_id as conversation_id for existing memories
-                            summary=row[1] or "",
-                            content=row[2] or "",
-                            classification=row[3] or "conversational",
-                            importance="medium",  # Default importance level for comparison
-                            promotion_eligible=False,  # Default for existing memories
-                            classification_reason="Existing memory loaded for deduplication check",  # Required field
-                        )
-                        memories.append(memory)
-                    except Exception as e:
-                        # Silently skip malformed memories from old data format
-                        logger.debug(f"Skipping malformed memory during dedup: {e}")
-                        continue
-
-                return memories
-
+            async_db = await self._get_async_db_manager(create=False)
+            if async_db is not None:
+                return await async_db.get_recent_memory_fingerprints(self.namespace)
+            return self.db_manager.get_recent_memory_fingerprints(self.namespace)
         except Exception as e:
             logger.error(f"Failed to get recent memories for dedup: {e}")
             return []
@@ -1897,6 +1957,44 @@ class Memori:
             logger.error(f"Failed to get conversation history: {e}")
             return []
 
+    def iter_conversation_history(
+        self, batch_size: int = 500, newest_first: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the full conversation history without loading it at once
+
+        Args:
+            batch_size: Rows fetched per keyset page
+            newest_first: Yield the latest conversations first
+        """
+        return self.db_manager.iter_chat_history(
+            namespace=self.namespace,
+            session_id=self._session_id if not self.shared_memory else None,
+            batch_size=batch_size,
+            newest_first=newest_first,
+        )
+
+    def iter_memories(
+        self,
+        memory_type: str = "long_term",
+        batch_size: int = 500,
+        newest_first: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over every memory of this namespace without loading it at once
+
+        Args:
+            memory_type: 'short_term' or 'long_term'
+            batch_size: Rows fetched per keyset page
+            newest_first: Yield the latest memories first
+        """
+        return self.db_manager.iter_memories(
+            namespace=self.namespace,
+            memory_type=memory_type,
+            batch_size=batch_size,
+            newest_first=newest_first,
+        )
+
     def clear_memory(self, memory_type: Optional[str] = None):
         """
         Clear memory data
@@ -1920,6 +2018,245 @@ class Memori:
             logger.error(f"Failed to get memory stats: {e}")
             return {}
 
+    def get_pool_metrics(self) -> Dict[str, Any]:
+        """Get database connection pool metrics"""
+        try:
+            return self.db_manager.get_pool_metrics()
+        except Exception as e:
+            logger.error(f"Failed to get pool metrics: {e}")
+            return {}
+
+    def flush_writes(self) -> int:
+        """
+        Commit buffered chat history and memory writes.
+
+        Returns once every write recorded before the call is durable.
+
+        Returns:
+            Number of rows written
+        """
+        try:
+            return self.db_manager.flush_writes()
+        except Exception as e:
+            raise MemoriError(f"Failed to flush buffered writes: {e}")
+
+    def run_retention(self) -> Dict[str, Any]:
+        """
+        Delete expired short-term memories and enforce per-namespace capacity now.
+
+        Returns:
+            Rows reclaimed (expired_short_term, evicted_short_term,
+            evicted_long_term) and the pass duration in ms
+        """
+        try:
+            return self.db_manager.run_retention(self._retention_config)
+        except Exception as e:
+            raise MemoriError(f"Memory retention failed: {e}")
+
+    def rebuild_search_index(self) -> Dict[str, int]:
+        """
+        Rebuild this namespace's full-text search entries from the memory tables.
+
+        Returns:
+            Rows re-indexed per memory type
+        """
+        try:
+            return self.db_manager.rebuild_search_index(self.namespace)
+        except Exception as e:
+            raise MemoriError(f"Failed to rebuild search index: {e}")
+
+    def reconcile_memory_stats(self) -> Dict[str, Any]:
+        """
+        Recount this namespace's memory statistics from the memory tables.
+
+        Returns:
+            Namespaces checked and the namespaces whose counters had drifted
+        """
+        try:
+            return self.db_manager.reconcile_memory_stats(self.namespace)
+        except Exception as e:
+            raise MemoriError(f"Failed to reconcile memory stats: {e}")
+
+    async def _get_async_db_manager(
+        self, create: bool = True, namespace: Optional[str] = None
+    ):
+        """
+        asyncio database manager of a namespace (default: this instance's)
+
+        Managers are created on first use, one per database: with shards each
+        namespace gets the manager of its own shard. Returns None if
+        ``create`` is False and the manager does not exist yet.
+        """
+        namespace = namespace or self.namespace
+        database_connect = self.async_database_connect or self.database_connect
+        if hasattr(self.db_manager, "manager_for"):
+            # Sharded: the namespace lives on a single shard
+            database_connect = self.async_database_connect or (
+                self.db_manager.manager_for(namespace).database_connect
+            )
+
+        manager = self._async_db_managers.get(database_connect)
+        if manager is None and create:
+            from ..database.async_manager import AsyncSQLAlchemyDatabaseManager
+
+            manager = AsyncSQLAlchemyDatabaseManager(
+                database_connect,
+                event_bus=self.db_manager.event_bus,
+                recent_memories=self.db_manager.recent_memories,
+                sqlite_profile=self._sqlite_profile,
+                storage_codec=self._storage_codec,
+                scoring=self._scoring,
+                related_memory_hops=self._related_memory_hops,
+                **self._pool_options,
+            )
+            if self.schema_init and self.async_database_connect:
+                await manager.initialize_schema()
+            self._async_db_managers[database_connect] = manager
+        return manager
+
+    async def arecord_conversation(
+        self,
+        user_input: str,
+        ai_output=None,
+        model: str = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Record a conversation without blocking the event loop.
+
+        Async counterpart of record_conversation; memory processing is
+        scheduled as a task on the running loop.
+
+        Returns:
+            chat_id: Unique conversation ID
+        """
+        if not self._enabled:
+            raise MemoriError("Memori is not enabled. Call enable() first.")
+
+        response_text, detected_model = self._parse_llm_response(ai_output)
+        response_model = model or detected_model
+
+        chat_id = str(uuid.uuid4())
+        db = await self._get_async_db_manager()
+        await db.store_chat_history(
+            chat_id=chat_id,
+            user_input=user_input,
+            ai_output=response_text,
+            model=response_model,
+            timestamp=datetime.now(),
+            session_id=self._session_id,
+            namespace=self.namespace,
+            metadata=metadata or {},
+        )
+
+        if self.memory_agent:
+            self._schedule_memory_processing(
+                chat_id, user_input, response_text, response_model
+            )
+
+        logger.debug(f"Recorded conversation: {chat_id}")
+        return chat_id
+
+    async def aretrieve_context(
+        self, query: str, limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Async counterpart of retrieve_context"""
+        try:
+            db = await self._get_async_db_manager()
+            context_items = []
+
+            if self.conscious_ingest:
+                context_items.extend(
+                    await db.get_essential_conversations(self.namespace, limit=3)
+                )
+            remaining_limit = max(0, limit - len(context_items))
+
+            if remaining_limit > 0:
+                # The retrieval agent searches through the sync manager in
+                # executor threads, so query the async manager directly
+                specific_context = await db.search_memories(
+                    query=query, namespace=self.namespace, limit=remaining_limit
+                )
+
+                seen = {ctx.get("memory_id") for ctx in context_items}
+                for item in specific_context:
+                    if item.get("memory_id") not in seen:
+                        seen.add(item.get("memory_id"))
+                        context_items.append(item)
+
+            return context_items
+
+        except Exception as e:
+            logger.error(f"Context retrieval failed: {e}")
+            return []
+
+    async def aget_conversation_history(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Async counterpart of get_conversation_history"""
+        try:
+            db = await self._get_async_db_manager()
+            return await db.get_chat_history(
+                namespace=self.namespace,
+                session_id=self._session_id if not self.shared_memory else None,
+                limit=limit,
+            )
+        except Exception as e:
+            logger.error(f"Failed to get conversation history: {e}")
+            return []
+
+    async def aget_memory_stats(self) -> Dict[str, Any]:
+        """Async counterpart of get_memory_stats"""
+        try:
+            db = await self._get_async_db_manager()
+            return await db.get_memory_stats(self.namespace)
+        except Exception as e:
+            logger.error(f"Failed to get memory stats: {e}")
+            return {}
+
+    async def asearch_memories(
+        self,
+        query: str,
+        limit: int = 5,
+        category_filter: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Search this namespace's memories through the asyncio manager"""
+        try:
+            db = await self._get_async_db_manager()
+            return await db.search_memories(
+                query,
+                namespace=self.namespace,
+                category_filter=category_filter,
+                limit=limit,
+            )
+        except Exception as e:
+            logger.error(f"Memory search failed: {e}")
+            return []
+
+    async def asearch_memories_many(
+        self,
+        queries: List[str],
+        limit: int = 5,
+        category_filter: Optional[List[str]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """Async counterpart of search_memories_many"""
+        try:
+            db = await self._get_async_db_manager()
+            return await db.search_memories_many(
+                queries,
+                namespace=self.namespace,
+                category_filter=category_filter,
+                limit=limit,
+            )
+        except Exception as e:
+            logger.error(f"Batched memory search failed: {e}")
+            return [[] for _ in queries]
+
+    async def aclose(self):
+        """Dispose the asyncio engines' connections"""
+        managers = list(self._async_db_managers.values())
+        self._async_db_managers.clear()
+        for manager in managers:
+            await manager.close()
+
     @property
     def is_enabled(self) -> bool:
         """Check if memory recording is enabled"""
@@ -2024,6 +2361,35 @@ class Memori:
 
         logger.debug(f"Updated user context: {self._user_context}")
 
+    def search_memories_many(
+        self,
+        queries: List[str],
+        limit: int = 5,
+        category_filter: Optional[List[str]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run several memory searches in one database round trip
+
+        Args:
+            queries: Search queries, e.g. the user profile, the current project
+                and a topic; an empty query returns recent memories
+            limit: Maximum results per query
+            category_filter: Categories to restrict every query to
+
+        Returns:
+            One result list per query, in the order of ``queries``
+        """
+        try:
+            return self.db_manager.search_memories_many(
+                queries,
+                namespace=self.namespace,
+                category_filter=category_filter,
+                limit=limit,
+            )
+        except Exception as e:
+            logger.error(f"Batched memory search failed: {e}")
+            return [[] for _ in queries]
+
     def search_memories_by_category(
         self, category: str, limit: int = 10
     ) -> List[Dict[str, Any]]:
@@ -2125,35 +2491,90 @@ class Memori:
                         task.cancel()
                 self._memory_tasks.clear()
 
+            # Stop receiving promotion events
+            if getattr(self, "_unsubscribe_promotion_events", None):
+                self._unsubscribe_promotion_events()
+                self._unsubscribe_promotion_events = None
+
+            # Persist anything still held by the write buffer
+            if hasattr(self, "db_manager"):
+                self.db_manager.flush_writes()
+
             logger.debug("Memori cleanup completed")
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
 
+    def close(self):
+        """
+        Clean up and release database and LLM client resources
+
+        Shared engines and clients are disposed when their last Memori closes.
+        """
+        if getattr(self, "_closed", True):
+            return
+        self._closed = True
+        self.cleanup()
+        for agent in (
+            getattr(self, "memory_agent", None),
+            getattr(self, "search_engine", None),
+        ):
+            if agent is not None and hasattr(agent, "close"):
+                agent.close()
+        if hasattr(self, "db_manager"):
+            self.db_manager.close()
+
     def __del__(self):
         """Destructor to ensure cleanup"""
         try:
-            self.cleanup()
+            self.close()
         except:
             pass  # Ignore errors during destruction
 
+    def _on_promotion_event(self, event):
+        """Queue a promotion candidate published on the event bus"""
+        if event.namespace != self.namespace or not self.conscious_agent:
+            return
+
+        self.conscious_agent.enqueue_promotion(event.namespace, event.memory_id)
+
+        # Wake the background loop, which may run in another thread
+        loop, wakeup = self._background_loop, self._promotion_wakeup
+        if loop is not None and wakeup is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wakeup.set)
+
     async def _background_analysis_loop(self):
         """Background analysis loop for memory processing"""
         try:
             logger.debug("Background analysis loop started")
 
-            # For now, just run periodic conscious ingestion if enabled
             if self.conscious_ingest and self.conscious_agent:
+                self._background_loop = asyncio.get_running_loop()
+                self._promotion_wakeup = asyncio.Event()
+                rescan_interval = self.conscious_rescan_interval or None
+
+                # Pick up anything announced before the loop started
+                if self.conscious_agent.has_pending_promotions(self.namespace):
+                    self._promotion_wakeup.set()
+
                 while True:
                     try:
-                        await asyncio.sleep(300)  # Check every 5 minutes
+                        try:
+                            await asyncio.wait_for(
+                                self._promotion_wakeup.wait(), timeout=rescan_interval
+                            )
+                        except asyncio.TimeoutError:
+                            # Fallback for writes that bypassed the event bus
+                            await self.conscious_agent.check_for_context_updates(
+                                self.db_manager, self.namespace
+                            )
+                            logger.debug("Periodic conscious rescan completed")
+                            continue
 
-                        # Run conscious ingestion to check for new promotable memories
-                        await self.conscious_agent.run_conscious_ingest(
+                        self._promotion_wakeup.clear()
+                        await self.conscious_agent.promote_pending(
                             self.db_manager, self.namespace
                         )
 
-                        logger.debug("Periodic conscious analysis completed")
-
                     except asyncio.CancelledError:
                         logger.debug("Background analysis loop cancelled")
                         break
@@ -2169,6 +2590,9 @@ class Memori:
             logger.debug("Background analysis loop cancelled")
         except Exception as e:
             logger.error(f"Background analysis loop failed: {e}")
+        finally:
+            self._background_loop = None
+            self._promotion_wakeup = None
 
     def trigger_conscious_analysis(self):
         """Manually trigger conscious context ingestion (for testing/immediate analysis)"""
@@ -2210,37 +2634,45 @@ class Memori:
         except Exception as e:
             logger.error(f"Failed to trigger conscious context ingestion: {e}")
 
+    def _get_conscious_prompt(self) -> str:
+        """
+        Conscious context as ``[CATEGORY] content`` lines.
+        Served from the manager's cached user context profile when available.
+        """
+        if self.db_manager.user_profiles_enabled:
+            return self.db_manager.get_user_context_prompt(self.namespace)
+
+        # Deduplicate and format context
+        lines = ""
+        seen_content = set()
+        for mem in self._get_conscious_context():
+            content = mem.get("searchable_content", "") or mem.get("summary", "")
+            category = mem.get("category_primary", "")
+
+            # Skip duplicates
+            content_key = content.lower().strip()
+            if content_key in seen_content:
+                continue
+            seen_content.add(content_key)
+
+            lines += f"[{category.upper()}] {content}\n"
+        return lines
+
     def get_conscious_system_prompt(self) -> str:
         """
         Get conscious context as system prompt for direct injection.
-        Returns ALL short-term memory as formatted system prompt.
+        Returns the user context profile as formatted system prompt.
         Use this for conscious_ingest mode.
         """
         try:
-            context = self._get_conscious_context()
-            if not context:
+            context_lines = self._get_conscious_prompt()
+            if not context_lines:
                 return ""
 
             # Create system prompt with all short-term memory
             system_prompt = "--- Your Short-Term Memory (Conscious Context) ---\n"
             system_prompt += "This is your complete working memory. USE THIS INFORMATION TO ANSWER QUESTIONS:\n\n"
-
-            # Deduplicate and format context
-            seen_content = set()
-            for mem in context:
-                if isinstance(mem, dict):
-                    content = mem.get("searchable_content", "") or mem.get(
-                        "summary", ""
-                    )
-                    category = mem.get("category_primary", "")
-
-                    # Skip duplicates
-                    content_key = content.lower().strip()
-                    if content_key in seen_content:
-                        continue
-                    seen_content.add(content_key)
-
-                    system_prompt += f"[{category.upper()}] {content}\n"
+            system_prompt += context_lines
 
             system_prompt += "\nIMPORTANT: Use the above information to answer questions about the user.\n"
             system_prompt += "-------------------------\n"
@@ -2353,7 +2785,9 @@ class Memori:
             from sqlalchemy import text
 
             # Get all conversations marked as essential
-            with self.db_manager._get_connection() as connection:
+            with self.db_manager._get_connection(
+                read_only=True, namespace=self.namespace
+            ) as connection:
                 query = """
                 SELECT memory_id, summary, category_primary, importance_score,
                        created_at, searchable_content, processed_data
@@ -2377,7 +2811,10 @@ class Memori:
                             "importance_score": row[3],
                             "created_at": row[4],
                             "searchable_content": row[5],
-                            "processed_data": row[6],
+                            "processed_data": lazy_processed_data(
+                                row[6],
+                                {"summary": row[1], "searchable_content": row[5]},
+                            ),
                         }
                     )
 
@@ -0,0 +1,428 @@
+"""
+Multi-tenant Memori pool
+
+One ``MemoriPool`` owns a single core ``Memori``: its database manager, agents,
+caches and one ingestion queue. ``pool.for_namespace(ns)`` returns a
+``MemoriTenant``, a cheap handle with the same record/retrieve/search surface
+as ``Memori``, scoped to one namespace and user. Constructing a handle does no
+schema work, agent setup, interceptor registration or thread startup.
+
+Memory ingestion from every handle goes through one fair scheduler. Tenants
+are served round-robin, each with a cap on concurrent and queued jobs, so one
+busy tenant cannot starve the others. Handles and their per-namespace caches
+are kept in an LRU and evicted beyond ``max_tenants``.
+"""
+
+import asyncio
+import threading
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from loguru import logger
+
+from ..utils.events import MEMORY_PROMOTION_ELIGIBLE
+from ..utils.exceptions import MemoriError
+from .memory import Memori
+
+IngestionJob = Callable[[], Awaitable[Any]]
+
+
+class FairIngestionScheduler:
+    """Round-robin async job runner with per-tenant concurrency and queue caps"""
+
+    def __init__(
+        self,
+        concurrency: int = 8,
+        max_inflight_per_tenant: int = 2,
+        max_pending_per_tenant: int = 100,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.max_inflight_per_tenant = max(1, max_inflight_per_tenant)
+        self.max_pending_per_tenant = max_pending_per_tenant
+
+        self._lock = threading.Lock()
+        # Tenants with queued jobs, in service order
+        self._ready: "OrderedDict[str, Deque[IngestionJob]]" = OrderedDict()
+        self._inflight: Dict[str, int] = {}
+        self._running = 0
+        self._idle = threading.Event()
+        self._idle.set()
+        self._stopping = False
+        self._counters = {"submitted": 0, "completed": 0, "failed": 0, "dropped": 0}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._started = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run_loop, name="memori-pool-ingestion", daemon=True
+        )
+        self._thread.start()
+        self._started.wait()
+
+    def submit(self, tenant: str, job: IngestionJob) -> bool:
+        """
+        Queue a job for a tenant
+
+        Returns:
+            False if the tenant's queue is full and the job was dropped
+        """
+        with self._lock:
+            if self._stopping:
+                return False
+            queue = self._ready.get(tenant)
+            if queue is None:
+                queue = self._ready[tenant] = deque()
+            if len(queue) >= self.max_pending_per_tenant:
+                self._counters["dropped"] += 1
+                logger.warning(f"Ingestion queue full for namespace '{tenant}'")
+                return False
+            queue.append(job)
+            self._counters["submitted"] += 1
+            self._idle.clear()
+        self._wake()
+        return True
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no job is queued or running; returns False on timeout"""
+        return self._idle.wait(timeout)
+
+    def stop(self, timeout: Optional[float] = 30):
+        """Finish queued jobs (up to timeout), then stop the loop thread"""
+        with self._lock:
+            self._stopping = True
+        self._wake()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._counters,
+                "running": self._running,
+                "pending": sum(len(queue) for queue in self._ready.values()),
+                "tenants_waiting": len(self._ready),
+                "concurrency": self.concurrency,
+                "max_inflight_per_tenant": self.max_inflight_per_tenant,
+            }
+
+    def _wake(self):
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                pass  # Loop already stopped
+
+    def _run_loop(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self._dispatch())
+        finally:
+            loop.close()
+
+    def _next_job(self) -> Optional[Tuple[str, IngestionJob]]:
+        """Take one job from the first tenant below its cap (lock held)"""
+        for _ in range(len(self._ready)):
+            tenant, queue = self._ready.popitem(last=False)
+            if self._inflight.get(tenant, 0) < self.max_inflight_per_tenant:
+                job = queue.popleft()
+                if queue:
+                    # Back of the line until every other tenant had a turn
+                    self._ready[tenant] = queue
+                return tenant, job
+            self._ready[tenant] = queue
+        return None
+
+    async def _dispatch(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._started.set()
+        tasks = set()
+        while True:
+            with self._lock:
+                while self._running < self.concurrency:
+                    picked = self._next_job()
+                    if picked is None:
+                        break
+                    tenant, job = picked
+                    self._inflight[tenant] = self._inflight.get(tenant, 0) + 1
+                    self._running += 1
+                    task = asyncio.ensure_future(self._execute(tenant, job))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                if self._stopping and not self._running and not self._ready:
+                    break
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+    async def _execute(self, tenant: str, job: IngestionJob):
+        failed = False
+        try:
+            await job()
+        except Exception as e:
+            failed = True
+            logger.error(f"Ingestion job failed for namespace '{tenant}': {e}")
+        finally:
+            with self._lock:
+                self._inflight[tenant] -= 1
+                if not self._inflight[tenant]:
+                    del self._inflight[tenant]
+                self._running -= 1
+                self._counters["failed" if failed else "completed"] += 1
+                if not self._running and not self._ready:
+                    self._idle.set()
+            self._wakeup.set()
+
+
+class MemoriTenant(Memori):
+    """
+    Namespace-scoped view of a pool's core Memori
+
+    Shares the core's database manager, agents and caches; only the namespace,
+    user, session and user context are its own. Obtain handles through
+    ``MemoriPool.for_namespace``. Closing a handle is a no-op: the pool owns
+    every resource.
+    """
+
+    def __init__(self, pool: "MemoriPool", namespace: str, user_id: Optional[str]):
+        self.__dict__.update(pool.core.__dict__)
+        self._pool = pool
+        self.namespace = namespace
+        self.user_id = user_id
+        self._session_id = str(uuid.uuid4())
+        self._conscious_context_injected = False
+        self._in_context_retrieval = False
+        self._user_context = {
+            "current_projects": [],
+            "relevant_skills": [],
+            "user_preferences": [],
+        }
+        self._memory_tasks = set()
+        self._background_task = None
+        self._background_loop = None
+        self._promotion_wakeup = None
+        self._unsubscribe_promotion_events = None
+        # Handles record directly; interceptors belong to standalone instances
+        self._enabled = True
+        self._closed = True
+
+    def _schedule_memory_processing(
+        self, chat_id: str, user_input: str, ai_output: str, model: str
+    ):
+        """Queue ingestion on the pool's fair scheduler"""
+        self._pool.scheduler.submit(
+            self.namespace,
+            lambda: self._process_memory_async(chat_id, user_input, ai_output, model),
+        )
+
+    async def _get_async_db_manager(
+        self, create: bool = True, namespace: Optional[str] = None
+    ):
+        # The core owns the managers; pick the one of this tenant's shard
+        return await self._pool.core._get_async_db_manager(
+            create, namespace or self.namespace
+        )
+
+    def enable(self, interceptors=None):
+        raise MemoriError(
+            "Tenant handles record directly; enable interceptors on a standalone Memori"
+        )
+
+    def disable(self):
+        raise MemoriError("Tenant handles cannot be disabled; close the MemoriPool")
+
+    def cleanup(self):
+        """Handles own no resources"""
+
+    def close(self):
+        """Handles own no resources; close the MemoriPool instead"""
+
+
+class MemoriPool:
+    """
+    Shared Memori core serving many tenants through lightweight handles
+
+    Usage:
+        pool = MemoriPool(database_connect="postgresql://...", conscious_ingest=True)
+        memori = pool.for_namespace("user-42", user_id="42")
+        memori.record_conversation("I prefer Python", "Noted!")
+        memori.retrieve_context("language preference")
+    """
+
+    def __init__(
+        self,
+        database_connect: str = "sqlite:///memori.db",
+        max_tenants: int = 10000,
+        ingestion_concurrency: int = 8,
+        max_inflight_per_tenant: int = 2,
+        max_pending_per_tenant: int = 100,
+        **memori_options: Any,
+    ):
+        """
+        Args:
+            database_connect: Database connection string shared by all tenants
+            max_tenants: Tenant handles (and their per-namespace caches) kept
+                before the least recently used is evicted
+            ingestion_concurrency: Conversations processed at once across tenants
+            max_inflight_per_tenant: Conversations processed at once per tenant
+            max_pending_per_tenant: Queued conversations per tenant before new
+                ones are dropped
+            **memori_options: Passed to the core Memori (provider, conscious_ingest, ...)
+        """
+        if "namespace" in memori_options or "user_id" in memori_options:
+            raise MemoriError("namespace and user_id are chosen per handle")
+
+        self.max_tenants = max_tenants
+        self.core = Memori(database_connect=database_connect, **memori_options)
+        self.scheduler = FairIngestionScheduler(
+            concurrency=ingestion_concurrency,
+            max_inflight_per_tenant=max_inflight_per_tenant,
+            max_pending_per_tenant=max_pending_per_tenant,
+        )
+        self.scheduler.start()
+
+        self._lock = threading.Lock()
+        self._tenants: "OrderedDict[Tuple[str, Optional[str]], MemoriTenant]" = (
+            OrderedDict()
+        )
+        self._evictions = 0
+        self._conscious_initialized = set()
+        # Namespaces with a promotion drain queued on the scheduler
+        self._promotions_scheduled = set()
+
+        # Promotion candidates of every tenant reach the shared conscious agent
+        self._unsubscribe_promotion_events = None
+        if self.core.conscious_agent:
+            self._unsubscribe_promotion_events = (
+                self.core.db_manager.event_bus.subscribe(
+                    MEMORY_PROMOTION_ELIGIBLE, self._on_promotion_event
+                )
+            )
+
+    def for_namespace(
+        self, namespace: str, user_id: Optional[str] = None
+    ) -> MemoriTenant:
+        """Get the handle for a namespace (and user), creating it on first use"""
+        key = (namespace, user_id)
+        evicted = []
+        with self._lock:
+            tenant = self._tenants.get(key)
+            if tenant is not None:
+                self._tenants.move_to_end(key)
+                return tenant
+
+            tenant = MemoriTenant(self, namespace, user_id)
+            self._tenants[key] = tenant
+            while len(self._tenants) > self.max_tenants:
+                evicted.append(self._tenants.popitem(last=False)[1])
+            initialize = (
+                self.core.conscious_ingest
+                and self.core.conscious_agent is not None
+                and namespace not in self._conscious_initialized
+            )
+            if initialize:
+                self._conscious_initialized.add(namespace)
+
+        for old in evicted:
+            self._release(old)
+        if initialize:
+            # Copy existing conscious-info memories into short-term memory
+            self.scheduler.submit(
+                namespace,
+                lambda: self.core.conscious_agent.initialize_existing_conscious_memories(
+                    self.core.db_manager, namespace
+                ),
+            )
+        return tenant
+
+    def evict(self, namespace: str, user_id: Optional[str] = None) -> bool:
+        """Drop a tenant handle and its cached state; returns False if not cached"""
+        with self._lock:
+            tenant = self._tenants.pop((namespace, user_id), None)
+        if tenant is None:
+            return False
+        self._release(tenant)
+        return True
+
+    def _release(self, tenant: MemoriTenant):
+        self._evictions += 1
+        self.core.conversation_manager.clear_session(tenant._session_id)
+        with self._lock:
+            still_cached = any(ns == tenant.namespace for ns, _ in self._tenants)
+            if not still_cached:
+                self._conscious_initialized.discard(tenant.namespace)
+        if not still_cached:
+            # Re-seeded from the database if the namespace comes back
+            self.core.db_manager.recent_memories.reset(tenant.namespace)
+
+    def _on_promotion_event(self, event):
+        # The core already handles its own namespace
+        if event.namespace == self.core.namespace:
+            return
+        if self.core.conscious_agent is None:
+            return
+        self.core.conscious_agent.enqueue_promotion(event.namespace, event.memory_id)
+        self._schedule_promotion(event.namespace)
+
+    def _schedule_promotion(self, namespace: str):
+        """Queue one drain of a tenant's announced memories on the scheduler"""
+        with self._lock:
+            if namespace in self._promotions_scheduled:
+                return
+            self._promotions_scheduled.add(namespace)
+        if not self.scheduler.submit(namespace, lambda: self._promote(namespace)):
+            # Queue full or stopping: the ids stay queued for the next event
+            with self._lock:
+                self._promotions_scheduled.discard(namespace)
+
+    async def _promote(self, namespace: str):
+        with self._lock:
+            # Memories announced from now on need another drain
+            self._promotions_scheduled.discard(namespace)
+        await self.core.conscious_agent.promote_pending(self.core.db_manager, namespace)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for queued ingestion, commit buffered writes, then wait for
+        the promotions those writes announced
+
+        Returns:
+            False if ingestion was still running at the timeout
+        """
+        idle = self.scheduler.join(timeout)
+        self.core.flush_writes()
+        return self.scheduler.join(timeout) and idle
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            tenants = len(self._tenants)
+        return {
+            "tenants": tenants,
+            "max_tenants": self.max_tenants,
+            "evictions": self._evictions,
+            "ingestion": self.scheduler.get_stats(),
+        }
+
+    def close(self, timeout: Optional[float] = 30):
+        """Finish queued ingestion (up to timeout) and release the core's resources"""
+        self.scheduler.stop(timeout)
+        if self._unsubscribe_promotion_events is not None:
+            self._unsubscribe_promotion_events()
+            self._unsubscribe_promotion_events = None
+        with self._lock:
+            self._tenants.clear()
+        self.core.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -2,12 +2,15 @@
 Provider configuration for different LLM providers (OpenAI, Azure, custom)
 """
 
+import asyncio
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Dict, Optional
 
 from loguru import logger
 
+from ..utils.registry import SharedResourceRegistry
+
 
 class ProviderType(Enum):
     """Supported LLM provider types"""
@@ -190,6 +193,50 @@ class ProviderConfig:
             return openai.AsyncOpenAI(**kwargs)
 
 
+def _close_client(client):
+    """Close a shared client's HTTP connections"""
+    result = client.close()
+    if asyncio.iscoroutine(result):
+        # Async clients close with a coroutine
+        try:
+            asyncio.get_running_loop().create_task(result)
+        except RuntimeError:
+            asyncio.run(result)
+
+
+# LLM clients shared by every agent in the process with the same configuration
+client_registry = SharedResourceRegistry("llm client", _close_client)
+
+
+def _client_key(config: ProviderConfig, asynchronous: bool) -> tuple:
+    """Hashable identity of the client a configuration creates"""
+    items = []
+    for name, value in sorted(config.get_openai_client_kwargs().items()):
+        if name == "http_client":
+            value = id(value)
+        elif isinstance(value, dict):
+            value = tuple(sorted(value.items()))
+        items.append((name, value))
+    return (asynchronous, tuple(items))
+
+
+def acquire_shared_client(config: ProviderConfig, asynchronous: bool = False):
+    """
+    Get a client shared with every other user of an identical configuration
+
+    Returns:
+        (client, key); pass the key to release_shared_client when done
+    """
+    key = _client_key(config, asynchronous)
+    factory = config.create_async_client if asynchronous else config.create_client
+    return client_registry.acquire(key, factory), key
+
+
+def release_shared_client(key: tuple) -> bool:
+    """Drop a reference taken by acquire_shared_client"""
+    return client_registry.release(key)
+
+
 def detect_provider_from_env() -> ProviderConfig:
     """
     Create provider configuration from environment variables WITHOUT automatic detection.
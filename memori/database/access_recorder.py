@@ -0,0 +1,153 @@
+"""
+Batched access tracking for search results
+
+Every memory returned by a search counts as one access. Writing each hit
+directly would add one UPDATE per returned memory per request. Instead, hits
+are coalesced in memory per memory row and flushed in the background as
+``access_count = access_count + n`` updates, one executemany per table.
+
+Access counts are a ranking signal, not an audit log: hits pending at a crash
+are lost, and a failed flush is logged and dropped rather than retried.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, Mapping, Tuple
+
+from loguru import logger
+from sqlalchemy import and_, bindparam, func, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from .background_flusher import BackgroundFlusher
+from .models import LongTermMemory, ShortTermMemory
+
+TRACKED_TABLES = {
+    "short_term": ShortTermMemory.__table__,
+    "long_term": LongTermMemory.__table__,
+}
+
+
+def _access_statement(table):
+    return (
+        update(table)
+        .where(
+            and_(
+                table.c.memory_id == bindparam("b_memory_id"),
+                table.c.namespace == bindparam("b_namespace"),
+            )
+        )
+        .values(
+            access_count=func.coalesce(table.c.access_count, 0) + bindparam("b_hits"),
+            last_accessed=bindparam("b_last_accessed"),
+        )
+    )
+
+
+class AccessRecorder(BackgroundFlusher):
+    """Coalesces memory access hits and writes them in periodic batches"""
+
+    thread_name = "memori-access-recorder"
+
+    def __init__(
+        self,
+        engine,
+        flush_interval_ms: int = 1000,
+        max_pending: int = 1000,
+    ):
+        """
+        Args:
+            engine: Engine the updates are written to (the primary)
+            flush_interval_ms: Maximum time a hit waits before being written
+            max_pending: Number of distinct pending memories that triggers an
+                early flush
+        """
+        super().__init__(flush_interval_ms, max_pending)
+        self.engine = engine
+        self._statements = {
+            memory_type: _access_statement(table)
+            for memory_type, table in TRACKED_TABLES.items()
+        }
+
+        # (memory_type, namespace, memory_id) -> [hits, last accessed]
+        self._pending: Dict[Tuple[str, str, str], list] = {}
+
+        self._stats = {"hits": 0, "flushes": 0, "rows_updated": 0, "dropped_hits": 0}
+
+    def record(self, namespace: str, results: Iterable[Mapping[str, Any]]):
+        """Count one access for each search result (needs memory_type and memory_id)"""
+        now = datetime.now()
+        with self._condition:
+            if self._closed:
+                return
+            for result in results:
+                memory_type = result.get("memory_type")
+                memory_id = result.get("memory_id")
+                if memory_type not in TRACKED_TABLES or not memory_id:
+                    continue
+                key = (memory_type, namespace, memory_id)
+                entry = self._pending.get(key)
+                if entry is None:
+                    self._pending[key] = [1, now]
+                else:
+                    entry[0] += 1
+                    entry[1] = now
+                self._stats["hits"] += 1
+            if not self._pending:
+                return
+            self._mark_pending()
+
+        self._ensure_worker()
+
+    def flush(self) -> int:
+        """
+        Write every pending hit
+
+        Returns:
+            Number of memory rows updated
+        """
+        with self._flush_lock:
+            with self._condition:
+                pending, self._pending = self._pending, {}
+                self._oldest_pending = None
+            if not pending:
+                return 0
+
+            batches: Dict[str, list] = {}
+            for (memory_type, namespace, memory_id), (hits, last) in pending.items():
+                batches.setdefault(memory_type, []).append(
+                    {
+                        "b_memory_id": memory_id,
+                        "b_namespace": namespace,
+                        "b_hits": hits,
+                        "b_last_accessed": last,
+                    }
+                )
+
+            try:
+                with self.engine.begin() as conn:
+                    for memory_type, rows in batches.items():
+                        conn.execute(self._statements[memory_type], rows)
+            except SQLAlchemyError as e:
+                dropped = sum(hits for hits, _ in pending.values())
+                self._stats["dropped_hits"] += dropped
+                logger.warning(f"Dropped {dropped} memory access hit(s): {e}")
+                return 0
+
+            self._stats["flushes"] += 1
+            self._stats["rows_updated"] += len(pending)
+            logger.debug(f"Access recorder updated {len(pending)} memory row(s)")
+            return len(pending)
+
+    def _pending_count(self) -> int:
+        return len(self._pending)
+
+    def _flush_pending(self):
+        self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._condition:
+            pending = len(self._pending)
+        return {
+            **self._stats,
+            "pending_rows": pending,
+            "flush_interval_ms": int(self.flush_interval * 1000),
+        }
@@ -0,0 +1,523 @@
+"""
+Async database manager built on SQLAlchemy asyncio
+
+Provides awaitable equivalents of the SQLAlchemyDatabaseManager operations
+used on hot paths (store, search, history and stats) so async hosts never
+block their event loop on database I/O. Drivers: aiosqlite, asyncpg and
+aiomysql (``pip install memorisdk[async]``).
+"""
+
+import importlib.util
+import json
+import uuid
+from typing import Any, Dict, List, Optional, Union
+
+from loguru import logger
+from sqlalchemy import inspect, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..utils.events import MEMORY_PROMOTION_ELIGIBLE, MemoryEventBus, memory_events
+from ..utils.exceptions import DatabaseError
+from ..utils.pydantic_models import ProcessedLongTermMemory
+from .index_advisor import create_missing_indexes
+from .memory_edges import EDGES_TABLE, MAX_HOPS, derive_edges, edge_rows, insert_edges
+from .memory_stats import (
+    STATS_TABLE,
+    StatDeltas,
+    list_namespaces,
+    read_memory_stats,
+    reconcile_namespace,
+)
+from .models import Base, ChatHistory, LongTermMemory, ShortTermMemory
+from .pool_metrics import InstrumentedAsyncAdaptedQueuePool, get_pool_metrics
+from .recent_memory_window import MemoryFingerprint, RecentMemoryWindow
+from .schema_version import load_schema_state, state_is_current, store_schema_state
+from .scoring import ScoringConfig, install_sqlite_functions
+from .search_service import SearchService
+from .sqlalchemy_manager import SQLAlchemyDatabaseManager
+from .sqlite_profile import SQLiteProfile, apply_sqlite_profile
+from .storage_codec import ProcessedDataCodec, lazy_processed_data
+from .user_profiles import PROFILES_TABLE, build_user_profiles
+
+# Sync URL scheme -> (async driver URL scheme, driver module)
+ASYNC_DRIVERS = {
+    "sqlite": ("sqlite+aiosqlite", "aiosqlite"),
+    "postgresql": ("postgresql+asyncpg", "asyncpg"),
+    "mysql": ("mysql+aiomysql", "aiomysql"),
+}
+
+
+def to_async_url(database_connect: str) -> str:
+    """
+    Map a sync connection string to its asyncio driver
+
+    ``sqlite:///x.db`` -> ``sqlite+aiosqlite:///x.db``,
+    ``postgresql+psycopg2://...`` -> ``postgresql+asyncpg://...``,
+    ``mysql+pymysql://...`` -> ``mysql+aiomysql://...``. URLs that already
+    name an async driver are returned unchanged.
+    """
+    scheme, sep, rest = database_connect.partition("://")
+    if not sep:
+        raise DatabaseError(f"Invalid database connection string: {database_connect}")
+
+    dialect, _, driver = scheme.partition("+")
+    if dialect not in ASYNC_DRIVERS:
+        raise DatabaseError(f"Unsupported database type: {database_connect}")
+
+    async_scheme, module = ASYNC_DRIVERS[dialect]
+    if driver and driver in ("aiosqlite", "asyncpg", "aiomysql", "psycopg", "asyncmy"):
+        return database_connect
+
+    if importlib.util.find_spec(module) is None:
+        raise DatabaseError(
+            f"❌ Async driver '{module}' not found. Install one of the following:\n\n"
+            f"Option 1: pip install {module}\n"
+            "Option 2: pip install memorisdk[async]"
+        )
+
+    # asyncpg does not understand libpq's sslmode query parameter
+    if dialect == "postgresql" and "sslmode=" in rest:
+        rest = rest.replace("sslmode=", "ssl=")
+
+    return f"{async_scheme}://{rest}"
+
+
+def _seed_memory_stats(conn):
+    """Build memory_stats counters for rows written before the table existed"""
+    for namespace in list_namespaces(conn):
+        reconcile_namespace(conn, namespace)
+
+
+def _seed_memory_edges(conn):
+    """Normalize relations of memories stored before memory_edges existed"""
+    insert_edges(conn, derive_edges(conn))
+
+
+def _seed_user_profiles(conn):
+    """Materialize the conscious context promoted before user profiles existed"""
+    build_user_profiles(conn)
+
+
+class AsyncSQLAlchemyDatabaseManager:
+    """SQLAlchemy asyncio database manager with cross-database support"""
+
+    def __init__(
+        self,
+        database_connect: str,
+        event_bus: Optional[MemoryEventBus] = None,
+        recent_memories: Optional[RecentMemoryWindow] = None,
+        sqlite_profile: Union[SQLiteProfile, Dict[str, Any], bool, None] = None,
+        pool_size: int = 10,
+        max_overflow: int = 20,
+        pool_timeout: float = 30,
+        pool_pre_ping: bool = True,
+        pool_use_lifo: bool = False,
+        pool_recycle: int = 3600,
+        storage_codec: Union[str, ProcessedDataCodec, None] = None,
+        scoring: Union[ScoringConfig, Dict[str, Any], None] = None,
+        related_memory_hops: int = 0,
+    ):
+        try:
+            from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        except ImportError as e:
+            raise DatabaseError(
+                f"SQLAlchemy asyncio support is unavailable ({e}). "
+                "Install it with: pip install memorisdk[async]"
+            )
+
+        self.database_connect = database_connect
+        self.async_database_connect = to_async_url(database_connect)
+
+        engine_options: Dict[str, Any] = {
+            "json_serializer": json.dumps,
+            "json_deserializer": json.loads,
+            "echo": False,
+        }
+        if not self.async_database_connect.startswith("sqlite"):
+            engine_options.update(
+                poolclass=InstrumentedAsyncAdaptedQueuePool,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=pool_timeout,
+                pool_pre_ping=pool_pre_ping,
+                pool_use_lifo=pool_use_lifo,
+                pool_recycle=pool_recycle,
+            )
+
+        self.engine = create_async_engine(self.async_database_connect, **engine_options)
+        self.database_type = self.engine.dialect.name
+
+        if self.database_type == "sqlite":
+            profile = SQLiteProfile.from_config(sqlite_profile)
+            if profile is not None:
+                # Periodic maintenance is left to the sync manager
+                apply_sqlite_profile(self.engine.sync_engine, profile)
+            install_sqlite_functions(self.engine.sync_engine)
+
+        self.SessionLocal = async_sessionmaker(self.engine, expire_on_commit=False)
+        self.event_bus = event_bus or memory_events
+        self.recent_memories = recent_memories or RecentMemoryWindow()
+        self.storage_codec = ProcessedDataCodec.from_spec(storage_codec)
+        self.scoring = ScoringConfig.from_config(scoring)
+        if not 0 <= related_memory_hops <= MAX_HOPS:
+            raise ValueError(f"related_memory_hops must be between 0 and {MAX_HOPS}")
+        self.related_memory_hops = related_memory_hops
+        self._stats_counters: Optional[bool] = None
+        self._memory_edges: Optional[bool] = None
+
+        logger.info(
+            f"Initialized async SQLAlchemy database manager for {self.database_type}"
+        )
+
+    async def initialize_schema(self, force: bool = False):
+        """
+        Create tables and database-specific search features
+
+        Skipped when the recorded schema fingerprint matches this library,
+        unless ``force`` is set.
+        """
+        if not force:
+            async with self.engine.connect() as conn:
+                state = await conn.run_sync(load_schema_state)
+            if state_is_current(state, self.engine.dialect):
+                self._stats_counters = True
+                self._memory_edges = True
+                logger.debug(f"Database schema is current for {self.database_type}")
+                return
+        try:
+            async with self.engine.begin() as conn:
+                had_stats_table, had_edges_table, had_profiles_table = (
+                    await conn.run_sync(
+                        lambda sync_conn: (
+                            inspect(sync_conn).has_table(STATS_TABLE.name),
+                            inspect(sync_conn).has_table(EDGES_TABLE.name),
+                            inspect(sync_conn).has_table(PROFILES_TABLE.name),
+                        )
+                    )
+                )
+                await conn.run_sync(Base.metadata.create_all)
+                if not had_stats_table:
+                    # Seed the counters for data written before they existed
+                    await conn.run_sync(_seed_memory_stats)
+                if not had_edges_table:
+                    await conn.run_sync(_seed_memory_edges)
+                if not had_profiles_table:
+                    await conn.run_sync(_seed_user_profiles)
+                # Tables created by older versions lack newer composite indexes
+                await conn.run_sync(create_missing_indexes)
+            self._stats_counters = True
+            self._memory_edges = True
+            if not await self._setup_database_features():
+                # Without a recorded version the next startup retries the DDL
+                logger.warning(
+                    f"Database schema setup incomplete for {self.database_type}; "
+                    "not recording the schema version"
+                )
+                return
+            async with self.engine.begin() as conn:
+                await conn.run_sync(store_schema_state)
+            logger.info(
+                f"Database schema initialized successfully for {self.database_type}"
+            )
+        except Exception as e:
+            logger.error(f"Failed to initialize schema: {e}")
+            raise DatabaseError(f"Failed to initialize schema: {e}")
+
+    async def _setup_database_features(self) -> bool:
+        """Setup database-specific features like full-text search; True on success"""
+        setup = {
+            "sqlite": SQLAlchemyDatabaseManager._setup_sqlite_fts,
+            "mysql": SQLAlchemyDatabaseManager._setup_mysql_fulltext,
+            "postgresql": SQLAlchemyDatabaseManager._setup_postgresql_fts,
+        }.get(self.database_type)
+        if setup is None:
+            return True
+        try:
+            async with self.engine.begin() as conn:
+                return await conn.run_sync(lambda sync_conn: setup(self, sync_conn))
+        except Exception as e:
+            logger.warning(f"Failed to setup database-specific features: {e}")
+            return False
+
+    async def _stats_counters_enabled(self) -> bool:
+        """Whether writes maintain the memory_stats counters"""
+        if self._stats_counters is None:
+            try:
+                async with self.engine.connect() as conn:
+                    self._stats_counters = await conn.run_sync(
+                        lambda sync_conn: inspect(sync_conn).has_table(STATS_TABLE.name)
+                    )
+            except SQLAlchemyError:
+                self._stats_counters = False
+        return self._stats_counters
+
+    async def _memory_edges_enabled(self) -> bool:
+        """Whether the memory_edges table exists"""
+        if self._memory_edges is None:
+            try:
+                async with self.engine.connect() as conn:
+                    self._memory_edges = await conn.run_sync(
+                        lambda sync_conn: inspect(sync_conn).has_table(EDGES_TABLE.name)
+                    )
+            except SQLAlchemyError:
+                self._memory_edges = False
+        return self._memory_edges
+
+    async def _apply_stat_deltas(self, session, deltas: StatDeltas):
+        """Update the memory_stats counters inside the session's transaction"""
+        if deltas and await self._stats_counters_enabled():
+            await session.run_sync(deltas.apply)
+
+    async def store_chat_history(
+        self,
+        chat_id: str,
+        user_input: str,
+        ai_output: str,
+        model: str,
+        timestamp,
+        session_id: str,
+        namespace: str = "default",
+        tokens_used: int = 0,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        """Store chat history"""
+        async with self.SessionLocal() as session:
+            try:
+                merged = await session.merge(
+                    ChatHistory(
+                        chat_id=chat_id,
+                        user_input=user_input,
+                        ai_output=ai_output,
+                        model=model,
+                        timestamp=timestamp,
+                        session_id=session_id,
+                        namespace=namespace,
+                        tokens_used=tokens_used,
+                        metadata_json=metadata or {},
+                    )
+                )
+                if merged in session.new:
+                    deltas = StatDeltas()
+                    deltas.add(namespace, "chat_history")
+                    await self._apply_stat_deltas(session, deltas)
+                await session.commit()
+            except SQLAlchemyError as e:
+                await session.rollback()
+                raise DatabaseError(f"Failed to store chat history: {e}")
+
+    async def get_chat_history(
+        self,
+        namespace: str = "default",
+        session_id: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Get chat history with optional session filtering"""
+        query = select(ChatHistory).where(ChatHistory.namespace == namespace)
+        if session_id:
+            query = query.where(ChatHistory.session_id == session_id)
+        query = query.order_by(ChatHistory.timestamp.desc()).limit(limit)
+
+        async with self.SessionLocal() as session:
+            try:
+                results = (await session.execute(query)).scalars().all()
+            except SQLAlchemyError as e:
+                raise DatabaseError(f"Failed to get chat history: {e}")
+
+        return [
+            {
+                "chat_id": result.chat_id,
+                "user_input": result.user_input,
+                "ai_output": result.ai_output,
+                "model": result.model,
+                "timestamp": result.timestamp,
+                "session_id": result.session_id,
+                "namespace": result.namespace,
+                "tokens_used": result.tokens_used,
+                "metadata": result.metadata_json or {},
+            }
+            for result in results
+        ]
+
+    async def store_long_term_memory_enhanced(
+        self, memory: ProcessedLongTermMemory, chat_id: str, namespace: str = "default"
+    ) -> str:
+        """Store a ProcessedLongTermMemory with enhanced schema"""
+        memory_id = str(uuid.uuid4())
+        row = SQLAlchemyDatabaseManager._build_long_term_memory_row(
+            memory, memory_id, chat_id, namespace, self.storage_codec
+        )
+
+        async with self.SessionLocal() as session:
+            try:
+                session.add(LongTermMemory(**row))
+                deltas = StatDeltas()
+                deltas.add_rows("long_term", [row])
+                await self._apply_stat_deltas(session, deltas)
+                edges = edge_rows([row])
+                if edges and await self._memory_edges_enabled():
+                    await session.run_sync(
+                        lambda sync_session: insert_edges(sync_session, edges)
+                    )
+                await session.commit()
+            except SQLAlchemyError as e:
+                await session.rollback()
+                logger.error(f"Failed to store enhanced long-term memory: {e}")
+                raise DatabaseError(f"Failed to store enhanced long-term memory: {e}")
+
+        logger.debug(f"Stored enhanced long-term memory {memory_id}")
+        self.recent_memories.record(
+            namespace, memory_id, row["searchable_content"], row["summary"]
+        )
+        if SQLAlchemyDatabaseManager._is_promotion_candidate(row):
+            self.event_bus.publish(MEMORY_PROMOTION_ELIGIBLE, namespace, memory_id)
+        return memory_id
+
+    async def get_recent_memory_fingerprints(
+        self, namespace: str = "default"
+    ) -> List[MemoryFingerprint]:
+        """Get fingerprints of the most recent memories for duplicate detection"""
+        if not self.recent_memories.is_seeded(namespace):
+            query = (
+                select(
+                    LongTermMemory.memory_id,
+                    LongTermMemory.searchable_content,
+                    LongTermMemory.summary,
+                )
+                .where(
+                    LongTermMemory.namespace == namespace,
+                    LongTermMemory.processed_for_duplicates.is_(False),
+                )
+                .order_by(LongTermMemory.created_at.desc())
+                .limit(self.recent_memories.size)
+            )
+            async with self.SessionLocal() as session:
+                try:
+                    rows = (await session.execute(query)).all()
+                except SQLAlchemyError as e:
+                    raise DatabaseError(f"Failed to load recent memories: {e}")
+            self.recent_memories.seed(namespace, [tuple(row) for row in rows])
+
+        return self.recent_memories.snapshot(namespace)
+
+    async def search_memories(
+        self,
+        query: str,
+        namespace: str = "default",
+        category_filter: Optional[List[str]] = None,
+        limit: int = 10,
+        expand_hops: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Search memories using the cross-database search service"""
+        if expand_hops is None:
+            expand_hops = self.related_memory_hops
+        elif not 0 <= expand_hops <= MAX_HOPS:
+            raise ValueError(f"expand_hops must be between 0 and {MAX_HOPS}")
+        try:
+            memory_edges = await self._memory_edges_enabled()
+            async with self.SessionLocal() as session:
+                results = await session.run_sync(
+                    lambda sync_session: SearchService(
+                        sync_session, self.database_type, self.scoring, memory_edges
+                    ).search_memories(
+                        query,
+                        namespace,
+                        category_filter,
+                        limit,
+                        expand_hops=expand_hops,
+                    )
+                )
+            logger.debug(f"Search for '{query}' returned {len(results)} results")
+            return results
+        except Exception as e:
+            logger.error(f"Memory search failed for query '{query}': {e}")
+            # Return empty list instead of raising exception to avoid breaking auto_ingest
+            return []
+
+    async def search_memories_many(
+        self,
+        queries: List[str],
+        namespace: str = "default",
+        category_filter: Optional[List[str]] = None,
+        limit: int = 10,
+    ) -> List[List[Dict[str, Any]]]:
+        """Run several searches in one session; one result list per query"""
+        if not queries:
+            return []
+        try:
+            memory_edges = await self._memory_edges_enabled()
+            async with self.SessionLocal() as session:
+                return await session.run_sync(
+                    lambda sync_session: SearchService(
+                        sync_session, self.database_type, self.scoring, memory_edges
+                    ).search_memories_many(queries, namespace, category_filter, limit)
+                )
+        except Exception as e:
+            logger.error(f"Batched memory search failed: {e}")
+            return [[] for _ in queries]
+
+    async def get_essential_conversations(
+        self, namespace: str = "default", limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Get essential conversations from short-term memory"""
+        query = (
+            select(
+                ShortTermMemory.memory_id,
+                ShortTermMemory.summary,
+                ShortTermMemory.category_primary,
+                ShortTermMemory.importance_score,
+                ShortTermMemory.created_at,
+                ShortTermMemory.searchable_content,
+                ShortTermMemory.processed_data,
+            )
+            .where(
+                ShortTermMemory.namespace == namespace,
+                ShortTermMemory.category_primary.like("essential_%"),
+            )
+            .order_by(
+                ShortTermMemory.importance_score.desc(),
+                ShortTermMemory.created_at.desc(),
+            )
+            .limit(limit)
+        )
+        async with self.SessionLocal() as session:
+            try:
+                rows = (await session.execute(query)).mappings().all()
+            except SQLAlchemyError as e:
+                raise DatabaseError(f"Failed to get essential conversations: {e}")
+        conversations = [dict(row) for row in rows]
+        for conversation in conversations:
+            conversation["processed_data"] = lazy_processed_data(
+                conversation["processed_data"], conversation
+            )
+        return conversations
+
+    async def get_memory_stats(self, namespace: str = "default") -> Dict[str, Any]:
+        """Get comprehensive memory statistics"""
+        async with self.SessionLocal() as session:
+            try:
+                if await self._stats_counters_enabled():
+                    stats = await session.run_sync(
+                        lambda sync_session: read_memory_stats(sync_session, namespace)
+                    )
+                else:
+                    stats = await session.run_sync(
+                        SQLAlchemyDatabaseManager._collect_memory_stats, namespace
+                    )
+            except SQLAlchemyError as e:
+                raise DatabaseError(f"Failed to get memory stats: {e}")
+
+        stats["database_type"] = self.database_type
+        stats["database_url"] = (
+            self.database_connect.split("@")[-1]
+            if "@" in self.database_connect
+            else self.database_connect
+        )
+        return stats
+
+    def get_pool_metrics(self) -> Dict[str, Any]:
+        """Get connection pool occupancy and checkout wait statistics"""
+        return get_pool_metrics(self.engine.sync_engine)
+
+    async def close(self):
+        """Close database connections"""
+        await self.engine.dispose()
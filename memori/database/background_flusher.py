@@ -0,0 +1,142 @@
+"""
+Background flushing shared by the write buffer and the access recorder
+
+Both coalesce work in memory and write it from a daemon thread, either every
+``flush_interval`` seconds after the first pending item or as soon as
+``max_pending`` items are waiting. BackgroundFlusher owns that lifecycle:
+
+    - The worker sleeps without a timeout while nothing is pending and is
+      woken by the first enqueued item.
+    - ``close()`` marks the flusher closed under its condition before the
+      final flush; subclasses check ``_closed`` under the same lock when
+      enqueueing, so nothing can be added after the last flush.
+    - Every live flusher is closed by an ``atexit`` hook.
+"""
+
+import atexit
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from loguru import logger
+
+_live_flushers: "weakref.WeakSet[BackgroundFlusher]" = weakref.WeakSet()
+
+
+def _close_all_flushers():
+    """Flush every live flusher at interpreter shutdown"""
+    for flusher in list(_live_flushers):
+        try:
+            flusher.close()
+        except Exception as e:
+            logger.error(f"Failed to flush {flusher.thread_name} at shutdown: {e}")
+
+
+atexit.register(_close_all_flushers)
+
+
+class BackgroundFlusher(ABC):
+    """
+    Base class for in-memory batches written by a background thread
+
+    Subclasses implement ``_pending_count`` and ``_flush_pending``, call
+    ``_mark_pending`` (holding ``_condition``) after adding work, then
+    ``_ensure_worker``.
+    """
+
+    thread_name = "memori-flusher"
+
+    def __init__(self, flush_interval_ms: int, max_pending: int):
+        self.flush_interval = max(flush_interval_ms, 1) / 1000.0
+        self.max_pending = max(max_pending, 1)
+
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._oldest_pending: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        _live_flushers.add(self)
+
+    # Subclass hooks
+
+    @abstractmethod
+    def _pending_count(self) -> int:
+        """Number of pending items (called holding ``_condition``)"""
+        pass
+
+    @abstractmethod
+    def _flush_pending(self):
+        """Write pending items (called by the worker, without locks held)"""
+        pass
+
+    def _final_flush(self):
+        """Write what is left once closed"""
+        self._flush_pending()
+
+    def _on_flush_error(self, error: Exception):
+        logger.error(f"{self.thread_name} flush failed: {error}")
+
+    # Scheduling
+
+    def _mark_pending(self):
+        """Start the flush timer or trigger an early flush; hold ``_condition``"""
+        if self._oldest_pending is None:
+            self._oldest_pending = time.monotonic()
+            self._condition.notify()
+        elif self._pending_count() >= self.max_pending:
+            self._condition.notify()
+
+    def _ensure_worker(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._condition:
+            if self._closed:
+                return
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name=self.thread_name, daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed:
+                    count = self._pending_count()
+                    if count >= self.max_pending:
+                        break
+                    if count and self._oldest_pending is not None:
+                        remaining = self.flush_interval - (
+                            time.monotonic() - self._oldest_pending
+                        )
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    else:
+                        # Idle until _mark_pending wakes us
+                        self._condition.wait()
+                if self._closed:
+                    return
+
+            try:
+                self._flush_pending()
+            except Exception as e:
+                self._on_flush_error(e)
+
+    def close(self):
+        """Stop accepting work, flush what is pending and stop the worker"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        _live_flushers.discard(self)
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            # Let an in-progress background flush finish first
+            thread.join()
+        self._final_flush()
@@ -0,0 +1,252 @@
+"""
+Keyset-paginated iteration and streaming JSONL export/import
+
+Walking a namespace with OFFSET gets slower with every page, because the
+database steps over all earlier rows again. These helpers instead page on the
+sort column plus the primary key: ``(timestamp, chat_id)`` for chat history
+and ``(created_at, memory_id)`` for memories. Each page is an index range
+scan. Rows are read through server-side cursors (``yield_per``), so memory
+stays bounded by the batch size however long the history is.
+
+The JSONL format has one header line, then one ``{"table": ..., "row": ...}``
+line per row. Parent tables come first. processed_data is written decoded, so
+a backup can be restored into a database that uses another storage codec.
+"""
+
+import json
+from datetime import date, datetime
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from loguru import logger
+from sqlalchemy import DateTime, and_, delete, insert, or_, select
+
+from .models import ChatHistory, LongTermMemory, ShortTermMemory
+from .storage_codec import ProcessedDataCodec, decode_processed_data
+
+FORMAT_NAME = "memori-jsonl"
+FORMAT_VERSION = 1
+
+# Sort column and unique tie-breaker of each exported table
+KEYSET_COLUMNS = {
+    ChatHistory.__tablename__: ("timestamp", "chat_id"),
+    ShortTermMemory.__tablename__: ("created_at", "memory_id"),
+    LongTermMemory.__tablename__: ("created_at", "memory_id"),
+}
+
+# Parents first: short-term rows reference chat history
+EXPORT_TABLES = (
+    ChatHistory.__table__,
+    LongTermMemory.__table__,
+    ShortTermMemory.__table__,
+)
+_TABLES_BY_NAME = {table.name: table for table in EXPORT_TABLES}
+
+
+def iter_table_rows(
+    engine,
+    table,
+    namespace: Optional[str] = None,
+    criteria: Sequence[Any] = (),
+    batch_size: int = 500,
+    descending: bool = False,
+    after: Optional[Tuple[Any, Any]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield a table's rows in keyset order, one bounded page at a time
+
+    Args:
+        engine: Engine to read from
+        table: One of the exported tables
+        namespace: Only rows of this namespace (all namespaces if None)
+        criteria: Extra WHERE clauses
+        batch_size: Rows per page and per server-side cursor fetch
+        descending: Newest first instead of oldest first
+        after: Resume after this (sort value, key) pair
+    """
+    sort_name, key_name = KEYSET_COLUMNS[table.name]
+    sort_column, key_column = table.c[sort_name], table.c[key_name]
+    if descending:
+        order = (sort_column.desc(), key_column.desc())
+    else:
+        order = (sort_column, key_column)
+
+    base = select(table)
+    if namespace is not None:
+        base = base.where(table.c.namespace == namespace)
+    for criterion in criteria:
+        base = base.where(criterion)
+
+    last = after
+    while True:
+        query = base
+        if last is not None:
+            # Expanded row-value comparison; (a, b) > (x, y) is not portable
+            if descending:
+                query = query.where(
+                    or_(
+                        sort_column < last[0],
+                        and_(sort_column == last[0], key_column < last[1]),
+                    )
+                )
+            else:
+                query = query.where(
+                    or_(
+                        sort_column > last[0],
+                        and_(sort_column == last[0], key_column > last[1]),
+                    )
+                )
+        query = query.order_by(*order).limit(batch_size)
+
+        count = 0
+        with engine.connect() as conn:
+            result = conn.execution_options(yield_per=batch_size).execute(query)
+            for row in result:
+                row = dict(row._mapping)
+                count += 1
+                last = (row[sort_name], row[key_name])
+                yield row
+        if count < batch_size:
+            return
+
+
+def _json_default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _export_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    if "processed_data" in row:
+        data = decode_processed_data(row["processed_data"], row)
+        if isinstance(data, str):
+            data = json.loads(data)
+        row["processed_data"] = data
+    return row
+
+
+def export_jsonl(
+    engine,
+    output: IO[str],
+    namespace: Optional[str] = None,
+    batch_size: int = 500,
+    progress: Optional[Callable[[str, int], None]] = None,
+) -> Dict[str, int]:
+    """
+    Stream a namespace (or the whole database) to JSONL
+
+    Returns:
+        Rows written per table
+    """
+    header = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "namespace": namespace,
+        "exported_at": datetime.utcnow().isoformat(),
+    }
+    output.write(json.dumps(header) + "\n")
+
+    written: Dict[str, int] = {}
+    for table in EXPORT_TABLES:
+        written[table.name] = 0
+        for row in iter_table_rows(engine, table, namespace, batch_size=batch_size):
+            line = {"table": table.name, "row": _export_row(row)}
+            output.write(json.dumps(line, default=_json_default) + "\n")
+            written[table.name] += 1
+            if progress is not None and written[table.name] % batch_size == 0:
+                progress(table.name, written[table.name])
+    return written
+
+
+def _import_row(table, row: Dict[str, Any], codec: Optional[ProcessedDataCodec]):
+    values = {}
+    for column in table.columns:
+        if column.name not in row:
+            continue
+        value = row[column.name]
+        if isinstance(value, str) and isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        values[column.name] = value
+    if codec is not None and isinstance(values.get("processed_data"), dict):
+        values["processed_data"] = codec.encode(values["processed_data"], values)
+    return values
+
+
+def _write_batch(engine, table, rows: List[Dict[str, Any]], replace: bool) -> int:
+    pk = next(iter(table.primary_key.columns))
+    keys = [row[pk.name] for row in rows]
+    with engine.begin() as conn:
+        if replace:
+            conn.execute(delete(table).where(pk.in_(keys)))
+        else:
+            existing = {key for (key,) in conn.execute(select(pk).where(pk.in_(keys)))}
+            rows = [row for row in rows if row[pk.name] not in existing]
+        if rows:
+            conn.execute(insert(table), rows)
+    return len(rows)
+
+
+def import_jsonl(
+    engine,
+    source: IO[str],
+    batch_size: int = 500,
+    codec: Optional[ProcessedDataCodec] = None,
+    replace: bool = False,
+    progress: Optional[Callable[[str, int], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Load a JSONL export in batches
+
+    Rows whose primary key already exists are skipped, or replaced when
+    ``replace`` is set. processed_data is re-encoded with ``codec``, if given.
+
+    Returns:
+        Rows written per table and the namespaces touched
+    """
+    header_line = source.readline()
+    try:
+        header = json.loads(header_line)
+    except ValueError:
+        header = None
+    if not isinstance(header, dict) or header.get("format") != FORMAT_NAME:
+        raise ValueError("Not a memori JSONL export (missing header line)")
+    if header.get("version", 0) > FORMAT_VERSION:
+        raise ValueError(
+            f"Export format v{header['version']} is newer than supported v{FORMAT_VERSION}"
+        )
+
+    imported: Dict[str, int] = {table.name: 0 for table in EXPORT_TABLES}
+    namespaces = set()
+    table = None
+    batch: List[Dict[str, Any]] = []
+
+    def flush():
+        if batch:
+            imported[table.name] += _write_batch(engine, table, batch, replace)
+            if progress is not None:
+                progress(table.name, imported[table.name])
+            batch.clear()
+
+    for line_number, line in enumerate(source, start=2):
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        line_table = _TABLES_BY_NAME.get(entry.get("table"))
+        if line_table is None:
+            logger.warning(
+                f"Skipping line {line_number}: unknown table {entry.get('table')!r}"
+            )
+            continue
+        # Write in file order so parents land before their children
+        if line_table is not table:
+            flush()
+            table = line_table
+        row = _import_row(table, entry["row"], codec)
+        namespaces.add(row.get("namespace", "default"))
+        batch.append(row)
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+
+    return {"rows": imported, "namespaces": sorted(namespaces)}
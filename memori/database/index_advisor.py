@@ -0,0 +1,283 @@
+"""
+Index advisor for the library's hot queries
+
+Runs the backend's EXPLAIN on a catalog of the queries Memori issues on every
+conversation (conscious context, essential conversations, promotion
+candidates, duplicate detection, chat history, statistics, retention) and
+reports the ones that scan a whole table or sort without an index, as well as
+indexes made redundant by another index with the same leading columns.
+"""
+
+import json
+from datetime import datetime
+from typing import Any, Dict, List
+
+from loguru import logger
+from sqlalchemy import Column, Index, MetaData, Table, func, inspect, select
+
+from .models import Base, ChatHistory, LongTermMemory, ShortTermMemory
+
+# Indexes that are a leading prefix of a composite index on the same table;
+# dropped from databases created by older versions
+RETIRED_INDEXES = {
+    "chat_history": ("idx_chat_namespace_session", "idx_chat_namespace_timestamp"),
+    "short_term_memory": ("idx_short_term_namespace",),
+    "long_term_memory": ("idx_long_term_namespace",),
+}
+
+
+def create_missing_indexes(engine) -> List[str]:
+    """
+    Create model indexes missing from existing tables, drop retired ones
+
+    ``create_all`` only creates indexes together with new tables, so databases
+    created by older versions would never receive new indexes.
+
+    Returns:
+        Names of the indexes created
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    created = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            index.create(bind=engine)
+            created.append(index.name)
+            logger.info(f"Created index {index.name} on {table.name}")
+        for name in RETIRED_INDEXES.get(table.name, ()):
+            if name not in existing:
+                continue
+            # Detached table, so the models' metadata is left untouched
+            retired = Table(table.name, MetaData(), Column("namespace"))
+            Index(name, retired.c.namespace).drop(bind=engine)
+            logger.info(f"Dropped redundant index {name} on {table.name}")
+    return created
+
+
+def redundant_indexes(engine) -> List[Dict[str, Any]]:
+    """
+    Find indexes whose columns are a leading prefix of another index's
+
+    Such an index serves no lookup the longer one cannot, but every write
+    maintains it. Unique indexes are kept: they enforce a constraint.
+
+    Returns:
+        One entry per redundant index: table, index, columns, covered_by
+    """
+    inspector = inspect(engine)
+    found = []
+    for table_name in sorted(inspector.get_table_names()):
+        indexes = [
+            (index["name"], list(index["column_names"]), index.get("unique"))
+            for index in inspector.get_indexes(table_name)
+            if None not in index["column_names"]
+        ]
+        for name, columns, unique in indexes:
+            if unique:
+                continue
+            for other, other_columns, _ in indexes:
+                if other == name or other_columns[: len(columns)] != columns:
+                    continue
+                # Of two identical indexes only the later name is reported
+                if len(other_columns) == len(columns) and other > name:
+                    continue
+                found.append(
+                    {
+                        "table": table_name,
+                        "index": name,
+                        "columns": columns,
+                        "covered_by": other,
+                    }
+                )
+                break
+    return found
+
+
+def hot_query_catalog(namespace: str = "default") -> Dict[str, Any]:
+    """Core equivalents of the queries issued on the conversation path"""
+    return {
+        "conscious_context": select(
+            ShortTermMemory.memory_id,
+            ShortTermMemory.summary,
+            ShortTermMemory.importance_score,
+        )
+        .where(ShortTermMemory.namespace == namespace)
+        .order_by(
+            ShortTermMemory.importance_score.desc(), ShortTermMemory.created_at.desc()
+        ),
+        "essential_conversations": select(
+            ShortTermMemory.memory_id,
+            ShortTermMemory.summary,
+            ShortTermMemory.category_primary,
+        )
+        .where(
+            ShortTermMemory.namespace == namespace,
+            ShortTermMemory.category_primary.like("essential_%"),
+        )
+        .order_by(
+            ShortTermMemory.importance_score.desc(), ShortTermMemory.created_at.desc()
+        )
+        .limit(10),
+        "promotion_candidates": select(
+            LongTermMemory.memory_id,
+            LongTermMemory.searchable_content,
+            LongTermMemory.summary,
+        )
+        .where(
+            LongTermMemory.namespace == namespace,
+            LongTermMemory.classification == "conscious-info",
+            LongTermMemory.conscious_processed.is_(False),
+        )
+        .order_by(
+            LongTermMemory.importance_score.desc(), LongTermMemory.created_at.desc()
+        ),
+        "dedup_fingerprints": select(
+            LongTermMemory.memory_id,
+            LongTermMemory.searchable_content,
+            LongTermMemory.summary,
+        )
+        .where(
+            LongTermMemory.namespace == namespace,
+            LongTermMemory.processed_for_duplicates.is_(False),
+        )
+        .order_by(LongTermMemory.created_at.desc())
+        .limit(20),
+        "chat_history_session": select(ChatHistory)
+        .where(ChatHistory.namespace == namespace, ChatHistory.session_id == "session")
+        .order_by(ChatHistory.timestamp.desc())
+        .limit(10),
+        "chat_history_namespace": select(ChatHistory)
+        .where(ChatHistory.namespace == namespace)
+        .order_by(ChatHistory.timestamp.desc())
+        .limit(10),
+        "long_term_stats_by_category": select(
+            LongTermMemory.category_primary, func.count()
+        )
+        .where(LongTermMemory.namespace == namespace)
+        .group_by(LongTermMemory.category_primary),
+        "retention_expired": select(ShortTermMemory.memory_id)
+        .where(
+            ShortTermMemory.expires_at.isnot(None),
+            ShortTermMemory.expires_at <= datetime(2000, 1, 1),
+        )
+        .order_by(ShortTermMemory.expires_at)
+        .limit(500),
+        "retention_eviction": select(LongTermMemory.memory_id)
+        .where(LongTermMemory.namespace == namespace)
+        .order_by(
+            LongTermMemory.importance_score.asc(), LongTermMemory.created_at.asc()
+        )
+        .limit(500),
+    }
+
+
+def explain_query(engine, statement) -> Dict[str, Any]:
+    """
+    EXPLAIN one statement
+
+    Returns:
+        ``plan`` (backend plan lines), ``full_scans`` (tables read in full)
+        and ``sorts`` (sorts not satisfied by an index)
+    """
+    compiled = statement.compile(dialect=engine.dialect)
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+
+    dialect = engine.dialect.name
+    prefix = {
+        "sqlite": "EXPLAIN QUERY PLAN ",
+        "postgresql": "EXPLAIN (FORMAT JSON) ",
+        "mysql": "EXPLAIN ",
+    }[dialect]
+
+    with engine.connect() as conn:
+        result = conn.exec_driver_sql(prefix + str(compiled), params)
+        rows = [tuple(row) for row in result]
+
+    if dialect == "sqlite":
+        return _analyze_sqlite(rows)
+    if dialect == "postgresql":
+        plan = rows[0][0]
+        return _analyze_postgresql(json.loads(plan) if isinstance(plan, str) else plan)
+    return _analyze_mysql(rows, list(result.keys()))
+
+
+def _analyze_sqlite(rows) -> Dict[str, Any]:
+    # (id, parent, notused, detail)
+    plan = [row[-1] for row in rows]
+    full_scans = [
+        detail.split()[1]
+        for detail in plan
+        if detail.startswith("SCAN ") and " USING " not in detail
+    ]
+    sorts = [detail for detail in plan if "TEMP B-TREE" in detail]
+    return {"plan": plan, "full_scans": full_scans, "sorts": sorts}
+
+
+def _analyze_postgresql(document) -> Dict[str, Any]:
+    plan, full_scans, sorts = [], [], []
+
+    def walk(node, depth=0):
+        relation = node.get("Relation Name")
+        label = node["Node Type"] + (f" on {relation}" if relation else "")
+        if node.get("Index Name"):
+            label += f" using {node['Index Name']}"
+        plan.append("  " * depth + label)
+        if node["Node Type"] == "Seq Scan":
+            full_scans.append(relation)
+        if node["Node Type"] in ("Sort", "Incremental Sort"):
+            sorts.append(label)
+        for child in node.get("Plans", []):
+            walk(child, depth + 1)
+
+    walk(document[0]["Plan"])
+    return {"plan": plan, "full_scans": full_scans, "sorts": sorts}
+
+
+def _analyze_mysql(rows, columns) -> Dict[str, Any]:
+    plan, full_scans, sorts = [], [], []
+    for row in rows:
+        info = dict(zip(columns, row))
+        plan.append(
+            f"{info.get('table')}: type={info.get('type')} key={info.get('key')} "
+            f"extra={info.get('Extra')}"
+        )
+        if info.get("type") == "ALL":
+            full_scans.append(info.get("table"))
+        if "filesort" in (info.get("Extra") or ""):
+            sorts.append(info.get("table"))
+    return {"plan": plan, "full_scans": full_scans, "sorts": sorts}
+
+
+def advise_indexes(engine, namespace: str = "default") -> List[Dict[str, Any]]:
+    """
+    EXPLAIN every catalog query and look for redundant indexes
+
+    Returns:
+        One report per query: name, plan, full_scans, sorts; then a
+        ``redundant_indexes`` report whose ``redundant`` entries come from
+        redundant_indexes()
+    """
+    reports = []
+    for name, statement in hot_query_catalog(namespace).items():
+        try:
+            report = explain_query(engine, statement)
+        except Exception as e:
+            report = {"plan": [], "full_scans": [], "sorts": [], "error": str(e)}
+        report["query"] = name
+        reports.append(report)
+
+    report = {"query": "redundant_indexes", "plan": [], "full_scans": [], "sorts": []}
+    try:
+        report["redundant"] = redundant_indexes(engine)
+    except Exception as e:
+        report["redundant"] = []
+        report["error"] = str(e)
+    reports.append(report)
+    return reports
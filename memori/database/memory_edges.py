@@ -0,0 +1,273 @@
+"""
+Normalized relations between long-term memories
+
+``related_memories_json``, ``supersedes_json`` and ``duplicate_of`` stay on
+the memory row, but the relations they declare are also written to
+``memory_edges`` in the transaction that stores the memory:
+
+* ``related`` edges are stored in both directions, so expanding search hits
+  to their neighbourhood only follows outgoing edges. The expansion is a
+  single recursive CTE, supported by SQLite, PostgreSQL and MySQL 8.
+* ``supersedes`` (new -> old) and ``duplicate_of`` (copy -> original) edges
+  hide the old and the copied memory from search through NOT EXISTS probes
+  on the edge indexes, instead of filtering results in Python.
+"""
+
+import json
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import (
+    Integer,
+    and_,
+    bindparam,
+    delete,
+    desc,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+)
+
+from .models import LongTermMemory, MemoryEdge
+from .scoring import ScoringConfig, score_expression
+
+EDGES_TABLE = MemoryEdge.__table__
+
+MAX_ID_LENGTH = EDGES_TABLE.c.target_id.type.length
+
+RELATED = "related"
+SUPERSEDES = "supersedes"
+DUPLICATE_OF = "duplicate_of"
+
+# Deepest neighbourhood expansion; each hop multiplies the rows visited
+MAX_HOPS = 2
+
+# Match score of an expanded memory, divided by its distance in hops
+RELATED_SCORE = 0.3
+
+
+def _memory_ids(value: Any) -> List[str]:
+    """Memory ids of a JSON list column (raw SQL paths return it as text)"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return [value]
+        if isinstance(value, str):
+            return [value]
+    return [str(item) for item in value if item]
+
+
+def edge_rows(memory_rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Edges declared by long_term_memory rows given as column dicts"""
+    now = datetime.now()
+    edges: Dict[tuple, Dict[str, Any]] = {}
+    for row in memory_rows:
+        namespace, memory_id = row["namespace"], row["memory_id"]
+        declared = []
+        for target in _memory_ids(row.get("related_memories_json")):
+            declared.append((memory_id, RELATED, target))
+            declared.append((target, RELATED, memory_id))
+        for target in _memory_ids(row.get("supersedes_json")):
+            declared.append((memory_id, SUPERSEDES, target))
+        if row.get("duplicate_of"):
+            declared.append((memory_id, DUPLICATE_OF, str(row["duplicate_of"])))
+
+        for source, edge_type, target in declared:
+            # Over-long ids (free text from extraction) cannot name a memory
+            if source == target or max(len(source), len(target)) > MAX_ID_LENGTH:
+                continue
+            edges[(namespace, source, edge_type, target)] = {
+                "namespace": namespace,
+                "source_id": source,
+                "edge_type": edge_type,
+                "target_id": target,
+                "created_at": now,
+            }
+    return list(edges.values())
+
+
+@lru_cache(maxsize=None)
+def _insert_ignore(dialect_name: str):
+    """INSERT that skips edges already present"""
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+        return dialect_insert(EDGES_TABLE).on_conflict_do_nothing()
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+        return dialect_insert(EDGES_TABLE).on_conflict_do_nothing()
+    if dialect_name == "mysql":
+        return insert(EDGES_TABLE).prefix_with("IGNORE")
+    return insert(EDGES_TABLE)
+
+
+def insert_edges(conn, edges: List[Dict[str, Any]]) -> int:
+    """Write edges in one executemany through a Connection or Session"""
+    if not edges:
+        return 0
+    dialect = getattr(conn, "dialect", None) or conn.get_bind().dialect
+    conn.execute(_insert_ignore(dialect.name), edges)
+    return len(edges)
+
+
+def delete_edges(conn, memory_rows: Iterable[Dict[str, Any]]) -> int:
+    """Remove edges touching deleted memories (rows with namespace and memory_id)"""
+    by_namespace: Dict[str, List[str]] = {}
+    for row in memory_rows:
+        by_namespace.setdefault(row["namespace"], []).append(row["memory_id"])
+    deleted = 0
+    for namespace, ids in by_namespace.items():
+        result = conn.execute(
+            delete(EDGES_TABLE).where(
+                EDGES_TABLE.c.namespace == namespace,
+                or_(EDGES_TABLE.c.source_id.in_(ids), EDGES_TABLE.c.target_id.in_(ids)),
+            )
+        )
+        deleted += result.rowcount or 0
+    return deleted
+
+
+def derive_edges(
+    conn, namespace: Optional[str] = None, batch_size: int = 500
+) -> List[Dict[str, Any]]:
+    """Edges declared by the JSON relation columns of stored memories"""
+    table = LongTermMemory.__table__
+    query = select(
+        table.c.memory_id,
+        table.c.namespace,
+        table.c.duplicate_of,
+        table.c.supersedes_json,
+        table.c.related_memories_json,
+    ).where(
+        (table.c.duplicate_of.is_not(None))
+        | (table.c.supersedes_json.is_not(None))
+        | (table.c.related_memories_json.is_not(None))
+    )
+    if namespace is not None:
+        query = query.where(table.c.namespace == namespace)
+
+    result = conn.execution_options(yield_per=batch_size).execute(query)
+    return edge_rows(dict(row._mapping) for row in result)
+
+
+def rebuild_memory_edges(
+    engine, namespace: Optional[str] = None, batch_size: int = 500
+) -> int:
+    """
+    Derive edges from the JSON columns of stored memories
+
+    Used when the table is first created, and to repair edges of rows written
+    without the manager. Existing edges are kept.
+
+    Returns:
+        Number of edges derived (including ones that already existed)
+    """
+    # Read fully before writing: SQLite cannot write while a read is open
+    with engine.connect() as conn:
+        edges = derive_edges(conn, namespace, batch_size)
+
+    for start in range(0, len(edges), batch_size):
+        with engine.begin() as conn:
+            insert_edges(conn, edges[start : start + batch_size])
+    return len(edges)
+
+
+def active_memory_clause(memory_id, namespace):
+    """Exclude memories that are superseded or duplicates of another one"""
+    superseding = EDGES_TABLE.alias("superseding")
+    original = EDGES_TABLE.alias("original")
+    # Probes idx_memory_edges_target
+    superseded = (
+        select(literal(1))
+        .where(
+            superseding.c.namespace == namespace,
+            superseding.c.target_id == memory_id,
+            superseding.c.edge_type == SUPERSEDES,
+        )
+        .exists()
+    )
+    # Probes the primary key (namespace, source_id, edge_type, ...)
+    duplicate = (
+        select(literal(1))
+        .where(
+            original.c.namespace == namespace,
+            original.c.source_id == memory_id,
+            original.c.edge_type == DUPLICATE_OF,
+        )
+        .exists()
+    )
+    return and_(~superseded, ~duplicate)
+
+
+@lru_cache(maxsize=None)
+def expansion_statement(result_columns: tuple, dialect: str, scoring: ScoringConfig):
+    """
+    Long-term memories within ``max_hops`` related edges of the seed ids
+
+    One recursive CTE walks the edges; each memory keeps its shortest
+    distance. Seeds, superseded and duplicate memories are excluded, and the
+    rest are ranked by the composite score, with a relevance divided by the
+    distance in hops.
+    """
+    namespace = bindparam("namespace")
+    edges = EDGES_TABLE
+
+    hops = (
+        select(
+            edges.c.target_id.label("memory_id"),
+            literal(1, Integer).label("depth"),
+        )
+        .where(
+            edges.c.namespace == namespace,
+            edges.c.edge_type == RELATED,
+            edges.c.source_id.in_(bindparam("seed_ids", expanding=True)),
+        )
+        .cte("hops", recursive=True)
+    )
+    step = edges.alias("step")
+    hops = hops.union_all(
+        select(step.c.target_id, hops.c.depth + 1)
+        .select_from(
+            hops.join(
+                step,
+                and_(
+                    step.c.namespace == namespace,
+                    step.c.edge_type == RELATED,
+                    step.c.source_id == hops.c.memory_id,
+                ),
+            )
+        )
+        .where(hops.c.depth < bindparam("max_hops"))
+    )
+    nearest = (
+        select(hops.c.memory_id, func.min(hops.c.depth).label("hops"))
+        .group_by(hops.c.memory_id)
+        .subquery("nearest")
+    )
+
+    table = LongTermMemory.__table__
+    relevance = RELATED_SCORE / nearest.c.hops
+    score = score_expression(table.c, dialect, scoring, relevance)
+    return (
+        select(
+            *(table.c[name] for name in result_columns),
+            nearest.c.hops,
+            relevance.label("search_score"),
+            score.label("composite_score"),
+        )
+        .select_from(table.join(nearest, table.c.memory_id == nearest.c.memory_id))
+        .where(
+            table.c.namespace == namespace,
+            table.c.memory_id.not_in(bindparam("exclude_ids", expanding=True)),
+            active_memory_clause(table.c.memory_id, table.c.namespace),
+        )
+        .order_by(desc("composite_score"))
+        .limit(bindparam("limit"))
+    )
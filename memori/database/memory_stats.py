@@ -0,0 +1,322 @@
+"""
+Incrementally maintained memory statistics
+
+The ``memory_stats`` table holds, per namespace, the number of rows and the
+sum of importance scores for chat history and for every short-term and
+long-term memory category. Write paths add deltas inside their own
+transaction, so ``get_memory_stats`` reads a handful of rows instead of
+aggregating whole namespaces. Writers that bypass the manager (raw SQL,
+older versions) cause drift, which ``reconcile_memory_stats`` repairs.
+"""
+
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import delete, func, insert, select, union, update
+
+from .models import ChatHistory, LongTermMemory, MemoryStat, ShortTermMemory
+
+STATS_TABLE = MemoryStat.__table__
+
+# memory_type -> source table
+TRACKED_TABLES = {
+    "chat_history": ChatHistory.__table__,
+    "short_term": ShortTermMemory.__table__,
+    "long_term": LongTermMemory.__table__,
+}
+
+StatKey = Tuple[str, str, str]  # (namespace, memory_type, category)
+
+
+class StatDeltas:
+    """Counter changes collected during one transaction"""
+
+    def __init__(self):
+        self._deltas: Dict[StatKey, List[float]] = defaultdict(lambda: [0, 0.0])
+
+    def __bool__(self):
+        return any(count or importance for count, importance in self._deltas.values())
+
+    @property
+    def namespaces(self) -> List[str]:
+        return sorted({namespace for namespace, _, _ in self._deltas})
+
+    def add(
+        self,
+        namespace: str,
+        memory_type: str,
+        category: Optional[str] = None,
+        count: int = 1,
+        importance: float = 0.0,
+    ):
+        delta = self._deltas[(namespace, memory_type, category or "")]
+        delta[0] += count
+        delta[1] += importance or 0.0
+
+    def add_rows(self, memory_type: str, rows: Iterable[Dict[str, Any]], sign: int = 1):
+        """Count rows given as column dicts (sign=-1 for deleted rows)"""
+        for row in rows:
+            if memory_type == "chat_history":
+                self.add(row["namespace"], memory_type, count=sign)
+            else:
+                self.add(
+                    row["namespace"],
+                    memory_type,
+                    row.get("category_primary"),
+                    count=sign,
+                    importance=sign * (row.get("importance_score") or 0.0),
+                )
+
+    def apply(self, conn):
+        """Write the deltas through a Connection or Session"""
+        now = datetime.now()
+        for (namespace, memory_type, category), (count, importance) in sorted(
+            self._deltas.items()
+        ):
+            if not count and not importance:
+                continue
+            _upsert(
+                conn,
+                {
+                    "namespace": namespace,
+                    "memory_type": memory_type,
+                    "category": category,
+                    "item_count": count,
+                    "importance_sum": importance,
+                    "updated_at": now,
+                },
+            )
+        self._deltas.clear()
+
+
+def _upsert(conn, values: Dict[str, Any]):
+    """Add values to a counter row, creating it if needed, in one statement"""
+    dialect = getattr(conn, "dialect", None) or conn.get_bind().dialect
+    if dialect.name in ("sqlite", "postgresql"):
+        if dialect.name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+        statement = dialect_insert(STATS_TABLE).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=["namespace", "memory_type", "category"],
+            set_={
+                "item_count": STATS_TABLE.c.item_count + statement.excluded.item_count,
+                "importance_sum": STATS_TABLE.c.importance_sum
+                + statement.excluded.importance_sum,
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+    elif dialect.name == "mysql":
+        from sqlalchemy.dialects.mysql import insert as dialect_insert
+
+        statement = dialect_insert(STATS_TABLE).values(**values)
+        statement = statement.on_duplicate_key_update(
+            item_count=STATS_TABLE.c.item_count + statement.inserted.item_count,
+            importance_sum=STATS_TABLE.c.importance_sum
+            + statement.inserted.importance_sum,
+            updated_at=statement.inserted.updated_at,
+        )
+    else:
+        result = conn.execute(
+            update(STATS_TABLE)
+            .where(
+                STATS_TABLE.c.namespace == values["namespace"],
+                STATS_TABLE.c.memory_type == values["memory_type"],
+                STATS_TABLE.c.category == values["category"],
+            )
+            .values(
+                item_count=STATS_TABLE.c.item_count + values["item_count"],
+                importance_sum=STATS_TABLE.c.importance_sum + values["importance_sum"],
+                updated_at=values["updated_at"],
+            )
+        )
+        if result.rowcount:
+            return
+        statement = insert(STATS_TABLE).values(**values)
+    conn.execute(statement)
+
+
+def reset_memory_stats(conn, namespace: str, memory_types: Iterable[str]):
+    """Drop the counters of memory types whose rows were all deleted"""
+    conn.execute(
+        delete(STATS_TABLE).where(
+            STATS_TABLE.c.namespace == namespace,
+            STATS_TABLE.c.memory_type.in_(list(memory_types)),
+        )
+    )
+
+
+def read_memory_stats(conn, namespace: str) -> Dict[str, Any]:
+    """Build the get_memory_stats counts from the counters (one query)"""
+    rows = conn.execute(
+        select(
+            STATS_TABLE.c.memory_type,
+            STATS_TABLE.c.category,
+            STATS_TABLE.c.item_count,
+            STATS_TABLE.c.importance_sum,
+        ).where(STATS_TABLE.c.namespace == namespace)
+    ).all()
+
+    counts = {memory_type: 0 for memory_type in TRACKED_TABLES}
+    categories: Dict[str, int] = {}
+    importance_sum = 0.0
+    for memory_type, category, count, importance in rows:
+        counts[memory_type] = counts.get(memory_type, 0) + count
+        if memory_type != "chat_history":
+            importance_sum += importance
+            if count > 0:
+                categories[category] = categories.get(category, 0) + count
+
+    total_memories = counts["short_term"] + counts["long_term"]
+    return {
+        "chat_history_count": counts["chat_history"],
+        "short_term_count": counts["short_term"],
+        "long_term_count": counts["long_term"],
+        "memories_by_category": categories,
+        "average_importance": (
+            float(importance_sum / total_memories) if total_memories > 0 else 0.0
+        ),
+    }
+
+
+def _aggregate(conn, namespace: str) -> Dict[Tuple[str, str], Tuple[int, float]]:
+    actual: Dict[Tuple[str, str], Tuple[int, float]] = {}
+    for memory_type, table in TRACKED_TABLES.items():
+        if memory_type == "chat_history":
+            count = conn.execute(
+                select(func.count()).where(table.c.namespace == namespace)
+            ).scalar()
+            if count:
+                actual[(memory_type, "")] = (count, 0.0)
+            continue
+        for category, count, importance in conn.execute(
+            select(
+                table.c.category_primary,
+                func.count(),
+                func.coalesce(func.sum(table.c.importance_score), 0.0),
+            )
+            .where(table.c.namespace == namespace)
+            .group_by(table.c.category_primary)
+        ):
+            actual[(memory_type, category or "")] = (count, float(importance))
+    return actual
+
+
+def reconcile_namespace(conn, namespace: str) -> bool:
+    """
+    Recompute one namespace's counters in the caller's transaction
+
+    Returns:
+        True if the stored counters had drifted
+    """
+    actual = _aggregate(conn, namespace)
+    current = {
+        (memory_type, category): (count, importance)
+        for memory_type, category, count, importance in conn.execute(
+            select(
+                STATS_TABLE.c.memory_type,
+                STATS_TABLE.c.category,
+                STATS_TABLE.c.item_count,
+                STATS_TABLE.c.importance_sum,
+            ).where(STATS_TABLE.c.namespace == namespace, STATS_TABLE.c.item_count != 0)
+        )
+    }
+    if _matches(actual, current):
+        return False
+
+    conn.execute(delete(STATS_TABLE).where(STATS_TABLE.c.namespace == namespace))
+    if actual:
+        now = datetime.now()
+        conn.execute(
+            insert(STATS_TABLE),
+            [
+                {
+                    "namespace": namespace,
+                    "memory_type": memory_type,
+                    "category": category,
+                    "item_count": count,
+                    "importance_sum": importance,
+                    "updated_at": now,
+                }
+                for (memory_type, category), (count, importance) in actual.items()
+            ],
+        )
+    return True
+
+
+def list_namespaces(conn) -> List[str]:
+    query = union(
+        *[select(table.c.namespace).distinct() for table in TRACKED_TABLES.values()],
+        select(STATS_TABLE.c.namespace).distinct(),
+    )
+    return sorted(row[0] for row in conn.execute(query))
+
+
+def reconcile_memory_stats(engine, namespace: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Recompute counters from the memory tables and fix any drift
+
+    Each namespace is reconciled in its own short transaction.
+
+    Returns:
+        Namespaces checked and the namespaces whose counters were corrected
+    """
+    with engine.connect() as conn:
+        namespaces = [namespace] if namespace is not None else list_namespaces(conn)
+
+    corrected = []
+    for ns in namespaces:
+        with engine.begin() as conn:
+            if reconcile_namespace(conn, ns):
+                corrected.append(ns)
+
+    if corrected:
+        logger.info(f"Reconciled memory stats drift in {len(corrected)} namespace(s)")
+    return {"namespaces": len(namespaces), "corrected": corrected}
+
+
+def _matches(actual, current) -> bool:
+    if actual.keys() != current.keys():
+        return False
+    return all(
+        actual[key][0] == current[key][0]
+        and abs(actual[key][1] - current[key][1]) < 1e-6 * max(1, actual[key][0])
+        for key in actual
+    )
+
+
+class MemoryStatsReconciler:
+    """Periodic memory_stats drift repair"""
+
+    def __init__(self, engine, interval_seconds: float = 24 * 3600):
+        self.engine = engine
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_report: Optional[Dict[str, Any]] = None
+
+    def start(self):
+        if self._thread is not None or not self.interval_seconds:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="memori-stats-reconcile", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.last_report = reconcile_memory_stats(self.engine)
+            except Exception as e:
+                logger.warning(f"Memory stats reconcile failed: {e}")
@@ -47,9 +47,17 @@ class ChatHistory(Base):
 
     # Indexes
     __table_args__ = (
-        Index("idx_chat_namespace_session", "namespace", "session_id"),
         Index("idx_chat_timestamp", "timestamp"),
         Index("idx_chat_model", "model"),
+        # Latest conversations of a session (get_chat_history)
+        Index(
+            "idx_chat_namespace_session_timestamp",
+            "namespace",
+            "session_id",
+            "timestamp",
+        ),
+        # Latest conversations of a namespace, keyset iteration and export
+        Index("idx_chat_namespace_timestamp_id", "namespace", "timestamp", "chat_id"),
     )
 
 
@@ -80,7 +88,6 @@ class ShortTermMemory(Base):
 
     # Indexes
     __table_args__ = (
-        Index("idx_short_term_namespace", "namespace"),
         Index("idx_short_term_category", "category_primary"),
         Index("idx_short_term_importance", "importance_score"),
         Index("idx_short_term_expires", "expires_at"),
@@ -93,6 +100,20 @@ class ShortTermMemory(Base):
             "category_primary",
             "importance_score",
         ),
+        # Conscious context and retention: namespace ordered by importance, recency
+        Index(
+            "idx_short_term_namespace_importance_created",
+            "namespace",
+            "importance_score",
+            "created_at",
+        ),
+        # Keyset iteration and export of a namespace's memories
+        Index(
+            "idx_short_term_namespace_created_id",
+            "namespace",
+            "created_at",
+            "memory_id",
+        ),
     )
 
 
@@ -147,7 +168,6 @@ class LongTermMemory(Base):
 
     # Indexes
     __table_args__ = (
-        Index("idx_long_term_namespace", "namespace"),
         Index("idx_long_term_category", "category_primary"),
         Index("idx_long_term_importance", "importance_score"),
         Index("idx_long_term_created", "created_at"),
@@ -177,9 +197,120 @@ class LongTermMemory(Base):
             "category_primary",
             "importance_score",
         ),
+        # Promotion candidates: conscious-info rows not yet promoted, in promotion order
+        Index(
+            "idx_long_term_conscious_candidates",
+            "namespace",
+            "classification",
+            "conscious_processed",
+            "importance_score",
+            "created_at",
+        ),
+        # Most recent memories awaiting duplicate detection
+        Index(
+            "idx_long_term_namespace_dedup_created",
+            "namespace",
+            "processed_for_duplicates",
+            "created_at",
+        ),
+        # Retention eviction and importance-ordered listing per namespace
+        Index(
+            "idx_long_term_namespace_importance_created",
+            "namespace",
+            "importance_score",
+            "created_at",
+        ),
+        # Keyset iteration and export of a namespace's memories
+        Index(
+            "idx_long_term_namespace_created_id", "namespace", "created_at", "memory_id"
+        ),
+    )
+
+
+class MemoryEdge(Base):
+    """Relations between long-term memories, normalized from their JSON columns"""
+
+    __tablename__ = "memory_edges"
+
+    # Ids are UUIDs; shorter columns keep the key within MySQL's 3072-byte limit
+    namespace = Column(String(255), primary_key=True)
+    source_id = Column(String(128), primary_key=True)
+    # related, supersedes or duplicate_of
+    edge_type = Column(String(20), primary_key=True)
+    target_id = Column(String(128), primary_key=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    # The primary key serves outgoing edges (expansion, duplicate_of lookups)
+    __table_args__ = (
+        # Incoming edges: is a memory superseded?
+        Index("idx_memory_edges_target", "namespace", "target_id", "edge_type"),
     )
 
 
+class UserProfile(Base):
+    """Materialized conscious context of a namespace, updated on promotion"""
+
+    __tablename__ = "user_context_profiles"
+
+    namespace = Column(String(255), primary_key=True)
+    profile_json = Column(JSON, nullable=False)  # UserContextProfile
+    rendered_context = Column(Text, nullable=False, default="")
+    fact_count = Column(Integer, nullable=False, default=0)
+    version = Column(Integer, nullable=False, default=1)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class MemoryChangeLog(Base):
+    """Change-sequence table used for cross-process notifications on SQLite/MySQL"""
+
+    __tablename__ = "memory_change_log"
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    event_type = Column(String(50), nullable=False)
+    namespace = Column(String(255), nullable=False, default="default")
+    memory_id = Column(String(255), nullable=False)
+    origin = Column(String(64))
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (Index("idx_change_log_created", "created_at"),)
+
+
+class NamespaceShard(Base):
+    """Namespace-to-shard overrides, kept on the first (catalog) shard"""
+
+    __tablename__ = "namespace_shards"
+
+    namespace = Column(String(255), primary_key=True)
+    shard = Column(String(255), nullable=False)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class MemoryStat(Base):
+    """Per-namespace memory counters maintained by the write paths"""
+
+    __tablename__ = "memory_stats"
+
+    namespace = Column(String(255), primary_key=True)
+    # chat_history, short_term or long_term
+    memory_type = Column(String(50), primary_key=True)
+    category = Column(String(255), primary_key=True, default="")
+    item_count = Column(Integer, nullable=False, default=0)
+    importance_sum = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class SchemaState(Base):
+    """Version and fingerprint of the schema last applied to this database"""
+
+    __tablename__ = "memori_schema"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False)
+    fingerprint = Column(String(64), nullable=False)
+    library_version = Column(String(50))
+    applied_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
 # Database-specific configurations
 def configure_mysql_fulltext(engine):
     """Configure MySQL FULLTEXT indexes"""
@@ -0,0 +1,217 @@
+"""
+Cross-process change notifiers
+
+Relay memory write events between processes that share a database so that a
+conscious agent running elsewhere can promote new memories without rescanning
+long_term_memory:
+
+    - PostgreSQL: LISTEN/NOTIFY on a dedicated channel
+    - SQLite/MySQL: a monotonically increasing change-sequence table
+      (memory_change_log) polled with an index seek on its primary key
+"""
+
+import json
+import select as select_module
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy import delete, func, insert, select, text
+
+from ..utils.events import MemoryEventBus
+from .models import MemoryChangeLog
+
+
+class ChangeNotifier(ABC):
+    """Base class for cross-process change notifiers"""
+
+    def __init__(self, engine, event_bus: MemoryEventBus):
+        self.engine = engine
+        self.event_bus = event_bus
+        # Identifies this process so our own notifications are not replayed
+        self.origin = uuid.uuid4().hex
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @abstractmethod
+    def notify(self, topic: str, namespace: str, memory_id: str):
+        """Announce a committed write to other processes"""
+        pass
+
+    @abstractmethod
+    def _listen(self):
+        """Relay remote notifications until stopped (run on the listener thread)"""
+        pass
+
+    def start(self):
+        """Start relaying remote notifications into the local event bus"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"memori-{type(self).__name__}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the listener thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except Exception as e:
+                logger.warning(f"Change notifier listener error, reconnecting: {e}")
+                self._stop.wait(5)
+
+    def _relay(self, topic: str, namespace: str, memory_id: str, origin: str):
+        if origin == self.origin:
+            return
+        self.event_bus.publish(topic, namespace, memory_id, remote=True)
+
+
+class PostgresChangeNotifier(ChangeNotifier):
+    """Notifier based on PostgreSQL LISTEN/NOTIFY (psycopg2 driver)"""
+
+    CHANNEL = "memori_memory_events"
+
+    def __init__(self, engine, event_bus: MemoryEventBus, poll_timeout: float = 5.0):
+        super().__init__(engine, event_bus)
+        self.poll_timeout = poll_timeout
+
+    def notify(self, topic: str, namespace: str, memory_id: str):
+        payload = json.dumps(
+            {
+                "topic": topic,
+                "namespace": namespace,
+                "memory_id": memory_id,
+                "origin": self.origin,
+            }
+        )
+        with self.engine.connect() as conn:
+            conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self.CHANNEL, "payload": payload},
+            )
+            conn.commit()
+
+    def _listen(self):
+        raw = self.engine.raw_connection()
+        # The connection is left in autocommit with an active LISTEN, so it
+        # must never go back to the pool: closing it closes the DBAPI connection
+        raw.detach()
+        try:
+            dbapi_conn = raw.driver_connection
+            dbapi_conn.autocommit = True
+            cursor = dbapi_conn.cursor()
+            cursor.execute(f"LISTEN {self.CHANNEL}")
+            logger.debug(f"Listening for memory events on {self.CHANNEL}")
+
+            while not self._stop.is_set():
+                ready, _, _ = select_module.select(
+                    [dbapi_conn], [], [], self.poll_timeout
+                )
+                if not ready:
+                    continue
+                dbapi_conn.poll()
+                while dbapi_conn.notifies:
+                    notification = dbapi_conn.notifies.pop(0)
+                    try:
+                        data = json.loads(notification.payload)
+                        self._relay(
+                            data["topic"],
+                            data["namespace"],
+                            data["memory_id"],
+                            data.get("origin"),
+                        )
+                    except (ValueError, KeyError) as e:
+                        logger.warning(f"Ignoring malformed memory event: {e}")
+        finally:
+            raw.close()
+
+
+class ChangeLogNotifier(ChangeNotifier):
+    """Notifier based on a polled change-sequence table (SQLite/MySQL)"""
+
+    def __init__(
+        self,
+        engine,
+        event_bus: MemoryEventBus,
+        poll_interval: float = 1.0,
+        retention_seconds: int = 3600,
+        batch_size: int = 500,
+    ):
+        super().__init__(engine, event_bus)
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self.batch_size = batch_size
+        self._last_seq: Optional[int] = None
+        self._polls = 0
+
+    def notify(self, topic: str, namespace: str, memory_id: str):
+        with self.engine.connect() as conn:
+            conn.execute(
+                insert(MemoryChangeLog).values(
+                    event_type=topic,
+                    namespace=namespace,
+                    memory_id=memory_id,
+                    origin=self.origin,
+                    created_at=datetime.utcnow(),
+                )
+            )
+            conn.commit()
+
+    def _listen(self):
+        if self._last_seq is None:
+            # Only relay changes made after we started listening
+            with self.engine.connect() as conn:
+                self._last_seq = conn.execute(
+                    select(func.coalesce(func.max(MemoryChangeLog.seq), 0))
+                ).scalar()
+
+        while not self._stop.is_set():
+            self._poll_once()
+            self._stop.wait(self.poll_interval)
+
+    def _poll_once(self):
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(
+                    MemoryChangeLog.seq,
+                    MemoryChangeLog.event_type,
+                    MemoryChangeLog.namespace,
+                    MemoryChangeLog.memory_id,
+                    MemoryChangeLog.origin,
+                )
+                .where(MemoryChangeLog.seq > self._last_seq)
+                .order_by(MemoryChangeLog.seq)
+                .limit(self.batch_size)
+            ).fetchall()
+
+            for seq, topic, namespace, memory_id, origin in rows:
+                self._last_seq = seq
+                self._relay(topic, namespace, memory_id, origin)
+
+            self._polls += 1
+            if self._polls % 100 == 0:
+                cutoff = datetime.utcnow() - timedelta(seconds=self.retention_seconds)
+                conn.execute(
+                    delete(MemoryChangeLog).where(MemoryChangeLog.created_at < cutoff)
+                )
+                conn.commit()
+
+
+def create_change_notifier(
+    engine, event_bus: MemoryEventBus, poll_interval: float = 1.0
+) -> ChangeNotifier:
+    """Create the notifier best suited to the engine's database"""
+    if engine.dialect.name == "postgresql":
+        return PostgresChangeNotifier(engine, event_bus)
+    return ChangeLogNotifier(engine, event_bus, poll_interval=poll_interval)
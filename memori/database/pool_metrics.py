@@ -0,0 +1,114 @@
+"""
+Connection pool instrumentation
+
+``InstrumentedQueuePool`` is a drop-in ``QueuePool`` (and
+``InstrumentedAsyncAdaptedQueuePool`` its asyncio counterpart) that records how long
+each checkout waited, so pool sizes can be chosen per worker from data rather
+than guessed.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Dict
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Thread-safe checkout counters and wait-time statistics"""
+
+    def __init__(self, sample_size: int = 1000):
+        self._lock = threading.Lock()
+        self._recent_waits = deque(maxlen=sample_size)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_checkout(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self._recent_waits.append(wait)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            recent = sorted(self._recent_waits)
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_time_total_ms": round(self.total_wait * 1000, 3),
+                "wait_time_avg_ms": round(
+                    (self.total_wait / attempts) * 1000 if attempts else 0.0, 3
+                ),
+                "wait_time_max_ms": round(self.max_wait * 1000, 3),
+                "wait_time_p95_ms": round(
+                    (
+                        recent[int(len(recent) * 0.95) - 1] * 1000
+                        if len(recent) >= 20
+                        else (recent[-1] * 1000 if recent else 0.0)
+                    ),
+                    3,
+                ),
+            }
+
+
+class _CheckoutTimingMixin:
+    """Records checkout wait time of a QueuePool subclass"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_checkout(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    """QueuePool that measures checkout wait time"""
+
+
+class InstrumentedAsyncAdaptedQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool (asyncio engines) that measures checkout wait time"""
+
+
+def get_pool_metrics(engine) -> Dict[str, Any]:
+    """
+    Describe an engine's pool: occupancy plus wait statistics when the pool
+    is an ``InstrumentedQueuePool``
+    """
+    pool = engine.pool
+    info: Dict[str, Any] = {"pool_class": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        info.update(
+            {
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                # overflow() is negative while the pool is still filling up
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                "pool_timeout": pool.timeout(),
+            }
+        )
+
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        info.update(metrics.snapshot())
+
+    return info
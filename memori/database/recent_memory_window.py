@@ -0,0 +1,115 @@
+"""
+In-process window of recent memory fingerprints used for deduplication
+
+Duplicate detection only compares the word sets of a memory's content and
+summary against the most recent memories in the namespace. Keeping those word
+sets in a small per-namespace ring buffer avoids a database round trip and
+pydantic model construction for every ingested conversation.
+
+The window is seeded once per namespace from the database and then updated on
+every store made through this process. Writes made by other processes are not
+observed until the namespace is reset.
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class MemoryFingerprint:
+    """Precomputed comparison data for one stored memory"""
+
+    memory_id: str
+    content_tokens: FrozenSet[str]
+    summary_tokens: FrozenSet[str]
+    # Shown to the memory agent as context for the new conversation
+    summary: str = ""
+
+    @classmethod
+    def from_text(
+        cls, memory_id: str, content: Optional[str], summary: Optional[str]
+    ) -> "MemoryFingerprint":
+        return cls(
+            memory_id=memory_id,
+            content_tokens=tokenize(content),
+            summary_tokens=tokenize(summary),
+            summary=summary or "",
+        )
+
+
+def tokenize(value: Optional[str]) -> FrozenSet[str]:
+    """Word set used for similarity comparison"""
+    return frozenset((value or "").lower().split())
+
+
+def jaccard_similarity(tokens1: FrozenSet[str], tokens2: FrozenSet[str]) -> float:
+    """Word-overlap similarity of two token sets"""
+    if not tokens1 or not tokens2:
+        return 0.0
+    return len(tokens1 & tokens2) / len(tokens1 | tokens2)
+
+
+class RecentMemoryWindow:
+    """Per-namespace ring buffer of the most recent memory fingerprints"""
+
+    def __init__(self, size: int = 20):
+        self.size = size
+        self._lock = threading.Lock()
+        self._windows: Dict[str, Deque[MemoryFingerprint]] = {}
+        self._seeded = set()
+
+    def is_seeded(self, namespace: str) -> bool:
+        with self._lock:
+            return namespace in self._seeded
+
+    def seed(self, namespace: str, rows: Iterable[Tuple[str, str, str]]):
+        """
+        Seed a namespace from the database
+
+        Args:
+            namespace: Memory namespace
+            rows: (memory_id, content, summary) tuples, newest first
+        """
+        fingerprints = [MemoryFingerprint.from_text(*row) for row in rows]
+
+        with self._lock:
+            if namespace in self._seeded:
+                return
+            # Stores recorded while seeding are newer than anything loaded
+            recorded = list(self._windows.get(namespace, ()))
+            known = {fp.memory_id for fp in recorded}
+            merged = recorded + [fp for fp in fingerprints if fp.memory_id not in known]
+            self._windows[namespace] = deque(merged[: self.size], maxlen=self.size)
+            self._seeded.add(namespace)
+
+    def record(
+        self,
+        namespace: str,
+        memory_id: str,
+        content: Optional[str],
+        summary: Optional[str],
+    ):
+        """Add a freshly stored memory to the front of the window"""
+        fingerprint = MemoryFingerprint.from_text(memory_id, content, summary)
+        with self._lock:
+            window = self._windows.get(namespace)
+            if window is None:
+                window = self._windows[namespace] = deque(maxlen=self.size)
+            window.appendleft(fingerprint)
+
+    def snapshot(self, namespace: str) -> List[MemoryFingerprint]:
+        """Recent fingerprints for a namespace, newest first"""
+        with self._lock:
+            return list(self._windows.get(namespace, ()))
+
+    def reset(self, namespace: Optional[str] = None):
+        """Forget a namespace (or everything) so it is re-seeded on next use"""
+        with self._lock:
+            if namespace is None:
+                self._windows.clear()
+                self._seeded.clear()
+            else:
+                self._windows.pop(namespace, None)
+                self._seeded.discard(namespace)
@@ -0,0 +1,106 @@
+"""
+Read-replica routing for the SQLAlchemy engine
+
+Read-only operations (search, chat history, statistics, conscious context) are
+sent to replica engines while writes stay on the primary. A namespace that
+wrote recently keeps reading from the primary for ``read_your_writes_seconds``
+so replication lag never hides a caller's own writes.
+"""
+
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+ROUND_ROBIN = "round_robin"
+LEAST_CONNECTIONS = "least_connections"
+REPLICA_STRATEGIES = (ROUND_ROBIN, LEAST_CONNECTIONS)
+
+
+class ReplicaRouter:
+    """Chooses the engine for each read and tracks recent writes per namespace"""
+
+    def __init__(
+        self,
+        primary,
+        replicas: List[Any],
+        strategy: str = ROUND_ROBIN,
+        read_your_writes_seconds: float = 5.0,
+    ):
+        if strategy not in REPLICA_STRATEGIES:
+            raise ValueError(
+                f"Unknown replica strategy '{strategy}', "
+                f"expected one of {', '.join(REPLICA_STRATEGIES)}"
+            )
+
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.strategy = strategy
+        self.read_your_writes_seconds = read_your_writes_seconds
+
+        self._lock = threading.Lock()
+        self._round_robin = itertools.cycle(range(len(self.replicas) or 1))
+        self._last_write: Dict[str, float] = {}
+        self._reads = {"replica": 0, "sticky": 0}
+
+    def record_write(self, namespace: Optional[str] = None):
+        """Pin reads of a namespace to the primary for the lag window"""
+        if not self.replicas or self.read_your_writes_seconds <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._last_write[namespace or "default"] = now
+            # Keep the map bounded by dropping expired entries
+            if len(self._last_write) > 1024:
+                cutoff = now - self.read_your_writes_seconds
+                self._last_write = {
+                    ns: ts for ns, ts in self._last_write.items() if ts >= cutoff
+                }
+
+    def read_engine(self, namespace: Optional[str] = None):
+        """Engine to use for a read-only operation on a namespace"""
+        if not self.replicas:
+            return self.primary
+
+        with self._lock:
+            last_write = self._last_write.get(namespace or "default")
+            if (
+                last_write is not None
+                and time.monotonic() - last_write < self.read_your_writes_seconds
+            ):
+                self._reads["sticky"] += 1
+                return self.primary
+
+            if self.strategy == LEAST_CONNECTIONS:
+                engine = min(self.replicas, key=self._checked_out)
+            else:
+                engine = self.replicas[next(self._round_robin)]
+            self._reads["replica"] += 1
+            return engine
+
+    @staticmethod
+    def _checked_out(engine) -> int:
+        try:
+            return engine.pool.checkedout()
+        except AttributeError:
+            return 0
+
+    def dispose(self):
+        """Close replica connections"""
+        for engine in self.replicas:
+            try:
+                engine.dispose()
+            except Exception as e:
+                logger.warning(f"Failed to dispose replica engine: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "strategy": self.strategy,
+                "replicas": len(self.replicas),
+                "read_your_writes_seconds": self.read_your_writes_seconds,
+                "replica_reads": self._reads["replica"],
+                "sticky_primary_reads": self._reads["sticky"],
+            }
@@ -0,0 +1,241 @@
+"""
+Retention engine for memory tables
+
+Deletes expired short-term memories and evicts the least valuable memories of
+namespaces above their capacity, in bounded batches so a sweep never holds
+long locks. Runs periodically on a background thread or on demand. With a
+sharded manager every shard is swept, each batch on its own shard's engine.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy import and_, delete, func, or_, select
+
+from .memory_stats import StatDeltas
+from .models import LongTermMemory, ShortTermMemory
+
+
+@dataclass
+class RetentionConfig:
+    """Capacity limits and schedule for the retention engine"""
+
+    max_short_term_memories: Optional[int] = 1000  # per namespace, None = unbounded
+    max_long_term_memories: Optional[int] = 10000  # per namespace, None = unbounded
+    batch_size: int = 500  # rows deleted per transaction
+    interval_seconds: float = 24 * 3600
+
+
+class RetentionEngine:
+    """Expiry sweeps and per-namespace capacity enforcement"""
+
+    def __init__(self, db_manager, config: Optional[RetentionConfig] = None):
+        self.db_manager = db_manager
+        self.config = config or RetentionConfig()
+        self._run_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._totals = {
+            "runs": 0,
+            "expired_short_term": 0,
+            "evicted_short_term": 0,
+            "evicted_long_term": 0,
+        }
+        self.last_report: Optional[Dict[str, Any]] = None
+
+    @property
+    def managers(self) -> List[Any]:
+        """Managers of the databases swept: every shard of a sharded manager"""
+        shards = getattr(self.db_manager, "shards", None)
+        if shards:
+            return list(shards.values())
+        return [self.db_manager]
+
+    def start(self):
+        if self._thread is not None or not self.config.interval_seconds:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="memori-retention", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.config.interval_seconds):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.warning(f"Memory retention sweep failed: {e}")
+
+    def run_once(self) -> Dict[str, Any]:
+        """
+        Run one retention pass
+
+        Returns:
+            Rows reclaimed per category and the duration of the pass
+        """
+        with self._run_lock:
+            start = time.perf_counter()
+            # Buffered rows must be visible to the counts
+            self.db_manager.flush_writes()
+
+            report = {
+                "expired_short_term": self.sweep_expired(),
+                "evicted_short_term": self._enforce_capacity(
+                    ShortTermMemory.__table__, self.config.max_short_term_memories
+                ),
+                "evicted_long_term": self._enforce_capacity(
+                    LongTermMemory.__table__, self.config.max_long_term_memories
+                ),
+            }
+            report["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+            self._totals["runs"] += 1
+            for key in (
+                "expired_short_term",
+                "evicted_short_term",
+                "evicted_long_term",
+            ):
+                self._totals[key] += report[key]
+            self.last_report = report
+
+        reclaimed = (
+            report["expired_short_term"]
+            + report["evicted_short_term"]
+            + report["evicted_long_term"]
+        )
+        if reclaimed:
+            logger.info(f"Memory retention reclaimed {reclaimed} rows: {report}")
+        return report
+
+    def sweep_expired(self) -> int:
+        """Delete short-term memories past their expires_at"""
+        table = ShortTermMemory.__table__
+        condition = and_(
+            table.c.expires_at.isnot(None),
+            table.c.expires_at <= datetime.now(),
+            self._not_permanent(table),
+        )
+        return sum(
+            self._delete_in_batches(manager, table, condition, [table.c.expires_at])
+            for manager in self.managers
+        )
+
+    def _enforce_capacity(self, table, capacity: Optional[int]) -> int:
+        """Evict the lowest-value rows of every namespace above capacity"""
+        if not capacity:
+            return 0
+        return sum(
+            self._enforce_shard_capacity(manager, table, capacity)
+            for manager in self.managers
+        )
+
+    def _enforce_shard_capacity(self, manager, table, capacity: int) -> int:
+        """Capacity enforcement on one database"""
+        evictable = (
+            self._not_permanent(table) if table is ShortTermMemory.__table__ else None
+        )
+        count_query = select(table.c.namespace, func.count()).group_by(
+            table.c.namespace
+        )
+        if evictable is not None:
+            count_query = count_query.where(evictable)
+        count_query = count_query.having(func.count() > capacity)
+
+        with manager.engine.connect() as conn:
+            over_capacity = conn.execute(count_query).all()
+
+        # Least important first, then least used, then oldest
+        eviction_order = [
+            table.c.importance_score.asc(),
+            func.coalesce(table.c.access_count, 0).asc(),
+            func.coalesce(table.c.last_accessed, table.c.created_at).asc(),
+            table.c.created_at.asc(),
+        ]
+
+        evicted = 0
+        for namespace, count in over_capacity:
+            condition = table.c.namespace == namespace
+            if evictable is not None:
+                condition = and_(condition, evictable)
+            evicted += self._delete_in_batches(
+                manager, table, condition, eviction_order, limit=count - capacity
+            )
+            if table is LongTermMemory.__table__:
+                manager.recent_memories.reset(namespace)
+        return evicted
+
+    @staticmethod
+    def _not_permanent(table):
+        # Conscious context promoted into short-term memory never expires
+        return or_(
+            table.c.is_permanent_context.is_(False),
+            table.c.is_permanent_context.is_(None),
+        )
+
+    def _delete_in_batches(
+        self,
+        manager,
+        table,
+        condition,
+        order_by: List[Any],
+        limit: Optional[int] = None,
+    ) -> int:
+        pk = table.c.memory_id
+        deleted = 0
+        while limit is None or deleted < limit:
+            batch = self.config.batch_size
+            if limit is not None:
+                batch = min(batch, limit - deleted)
+
+            with manager.engine.begin() as conn:
+                rows = [
+                    dict(row._mapping)
+                    for row in conn.execute(
+                        select(
+                            pk,
+                            table.c.namespace,
+                            table.c.category_primary,
+                            table.c.importance_score,
+                        )
+                        .where(condition)
+                        .order_by(*order_by)
+                        .limit(batch)
+                    )
+                ]
+                if not rows:
+                    break
+                ids = [row["memory_id"] for row in rows]
+                # Search index entries are removed by the delete triggers
+                conn.execute(delete(table).where(pk.in_(ids)))
+
+                deltas = StatDeltas()
+                deltas.add_rows(
+                    "short_term" if table is ShortTermMemory.__table__ else "long_term",
+                    rows,
+                    sign=-1,
+                )
+                # Counters and edges live on the shard the rows were deleted from
+                manager._apply_stat_deltas(conn, deltas)
+                if table is LongTermMemory.__table__:
+                    manager._delete_memory_edges(conn, rows)
+            deleted += len(ids)
+        return deleted
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._totals,
+            "max_short_term_memories": self.config.max_short_term_memories,
+            "max_long_term_memories": self.config.max_long_term_memories,
+            "interval_seconds": self.config.interval_seconds,
+            "last_report": self.last_report,
+        }
@@ -0,0 +1,125 @@
+"""
+Schema version tracking
+
+``memori_schema`` records the version and fingerprint of the schema last
+applied to a database. Startup reads that single row and skips all DDL
+(table reflection, index checks, full-text setup) when it matches the
+running library. Upgrades apply the DDL once, through ``memori migrate`` or
+the first process that finds the schema stale.
+"""
+
+import hashlib
+import weakref
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from loguru import logger
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from .models import Base, SchemaState
+
+# Bump when DDL outside the models changes (full-text tables, triggers, ...)
+SCHEMA_VERSION = 1
+
+SCHEMA_STATE_NAME = "memori"
+SCHEMA_TABLE = SchemaState.__table__
+
+_fingerprints: Dict[str, str] = {}
+
+# Engines already verified in this process; managers sharing an engine skip
+# even the one-row read
+_current_engines: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def schema_fingerprint(dialect) -> str:
+    """Hash of every table, column and index the models define for a dialect"""
+    cached = _fingerprints.get(dialect.name)
+    if cached is not None:
+        return cached
+
+    parts = [f"version={SCHEMA_VERSION}"]
+    for table in Base.metadata.sorted_tables:
+        parts.append(f"table {table.name}")
+        for column in table.columns:
+            parts.append(
+                f"  {column.name} {column.type.compile(dialect=dialect)} "
+                f"nullable={column.nullable} pk={column.primary_key}"
+            )
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            columns = ",".join(column.name for column in index.columns)
+            parts.append(f"  index {index.name} ({columns}) unique={index.unique}")
+
+    fingerprint = hashlib.sha256("\n".join(parts).encode()).hexdigest()
+    _fingerprints[dialect.name] = fingerprint
+    return fingerprint
+
+
+def load_schema_state(conn) -> Optional[Dict[str, Any]]:
+    """Read the recorded schema state through an open connection"""
+    try:
+        row = conn.execute(
+            select(
+                SCHEMA_TABLE.c.version,
+                SCHEMA_TABLE.c.fingerprint,
+                SCHEMA_TABLE.c.library_version,
+                SCHEMA_TABLE.c.applied_at,
+            ).where(SCHEMA_TABLE.c.name == SCHEMA_STATE_NAME)
+        ).first()
+    except SQLAlchemyError:
+        # memori_schema does not exist yet
+        return None
+    return dict(row._mapping) if row is not None else None
+
+
+def state_is_current(state: Optional[Dict[str, Any]], dialect) -> bool:
+    return state is not None and state["fingerprint"] == schema_fingerprint(dialect)
+
+
+def store_schema_state(conn) -> str:
+    """Record the current schema in the caller's transaction; returns its fingerprint"""
+    from .. import __version__
+
+    fingerprint = schema_fingerprint(conn.dialect)
+    conn.execute(delete(SCHEMA_TABLE).where(SCHEMA_TABLE.c.name == SCHEMA_STATE_NAME))
+    conn.execute(
+        insert(SCHEMA_TABLE).values(
+            name=SCHEMA_STATE_NAME,
+            version=SCHEMA_VERSION,
+            fingerprint=fingerprint,
+            library_version=__version__,
+            applied_at=datetime.now(),
+        )
+    )
+    logger.debug(f"Recorded schema version {SCHEMA_VERSION} ({fingerprint[:12]})")
+    return fingerprint
+
+
+def read_schema_state(engine) -> Optional[Dict[str, Any]]:
+    """
+    Read the recorded schema state
+
+    Returns:
+        version, fingerprint, library_version and applied_at, or None when
+        the database predates schema tracking or has no schema yet
+    """
+    with engine.connect() as conn:
+        return load_schema_state(conn)
+
+
+def schema_is_current(engine) -> bool:
+    """Check, with one read, whether the database schema matches this library"""
+    if engine in _current_engines:
+        return True
+    current = state_is_current(read_schema_state(engine), engine.dialect)
+    if current:
+        _current_engines.add(engine)
+    return current
+
+
+def record_schema_state(engine) -> str:
+    """Record that the current schema has been applied; returns its fingerprint"""
+    with engine.begin() as conn:
+        fingerprint = store_schema_state(conn)
+    _current_engines.add(engine)
+    return fingerprint
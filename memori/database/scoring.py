@@ -0,0 +1,159 @@
+"""
+Memory ranking score computed in SQL
+
+Every search strategy orders its rows by the same composite score:
+
+    relevance_weight  * text match score of the strategy
+  + importance_weight * importance_score
+  + recency_weight    * 0.5 ** (age_days / recency_half_life_days)
+  + access_weight     * hits / (hits + access_saturation)
+
+where ``hits = access_count * 0.5 ** (idle_days / access_half_life_days)``.
+
+The expression is built with each backend's date arithmetic (julianday,
+EXTRACT(EPOCH ...), TIMESTAMPDIFF) and used in ORDER BY. Only the top-k rows
+reach Python, and created_at is never parsed row by row. "Now" is bound as
+a parameter, so every backend measures age from the same instant.
+"""
+
+import math
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Optional, Union
+
+from loguru import logger
+from sqlalchemy import (
+    DateTime,
+    Float,
+    bindparam,
+    case,
+    event,
+    extract,
+    func,
+    literal,
+    literal_column,
+)
+from sqlalchemy.sql.elements import ColumnElement
+
+
+@dataclass(frozen=True)
+class ScoringConfig:
+    """Weights and decay rates of the memory ranking score"""
+
+    relevance_weight: float = 0.45  # Text match score of the search strategy
+    importance_weight: float = 0.27
+    recency_weight: float = 0.18
+    access_weight: float = 0.1  # Popularity from access_count (see access_recorder)
+    recency_half_life_days: float = 7.0
+    access_half_life_days: float = 14.0
+    access_saturation: float = 5.0  # Decayed hits that give half the access score
+
+    def __post_init__(self):
+        for name in ("recency_half_life_days", "access_half_life_days"):
+            if getattr(self, name) <= 0:
+                raise ValueError(f"{name} must be positive")
+        if self.access_saturation <= 0:
+            raise ValueError("access_saturation must be positive")
+
+    @classmethod
+    def from_config(
+        cls, config: Union["ScoringConfig", Dict[str, Any], None]
+    ) -> "ScoringConfig":
+        """Build a config from None (defaults), a ScoringConfig or a dict of overrides"""
+        if config is None:
+            return cls()
+        if isinstance(config, cls):
+            return config
+        known = {f.name for f in fields(cls)}
+        unknown = set(config) - known
+        if unknown:
+            raise ValueError(f"Unknown scoring options: {sorted(unknown)}")
+        return cls(**config)
+
+
+def age_in_days(column, dialect: str) -> Optional[ColumnElement]:
+    """Days between a timestamp column and the bound ``now`` (never negative)"""
+    now = bindparam("now", type_=DateTime)
+    if dialect == "sqlite":
+        days = func.julianday(now) - func.julianday(column)
+    elif dialect == "postgresql":
+        days = extract("epoch", now - column) / 86400.0
+    elif dialect == "mysql":
+        days = func.timestampdiff(literal_column("SECOND"), column, now) / 86400.0
+    else:
+        return None
+    if dialect == "sqlite":
+        return func.max(days, 0.0)  # Scalar max() with two arguments
+    return func.greatest(days, 0.0)
+
+
+def half_life_decay(column, dialect: str, half_life_days: float) -> ColumnElement:
+    """0.5 ** (age / half-life) of a timestamp column; 0 when it is NULL"""
+    age = age_in_days(column, dialect)
+    if age is None:
+        return literal(0.0, Float)
+    return func.coalesce(func.power(0.5, age / half_life_days), 0.0)
+
+
+def score_expression(
+    columns, dialect: str, config: ScoringConfig, relevance
+) -> ColumnElement:
+    """
+    Composite score of a row
+
+    Args:
+        columns: Column collection with importance_score, created_at,
+            access_count and last_accessed (a table's ``.c`` or a subquery's)
+        dialect: Backend name, for date arithmetic
+        config: Weights and half-lives
+        relevance: SQL expression or constant for the strategy's match score
+    """
+    if not isinstance(relevance, ColumnElement):
+        relevance = literal(float(relevance), Float)
+
+    score = (
+        relevance * config.relevance_weight
+        + func.coalesce(columns.importance_score, 0.5) * config.importance_weight
+        + half_life_decay(columns.created_at, dialect, config.recency_half_life_days)
+        * config.recency_weight
+    )
+    if config.access_weight:
+        hits = columns.access_count * half_life_decay(
+            columns.last_accessed, dialect, config.access_half_life_days
+        )
+        # Skips the date arithmetic for the (usual) never-accessed rows
+        access = case(
+            (columns.access_count > 0, hits / (hits + config.access_saturation)),
+            else_=0.0,
+        )
+        score = score + access * config.access_weight
+    return score
+
+
+def _power(base, exponent):
+    try:
+        return math.pow(base, exponent)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def install_sqlite_functions(engine):
+    """
+    Provide power() on SQLite builds compiled without the math functions
+
+    Must be called before the engine opens its first connection.
+    """
+
+    @event.listens_for(engine, "connect")
+    def _ensure_power(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT power(2, 1)")
+            return
+        except Exception:
+            pass
+        finally:
+            cursor.close()
+        try:
+            dbapi_connection.create_function("power", 2, _power, deterministic=True)
+        except Exception as e:
+            logger.warning(f"Could not register SQLite power(): {e}")
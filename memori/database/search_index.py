@@ -0,0 +1,350 @@
+"""
+Full-text search index consistency and maintenance
+
+SQLite keeps ``memory_search_fts`` in sync with the memory tables through
+insert, update and delete triggers. Deletes locate the FTS row through the
+index (a ``MATCH`` on the memory id) instead of scanning the whole table.
+MySQL FULLTEXT and PostgreSQL tsvector indexes live on the memory tables
+themselves, so they only need periodic optimization.
+"""
+
+import threading
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+from loguru import logger
+from sqlalchemy import bindparam, select, text
+
+from .models import LongTermMemory, ShortTermMemory
+
+SQLITE_FTS_TABLE = "memory_search_fts"
+
+# (table, memory_type stored in the FTS row)
+INDEXED_TABLES = (
+    (ShortTermMemory.__table__, "short_term"),
+    (LongTermMemory.__table__, "long_term"),
+)
+
+SQLITE_FTS_COLUMNS = (
+    "memory_id, memory_type, namespace, searchable_content, summary, category_primary"
+)
+
+# Rowids of one memory's FTS entries, found through the memory_id column index
+_SQLITE_FTS_ROWIDS = (
+    "SELECT rowid FROM memory_search_fts "
+    "WHERE memory_search_fts MATCH 'memory_id : \"' || replace({ref}.memory_id, '\"', '\"\"') || '\"' "
+    "AND memory_id = {ref}.memory_id AND memory_type = '{memory_type}'"
+)
+
+# Words an InnoDB FULLTEXT optimization processes per OPTIMIZE TABLE
+MYSQL_FT_WORDS_PER_OPTIMIZE = 2000
+
+# PostgreSQL GIN indexes maintained by _setup_postgresql_fts
+POSTGRES_SEARCH_INDEXES = (
+    "idx_short_term_search_vector",
+    "idx_long_term_search_vector",
+)
+
+
+def _sqlite_triggers(table: str, memory_type: str):
+    insert_new = (
+        f"INSERT INTO memory_search_fts({SQLITE_FTS_COLUMNS}) "
+        f"VALUES (NEW.memory_id, '{memory_type}', NEW.namespace, "
+        "NEW.searchable_content, NEW.summary, NEW.category_primary);"
+    )
+    delete_old = (
+        "DELETE FROM memory_search_fts WHERE rowid IN ("
+        + _SQLITE_FTS_ROWIDS.format(ref="OLD", memory_type=memory_type)
+        + ");"
+    )
+    return {
+        f"{table}_fts_insert": (
+            f"CREATE TRIGGER {table}_fts_insert AFTER INSERT ON {table} "
+            f"BEGIN {insert_new} END"
+        ),
+        f"{table}_fts_delete": (
+            f"CREATE TRIGGER {table}_fts_delete AFTER DELETE ON {table} "
+            f"BEGIN {delete_old} END"
+        ),
+        f"{table}_fts_update": (
+            f"CREATE TRIGGER {table}_fts_update AFTER UPDATE OF "
+            f"memory_id, namespace, searchable_content, summary, category_primary ON {table} "
+            f"BEGIN {delete_old} {insert_new} END"
+        ),
+    }
+
+
+def setup_sqlite_search_index(conn, automerge: int = 8):
+    """
+    Create the FTS5 table and its triggers
+
+    Replaces a legacy contentless table (whose columns cannot be read back
+    and which cannot be deleted from by memory id) and repopulates it.
+    """
+    existing = conn.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": SQLITE_FTS_TABLE},
+    ).scalar()
+    rebuild = existing is not None and "content=''" in existing.replace('"', "'")
+    if rebuild:
+        logger.info("Replacing contentless memory_search_fts table")
+        conn.execute(text(f"DROP TABLE {SQLITE_FTS_TABLE}"))
+
+    conn.execute(
+        text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} "
+            f"USING fts5({SQLITE_FTS_COLUMNS})"
+        )
+    )
+
+    for table, memory_type in INDEXED_TABLES:
+        for name, ddl in _sqlite_triggers(table.name, memory_type).items():
+            # Recreate so triggers from older versions are replaced
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+            conn.execute(text(ddl))
+
+    # Merge index segments more eagerly than the default of 4
+    conn.execute(
+        text(
+            f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rank) "
+            "VALUES ('automerge', :automerge)"
+        ),
+        {"automerge": automerge},
+    )
+
+    if rebuild:
+        for table, memory_type in INDEXED_TABLES:
+            conn.execute(
+                text(
+                    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_COLUMNS}) "
+                    f"SELECT memory_id, '{memory_type}', namespace, searchable_content, "
+                    f"summary, category_primary FROM {table.name}"
+                )
+            )
+
+
+def rebuild_search_index(
+    engine,
+    database_type: str,
+    namespace: Optional[str] = None,
+    batch_size: int = 1000,
+) -> Dict[str, int]:
+    """
+    Rebuild search index entries from the memory tables in batches
+
+    Args:
+        engine: SQLAlchemy engine
+        database_type: sqlite, mysql or postgresql
+        namespace: Only rebuild this namespace (all namespaces if None).
+            Ignored on MySQL, whose FULLTEXT indexes cover every namespace
+        batch_size: Rows re-indexed per transaction
+
+    Returns:
+        Rows re-indexed per memory type (empty on MySQL)
+    """
+    if database_type == "mysql":
+        # FULLTEXT indexes are maintained by the storage engine
+        if namespace is not None:
+            logger.info(
+                f"MySQL FULLTEXT indexes cover every namespace; "
+                f"optimizing them for all namespaces, not only '{namespace}'"
+            )
+        for table, _ in INDEXED_TABLES:
+            with engine.connect() as conn:
+                optimize_mysql_fulltext(conn, table.name)
+        return {}
+
+    if database_type == "sqlite":
+        _clear_sqlite_entries(engine, namespace, batch_size)
+
+    reindexed: Dict[str, int] = {}
+    for table, memory_type in INDEXED_TABLES:
+        reindexed[memory_type] = 0
+        last_id = None
+        while True:
+            query = select(table.c.memory_id)
+            if namespace is not None:
+                query = query.where(table.c.namespace == namespace)
+            if last_id is not None:
+                query = query.where(table.c.memory_id > last_id)
+            query = query.order_by(table.c.memory_id).limit(batch_size)
+
+            with engine.begin() as conn:
+                ids = [row[0] for row in conn.execute(query)]
+                if not ids:
+                    break
+                conn.execute(
+                    _reindex_statement(database_type, table.name, memory_type),
+                    {"ids": ids},
+                )
+            reindexed[memory_type] += len(ids)
+            last_id = ids[-1]
+
+    if database_type == "sqlite":
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('optimize')"
+                )
+            )
+
+    return reindexed
+
+
+def optimize_mysql_fulltext(conn, table: str, words: int = MYSQL_FT_WORDS_PER_OPTIMIZE):
+    """
+    Optimize a table's FULLTEXT indexes without rebuilding the table
+
+    Plain ``OPTIMIZE TABLE`` on InnoDB copies the whole table. With
+    ``innodb_optimize_fulltext_only`` it only merges FULLTEXT index entries,
+    at most ``words`` words per call. Both variables are global in InnoDB,
+    so their previous values are restored afterwards.
+    """
+    previous = conn.execute(
+        text(
+            "SELECT @@GLOBAL.innodb_optimize_fulltext_only, "
+            "@@GLOBAL.innodb_ft_num_word_optimize"
+        )
+    ).one()
+    try:
+        conn.execute(
+            text(
+                "SET GLOBAL innodb_optimize_fulltext_only = ON, "
+                "innodb_ft_num_word_optimize = :words"
+            ),
+            {"words": int(words)},
+        )
+        conn.execute(text(f"OPTIMIZE TABLE {table}")).fetchall()
+    finally:
+        conn.execute(
+            text(
+                "SET GLOBAL innodb_optimize_fulltext_only = :fulltext_only, "
+                "innodb_ft_num_word_optimize = :words"
+            ),
+            {"fulltext_only": previous[0], "words": previous[1]},
+        )
+
+
+def _clear_sqlite_entries(engine, namespace: Optional[str], batch_size: int):
+    if namespace is None:
+        with engine.begin() as conn:
+            conn.execute(text(f"DELETE FROM {SQLITE_FTS_TABLE}"))
+        return
+
+    statement = text(
+        f"DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid IN ("
+        f"SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH :match "
+        "AND namespace = :namespace LIMIT :limit)"
+    )
+    params = {
+        "match": 'namespace : "' + namespace.replace('"', '""') + '"',
+        "namespace": namespace,
+        "limit": batch_size,
+    }
+    while True:
+        with engine.begin() as conn:
+            if not conn.execute(statement, params).rowcount:
+                return
+
+
+def _reindex_statement(database_type: str, table: str, memory_type: str):
+    if database_type == "postgresql":
+        sql = (
+            f"UPDATE {table} SET search_vector = to_tsvector('english', "
+            "COALESCE(searchable_content, '') || ' ' || COALESCE(summary, '')) "
+            "WHERE memory_id IN :ids"
+        )
+    else:
+        sql = (
+            f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_COLUMNS}) "
+            f"SELECT memory_id, '{memory_type}', namespace, searchable_content, "
+            f"summary, category_primary FROM {table} WHERE memory_id IN :ids"
+        )
+    return text(sql).bindparams(bindparam("ids", expanding=True))
+
+
+class SearchIndexMaintenance:
+    """
+    Periodic search index optimization with bounded impact
+
+    SQLite merges at most ``merge_pages`` FTS5 pages per run. MySQL optimizes
+    the FULLTEXT indexes only (see ``optimize_mysql_fulltext``) and PostgreSQL
+    runs ``REINDEX INDEX CONCURRENTLY``, one table or index at a time.
+    """
+
+    def __init__(
+        self,
+        engine,
+        database_type: str,
+        interval_seconds: float = 24 * 3600,
+        merge_pages: int = 500,
+    ):
+        self.engine = engine
+        self.database_type = database_type
+        self.interval_seconds = interval_seconds
+        self.merge_pages = merge_pages
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None or not self.interval_seconds:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="memori-search-index-maintenance", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            self.run_once()
+
+    def run_once(self) -> Dict[str, Any]:
+        """Run one maintenance step; returns what was done per index"""
+        results: Dict[str, Any] = {}
+        if self.database_type == "sqlite":
+            results[SQLITE_FTS_TABLE] = self._run_step(
+                f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rank) "
+                f"VALUES ('merge', {int(self.merge_pages)})"
+            )
+        elif self.database_type == "mysql":
+            for table, _ in INDEXED_TABLES:
+                results[table.name] = self._run_step(
+                    f"OPTIMIZE TABLE {table.name}",
+                    step=partial(optimize_mysql_fulltext, table=table.name),
+                )
+        elif self.database_type == "postgresql":
+            for index in POSTGRES_SEARCH_INDEXES:
+                # CONCURRENTLY cannot run inside a transaction block
+                results[index] = self._run_step(
+                    f"REINDEX INDEX CONCURRENTLY {index}", autocommit=True
+                )
+        return results
+
+    def _run_step(
+        self,
+        sql: str,
+        autocommit: bool = False,
+        step: Optional[Callable[[Any], Any]] = None,
+    ) -> str:
+        """Run ``sql``, or ``step(conn)`` when given (``sql`` then only labels it)"""
+        try:
+            with self.engine.connect() as conn:
+                if autocommit:
+                    conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+                if step is not None:
+                    step(conn)
+                else:
+                    conn.execute(text(sql))
+                if not autocommit:
+                    conn.commit()
+            logger.debug(f"Search index maintenance: {sql}")
+            return "ok"
+        except Exception as e:
+            logger.warning(f"Search index maintenance step failed ({sql}): {e}")
+            return f"failed: {e}"
@@ -3,22 +3,392 @@ SQLAlchemy-based search service for Memori v2.0
 Provides cross-database full-text search capabilities
 """
 
+import json
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 from loguru import logger
-from sqlalchemy import and_, desc, or_, text
+from sqlalchemy import (
+    DateTime,
+    Float,
+    Integer,
+    String,
+    bindparam,
+    column,
+    desc,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    text,
+    true,
+    union_all,
+)
+from sqlalchemy.engine import Result
 from sqlalchemy.orm import Session
 
+from .memory_edges import (
+    DUPLICATE_OF,
+    MAX_HOPS,
+    SUPERSEDES,
+    active_memory_clause,
+    expansion_statement,
+)
 from .models import LongTermMemory, ShortTermMemory
+from .scoring import ScoringConfig, score_expression
+from .storage_codec import lazy_processed_data
+
+# Fixed match scores of strategies without a text ranking function
+LIKE_SCORE = 0.4
+RECENT_SCORE = 1.0
+
+# Columns a search result carries. Selecting them with Core instead of loading
+# ORM entities skips identity-map bookkeeping and the remaining JSON columns.
+RESULT_COLUMNS = (
+    "memory_id",
+    "processed_data",
+    "importance_score",
+    "created_at",
+    "summary",
+    "searchable_content",
+    "category_primary",
+    "access_count",
+    "last_accessed",
+)
+
+
+def _rows_to_dicts(result: Result, **constants: Any) -> List[Dict[str, Any]]:
+    """Map result tuples to dicts, adding per-path constant fields"""
+    keys = list(result.keys())
+    rows = []
+    for row in result:
+        entry = dict(zip(keys, row))
+        entry.update(constants)
+        rows.append(entry)
+    return rows
+
+
+# Statements are built once per shape and reused with new parameters; the
+# compiled form is then served from SQLAlchemy's statement cache.
+
+
+def _filtered(table, with_categories: bool, active_only: bool):
+    statement = select(*(table.c[name] for name in RESULT_COLUMNS)).where(
+        table.c.namespace == bindparam("namespace")
+    )
+    if active_only:
+        statement = statement.where(
+            active_memory_clause(table.c.memory_id, table.c.namespace)
+        )
+    if with_categories:
+        statement = statement.where(
+            table.c.category_primary.in_(bindparam("categories", expanding=True))
+        )
+    return statement
+
+
+def _ranked(statement, table, dialect: str, scoring: ScoringConfig, relevance):
+    """Add the composite score and keep the top rows by it"""
+    score = score_expression(table.c, dialect, scoring, relevance)
+    return (
+        statement.add_columns(score.label("composite_score"))
+        .order_by(desc("composite_score"))
+        .limit(bindparam("limit"))
+    )
+
+
+def _like_select(table, dialect, with_categories, active_only, scoring, pattern):
+    statement = _filtered(table, with_categories, active_only).where(
+        or_(table.c.searchable_content.like(pattern), table.c.summary.like(pattern))
+    )
+    return _ranked(statement, table, dialect, scoring, LIKE_SCORE)
+
+
+@lru_cache(maxsize=None)
+def _like_statement(
+    table,
+    dialect: str,
+    with_categories: bool,
+    active_only: bool,
+    scoring: ScoringConfig,
+):
+    return _like_select(
+        table, dialect, with_categories, active_only, scoring, bindparam("pattern")
+    )
+
+
+@lru_cache(maxsize=None)
+def _recent_statement(
+    table,
+    dialect: str,
+    with_categories: bool,
+    active_only: bool,
+    scoring: ScoringConfig,
+):
+    return _ranked(
+        _filtered(table, with_categories, active_only),
+        table,
+        dialect,
+        scoring,
+        RECENT_SCORE,
+    )
+
+
+def _per_query_union(branches):
+    """
+    One statement answering a batch of queries
+
+    Each branch keeps its own ORDER BY ... LIMIT, so the database still runs a
+    bounded top-k sort per query. (Ranking a joined table of queries with
+    ROW_NUMBER() instead sorts every match, wide columns included.) Branches
+    are wrapped as derived tables, since SQLite rejects ORDER BY inside a
+    compound member.
+    """
+    selects = []
+    for i, branch in enumerate(branches):
+        matches = branch.subquery(f"matches_{i}")
+        selects.append(
+            select(literal(i, Integer).label("query_index"), *matches.c).select_from(
+                matches
+            )
+        )
+    return union_all(*selects)
+
+
+@lru_cache(maxsize=None)
+def _like_many_statement(
+    table,
+    dialect: str,
+    with_categories: bool,
+    active_only: bool,
+    scoring: ScoringConfig,
+    queries: int,
+):
+    return _per_query_union(
+        _like_select(
+            table,
+            dialect,
+            with_categories,
+            active_only,
+            scoring,
+            bindparam(f"pattern_{i}"),
+        )
+        for i in range(queries)
+    )
+
+
+def _fulltext_score(dialect: str, query):
+    """(match condition, relevance expression) of a backend's full-text search"""
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import match
+
+        relevance = match(
+            literal_column("searchable_content"),
+            literal_column("summary"),
+            against=query,
+        ).in_natural_language_mode()
+        return relevance, relevance
+    vector = literal_column("search_vector")
+    tsquery = func.to_tsquery("english", query)
+    return vector.op("@@")(tsquery), func.ts_rank(vector, tsquery)
+
+
+def _fulltext_select(table, dialect, with_categories, active_only, scoring, query):
+    condition, relevance = _fulltext_score(dialect, query)
+    statement = (
+        _filtered(table, with_categories, active_only)
+        .add_columns(relevance.label("search_score"))
+        .where(condition)
+    )
+    return _ranked(statement, table, dialect, scoring, relevance)
+
+
+@lru_cache(maxsize=None)
+def _fulltext_statement(
+    table,
+    dialect: str,
+    with_categories: bool,
+    active_only: bool,
+    scoring: ScoringConfig,
+):
+    return _fulltext_select(
+        table, dialect, with_categories, active_only, scoring, bindparam("query")
+    )
+
+
+@lru_cache(maxsize=None)
+def _fulltext_many_statement(
+    table,
+    dialect: str,
+    with_categories: bool,
+    active_only: bool,
+    scoring: ScoringConfig,
+    queries: int,
+):
+    """Full-text matches of a batch of queries, top rows per query"""
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import ARRAY
+
+        # One lateral top-k subquery per element of the queries array
+        texts = (
+            func.unnest(bindparam("queries", type_=ARRAY(String)))
+            .table_valued("query_text", with_ordinality="query_index")
+            .render_derived()
+        )
+        matches = _fulltext_select(
+            table, dialect, with_categories, active_only, scoring, texts.c.query_text
+        ).lateral("matches")
+        return select(
+            (texts.c.query_index - 1).label("query_index"), *matches.c
+        ).select_from(texts.join(matches, true()))
+
+    # MATCH ... AGAINST only takes constants: one branch per query
+    return _per_query_union(
+        _fulltext_select(
+            table,
+            dialect,
+            with_categories,
+            active_only,
+            scoring,
+            bindparam(f"query_{i}"),
+        )
+        for i in range(queries)
+    )
+
+
+def _sqlite_fts_matches(categories: int, active_only: bool, query_param: str):
+    """FTS5 matches of the query bound as ``query_param``, joined to their memory rows"""
+    category_clause = ""
+    if categories:
+        placeholders = ",".join(f":cat_{i}" for i in range(categories))
+        category_clause = f"AND fts.category_primary IN ({placeholders})"
+    active_clause = ""
+    if active_only:
+        # Same index probes as active_memory_clause, for long-term rows only
+        active_clause = f"""
+            AND NOT EXISTS (
+                SELECT 1 FROM memory_edges e
+                WHERE fts.memory_type = 'long_term' AND e.namespace = fts.namespace
+                AND e.target_id = fts.memory_id AND e.edge_type = '{SUPERSEDES}'
+            )
+            AND NOT EXISTS (
+                SELECT 1 FROM memory_edges e
+                WHERE fts.memory_type = 'long_term' AND e.namespace = fts.namespace
+                AND e.source_id = fts.memory_id AND e.edge_type = '{DUPLICATE_OF}'
+            )"""
+
+    return (
+        text(f"""
+            SELECT
+                fts.memory_id, fts.memory_type, fts.category_primary,
+                fts.searchable_content,
+                CASE
+                    WHEN fts.memory_type = 'short_term' THEN st.processed_data
+                    WHEN fts.memory_type = 'long_term' THEN lt.processed_data
+                END as processed_data,
+                CASE
+                    WHEN fts.memory_type = 'short_term' THEN st.importance_score
+                    WHEN fts.memory_type = 'long_term' THEN lt.importance_score
+                    ELSE 0.5
+                END as importance_score,
+                CASE
+                    WHEN fts.memory_type = 'short_term' THEN st.created_at
+                    WHEN fts.memory_type = 'long_term' THEN lt.created_at
+                END as created_at,
+                CASE
+                    WHEN fts.memory_type = 'short_term' THEN st.access_count
+                    WHEN fts.memory_type = 'long_term' THEN lt.access_count
+                END as access_count,
+                CASE
+                    WHEN fts.memory_type = 'short_term' THEN st.last_accessed
+                    WHEN fts.memory_type = 'long_term' THEN lt.last_accessed
+                END as last_accessed,
+                fts.summary,
+                rank as fts_rank,
+                'sqlite_fts5' as search_strategy
+            FROM memory_search_fts fts
+            LEFT JOIN short_term_memory st ON fts.memory_id = st.memory_id AND fts.memory_type = 'short_term'
+            LEFT JOIN long_term_memory lt ON fts.memory_id = lt.memory_id AND fts.memory_type = 'long_term'
+            WHERE memory_search_fts MATCH :{query_param} AND fts.namespace = :namespace
+            {category_clause}{active_clause}
+            """)
+        .columns(
+            column("memory_id", String),
+            column("memory_type", String),
+            column("category_primary", String),
+            column("searchable_content", String),
+            column("processed_data"),  # Raw SQL: JSON is decoded afterwards
+            column("importance_score", Float),
+            column("created_at", DateTime),
+            column("access_count", Integer),
+            column("last_accessed", DateTime),
+            column("summary", String),
+            column("fts_rank", Float),
+            column("search_strategy", String),
+        )
+        .subquery("matches")
+    )
+
+
+def _sqlite_fts_scored(matches, scoring: ScoringConfig):
+    """Match columns plus the relevance and composite score of each FTS row"""
+    # bm25 rank is negative, more negative is a better match
+    rank = func.abs(matches.c.fts_rank)
+    relevance = rank / (1.0 + rank)
+    statement = select(
+        *(c for c in matches.c if c.name != "fts_rank"),
+        relevance.label("search_score"),
+    )
+    return statement, score_expression(matches.c, "sqlite", scoring, relevance)
+
+
+@lru_cache(maxsize=None)
+def _sqlite_fts_statement(categories: int, active_only: bool, scoring: ScoringConfig):
+    """FTS5 matches ranked by the composite score"""
+    return _sqlite_fts_select(categories, active_only, scoring, "fts_query")
+
+
+def _sqlite_fts_select(
+    categories: int, active_only: bool, scoring: ScoringConfig, query_param: str
+):
+    statement, score = _sqlite_fts_scored(
+        _sqlite_fts_matches(categories, active_only, query_param), scoring
+    )
+    return (
+        statement.add_columns(score.label("composite_score"))
+        .order_by(desc("composite_score"))
+        .limit(bindparam("limit"))
+    )
+
+
+@lru_cache(maxsize=None)
+def _sqlite_fts_many_statement(
+    queries: int, categories: int, active_only: bool, scoring: ScoringConfig
+):
+    """FTS5 matches of a batch of queries, top rows per query"""
+    return _per_query_union(
+        _sqlite_fts_select(categories, active_only, scoring, f"query_{i}")
+        for i in range(queries)
+    )
 
 
 class SearchService:
     """Cross-database search service using SQLAlchemy"""
 
-    def __init__(self, session: Session, database_type: str):
+    def __init__(
+        self,
+        session: Session,
+        database_type: str,
+        scoring: Optional[ScoringConfig] = None,
+        memory_edges: bool = True,
+    ):
         self.session = session
         self.database_type = database_type
+        self.scoring = scoring or ScoringConfig()
+        # Whether the memory_edges table exists (superseded filter, expansion)
+        self.memory_edges = memory_edges
 
     def search_memories(
         self,
@@ -27,6 +397,7 @@ class SearchService:
         category_filter: Optional[List[str]] = None,
         limit: int = 10,
         memory_types: Optional[List[str]] = None,
+        expand_hops: int = 0,
     ) -> List[Dict[str, Any]]:
         """
         Search memories across different database backends
@@ -37,14 +408,22 @@ class SearchService:
             category_filter: List of categories to filter by
             limit: Maximum number of results
             memory_types: Types of memory to search ('short_term', 'long_term', or both)
+            expand_hops: Also return long-term memories up to this many related
+                edges away from the hits (0-2), after the hits themselves
 
         Returns:
             List of memory dictionaries with search metadata
         """
+        if not 0 <= expand_hops <= MAX_HOPS:
+            raise ValueError(f"expand_hops must be between 0 and {MAX_HOPS}")
+
         if not query or not query.strip():
-            return self._get_recent_memories(
+            results = self._get_recent_memories(
                 namespace, category_filter, limit, memory_types
             )
+            return self._decode_processed_data(
+                results + self._expand_related(results, namespace, expand_hops, limit)
+            )
 
         results = []
 
@@ -104,157 +483,257 @@ class SearchService:
                 search_long_term,
             )
 
-        return self._rank_and_limit_results(results, limit)
+        results = self._rank_and_limit_results(results, limit)
+        return self._decode_processed_data(
+            results + self._expand_related(results, namespace, expand_hops, limit)
+        )
 
-    def _search_sqlite_fts(
+    def search_memories_many(
         self,
-        query: str,
+        queries: List[str],
+        namespace: str = "default",
+        category_filter: Optional[List[str]] = None,
+        limit: int = 10,
+        memory_types: Optional[List[str]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search several queries with one statement per strategy
+
+        Full-text search runs every query in a single statement (per memory
+        table on MySQL/PostgreSQL); queries without full-text hits share one
+        LIKE statement. Results are ranked exactly as by ``search_memories``;
+        related-memory expansion is not applied.
+
+        Returns:
+            One result list per query, in the order of ``queries``
+        """
+        results: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        positions: Dict[str, List[int]] = {}
+        blank = []
+        for position, query in enumerate(queries):
+            if query and query.strip():
+                positions.setdefault(query.strip(), []).append(position)
+            else:
+                blank.append(position)
+
+        if blank:
+            recent = self._get_recent_memories(
+                namespace, category_filter, limit, memory_types
+            )
+            for position in blank:
+                results[position] = [dict(row) for row in recent]
+
+        texts = list(positions)
+        if texts:
+            search_short_term = not memory_types or "short_term" in memory_types
+            search_long_term = not memory_types or "long_term" in memory_types
+
+            found = self._search_fulltext_many(
+                texts,
+                namespace,
+                category_filter,
+                limit,
+                search_short_term,
+                search_long_term,
+            )
+            missing = [i for i in range(len(texts)) if not found.get(i)]
+            if missing:
+                fallback = self._search_like_many(
+                    [texts[i] for i in missing],
+                    namespace,
+                    category_filter,
+                    limit,
+                    search_short_term,
+                    search_long_term,
+                )
+                for j, i in enumerate(missing):
+                    found[i] = fallback.get(j, [])
+
+            for i, query in enumerate(texts):
+                ranked = self._rank_and_limit_results(found.get(i, []), limit)
+                for position in positions[query]:
+                    results[position] = [dict(row) for row in ranked]
+
+        return [self._decode_processed_data(rows) for rows in results]
+
+    def _search_fulltext_many(
+        self,
+        texts: List[str],
         namespace: str,
         category_filter: Optional[List[str]],
         limit: int,
         search_short_term: bool,
         search_long_term: bool,
-    ) -> List[Dict[str, Any]]:
-        """Search using SQLite FTS5"""
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """Full-text hits of a batch of queries, by index in ``texts``"""
         try:
-            # Build FTS query
-            fts_query = f'"{query.strip()}"'
-
-            # Build category filter
-            category_clause = ""
-            params = {"fts_query": fts_query, "namespace": namespace}
+            if self.database_type == "sqlite":
+                params = self._params(namespace, category_filter, limit)
+                for i, query in enumerate(texts):
+                    params[f"query_{i}"] = f'"{query}"'
+                for i, cat in enumerate(category_filter or []):
+                    params[f"cat_{i}"] = cat
+                statement = _sqlite_fts_many_statement(
+                    len(texts),
+                    len(category_filter or []),
+                    self.memory_edges,
+                    self.scoring,
+                )
+                rows = _rows_to_dicts(self.session.execute(statement, params))
+                return self._group_by_query(self._decode_raw_json(rows))
 
-            if category_filter:
-                category_placeholders = ",".join(
-                    [f":cat_{i}" for i in range(len(category_filter))]
+            if self.database_type == "postgresql":
+                strategy = "postgresql_fts"
+                extra = {"queries": [" & ".join(query.split()) for query in texts]}
+            elif self.database_type == "mysql":
+                strategy = "mysql_fulltext"
+                extra = {f"query_{i}": query for i, query in enumerate(texts)}
+            else:
+                return {}
+
+            rows = []
+            for memory_type, table in self._memory_tables(
+                search_short_term, search_long_term
+            ):
+                statement = _fulltext_many_statement(
+                    table,
+                    self.database_type,
+                    bool(category_filter),
+                    self._active_only(table),
+                    self.scoring,
+                    len(texts),
                 )
-                category_clause = (
-                    f"AND fts.category_primary IN ({category_placeholders})"
+                rows.extend(
+                    _rows_to_dicts(
+                        self.session.execute(
+                            statement,
+                            self._params(namespace, category_filter, limit, **extra),
+                        ),
+                        memory_type=memory_type,
+                        search_strategy=strategy,
+                    )
                 )
-                for i, cat in enumerate(category_filter):
-                    params[f"cat_{i}"] = cat
-
-            # SQLite FTS5 search query
-            sql_query = f"""
-                SELECT
-                    fts.memory_id, fts.memory_type, fts.category_primary,
-                    CASE
-                        WHEN fts.memory_type = 'short_term' THEN st.processed_data
-                        WHEN fts.memory_type = 'long_term' THEN lt.processed_data
-                    END as processed_data,
-                    CASE
-                        WHEN fts.memory_type = 'short_term' THEN st.importance_score
-                        WHEN fts.memory_type = 'long_term' THEN lt.importance_score
-                        ELSE 0.5
-                    END as importance_score,
-                    CASE
-                        WHEN fts.memory_type = 'short_term' THEN st.created_at
-                        WHEN fts.memory_type = 'long_term' THEN lt.created_at
-                    END as created_at,
-                    fts.summary,
-                    rank as search_score,
-                    'sqlite_fts5' as search_strategy
-                FROM memory_search_fts fts
-                LEFT JOIN short_term_memory st ON fts.memory_id = st.memory_id AND fts.memory_type = 'short_term'
-                LEFT JOIN long_term_memory lt ON fts.memory_id = lt.memory_id AND fts.memory_type = 'long_term'
-                WHERE memory_search_fts MATCH :fts_query AND fts.namespace = :namespace
-                {category_clause}
-                ORDER BY rank, importance_score DESC
-                LIMIT {limit}
-            """
-
-            result = self.session.execute(text(sql_query), params)
-            return [dict(row) for row in result]
+            return self._group_by_query(rows)
 
         except Exception as e:
-            logger.debug(f"SQLite FTS5 search failed: {e}")
+            logger.debug(f"Batched full-text search failed: {e}")
             # Roll back the transaction to recover from error state
             self.session.rollback()
-            return []
+            return {}
 
-    def _search_mysql_fulltext(
+    def _search_like_many(
         self,
-        query: str,
+        texts: List[str],
         namespace: str,
         category_filter: Optional[List[str]],
         limit: int,
         search_short_term: bool,
         search_long_term: bool,
-    ) -> List[Dict[str, Any]]:
-        """Search using MySQL FULLTEXT"""
-        results = []
-
-        try:
-            # Search short-term memory if requested
-            if search_short_term:
-                short_query = self.session.query(ShortTermMemory).filter(
-                    ShortTermMemory.namespace == namespace
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """LIKE hits of a batch of queries, by index in ``texts``"""
+        params = self._params(namespace, category_filter, limit)
+        for i, query in enumerate(texts):
+            params[f"pattern_{i}"] = f"%{query}%"
+
+        rows = []
+        for memory_type, table in self._memory_tables(
+            search_short_term, search_long_term
+        ):
+            statement = _like_many_statement(
+                table,
+                self.database_type,
+                bool(category_filter),
+                self._active_only(table),
+                self.scoring,
+                len(texts),
+            )
+            rows.extend(
+                _rows_to_dicts(
+                    self.session.execute(statement, params),
+                    memory_type=memory_type,
+                    search_score=LIKE_SCORE,
+                    search_strategy=f"{self.database_type}_like_fallback",
                 )
-
-                # Add FULLTEXT search
-                fulltext_condition = text(
-                    "MATCH(searchable_content, summary) AGAINST(:query IN NATURAL LANGUAGE MODE)"
-                ).params(query=query)
-                short_query = short_query.filter(fulltext_condition)
-
-                # Add category filter
-                if category_filter:
-                    short_query = short_query.filter(
-                        ShortTermMemory.category_primary.in_(category_filter)
-                    )
-
-                # Add relevance score
-                short_results = self.session.execute(
-                    short_query.statement.add_columns(
-                        text(
-                            "MATCH(searchable_content, summary) AGAINST(:query IN NATURAL LANGUAGE MODE) as search_score"
-                        ).params(query=query),
-                        text("'short_term' as memory_type"),
-                        text("'mysql_fulltext' as search_strategy"),
-                    )
-                ).fetchall()
-
-                results.extend([dict(row) for row in short_results])
-
-            # Search long-term memory if requested
-            if search_long_term:
-                long_query = self.session.query(LongTermMemory).filter(
-                    LongTermMemory.namespace == namespace
+            )
+        return self._group_by_query(rows)
+
+    @staticmethod
+    def _group_by_query(rows: List[Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
+        grouped: Dict[int, List[Dict[str, Any]]] = {}
+        for row in rows:
+            grouped.setdefault(int(row.pop("query_index")), []).append(row)
+        return grouped
+
+    @staticmethod
+    def _decode_raw_json(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Raw SQL returns JSON columns undecoded"""
+        for row in rows:
+            row["processed_data"] = lazy_processed_data(row["processed_data"], row)
+            if isinstance(row["processed_data"], str):
+                row["processed_data"] = json.loads(row["processed_data"])
+        return rows
+
+    @staticmethod
+    def _decode_processed_data(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Wrap codec-encoded processed_data so it is only decoded when read"""
+        for result in results:
+            if "processed_data" in result:
+                result["processed_data"] = lazy_processed_data(
+                    result["processed_data"], result
                 )
+        return results
 
-                # Add FULLTEXT search
-                fulltext_condition = text(
-                    "MATCH(searchable_content, summary) AGAINST(:query IN NATURAL LANGUAGE MODE)"
-                ).params(query=query)
-                long_query = long_query.filter(fulltext_condition)
-
-                # Add category filter
-                if category_filter:
-                    long_query = long_query.filter(
-                        LongTermMemory.category_primary.in_(category_filter)
-                    )
-
-                # Add relevance score
-                long_results = self.session.execute(
-                    long_query.statement.add_columns(
-                        text(
-                            "MATCH(searchable_content, summary) AGAINST(:query IN NATURAL LANGUAGE MODE) as search_score"
-                        ).params(query=query),
-                        text("'long_term' as memory_type"),
-                        text("'mysql_fulltext' as search_strategy"),
-                    )
-                ).fetchall()
-
-                results.extend([dict(row) for row in long_results])
+    def _search_sqlite_fts(
+        self,
+        query: str,
+        namespace: str,
+        category_filter: Optional[List[str]],
+        limit: int,
+        search_short_term: bool,
+        search_long_term: bool,
+    ) -> List[Dict[str, Any]]:
+        """Search using SQLite FTS5"""
+        try:
+            params = self._params(
+                namespace, category_filter, limit, fts_query=f'"{query.strip()}"'
+            )
+            for i, cat in enumerate(category_filter or []):
+                params[f"cat_{i}"] = cat
 
-            return results
+            statement = _sqlite_fts_statement(
+                len(category_filter or []), self.memory_edges, self.scoring
+            )
+            return self._decode_raw_json(
+                _rows_to_dicts(self.session.execute(statement, params))
+            )
 
         except Exception as e:
-            logger.debug(f"MySQL FULLTEXT search failed: {e}")
+            logger.debug(f"SQLite FTS5 search failed: {e}")
             # Roll back the transaction to recover from error state
             self.session.rollback()
             return []
 
+    def _search_mysql_fulltext(
+        self,
+        query: str,
+        namespace: str,
+        category_filter: Optional[List[str]],
+        limit: int,
+        search_short_term: bool,
+        search_long_term: bool,
+    ) -> List[Dict[str, Any]]:
+        """Search using MySQL FULLTEXT"""
+        return self._search_fulltext(
+            "mysql",
+            "mysql_fulltext",
+            {"query": query},
+            namespace,
+            category_filter,
+            limit,
+            search_short_term,
+            search_long_term,
+        )
+
     def _search_postgresql_fts(
         self,
         query: str,
@@ -265,79 +744,56 @@ class SearchService:
         search_long_term: bool,
     ) -> List[Dict[str, Any]]:
         """Search using PostgreSQL tsvector"""
+        # Convert simple query to tsquery format (join words with &)
+        tsquery_text = " & ".join(query.split())
+        return self._search_fulltext(
+            "postgresql",
+            "postgresql_fts",
+            {"query": tsquery_text},
+            namespace,
+            category_filter,
+            limit,
+            search_short_term,
+            search_long_term,
+        )
+
+    def _search_fulltext(
+        self,
+        dialect: str,
+        strategy: str,
+        params: Dict[str, Any],
+        namespace: str,
+        category_filter: Optional[List[str]],
+        limit: int,
+        search_short_term: bool,
+        search_long_term: bool,
+    ) -> List[Dict[str, Any]]:
+        """Run the dialect's full-text statement against the requested memory tables"""
         results = []
-
         try:
-            # Prepare query for tsquery - handle spaces and special characters
-            # Convert simple query to tsquery format (join words with &)
-            tsquery_text = " & ".join(query.split())
-
-            # Search short-term memory if requested
-            if search_short_term:
-                short_query = self.session.query(ShortTermMemory).filter(
-                    ShortTermMemory.namespace == namespace
+            for memory_type, table in self._memory_tables(
+                search_short_term, search_long_term
+            ):
+                statement = _fulltext_statement(
+                    table,
+                    dialect,
+                    bool(category_filter),
+                    self._active_only(table),
+                    self.scoring,
                 )
-
-                # Add tsvector search
-                ts_query = text(
-                    "search_vector @@ to_tsquery('english', :query)"
-                ).params(query=tsquery_text)
-                short_query = short_query.filter(ts_query)
-
-                # Add category filter
-                if category_filter:
-                    short_query = short_query.filter(
-                        ShortTermMemory.category_primary.in_(category_filter)
-                    )
-
-                # Add relevance score
-                short_results = self.session.execute(
-                    short_query.statement.add_columns(
-                        text(
-                            "ts_rank(search_vector, to_tsquery('english', :query)) as search_score"
-                        ).params(query=tsquery_text),
-                        text("'short_term' as memory_type"),
-                        text("'postgresql_fts' as search_strategy"),
-                    ).order_by(text("search_score DESC"))
-                ).fetchall()
-
-                results.extend([dict(row) for row in short_results])
-
-            # Search long-term memory if requested
-            if search_long_term:
-                long_query = self.session.query(LongTermMemory).filter(
-                    LongTermMemory.namespace == namespace
+                rows = self.session.execute(
+                    statement,
+                    self._params(namespace, category_filter, limit, **params),
                 )
-
-                # Add tsvector search
-                ts_query = text(
-                    "search_vector @@ to_tsquery('english', :query)"
-                ).params(query=tsquery_text)
-                long_query = long_query.filter(ts_query)
-
-                # Add category filter
-                if category_filter:
-                    long_query = long_query.filter(
-                        LongTermMemory.category_primary.in_(category_filter)
+                results.extend(
+                    _rows_to_dicts(
+                        rows, memory_type=memory_type, search_strategy=strategy
                     )
-
-                # Add relevance score
-                long_results = self.session.execute(
-                    long_query.statement.add_columns(
-                        text(
-                            "ts_rank(search_vector, to_tsquery('english', :query)) as search_score"
-                        ).params(query=tsquery_text),
-                        text("'long_term' as memory_type"),
-                        text("'postgresql_fts' as search_strategy"),
-                    ).order_by(text("search_score DESC"))
-                ).fetchall()
-
-                results.extend([dict(row) for row in long_results])
-
+                )
             return results
 
         except Exception as e:
-            logger.debug(f"PostgreSQL FTS search failed: {e}")
+            logger.debug(f"{strategy} search failed: {e}")
             # Roll back the transaction to recover from error state
             self.session.rollback()
             return []
@@ -353,88 +809,30 @@ class SearchService:
     ) -> List[Dict[str, Any]]:
         """Fallback LIKE-based search"""
         results = []
-        search_pattern = f"%{query}%"
-
-        # Search short-term memory
-        if search_short_term:
-            short_query = self.session.query(ShortTermMemory).filter(
-                and_(
-                    ShortTermMemory.namespace == namespace,
-                    or_(
-                        ShortTermMemory.searchable_content.like(search_pattern),
-                        ShortTermMemory.summary.like(search_pattern),
-                    ),
-                )
-            )
-
-            if category_filter:
-                short_query = short_query.filter(
-                    ShortTermMemory.category_primary.in_(category_filter)
-                )
-
-            short_results = (
-                short_query.order_by(
-                    desc(ShortTermMemory.importance_score),
-                    desc(ShortTermMemory.created_at),
-                )
-                .limit(limit)
-                .all()
+        params = self._params(namespace, category_filter, limit, pattern=f"%{query}%")
+
+        for memory_type, table in self._memory_tables(
+            search_short_term, search_long_term
+        ):
+            rows = self.session.execute(
+                _like_statement(
+                    table,
+                    self.database_type,
+                    bool(category_filter),
+                    self._active_only(table),
+                    self.scoring,
+                ),
+                params,
             )
-
-            for result in short_results:
-                memory_dict = {
-                    "memory_id": result.memory_id,
-                    "memory_type": "short_term",
-                    "processed_data": result.processed_data,
-                    "importance_score": result.importance_score,
-                    "created_at": result.created_at,
-                    "summary": result.summary,
-                    "category_primary": result.category_primary,
-                    "search_score": 0.4,  # Fixed score for LIKE search
-                    "search_strategy": f"{self.database_type}_like_fallback",
-                }
-                results.append(memory_dict)
-
-        # Search long-term memory
-        if search_long_term:
-            long_query = self.session.query(LongTermMemory).filter(
-                and_(
-                    LongTermMemory.namespace == namespace,
-                    or_(
-                        LongTermMemory.searchable_content.like(search_pattern),
-                        LongTermMemory.summary.like(search_pattern),
-                    ),
+            results.extend(
+                _rows_to_dicts(
+                    rows,
+                    memory_type=memory_type,
+                    search_score=LIKE_SCORE,
+                    search_strategy=f"{self.database_type}_like_fallback",
                 )
             )
 
-            if category_filter:
-                long_query = long_query.filter(
-                    LongTermMemory.category_primary.in_(category_filter)
-                )
-
-            long_results = (
-                long_query.order_by(
-                    desc(LongTermMemory.importance_score),
-                    desc(LongTermMemory.created_at),
-                )
-                .limit(limit)
-                .all()
-            )
-
-            for result in long_results:
-                memory_dict = {
-                    "memory_id": result.memory_id,
-                    "memory_type": "long_term",
-                    "processed_data": result.processed_data,
-                    "importance_score": result.importance_score,
-                    "created_at": result.created_at,
-                    "summary": result.summary,
-                    "category_primary": result.category_primary,
-                    "search_score": 0.4,  # Fixed score for LIKE search
-                    "search_strategy": f"{self.database_type}_like_fallback",
-                }
-                results.append(memory_dict)
-
         return results
 
     def _get_recent_memories(
@@ -446,103 +844,94 @@ class SearchService:
     ) -> List[Dict[str, Any]]:
         """Get recent memories when no search query is provided"""
         results = []
+        params = self._params(namespace, category_filter, limit // 2)
 
         search_short_term = not memory_types or "short_term" in memory_types
         search_long_term = not memory_types or "long_term" in memory_types
 
-        # Get recent short-term memories
-        if search_short_term:
-            short_query = self.session.query(ShortTermMemory).filter(
-                ShortTermMemory.namespace == namespace
+        for memory_type, table in self._memory_tables(
+            search_short_term, search_long_term
+        ):
+            rows = self.session.execute(
+                _recent_statement(
+                    table,
+                    self.database_type,
+                    bool(category_filter),
+                    self._active_only(table),
+                    self.scoring,
+                ),
+                params,
             )
-
-            if category_filter:
-                short_query = short_query.filter(
-                    ShortTermMemory.category_primary.in_(category_filter)
+            results.extend(
+                _rows_to_dicts(
+                    rows,
+                    memory_type=memory_type,
+                    search_score=RECENT_SCORE,
+                    search_strategy="recent_memories",
                 )
-
-            short_results = (
-                short_query.order_by(desc(ShortTermMemory.created_at))
-                .limit(limit // 2)
-                .all()
             )
 
-            for result in short_results:
-                memory_dict = {
-                    "memory_id": result.memory_id,
-                    "memory_type": "short_term",
-                    "processed_data": result.processed_data,
-                    "importance_score": result.importance_score,
-                    "created_at": result.created_at,
-                    "summary": result.summary,
-                    "category_primary": result.category_primary,
-                    "search_score": 1.0,
-                    "search_strategy": "recent_memories",
-                }
-                results.append(memory_dict)
-
-        # Get recent long-term memories
-        if search_long_term:
-            long_query = self.session.query(LongTermMemory).filter(
-                LongTermMemory.namespace == namespace
-            )
-
-            if category_filter:
-                long_query = long_query.filter(
-                    LongTermMemory.category_primary.in_(category_filter)
-                )
+        return results
 
-            long_results = (
-                long_query.order_by(desc(LongTermMemory.created_at))
-                .limit(limit // 2)
-                .all()
+    def _expand_related(
+        self,
+        hits: List[Dict[str, Any]],
+        namespace: str,
+        hops: int,
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """Related long-term memories of the hits, in one recursive query"""
+        if not hops or not hits or not self.memory_edges:
+            return []
+        seed_ids = [hit["memory_id"] for hit in hits]
+        try:
+            rows = self.session.execute(
+                expansion_statement(RESULT_COLUMNS, self.database_type, self.scoring),
+                self._params(
+                    namespace,
+                    None,
+                    limit,
+                    seed_ids=seed_ids,
+                    exclude_ids=seed_ids,
+                    max_hops=hops,
+                ),
+            )
+            return _rows_to_dicts(
+                rows, memory_type="long_term", search_strategy="related_expansion"
             )
+        except Exception as e:
+            logger.debug(f"Related memory expansion failed: {e}")
+            self.session.rollback()
+            return []
 
-            for result in long_results:
-                memory_dict = {
-                    "memory_id": result.memory_id,
-                    "memory_type": "long_term",
-                    "processed_data": result.processed_data,
-                    "importance_score": result.importance_score,
-                    "created_at": result.created_at,
-                    "summary": result.summary,
-                    "category_primary": result.category_primary,
-                    "search_score": 1.0,
-                    "search_strategy": "recent_memories",
-                }
-                results.append(memory_dict)
+    def _active_only(self, table) -> bool:
+        """Whether superseded and duplicate rows of the table are filtered"""
+        return self.memory_edges and table is LongTermMemory.__table__
 
-        return results
+    @staticmethod
+    def _memory_tables(search_short_term: bool, search_long_term: bool):
+        if search_short_term:
+            yield "short_term", ShortTermMemory.__table__
+        if search_long_term:
+            yield "long_term", LongTermMemory.__table__
+
+    @staticmethod
+    def _params(
+        namespace: str,
+        category_filter: Optional[List[str]],
+        limit: int,
+        **extra: Any,
+    ) -> Dict[str, Any]:
+        # Ages are measured from one instant, bound into the SQL score
+        params = {"namespace": namespace, "limit": limit, "now": datetime.now()}
+        params.update(extra)
+        if category_filter:
+            params["categories"] = list(category_filter)
+        return params
 
     def _rank_and_limit_results(
         self, results: List[Dict[str, Any]], limit: int
     ) -> List[Dict[str, Any]]:
-        """Rank and limit search results"""
-        # Calculate composite score
-        for result in results:
-            search_score = result.get("search_score", 0.4)
-            importance_score = result.get("importance_score", 0.5)
-            recency_score = self._calculate_recency_score(result.get("created_at"))
-
-            # Weighted composite score
-            result["composite_score"] = (
-                search_score * 0.5 + importance_score * 0.3 + recency_score * 0.2
-            )
-
-        # Sort by composite score and limit
-        results.sort(key=lambda x: x.get("composite_score", 0), reverse=True)
+        """Merge per-table results, already scored in SQL, and keep the top rows"""
+        results.sort(key=lambda x: x.get("composite_score") or 0.0, reverse=True)
         return results[:limit]
-
-    def _calculate_recency_score(self, created_at) -> float:
-        """Calculate recency score (0-1, newer = higher)"""
-        try:
-            if not created_at:
-                return 0.0
-
-            if isinstance(created_at, str):
-                created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-
-            days_old = (datetime.now() - created_at).days
-            return max(0, 1 - (days_old / 30))  # Full score for recent, 0 after 30 days
-        except:
-            return 0.0
@@ -0,0 +1,567 @@
+"""
+Namespace sharding across multiple databases
+
+Each namespace lives on exactly one shard, chosen by a consistent-hash ring so
+adding a shard only moves a fraction of the namespaces. Explicit assignments
+(from configuration or written by ``rebalance_namespace``) take precedence over
+the ring and are persisted in the ``namespace_shards`` table of the first shard.
+"""
+
+import bisect
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..utils.events import MemoryEventBus, memory_events
+from ..utils.exceptions import DatabaseError
+from ..utils.pydantic_models import ProcessedLongTermMemory, UserContextProfile
+from .memory_edges import EDGES_TABLE, rebuild_memory_edges
+from .memory_stats import StatDeltas, reconcile_memory_stats
+from .models import ChatHistory, LongTermMemory, NamespaceShard, ShortTermMemory
+from .recent_memory_window import MemoryFingerprint, RecentMemoryWindow
+from .retention import RetentionConfig, RetentionEngine
+from .sqlalchemy_manager import SQLAlchemyDatabaseManager
+from .user_profiles import rebuild_user_profiles
+
+# Copied parents first (short-term memory references chat history)
+SHARDED_MODELS = (ChatHistory, ShortTermMemory, LongTermMemory)
+
+
+class ConsistentHashRing:
+    """Maps keys to shard names with virtual nodes for an even spread"""
+
+    def __init__(self, shard_names: List[str], vnodes: int = 64):
+        if not shard_names:
+            raise ValueError("At least one shard is required")
+        self.vnodes = vnodes
+        self._ring: List[Tuple[int, str]] = sorted(
+            (self._hash(f"{name}#{i}"), name)
+            for name in shard_names
+            for i in range(vnodes)
+        )
+        self._keys = [point for point, _ in self._ring]
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+    def get(self, key: str) -> str:
+        index = bisect.bisect(self._keys, self._hash(key)) % len(self._ring)
+        return self._ring[index][1]
+
+
+class ShardedDatabaseManager:
+    """
+    Routes every namespace-scoped operation to the namespace's shard
+
+    Presents the SQLAlchemyDatabaseManager interface used by Memori, so it can
+    be passed wherever a single database manager is expected.
+    """
+
+    def __init__(
+        self,
+        shards: Dict[str, str],
+        template: str = "basic",
+        schema_init: bool = True,
+        overrides: Optional[Dict[str, str]] = None,
+        vnodes: int = 64,
+        event_bus: Optional[MemoryEventBus] = None,
+        dedup_window_size: int = 20,
+        **manager_options: Any,
+    ):
+        """
+        Args:
+            shards: Shard name -> connection string; the first shard also
+                stores the namespace assignment table
+            template: Database template to use
+            schema_init: Initialize database schema on every shard
+            overrides: Namespace -> shard name assignments that bypass the ring
+            vnodes: Virtual nodes per shard on the hash ring
+            event_bus: Event bus shared by all shards
+            dedup_window_size: Recent memories kept per namespace for deduplication
+            **manager_options: Passed to each SQLAlchemyDatabaseManager
+        """
+        if not shards:
+            raise DatabaseError("ShardedDatabaseManager requires at least one shard")
+
+        self.event_bus = event_bus or memory_events
+        self.recent_memories = RecentMemoryWindow(dedup_window_size)
+        # One retention engine sweeps every shard (see enable_retention)
+        self.retention: Optional[RetentionEngine] = None
+        self.shards: Dict[str, SQLAlchemyDatabaseManager] = {}
+        for name, database_connect in shards.items():
+            manager = SQLAlchemyDatabaseManager(
+                database_connect,
+                template,
+                schema_init,
+                event_bus=self.event_bus,
+                dedup_window_size=dedup_window_size,
+                **manager_options,
+            )
+            # Namespaces never span shards, so one window serves them all
+            manager.recent_memories = self.recent_memories
+            self.shards[name] = manager
+
+        self.catalog_shard = next(iter(self.shards))
+        self.ring = ConsistentHashRing(list(self.shards), vnodes=vnodes)
+        self._config_overrides = dict(overrides or {})
+        self._assignments: Dict[str, str] = {}
+        self._validate_shard_names(self._config_overrides.values())
+        self._load_assignments()
+
+        logger.info(f"Initialized sharded database manager with {len(shards)} shards")
+
+    @property
+    def catalog(self) -> SQLAlchemyDatabaseManager:
+        return self.shards[self.catalog_shard]
+
+    @property
+    def database_type(self) -> str:
+        return self.catalog.database_type
+
+    def _validate_shard_names(self, names):
+        unknown = set(names) - set(self.shards)
+        if unknown:
+            raise DatabaseError(f"Unknown shard(s): {', '.join(sorted(unknown))}")
+
+    def _load_assignments(self):
+        """Read persisted namespace assignments from the catalog shard"""
+        try:
+            with self.catalog.SessionLocal() as session:
+                rows = session.query(NamespaceShard.namespace, NamespaceShard.shard)
+                assignments = {namespace: shard for namespace, shard in rows}
+        except SQLAlchemyError as e:
+            # The table does not exist until the schema is initialized
+            logger.debug(f"Namespace shard assignments not loaded: {e}")
+            return
+
+        stale = set(assignments.values()) - set(self.shards)
+        if stale:
+            logger.warning(
+                f"Ignoring namespace assignments to unknown shard(s): {sorted(stale)}"
+            )
+        self._assignments = {
+            namespace: shard
+            for namespace, shard in assignments.items()
+            if shard in self.shards
+        }
+
+    def shard_for(self, namespace: Optional[str] = None) -> str:
+        """Name of the shard holding a namespace"""
+        namespace = namespace or "default"
+        return (
+            self._config_overrides.get(namespace)
+            or self._assignments.get(namespace)
+            or self.ring.get(namespace)
+        )
+
+    def manager_for(self, namespace: Optional[str] = None) -> SQLAlchemyDatabaseManager:
+        """Database manager of the shard holding a namespace"""
+        return self.shards[self.shard_for(namespace)]
+
+    def assign_namespace(self, namespace: str, shard: str):
+        """Persist an explicit namespace -> shard assignment"""
+        self._validate_shard_names([shard])
+        with self.catalog.SessionLocal() as session:
+            try:
+                session.merge(
+                    NamespaceShard(
+                        namespace=namespace, shard=shard, updated_at=datetime.utcnow()
+                    )
+                )
+                session.commit()
+            except SQLAlchemyError as e:
+                session.rollback()
+                raise DatabaseError(f"Failed to assign namespace to shard: {e}")
+        self._assignments[namespace] = shard
+
+    def initialize_schema(self, force: bool = False):
+        """Initialize the schema on every shard"""
+        for manager in self.shards.values():
+            manager.initialize_schema(force=force)
+        self._load_assignments()
+
+    # Namespace-scoped operations
+
+    def store_chat_history(
+        self,
+        chat_id: str,
+        user_input: str,
+        ai_output: str,
+        model: str,
+        timestamp: datetime,
+        session_id: str,
+        namespace: str = "default",
+        tokens_used: int = 0,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        """Store chat history"""
+        return self.manager_for(namespace).store_chat_history(
+            chat_id=chat_id,
+            user_input=user_input,
+            ai_output=ai_output,
+            model=model,
+            timestamp=timestamp,
+            session_id=session_id,
+            namespace=namespace,
+            tokens_used=tokens_used,
+            metadata=metadata,
+        )
+
+    def get_chat_history(
+        self,
+        namespace: str = "default",
+        session_id: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Get chat history with optional session filtering"""
+        return self.manager_for(namespace).get_chat_history(
+            namespace=namespace, session_id=session_id, limit=limit
+        )
+
+    def iter_chat_history(
+        self,
+        namespace: str = "default",
+        session_id: Optional[str] = None,
+        batch_size: int = 500,
+        newest_first: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield a namespace's whole chat history in keyset-paginated batches"""
+        return self.manager_for(namespace).iter_chat_history(
+            namespace, session_id, batch_size=batch_size, newest_first=newest_first
+        )
+
+    def iter_memories(
+        self,
+        namespace: str = "default",
+        memory_type: str = "long_term",
+        batch_size: int = 500,
+        newest_first: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield every short_term or long_term memory of a namespace in batches"""
+        return self.manager_for(namespace).iter_memories(
+            namespace, memory_type, batch_size=batch_size, newest_first=newest_first
+        )
+
+    def store_long_term_memory_enhanced(
+        self, memory: ProcessedLongTermMemory, chat_id: str, namespace: str = "default"
+    ) -> str:
+        """Store a ProcessedLongTermMemory with enhanced schema"""
+        return self.manager_for(namespace).store_long_term_memory_enhanced(
+            memory, chat_id, namespace
+        )
+
+    def get_recent_memory_fingerprints(
+        self, namespace: str = "default"
+    ) -> List[MemoryFingerprint]:
+        """Get fingerprints of the most recent memories for duplicate detection"""
+        return self.manager_for(namespace).get_recent_memory_fingerprints(namespace)
+
+    def search_memories(
+        self,
+        query: str,
+        namespace: str = "default",
+        category_filter: Optional[List[str]] = None,
+        limit: int = 10,
+        expand_hops: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Search memories using the cross-database search service"""
+        return self.manager_for(namespace).search_memories(
+            query, namespace, category_filter, limit, expand_hops=expand_hops
+        )
+
+    def search_memories_many(
+        self,
+        queries: List[str],
+        namespace: str = "default",
+        category_filter: Optional[List[str]] = None,
+        limit: int = 10,
+    ) -> List[List[Dict[str, Any]]]:
+        """Run several searches on the namespace's shard; one result list per query"""
+        return self.manager_for(namespace).search_memories_many(
+            queries, namespace, category_filter, limit
+        )
+
+    def get_memory_stats(self, namespace: str = "default") -> Dict[str, Any]:
+        """Get comprehensive memory statistics"""
+        stats = self.manager_for(namespace).get_memory_stats(namespace)
+        stats["shard"] = self.shard_for(namespace)
+        return stats
+
+    def clear_memory(
+        self, namespace: str = "default", memory_type: Optional[str] = None
+    ):
+        """Clear memory data"""
+        return self.manager_for(namespace).clear_memory(namespace, memory_type)
+
+    def flush_writes(self, namespace: Optional[str] = None) -> int:
+        """Commit rows held by the write buffer of one or all shards"""
+        if namespace is not None:
+            return self.manager_for(namespace).flush_writes(namespace)
+        return sum(manager.flush_writes() for manager in self.shards.values())
+
+    def _get_connection(self, read_only: bool = False, namespace: Optional[str] = None):
+        """Raw connection to the shard holding a namespace"""
+        return self.manager_for(namespace)._get_connection(
+            read_only=read_only, namespace=namespace
+        )
+
+    def _record_write(self, namespace: Optional[str] = None):
+        self.manager_for(namespace)._record_write(namespace)
+
+    def _apply_stat_deltas(self, conn, deltas: StatDeltas):
+        """Apply counter deltas on the connection's shard (one namespace per call)"""
+        namespaces = deltas.namespaces
+        if namespaces:
+            self.manager_for(namespaces[0])._apply_stat_deltas(conn, deltas)
+
+    @property
+    def user_profiles_enabled(self) -> bool:
+        """Whether every shard has the user_context_profiles table"""
+        return all(manager.user_profiles_enabled for manager in self.shards.values())
+
+    def _update_user_profile(self, conn, namespace: str, rows: List[Dict[str, Any]]):
+        self.manager_for(namespace)._update_user_profile(conn, namespace, rows)
+
+    def _invalidate_user_profile(self, namespace: Optional[str] = None):
+        if namespace is not None:
+            self.manager_for(namespace)._invalidate_user_profile(namespace)
+            return
+        for manager in self.shards.values():
+            manager._invalidate_user_profile()
+
+    def get_user_profile(
+        self, namespace: str = "default"
+    ) -> Optional[UserContextProfile]:
+        """Materialized conscious context of a namespace"""
+        return self.manager_for(namespace).get_user_profile(namespace)
+
+    def get_user_context_prompt(self, namespace: str = "default") -> str:
+        """Cached context lines of a namespace's profile"""
+        return self.manager_for(namespace).get_user_context_prompt(namespace)
+
+    def rebuild_user_profiles(self, namespace: Optional[str] = None) -> int:
+        """Recompute user context profiles of one namespace, or of every shard"""
+        if namespace is not None:
+            return self.manager_for(namespace).rebuild_user_profiles(namespace)
+        return sum(manager.rebuild_user_profiles() for manager in self.shards.values())
+
+    def reconcile_memory_stats(self, namespace: Optional[str] = None) -> Dict[str, Any]:
+        """Recompute memory_stats counters of one namespace, or of every shard"""
+        if namespace is not None:
+            return self.manager_for(namespace).reconcile_memory_stats(namespace)
+        totals: Dict[str, Any] = {"namespaces": 0, "corrected": []}
+        for manager in self.shards.values():
+            report = manager.reconcile_memory_stats()
+            totals["namespaces"] += report["namespaces"]
+            totals["corrected"].extend(report["corrected"])
+        return totals
+
+    def rebuild_memory_edges(self, namespace: Optional[str] = None) -> int:
+        """Re-derive memory_edges of one namespace, or of every shard"""
+        if namespace is not None:
+            return self.manager_for(namespace).rebuild_memory_edges(namespace)
+        return sum(manager.rebuild_memory_edges() for manager in self.shards.values())
+
+    # Shard-wide operations
+
+    def enable_change_notifications(self, poll_interval: float = 1.0):
+        """Relay memory write events to and from other processes on every shard"""
+        for manager in self.shards.values():
+            manager.enable_change_notifications(poll_interval=poll_interval)
+
+    def rebuild_search_index(
+        self, namespace: Optional[str] = None, batch_size: int = 1000
+    ) -> Dict[str, int]:
+        """Rebuild search entries of one namespace, or of every shard"""
+        if namespace is not None:
+            return self.manager_for(namespace).rebuild_search_index(
+                namespace, batch_size
+            )
+        totals: Dict[str, int] = {}
+        for manager in self.shards.values():
+            for key, value in manager.rebuild_search_index(None, batch_size).items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def enable_search_index_maintenance(
+        self, interval_seconds: float = 24 * 3600, merge_pages: int = 500
+    ):
+        """Optimize the search index of every shard periodically"""
+        for manager in self.shards.values():
+            manager.enable_search_index_maintenance(interval_seconds, merge_pages)
+
+    def enable_retention(
+        self, config: Optional[RetentionConfig] = None
+    ) -> RetentionEngine:
+        """Periodically run one retention engine over every shard"""
+        if self.retention is None:
+            self.retention = RetentionEngine(self, config)
+            self.retention.start()
+            logger.info(
+                f"Memory retention enabled on {len(self.shards)} shards "
+                f"(every {self.retention.config.interval_seconds}s)"
+            )
+        return self.retention
+
+    def enable_stats_reconcile(self, interval_seconds: float = 24 * 3600):
+        """Periodically repair memory_stats drift on every shard"""
+        for manager in self.shards.values():
+            manager.enable_stats_reconcile(interval_seconds)
+
+    def run_retention(self, config: Optional[RetentionConfig] = None) -> Dict[str, Any]:
+        """Run one retention pass over every shard; returns reclaimed rows summed over shards"""
+        if self.retention is not None and config in (None, self.retention.config):
+            return self.retention.run_once()
+        return RetentionEngine(self, config).run_once()
+
+    def get_pool_metrics(self) -> Dict[str, Any]:
+        """Connection pool metrics per shard"""
+        return {
+            name: manager.get_pool_metrics() for name, manager in self.shards.items()
+        }
+
+    def get_database_info(self) -> Dict[str, Any]:
+        """Database information per shard"""
+        return {
+            "sharded": True,
+            "catalog_shard": self.catalog_shard,
+            "shards": {
+                name: manager.get_database_info()
+                for name, manager in self.shards.items()
+            },
+        }
+
+    def close(self):
+        """Close database connections of every shard"""
+        if self.retention is not None:
+            self.retention.stop()
+        error = None
+        for manager in self.shards.values():
+            try:
+                manager.close()
+            except DatabaseError as e:
+                error = e
+        if error is not None:
+            raise error
+
+    # Rebalancing
+
+    def rebalance_namespace(
+        self,
+        namespace: str,
+        target_shard: str,
+        batch_size: int = 500,
+        delete_source: bool = True,
+    ) -> Dict[str, int]:
+        """
+        Move a namespace's rows to another shard
+
+        Meant to run offline (no writers on the namespace). Rows are copied in
+        primary-key order in batches, the namespace is then assigned to the
+        target shard and finally removed from the source. Rows the target
+        already holds for the namespace (from an interrupted run) are replaced.
+
+        Returns:
+            Rows copied per table
+        """
+        self._validate_shard_names([target_shard])
+        source_shard = self.shard_for(namespace)
+        copied = {model.__tablename__: 0 for model in SHARDED_MODELS}
+        if source_shard == target_shard:
+            logger.info(
+                f"Namespace '{namespace}' already lives on shard {target_shard}"
+            )
+            return copied
+
+        source = self.shards[source_shard]
+        target = self.shards[target_shard]
+        source.flush_writes(namespace)
+
+        try:
+            self._delete_namespace_rows(target.engine, namespace, batch_size)
+            for model in SHARDED_MODELS:
+                copied[model.__tablename__] = self._copy_namespace_rows(
+                    model.__table__, source.engine, target.engine, namespace, batch_size
+                )
+
+            self.assign_namespace(namespace, target_shard)
+
+            if delete_source:
+                self._delete_namespace_rows(source.engine, namespace, batch_size)
+
+            # Rows were moved with bulk statements; recount on both shards
+            for manager in (source, target):
+                if manager.stats_counters_enabled:
+                    reconcile_memory_stats(manager.engine, namespace)
+                if manager.memory_edges_enabled:
+                    # Derived from the moved rows rather than copied
+                    with manager.engine.begin() as conn:
+                        conn.execute(
+                            delete(EDGES_TABLE).where(
+                                EDGES_TABLE.c.namespace == namespace
+                            )
+                        )
+                    rebuild_memory_edges(manager.engine, namespace)
+                if manager.user_profiles_enabled:
+                    rebuild_user_profiles(
+                        manager.engine, namespace, manager.profile_max_facts
+                    )
+                    manager._invalidate_user_profile(namespace)
+        except SQLAlchemyError as e:
+            raise DatabaseError(
+                f"Failed to move namespace '{namespace}' from {source_shard} to {target_shard}: {e}"
+            )
+
+        self.recent_memories.reset(namespace)
+        logger.info(
+            f"Moved namespace '{namespace}' from {source_shard} to {target_shard}: {copied}"
+        )
+        return copied
+
+    @staticmethod
+    def _copy_namespace_rows(
+        table, source_engine, target_engine, namespace, batch_size
+    ):
+        pk = next(iter(table.primary_key.columns))
+        copied = 0
+        last_key = None
+        while True:
+            query = select(table).where(table.c.namespace == namespace)
+            if last_key is not None:
+                query = query.where(pk > last_key)
+            query = query.order_by(pk).limit(batch_size)
+
+            with source_engine.connect() as conn:
+                rows = [dict(row._mapping) for row in conn.execute(query)]
+            if not rows:
+                return copied
+
+            with target_engine.begin() as conn:
+                conn.execute(insert(table), rows)
+            copied += len(rows)
+            last_key = rows[-1][pk.name]
+
+    @staticmethod
+    def _delete_namespace_rows(engine, namespace, batch_size):
+        # Children first so foreign keys never point at deleted chat history
+        for model in reversed(SHARDED_MODELS):
+            table = model.__table__
+            pk = next(iter(table.primary_key.columns))
+            while True:
+                with engine.begin() as conn:
+                    keys = [
+                        row[0]
+                        for row in conn.execute(
+                            select(pk)
+                            .where(table.c.namespace == namespace)
+                            .limit(batch_size)
+                        )
+                    ]
+                    if not keys:
+                        break
+                    conn.execute(delete(table).where(pk.in_(keys)))
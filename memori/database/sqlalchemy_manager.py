@@ -6,63 +6,256 @@ Replaces the existing database.py with cross-database compatibility
 import importlib.util
 import json
 import ssl
+import time
 import uuid
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import IO, Any, Dict, Iterator, List, Optional, Union
 from urllib.parse import parse_qs, urlparse
 
 from loguru import logger
-from sqlalchemy import create_engine, func, text
+from sqlalchemy import bindparam, create_engine, func, inspect, select, text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import sessionmaker
 
+from ..utils.events import MEMORY_PROMOTION_ELIGIBLE, MemoryEventBus, memory_events
 from ..utils.exceptions import DatabaseError
 from ..utils.pydantic_models import (
     ProcessedLongTermMemory,
+    UserContextProfile,
 )
+from ..utils.registry import SharedResourceRegistry
+from .access_recorder import AccessRecorder
 from .auto_creator import DatabaseAutoCreator
+from .export import export_jsonl, import_jsonl, iter_table_rows
+from .index_advisor import advise_indexes, create_missing_indexes
+from .memory_edges import (
+    EDGES_TABLE,
+    MAX_HOPS,
+    delete_edges,
+    edge_rows,
+    insert_edges,
+)
+from .memory_edges import rebuild_memory_edges as rebuild_edges
+from .memory_stats import (
+    STATS_TABLE,
+    MemoryStatsReconciler,
+    StatDeltas,
+    read_memory_stats,
+    reconcile_memory_stats,
+    reset_memory_stats,
+)
 from .models import (
     Base,
     ChatHistory,
     LongTermMemory,
     ShortTermMemory,
 )
+from .notifiers import ChangeNotifier, create_change_notifier
+from .pool_metrics import InstrumentedQueuePool, get_pool_metrics
 from .query_translator import QueryParameterTranslator
+from .recent_memory_window import MemoryFingerprint, RecentMemoryWindow
+from .replica_router import ReplicaRouter
+from .retention import RetentionConfig, RetentionEngine
+from .schema_version import record_schema_state, schema_is_current
+from .scoring import ScoringConfig, install_sqlite_functions
+from .search_index import (
+    SearchIndexMaintenance,
+    rebuild_search_index,
+    setup_sqlite_search_index,
+)
 from .search_service import SearchService
+from .sqlite_profile import SQLiteMaintenance, SQLiteProfile, apply_sqlite_profile
+from .storage_codec import ProcessedDataCodec, lazy_processed_data
+from .user_profiles import (
+    DEFAULT_MAX_FACTS,
+    PROFILES_TABLE,
+    PROMPT_CACHE_SECONDS,
+    delete_user_profile,
+    load_profile,
+    read_profile_row,
+    rebuild_user_profiles,
+    update_user_profile,
+)
+from .write_buffer import WriteBehindBuffer
+
+CHAT_HISTORY_COLUMNS = (
+    "chat_id",
+    "user_input",
+    "ai_output",
+    "model",
+    "timestamp",
+    "session_id",
+    "namespace",
+    "tokens_used",
+    "metadata_json",
+)
+
+
+@lru_cache(maxsize=None)
+def _chat_history_statement(with_session: bool):
+    """Latest chat history of a namespace (or session), built once per shape"""
+    table = ChatHistory.__table__
+    statement = select(*(table.c[name] for name in CHAT_HISTORY_COLUMNS)).where(
+        table.c.namespace == bindparam("namespace")
+    )
+    if with_session:
+        statement = statement.where(table.c.session_id == bindparam("session_id"))
+    return statement.order_by(table.c.timestamp.desc()).limit(bindparam("limit"))
+
+
+class _SharedEngine:
+    """An engine and its SQLite maintenance thread, shared between managers"""
+
+    def __init__(self, engine, maintenance: Optional[SQLiteMaintenance]):
+        self.engine = engine
+        self.maintenance = maintenance
+
+    def dispose(self):
+        if self.maintenance is not None:
+            self.maintenance.stop()
+        self.engine.dispose()
+
+
+# Engines shared by every manager in the process with the same URL and options
+engine_registry = SharedResourceRegistry("engine", _SharedEngine.dispose)
 
 
 class SQLAlchemyDatabaseManager:
     """SQLAlchemy-based database manager with cross-database support"""
 
     def __init__(
-        self, database_connect: str, template: str = "basic", schema_init: bool = True
+        self,
+        database_connect: str,
+        template: str = "basic",
+        schema_init: bool = True,
+        write_buffer: bool = False,
+        write_buffer_flush_interval_ms: int = 50,
+        write_buffer_max_rows: int = 100,
+        event_bus: Optional[MemoryEventBus] = None,
+        dedup_window_size: int = 20,
+        sqlite_profile: Union[SQLiteProfile, Dict[str, Any], bool, None] = None,
+        pool_size: int = 10,
+        max_overflow: int = 20,
+        pool_timeout: float = 30,
+        pool_pre_ping: bool = True,
+        pool_use_lifo: bool = False,
+        pool_recycle: int = 3600,
+        read_replicas: Optional[List[str]] = None,
+        replica_strategy: str = "round_robin",
+        read_your_writes_seconds: float = 5.0,
+        storage_codec: Union[str, ProcessedDataCodec, None] = None,
+        shared_engine: bool = True,
+        access_tracking: bool = True,
+        access_flush_interval_ms: int = 1000,
+        scoring: Union[ScoringConfig, Dict[str, Any], None] = None,
+        related_memory_hops: int = 0,
+        profile_max_facts: int = DEFAULT_MAX_FACTS,
     ):
         self.database_connect = database_connect
         self.template = template
         self.schema_init = schema_init
+        self.sqlite_profile = SQLiteProfile.from_config(sqlite_profile)
+        self.sqlite_maintenance: Optional[SQLiteMaintenance] = None
+        # Share engines (and pools) with other managers in this process
+        self.shared_engine = shared_engine
+        self._engine_keys: List[tuple] = []
+        # Opt-in compact encoding of processed_data (see storage_codec)
+        self.storage_codec = ProcessedDataCodec.from_spec(storage_codec)
+        # Weights and half-lives of the search ranking score (see scoring)
+        self.scoring = ScoringConfig.from_config(scoring)
+        # Default related-memory expansion of searches (see memory_edges)
+        if not 0 <= related_memory_hops <= MAX_HOPS:
+            raise ValueError(f"related_memory_hops must be between 0 and {MAX_HOPS}")
+        self.related_memory_hops = related_memory_hops
+        # Facts kept in each materialized user context profile (see user_profiles)
+        if profile_max_facts < 1:
+            raise ValueError("profile_max_facts must be at least 1")
+        self.profile_max_facts = profile_max_facts
+
+        # Connection pool options for server databases (MySQL/PostgreSQL)
+        self.pool_options = {
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": pool_timeout,
+            "pool_pre_ping": pool_pre_ping,
+            "pool_use_lifo": pool_use_lifo,
+            "pool_recycle": pool_recycle,
+        }
 
         # Initialize database auto-creator
         self.auto_creator = DatabaseAutoCreator(schema_init)
 
-        # Ensure database exists (create if necessary)
-        self.database_connect = self.auto_creator.ensure_database_exists(
-            database_connect
-        )
-
-        # Parse connection string and create engine
-        self.engine = self._create_engine(self.database_connect)
+        # Connect first; the database only needs creating (an extra server
+        # round trip) when the connection fails
+        try:
+            self.engine = self._acquire_engine(self.database_connect)
+        except DatabaseError:
+            if not schema_init:
+                raise
+            self.database_connect = self.auto_creator.ensure_database_exists(
+                database_connect
+            )
+            self.engine = self._acquire_engine(self.database_connect)
         self.database_type = self.engine.dialect.name
 
         # Create session factory
         self.SessionLocal = sessionmaker(bind=self.engine)
 
+        # Optional read replicas; writes always go to self.engine
+        self.replica_router = self._create_replica_router(
+            read_replicas or [], replica_strategy, read_your_writes_seconds
+        )
+
         # Initialize search service
         self._search_service = None
 
         # Initialize query parameter translator for cross-database compatibility
         self.query_translator = QueryParameterTranslator(self.database_type)
 
+        # Memory write events (promotion candidates) and optional relay to
+        # other processes sharing this database
+        self.event_bus = event_bus or memory_events
+        self.change_notifier: Optional[ChangeNotifier] = None
+
+        # Background expiry and capacity enforcement (see enable_retention)
+        self.retention: Optional[RetentionEngine] = None
+        self.search_index_maintenance: Optional[SearchIndexMaintenance] = None
+        self.stats_reconciler: Optional[MemoryStatsReconciler] = None
+
+        # Whether the memory_stats counters table exists (checked lazily)
+        self._stats_counters: Optional[bool] = None
+        # Whether the memory_edges table exists (checked lazily)
+        self._memory_edges: Optional[bool] = None
+        # Whether the user_context_profiles table exists (checked lazily)
+        self._user_profiles: Optional[bool] = None
+        # Rendered conscious context per namespace: (context, cached at)
+        self._profile_prompts: Dict[str, tuple] = {}
+        self._profile_generation = 0
+
+        # Recent memory fingerprints per namespace for duplicate detection
+        self.recent_memories = RecentMemoryWindow(dedup_window_size)
+
+        # Optional group-commit buffer for chat history and memory inserts
+        self.write_buffer: Optional[WriteBehindBuffer] = None
+        if write_buffer:
+            self.write_buffer = WriteBehindBuffer(
+                self.SessionLocal,
+                flush_interval_ms=write_buffer_flush_interval_ms,
+                max_batch_rows=write_buffer_max_rows,
+                on_flush=self._on_buffered_flush,
+                on_commit=self._on_buffered_commit,
+            )
+
+        # Batched access_count/last_accessed updates for returned search results
+        self.access_recorder: Optional[AccessRecorder] = None
+        if access_tracking:
+            self.access_recorder = AccessRecorder(
+                self.engine, flush_interval_ms=access_flush_interval_ms
+            )
+
         logger.info(f"Initialized SQLAlchemy database manager for {self.database_type}")
 
     def _validate_database_dependencies(self, database_connect: str):
@@ -144,6 +337,13 @@ class SQLAlchemyDatabaseManager:
                     },
                 )
 
+                # WAL, cache and mmap PRAGMAs on every pooled connection
+                if self.sqlite_profile is not None:
+                    self.sqlite_maintenance = apply_sqlite_profile(
+                        engine, self.sqlite_profile
+                    )
+                install_sqlite_functions(engine)
+
             elif database_connect.startswith("mysql:") or database_connect.startswith(
                 "mysql+"
             ):
@@ -206,8 +406,7 @@ class SQLAlchemyDatabaseManager:
                     json_deserializer=json.loads,
                     echo=False,
                     connect_args=connect_args,
-                    pool_pre_ping=True,  # Validate connections
-                    pool_recycle=3600,  # Recycle connections every hour
+                    **self.pool_options,
                 )
 
             elif database_connect.startswith(
@@ -219,8 +418,7 @@ class SQLAlchemyDatabaseManager:
                     json_serializer=json.dumps,
                     json_deserializer=json.loads,
                     echo=False,
-                    pool_pre_ping=True,
-                    pool_recycle=3600,
+                    **self.pool_options,
                 )
 
             else:
@@ -261,14 +459,125 @@ class SQLAlchemyDatabaseManager:
         except Exception as e:
             raise DatabaseError(f"Failed to create database engine: {e}")
 
-    def initialize_schema(self):
-        """Initialize database schema"""
+    def _acquire_engine(self, database_connect: str):
+        """Engine for a URL, shared with other managers when shared_engine is set"""
+        if not self.shared_engine:
+            engine = self._create_engine(database_connect)
+            if self.sqlite_maintenance is not None:
+                self.sqlite_maintenance.start()
+            return engine
+
+        key = (
+            database_connect,
+            tuple(sorted(self.pool_options.items(), key=lambda item: item[0])),
+            repr(self.sqlite_profile),
+        )
+
+        def create() -> _SharedEngine:
+            engine = self._create_engine(database_connect)
+            if self.sqlite_maintenance is not None:
+                self.sqlite_maintenance.start()
+            return _SharedEngine(engine, self.sqlite_maintenance)
+
+        shared = engine_registry.acquire(key, create)
+        self._engine_keys.append(key)
+        if shared.maintenance is not None:
+            self.sqlite_maintenance = shared.maintenance
+        return shared.engine
+
+    def _release_engines(self):
+        """Drop this manager's references to shared engines"""
+        keys, self._engine_keys = self._engine_keys, []
+        for key in keys:
+            engine_registry.release(key)
+
+    def _create_replica_router(
+        self,
+        read_replicas: List[str],
+        strategy: str,
+        read_your_writes_seconds: float,
+    ) -> ReplicaRouter:
+        """Create engines for read replicas and the router choosing between them"""
+        if read_replicas and self.database_type == "sqlite":
+            logger.warning("Read replicas are not supported for SQLite, ignoring them")
+            read_replicas = []
+
+        replicas = [self._acquire_engine(url) for url in read_replicas]
+        if replicas:
+            logger.info(f"Routing reads to {len(replicas)} replica(s) using {strategy}")
+        return ReplicaRouter(
+            self.engine,
+            replicas,
+            strategy=strategy,
+            read_your_writes_seconds=read_your_writes_seconds,
+        )
+
+    def _read_session(self, namespace: Optional[str] = None):
+        """Session bound to the engine chosen for a read-only operation"""
+        return self.SessionLocal(bind=self.replica_router.read_engine(namespace))
+
+    def _record_write(self, namespace: Optional[str] = None):
+        """Keep the namespace's reads on the primary while replicas catch up"""
+        self.replica_router.record_write(namespace)
+
+    def initialize_schema(self, force: bool = False):
+        """
+        Initialize database schema
+
+        Startup reads the recorded schema fingerprint and skips all DDL when
+        it matches this library version. ``force`` re-applies the DDL anyway.
+        """
+        if not force and schema_is_current(self.engine):
+            self._stats_counters = True
+            self._memory_edges = True
+            self._user_profiles = True
+            logger.debug(f"Database schema is current for {self.database_type}")
+            return
+        self.migrate_schema()
+
+    def migrate_schema(self):
+        """Apply tables, indexes and full-text setup, then record the schema version"""
         try:
+            inspector = inspect(self.engine)
+            had_stats_table = inspector.has_table(STATS_TABLE.name)
+            had_edges_table = inspector.has_table(EDGES_TABLE.name)
+            had_profiles_table = inspector.has_table(PROFILES_TABLE.name)
+
             # Create all tables
             Base.metadata.create_all(bind=self.engine)
+            self._stats_counters = True
+            self._memory_edges = True
+            self._user_profiles = True
+            if not had_stats_table:
+                # Seed the counters for data written before they existed
+                reconcile_memory_stats(self.engine)
+            if not had_edges_table:
+                # Normalize relations of memories stored before the table existed
+                rebuild_edges(self.engine)
+            if not had_profiles_table:
+                # Materialize the conscious context promoted so far
+                rebuild_user_profiles(self.engine, max_facts=self.profile_max_facts)
+
+            # Tables created by older versions lack newer composite indexes
+            complete = True
+            try:
+                create_missing_indexes(self.engine)
+            except SQLAlchemyError as e:
+                logger.warning(f"Failed to create missing indexes: {e}")
+                complete = False
 
             # Setup database-specific features
-            self._setup_database_features()
+            complete = self._setup_database_features() and complete
+
+            if not complete:
+                # Without a recorded version the next startup retries the DDL
+                logger.warning(
+                    f"Database schema setup incomplete for {self.database_type}; "
+                    "not recording the schema version"
+                )
+                return
+
+            record_schema_state(self.engine)
 
             logger.info(
                 f"Database schema initialized successfully for {self.database_type}"
@@ -278,96 +587,61 @@ class SQLAlchemyDatabaseManager:
             logger.error(f"Failed to initialize schema: {e}")
             raise DatabaseError(f"Failed to initialize schema: {e}")
 
-    def _setup_database_features(self):
-        """Setup database-specific features like full-text search"""
+    def _setup_database_features(self) -> bool:
+        """Setup database-specific features like full-text search; True on success"""
         try:
             with self.engine.connect() as conn:
+                completed = True
                 if self.database_type == "sqlite":
-                    self._setup_sqlite_fts(conn)
+                    completed = self._setup_sqlite_fts(conn)
                 elif self.database_type == "mysql":
-                    self._setup_mysql_fulltext(conn)
+                    completed = self._setup_mysql_fulltext(conn)
                 elif self.database_type == "postgresql":
-                    self._setup_postgresql_fts(conn)
+                    completed = self._setup_postgresql_fts(conn)
 
                 conn.commit()
+                return completed
 
         except Exception as e:
             logger.warning(f"Failed to setup database-specific features: {e}")
+            return False
 
-    def _setup_sqlite_fts(self, conn):
-        """Setup SQLite FTS5"""
+    def _setup_sqlite_fts(self, conn) -> bool:
+        """Setup SQLite FTS5 with insert, update and delete triggers"""
         try:
-            # Create FTS5 virtual table
-            conn.execute(
-                text(
-                    """
-                CREATE VIRTUAL TABLE IF NOT EXISTS memory_search_fts USING fts5(
-                    memory_id,
-                    memory_type,
-                    namespace,
-                    searchable_content,
-                    summary,
-                    category_primary,
-                    content='',
-                    contentless_delete=1
-                )
-            """
-                )
-            )
-
-            # Create triggers
-            conn.execute(
-                text(
-                    """
-                CREATE TRIGGER IF NOT EXISTS short_term_memory_fts_insert AFTER INSERT ON short_term_memory
-                BEGIN
-                    INSERT INTO memory_search_fts(memory_id, memory_type, namespace, searchable_content, summary, category_primary)
-                    VALUES (NEW.memory_id, 'short_term', NEW.namespace, NEW.searchable_content, NEW.summary, NEW.category_primary);
-                END
-            """
-                )
-            )
-
-            conn.execute(
-                text(
-                    """
-                CREATE TRIGGER IF NOT EXISTS long_term_memory_fts_insert AFTER INSERT ON long_term_memory
-                BEGIN
-                    INSERT INTO memory_search_fts(memory_id, memory_type, namespace, searchable_content, summary, category_primary)
-                    VALUES (NEW.memory_id, 'long_term', NEW.namespace, NEW.searchable_content, NEW.summary, NEW.category_primary);
-                END
-            """
-                )
-            )
-
+            setup_sqlite_search_index(conn)
             logger.info("SQLite FTS5 setup completed")
+            return True
 
         except Exception as e:
             logger.warning(f"SQLite FTS5 setup failed: {e}")
+            return False
 
-    def _setup_mysql_fulltext(self, conn):
+    def _setup_mysql_fulltext(self, conn) -> bool:
         """Setup MySQL FULLTEXT indexes"""
         try:
-            # Create FULLTEXT indexes
-            conn.execute(
-                text(
-                    "ALTER TABLE short_term_memory ADD FULLTEXT INDEX ft_short_term_search (searchable_content, summary)"
-                )
-            )
-            conn.execute(
-                text(
-                    "ALTER TABLE long_term_memory ADD FULLTEXT INDEX ft_long_term_search (searchable_content, summary)"
+            inspector = inspect(conn)
+            for table, index in (
+                ("short_term_memory", "ft_short_term_search"),
+                ("long_term_memory", "ft_long_term_search"),
+            ):
+                # MySQL has no ADD INDEX IF NOT EXISTS
+                if any(ix["name"] == index for ix in inspector.get_indexes(table)):
+                    continue
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {table} ADD FULLTEXT INDEX {index} (searchable_content, summary)"
+                    )
                 )
-            )
 
             logger.info("MySQL FULLTEXT indexes setup completed")
+            return True
 
         except Exception as e:
-            logger.warning(
-                f"MySQL FULLTEXT setup failed (indexes may already exist): {e}"
-            )
+            logger.warning(f"MySQL FULLTEXT setup failed: {e}")
+            return False
 
-    def _setup_postgresql_fts(self, conn):
+    def _setup_postgresql_fts(self, conn) -> bool:
         """Setup PostgreSQL full-text search"""
         try:
             # Add tsvector columns
@@ -420,15 +694,234 @@ class SQLAlchemyDatabaseManager:
             )
 
             logger.info("PostgreSQL FTS setup completed")
+            return True
 
         except Exception as e:
             logger.warning(f"PostgreSQL FTS setup failed: {e}")
+            return False
 
-    def _get_search_service(self) -> SearchService:
+    def _get_search_service(self, namespace: Optional[str] = None) -> SearchService:
         """Get search service instance with fresh session"""
         # Always create a new session to avoid stale connections
-        session = self.SessionLocal()
-        return SearchService(session, self.database_type)
+        session = self._read_session(namespace)
+        return SearchService(
+            session, self.database_type, self.scoring, self.memory_edges_enabled
+        )
+
+    def flush_writes(self, namespace: Optional[str] = None) -> int:
+        """
+        Commit rows held by the write buffer.
+
+        Args:
+            namespace: Only flush this namespace's rows; other namespaces
+                keep waiting for their group commit
+
+        Returns:
+            Number of rows written
+        """
+        if self.write_buffer is None:
+            return 0
+        if not self.write_buffer.has_pending(namespace):
+            return 0
+        return self.write_buffer.flush(namespace)
+
+    def enable_change_notifications(self, poll_interval: float = 1.0):
+        """
+        Relay memory write events to and from other processes.
+
+        Uses LISTEN/NOTIFY on PostgreSQL and a polled change-sequence table
+        on SQLite/MySQL.
+
+        Args:
+            poll_interval: Seconds between change-table polls (SQLite/MySQL)
+        """
+        if self.change_notifier is not None:
+            return self.change_notifier
+
+        self.change_notifier = create_change_notifier(
+            self.engine, self.event_bus, poll_interval=poll_interval
+        )
+        self.change_notifier.start()
+        logger.info(
+            f"Cross-process memory notifications enabled ({type(self.change_notifier).__name__})"
+        )
+        return self.change_notifier
+
+    def enable_retention(
+        self, config: Optional[RetentionConfig] = None
+    ) -> RetentionEngine:
+        """
+        Periodically delete expired short-term memories and evict memories of
+        namespaces above their capacity.
+
+        Args:
+            config: Capacity limits, batch size and sweep interval
+        """
+        if self.retention is None:
+            self.retention = RetentionEngine(self, config)
+            self.retention.start()
+            logger.info(
+                f"Memory retention enabled (every {self.retention.config.interval_seconds}s)"
+            )
+        return self.retention
+
+    def run_retention(self, config: Optional[RetentionConfig] = None) -> Dict[str, Any]:
+        """
+        Run one retention pass now
+
+        Returns:
+            Rows reclaimed per category (expired_short_term, evicted_short_term,
+            evicted_long_term) and the pass duration
+        """
+        if self.retention is not None and config in (None, self.retention.config):
+            return self.retention.run_once()
+        return RetentionEngine(self, config).run_once()
+
+    def rebuild_search_index(
+        self, namespace: Optional[str] = None, batch_size: int = 1000
+    ) -> Dict[str, int]:
+        """
+        Rebuild full-text search entries from the memory tables
+
+        Args:
+            namespace: Only rebuild this namespace (all namespaces if None)
+            batch_size: Rows re-indexed per transaction
+
+        Returns:
+            Rows re-indexed per memory type
+        """
+        self.flush_writes(namespace)
+        try:
+            return rebuild_search_index(
+                self.engine, self.database_type, namespace, batch_size
+            )
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Failed to rebuild search index: {e}")
+
+    def advise_indexes(self, namespace: str = "default") -> List[Dict[str, Any]]:
+        """
+        EXPLAIN the hot queries and report full table scans and unindexed sorts
+
+        Returns:
+            One report per query (query, plan, full_scans, sorts), then a
+            ``redundant_indexes`` report listing prefix-duplicate indexes
+        """
+        return advise_indexes(self.engine, namespace)
+
+    def enable_search_index_maintenance(
+        self, interval_seconds: float = 24 * 3600, merge_pages: int = 500
+    ) -> SearchIndexMaintenance:
+        """
+        Periodically optimize the full-text search index
+
+        Args:
+            interval_seconds: Seconds between maintenance runs
+            merge_pages: FTS5 pages merged per run (SQLite)
+        """
+        if self.search_index_maintenance is None:
+            self.search_index_maintenance = SearchIndexMaintenance(
+                self.engine,
+                self.database_type,
+                interval_seconds=interval_seconds,
+                merge_pages=merge_pages,
+            )
+            self.search_index_maintenance.start()
+        return self.search_index_maintenance
+
+    @staticmethod
+    def _is_promotion_candidate(row: Dict[str, Any]) -> bool:
+        """Check whether a long_term_memory row may be promoted to short-term"""
+        return bool(
+            row.get("promotion_eligible")
+            or row.get("classification") == "conscious-info"
+        )
+
+    def _notify_remote(self, row: Dict[str, Any]):
+        """Announce a committed promotion candidate to other processes"""
+        if self.change_notifier is None or not self._is_promotion_candidate(row):
+            return
+        try:
+            self.change_notifier.notify(
+                MEMORY_PROMOTION_ELIGIBLE, row["namespace"], row["memory_id"]
+            )
+        except Exception as e:
+            logger.warning(f"Failed to send cross-process memory notification: {e}")
+
+    @property
+    def stats_counters_enabled(self) -> bool:
+        """Whether writes maintain the memory_stats counters"""
+        if self._stats_counters is None:
+            try:
+                self._stats_counters = inspect(self.engine).has_table(STATS_TABLE.name)
+            except SQLAlchemyError:
+                self._stats_counters = False
+        return self._stats_counters
+
+    @property
+    def memory_edges_enabled(self) -> bool:
+        """Whether the memory_edges table exists"""
+        if self._memory_edges is None:
+            try:
+                self._memory_edges = inspect(self.engine).has_table(EDGES_TABLE.name)
+            except SQLAlchemyError:
+                self._memory_edges = False
+        return self._memory_edges
+
+    def _insert_memory_edges(self, conn, rows: List[Dict[str, Any]]):
+        """Write the relations of new long-term memories in the caller's transaction"""
+        if rows and self.memory_edges_enabled:
+            insert_edges(conn, edge_rows(rows))
+
+    def _delete_memory_edges(self, conn, rows: List[Dict[str, Any]]):
+        """Drop edges of deleted long-term memories in the caller's transaction"""
+        if rows and self.memory_edges_enabled:
+            delete_edges(conn, rows)
+
+    @property
+    def user_profiles_enabled(self) -> bool:
+        """Whether the user_context_profiles table exists"""
+        if self._user_profiles is None:
+            try:
+                self._user_profiles = inspect(self.engine).has_table(
+                    PROFILES_TABLE.name
+                )
+            except SQLAlchemyError:
+                self._user_profiles = False
+        return self._user_profiles
+
+    def _update_user_profile(self, conn, namespace: str, rows: List[Dict[str, Any]]):
+        """Merge promoted short-term memories into the profile in the caller's transaction"""
+        if rows and self.user_profiles_enabled:
+            update_user_profile(conn, namespace, rows, self.profile_max_facts)
+
+    def _invalidate_user_profile(self, namespace: Optional[str] = None):
+        """Drop cached context (of one namespace, or all) once a profile change is committed"""
+        self._profile_generation += 1
+        if namespace is None:
+            self._profile_prompts.clear()
+        else:
+            self._profile_prompts.pop(namespace, None)
+
+    def _apply_stat_deltas(self, conn, deltas: StatDeltas):
+        """Update the memory_stats counters inside the caller's transaction"""
+        if deltas and self.stats_counters_enabled:
+            deltas.apply(conn)
+
+    def _on_buffered_flush(self, session, rows: Dict[str, List[Dict[str, Any]]]):
+        """Count buffered rows in the transaction that inserts them"""
+        deltas = StatDeltas()
+        deltas.add_rows("chat_history", rows.get("chat_history", []))
+        deltas.add_rows("long_term", rows.get("long_term", []))
+        self._apply_stat_deltas(session, deltas)
+        self._insert_memory_edges(session, rows.get("long_term", []))
+
+    def _on_buffered_commit(self, rows: Dict[str, List[Dict[str, Any]]]):
+        """Send remote notifications once buffered memories are durable"""
+        for table_rows in rows.values():
+            for namespace in {row["namespace"] for row in table_rows}:
+                self._record_write(namespace)
+        for row in rows.get("long_term", []):
+            self._notify_remote(row)
 
     def store_chat_history(
         self,
@@ -443,22 +936,34 @@ class SQLAlchemyDatabaseManager:
         metadata: Optional[Dict[str, Any]] = None,
     ):
         """Store chat history"""
+        row = {
+            "chat_id": chat_id,
+            "user_input": user_input,
+            "ai_output": ai_output,
+            "model": model,
+            "timestamp": timestamp,
+            "session_id": session_id,
+            "namespace": namespace,
+            "tokens_used": tokens_used,
+            "metadata_json": metadata or {},
+        }
+
+        if self.write_buffer is not None:
+            self.write_buffer.add_chat_history(row)
+            return
+
         with self.SessionLocal() as session:
             try:
-                chat_history = ChatHistory(
-                    chat_id=chat_id,
-                    user_input=user_input,
-                    ai_output=ai_output,
-                    model=model,
-                    timestamp=timestamp,
-                    session_id=session_id,
-                    namespace=namespace,
-                    tokens_used=tokens_used,
-                    metadata_json=metadata or {},
-                )
-
-                session.merge(chat_history)  # Use merge for INSERT OR REPLACE behavior
+                chat_history = ChatHistory(**row)
+
+                # Use merge for INSERT OR REPLACE behavior
+                merged = session.merge(chat_history)
+                if merged in session.new:
+                    deltas = StatDeltas()
+                    deltas.add_rows("chat_history", [row])
+                    self._apply_stat_deltas(session, deltas)
                 session.commit()
+                self._record_write(namespace)
 
             except SQLAlchemyError as e:
                 session.rollback()
@@ -471,84 +976,250 @@ class SQLAlchemyDatabaseManager:
         limit: int = 10,
     ) -> List[Dict[str, Any]]:
         """Get chat history with optional session filtering"""
-        with self.SessionLocal() as session:
+        with self._read_session(namespace) as session:
             try:
-                query = session.query(ChatHistory).filter(
-                    ChatHistory.namespace == namespace
-                )
-
+                params = {"namespace": namespace, "limit": limit}
                 if session_id:
-                    query = query.filter(ChatHistory.session_id == session_id)
-
-                results = (
-                    query.order_by(ChatHistory.timestamp.desc()).limit(limit).all()
+                    params["session_id"] = session_id
+                result = session.execute(
+                    _chat_history_statement(bool(session_id)), params
                 )
+                keys = list(result.keys())
+                history = []
+                for row in result:
+                    entry = dict(zip(keys, row))
+                    entry["metadata"] = entry.pop("metadata_json") or {}
+                    history.append(entry)
+
+                # Read-your-writes: include rows still held by the write buffer
+                if self.write_buffer is not None:
+                    history = self._merge_pending_chat_history(
+                        history, namespace, session_id, limit
+                    )
 
-                # Convert to dictionaries
-                return [
-                    {
-                        "chat_id": result.chat_id,
-                        "user_input": result.user_input,
-                        "ai_output": result.ai_output,
-                        "model": result.model,
-                        "timestamp": result.timestamp,
-                        "session_id": result.session_id,
-                        "namespace": result.namespace,
-                        "tokens_used": result.tokens_used,
-                        "metadata": result.metadata_json or {},
-                    }
-                    for result in results
-                ]
+                return history
 
             except SQLAlchemyError as e:
                 raise DatabaseError(f"Failed to get chat history: {e}")
 
+    def _merge_pending_chat_history(
+        self,
+        history: List[Dict[str, Any]],
+        namespace: str,
+        session_id: Optional[str],
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """Merge uncommitted buffered rows into a chat history result"""
+        pending = self.write_buffer.pending_chat_history(namespace, session_id)
+        if not pending:
+            return history
+
+        merged = {entry["chat_id"]: entry for entry in history}
+        for row in pending:
+            merged[row["chat_id"]] = {
+                "chat_id": row["chat_id"],
+                "user_input": row["user_input"],
+                "ai_output": row["ai_output"],
+                "model": row["model"],
+                "timestamp": row["timestamp"],
+                "session_id": row["session_id"],
+                "namespace": row["namespace"],
+                "tokens_used": row["tokens_used"],
+                "metadata": row["metadata_json"] or {},
+            }
+
+        return sorted(
+            merged.values(), key=lambda entry: entry["timestamp"], reverse=True
+        )[:limit]
+
+    def iter_chat_history(
+        self,
+        namespace: str = "default",
+        session_id: Optional[str] = None,
+        batch_size: int = 500,
+        newest_first: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield a namespace's whole chat history in keyset-paginated batches
+
+        Memory use is bounded by batch_size. Buffered writes are flushed first
+        so the walk sees every recorded conversation.
+        """
+        self.flush_writes(namespace)
+        criteria = []
+        if session_id:
+            criteria.append(ChatHistory.session_id == session_id)
+        try:
+            for row in iter_table_rows(
+                self.replica_router.read_engine(namespace),
+                ChatHistory.__table__,
+                namespace,
+                criteria=criteria,
+                batch_size=batch_size,
+                descending=newest_first,
+            ):
+                row["metadata"] = row.pop("metadata_json") or {}
+                yield row
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Failed to iterate chat history: {e}")
+
+    def iter_memories(
+        self,
+        namespace: str = "default",
+        memory_type: str = "long_term",
+        batch_size: int = 500,
+        newest_first: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every short_term or long_term memory of a namespace in batches
+
+        Rows are ordered by (created_at, memory_id); processed_data is decoded
+        lazily, like search results.
+        """
+        tables = {
+            "short_term": ShortTermMemory.__table__,
+            "long_term": LongTermMemory.__table__,
+        }
+        if memory_type not in tables:
+            raise ValueError(
+                f"memory_type must be 'short_term' or 'long_term', got {memory_type!r}"
+            )
+        self.flush_writes(namespace)
+        try:
+            for row in iter_table_rows(
+                self.replica_router.read_engine(namespace),
+                tables[memory_type],
+                namespace,
+                batch_size=batch_size,
+                descending=newest_first,
+            ):
+                row["processed_data"] = lazy_processed_data(row["processed_data"], row)
+                yield row
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Failed to iterate {memory_type} memories: {e}")
+
+    def export_jsonl(
+        self, output: IO[str], namespace: Optional[str] = None, batch_size: int = 500
+    ) -> Dict[str, int]:
+        """Stream a namespace (all namespaces if None) to JSONL; returns rows per table"""
+        self.flush_writes(namespace)
+        try:
+            return export_jsonl(self.engine, output, namespace, batch_size=batch_size)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Failed to export: {e}")
+
+    def import_jsonl(
+        self, source: IO[str], batch_size: int = 500, replace: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Load a JSONL export, re-encoding processed_data with this manager's codec
+
+        Existing rows are skipped, or replaced when ``replace`` is set.
+        """
+        try:
+            result = import_jsonl(
+                self.engine,
+                source,
+                batch_size=batch_size,
+                codec=self.storage_codec,
+                replace=replace,
+            )
+            # Rows were written with bulk statements; recount what changed
+            for namespace in result["namespaces"]:
+                if self.stats_counters_enabled:
+                    reconcile_memory_stats(self.engine, namespace)
+                if self.memory_edges_enabled:
+                    rebuild_edges(self.engine, namespace)
+                if self.user_profiles_enabled:
+                    rebuild_user_profiles(
+                        self.engine, namespace, self.profile_max_facts
+                    )
+                    self._invalidate_user_profile(namespace)
+                self.recent_memories.reset(namespace)
+                self._record_write(namespace)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Failed to import: {e}")
+        return result
+
+    @staticmethod
+    def _build_long_term_memory_row(
+        memory: ProcessedLongTermMemory,
+        memory_id: str,
+        chat_id: str,
+        namespace: str,
+        codec: Optional[ProcessedDataCodec] = None,
+    ) -> Dict[str, Any]:
+        """Build the long_term_memory column values for a processed memory"""
+        row = {
+            "memory_id": memory_id,
+            "original_chat_id": chat_id,
+            "processed_data": memory.model_dump(mode="json"),
+            "importance_score": memory.importance_score,
+            "category_primary": memory.classification.value,
+            "retention_type": "long_term",
+            "namespace": namespace,
+            "created_at": datetime.now(),
+            "searchable_content": memory.content,
+            "summary": memory.summary,
+            "novelty_score": 0.5,
+            "relevance_score": 0.5,
+            "actionability_score": 0.5,
+            "classification": memory.classification.value,
+            "memory_importance": memory.importance.value,
+            "topic": memory.topic,
+            "entities_json": memory.entities,
+            "keywords_json": memory.keywords,
+            "is_user_context": memory.is_user_context,
+            "is_preference": memory.is_preference,
+            "is_skill_knowledge": memory.is_skill_knowledge,
+            "is_current_project": memory.is_current_project,
+            "promotion_eligible": memory.promotion_eligible,
+            "duplicate_of": memory.duplicate_of,
+            "supersedes_json": memory.supersedes,
+            "related_memories_json": memory.related_memories,
+            "confidence_score": memory.confidence_score,
+            "extraction_timestamp": memory.extraction_timestamp,
+            "classification_reason": memory.classification_reason,
+            "processed_for_duplicates": False,
+            "conscious_processed": False,
+        }
+        if codec is not None:
+            row["processed_data"] = codec.encode(row["processed_data"], row)
+        return row
+
     def store_long_term_memory_enhanced(
         self, memory: ProcessedLongTermMemory, chat_id: str, namespace: str = "default"
     ) -> str:
         """Store a ProcessedLongTermMemory with enhanced schema"""
         memory_id = str(uuid.uuid4())
+        row = self._build_long_term_memory_row(
+            memory, memory_id, chat_id, namespace, self.storage_codec
+        )
+
+        if self.write_buffer is not None:
+            self.write_buffer.add_long_term_memory(row)
+            self._record_recent_memory(row)
+            logger.debug(f"Buffered enhanced long-term memory {memory_id}")
+            # Local consumers read through the buffer, so they can be told now
+            self._publish_memory_written(row)
+            return memory_id
 
         with self.SessionLocal() as session:
             try:
-                long_term_memory = LongTermMemory(
-                    memory_id=memory_id,
-                    original_chat_id=chat_id,
-                    processed_data=memory.model_dump(mode="json"),
-                    importance_score=memory.importance_score,
-                    category_primary=memory.classification.value,
-                    retention_type="long_term",
-                    namespace=namespace,
-                    created_at=datetime.now(),
-                    searchable_content=memory.content,
-                    summary=memory.summary,
-                    novelty_score=0.5,
-                    relevance_score=0.5,
-                    actionability_score=0.5,
-                    classification=memory.classification.value,
-                    memory_importance=memory.importance.value,
-                    topic=memory.topic,
-                    entities_json=memory.entities,
-                    keywords_json=memory.keywords,
-                    is_user_context=memory.is_user_context,
-                    is_preference=memory.is_preference,
-                    is_skill_knowledge=memory.is_skill_knowledge,
-                    is_current_project=memory.is_current_project,
-                    promotion_eligible=memory.promotion_eligible,
-                    duplicate_of=memory.duplicate_of,
-                    supersedes_json=memory.supersedes,
-                    related_memories_json=memory.related_memories,
-                    confidence_score=memory.confidence_score,
-                    extraction_timestamp=memory.extraction_timestamp,
-                    classification_reason=memory.classification_reason,
-                    processed_for_duplicates=False,
-                    conscious_processed=False,
-                )
+                long_term_memory = LongTermMemory(**row)
 
                 session.add(long_term_memory)
+                deltas = StatDeltas()
+                deltas.add_rows("long_term", [row])
+                self._apply_stat_deltas(session, deltas)
+                self._insert_memory_edges(session, [row])
                 session.commit()
 
                 logger.debug(f"Stored enhanced long-term memory {memory_id}")
+                self._record_write(namespace)
+                self._record_recent_memory(row)
+                self._publish_memory_written(row)
+                self._notify_remote(row)
                 return memory_id
 
             except SQLAlchemyError as e:
@@ -556,21 +1227,82 @@ class SQLAlchemyDatabaseManager:
                 logger.error(f"Failed to store enhanced long-term memory: {e}")
                 raise DatabaseError(f"Failed to store enhanced long-term memory: {e}")
 
+    def _record_recent_memory(self, row: Dict[str, Any]):
+        """Add a stored memory to the deduplication window"""
+        self.recent_memories.record(
+            row["namespace"],
+            row["memory_id"],
+            row["searchable_content"],
+            row["summary"],
+        )
+
+    def get_recent_memory_fingerprints(
+        self, namespace: str = "default"
+    ) -> List[MemoryFingerprint]:
+        """
+        Get fingerprints of the most recent memories for duplicate detection
+
+        The database is only queried the first time a namespace is used;
+        afterwards the window is maintained in process on every store.
+        """
+        if not self.recent_memories.is_seeded(namespace):
+            with self._read_session(namespace) as session:
+                try:
+                    rows = (
+                        session.query(
+                            LongTermMemory.memory_id,
+                            LongTermMemory.searchable_content,
+                            LongTermMemory.summary,
+                        )
+                        .filter(
+                            LongTermMemory.namespace == namespace,
+                            LongTermMemory.processed_for_duplicates.is_(False),
+                        )
+                        .order_by(LongTermMemory.created_at.desc())
+                        .limit(self.recent_memories.size)
+                        .all()
+                    )
+                except SQLAlchemyError as e:
+                    raise DatabaseError(f"Failed to load recent memories: {e}")
+            self.recent_memories.seed(namespace, [tuple(row) for row in rows])
+
+        return self.recent_memories.snapshot(namespace)
+
+    def _publish_memory_written(self, row: Dict[str, Any]):
+        """Publish a promotion candidate on the in-process event bus"""
+        if self._is_promotion_candidate(row):
+            self.event_bus.publish(
+                MEMORY_PROMOTION_ELIGIBLE, row["namespace"], row["memory_id"]
+            )
+
     def search_memories(
         self,
         query: str,
         namespace: str = "default",
         category_filter: Optional[List[str]] = None,
         limit: int = 10,
+        expand_hops: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
-        """Search memories using the cross-database search service"""
+        """
+        Search memories using the cross-database search service
+
+        ``expand_hops`` (default: related_memory_hops) appends long-term
+        memories up to that many related edges away from the hits.
+        """
+        if expand_hops is None:
+            expand_hops = self.related_memory_hops
+        elif not 0 <= expand_hops <= MAX_HOPS:
+            raise ValueError(f"expand_hops must be between 0 and {MAX_HOPS}")
         try:
-            search_service = self._get_search_service()
+            self.flush_writes(namespace)
+            search_service = self._get_search_service(namespace)
             try:
                 results = search_service.search_memories(
-                    query, namespace, category_filter, limit
+                    query, namespace, category_filter, limit, expand_hops=expand_hops
                 )
                 logger.debug(f"Search for '{query}' returned {len(results)} results")
+                if self.access_recorder is not None:
+                    self.access_recorder.record(namespace, results)
                 return results
             finally:
                 # Ensure session is properly closed
@@ -581,89 +1313,118 @@ class SQLAlchemyDatabaseManager:
             # Return empty list instead of raising exception to avoid breaking auto_ingest
             return []
 
-    def get_memory_stats(self, namespace: str = "default") -> Dict[str, Any]:
-        """Get comprehensive memory statistics"""
-        with self.SessionLocal() as session:
-            try:
-                stats = {}
-
-                # Basic counts
-                stats["chat_history_count"] = (
-                    session.query(ChatHistory)
-                    .filter(ChatHistory.namespace == namespace)
-                    .count()
-                )
+    def search_memories_many(
+        self,
+        queries: List[str],
+        namespace: str = "default",
+        category_filter: Optional[List[str]] = None,
+        limit: int = 10,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run several searches in one session and one statement per strategy
 
-                stats["short_term_count"] = (
-                    session.query(ShortTermMemory)
-                    .filter(ShortTermMemory.namespace == namespace)
-                    .count()
+        Returns:
+            One result list per query, in the order of ``queries``
+        """
+        if not queries:
+            return []
+        try:
+            self.flush_writes(namespace)
+            search_service = self._get_search_service(namespace)
+            try:
+                results = search_service.search_memories_many(
+                    queries, namespace, category_filter, limit
                 )
-
-                stats["long_term_count"] = (
-                    session.query(LongTermMemory)
-                    .filter(LongTermMemory.namespace == namespace)
-                    .count()
+                logger.debug(
+                    f"Batched search of {len(queries)} queries returned "
+                    f"{sum(len(rows) for rows in results)} results"
                 )
+                if self.access_recorder is not None:
+                    for rows in results:
+                        self.access_recorder.record(namespace, rows)
+                return results
+            finally:
+                search_service.session.close()
 
-                # Category breakdown
-                categories = {}
+        except Exception as e:
+            logger.error(f"Batched memory search failed: {e}")
+            return [[] for _ in queries]
 
-                # Short-term categories
-                short_categories = (
-                    session.query(
-                        ShortTermMemory.category_primary,
-                        func.count(ShortTermMemory.memory_id).label("count"),
-                    )
-                    .filter(ShortTermMemory.namespace == namespace)
-                    .group_by(ShortTermMemory.category_primary)
-                    .all()
-                )
+    def rebuild_memory_edges(self, namespace: Optional[str] = None) -> int:
+        """
+        Re-derive memory_edges from the memories' JSON relation columns
 
-                for cat, count in short_categories:
-                    categories[cat] = categories.get(cat, 0) + count
+        Only needed after writing memories without the manager (raw SQL,
+        older versions). Returns the number of edges derived.
+        """
+        self.flush_writes(namespace)
+        try:
+            return rebuild_edges(self.engine, namespace)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Failed to rebuild memory edges: {e}")
 
-                # Long-term categories
-                long_categories = (
-                    session.query(
-                        LongTermMemory.category_primary,
-                        func.count(LongTermMemory.memory_id).label("count"),
-                    )
-                    .filter(LongTermMemory.namespace == namespace)
-                    .group_by(LongTermMemory.category_primary)
-                    .all()
-                )
+    def get_user_profile(
+        self, namespace: str = "default"
+    ) -> Optional[UserContextProfile]:
+        """Materialized conscious context of a namespace (None until a promotion)"""
+        try:
+            with self._read_session(namespace) as session:
+                return load_profile(read_profile_row(session, namespace))
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Failed to read user profile: {e}")
 
-                for cat, count in long_categories:
-                    categories[cat] = categories.get(cat, 0) + count
+    def get_user_context_prompt(self, namespace: str = "default") -> str:
+        """
+        Context lines of a namespace's profile, one ``[CATEGORY] fact`` per line
 
-                stats["memories_by_category"] = categories
+        Reads one row by primary key, then serves the lines from memory until
+        a promotion or clear_memory through this manager changes the profile
+        (or PROMPT_CACHE_SECONDS pass, for changes made by other processes).
+        """
+        cached = self._profile_prompts.get(namespace)
+        if cached is not None and time.monotonic() - cached[1] < PROMPT_CACHE_SECONDS:
+            return cached[0]
 
-                # Average importance
-                short_avg = (
-                    session.query(func.avg(ShortTermMemory.importance_score))
-                    .filter(ShortTermMemory.namespace == namespace)
-                    .scalar()
-                    or 0
-                )
+        generation = self._profile_generation
+        try:
+            with self._read_session(namespace) as session:
+                prompt = session.execute(
+                    select(PROFILES_TABLE.c.rendered_context).where(
+                        PROFILES_TABLE.c.namespace == namespace
+                    )
+                ).scalar()
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Failed to read user context: {e}")
+        prompt = prompt or ""
+        # Skip caching a read that raced with a profile change
+        if generation == self._profile_generation:
+            self._profile_prompts[namespace] = (prompt, time.monotonic())
+        return prompt
+
+    def rebuild_user_profiles(self, namespace: Optional[str] = None) -> int:
+        """
+        Recompute user context profiles from short-term memory
 
-                long_avg = (
-                    session.query(func.avg(LongTermMemory.importance_score))
-                    .filter(LongTermMemory.namespace == namespace)
-                    .scalar()
-                    or 0
-                )
+        Only needed after writing short-term memories without the manager.
+        Returns the number of profiles written.
+        """
+        self.flush_writes(namespace)
+        try:
+            return rebuild_user_profiles(self.engine, namespace, self.profile_max_facts)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Failed to rebuild user profiles: {e}")
+        finally:
+            self._invalidate_user_profile(namespace)
 
-                total_memories = stats["short_term_count"] + stats["long_term_count"]
-                if total_memories > 0:
-                    # Weight averages by count
-                    total_avg = (
-                        (short_avg * stats["short_term_count"])
-                        + (long_avg * stats["long_term_count"])
-                    ) / total_memories
-                    stats["average_importance"] = float(total_avg) if total_avg else 0.0
+    def get_memory_stats(self, namespace: str = "default") -> Dict[str, Any]:
+        """Get comprehensive memory statistics"""
+        self.flush_writes(namespace)
+        with self._read_session(namespace) as session:
+            try:
+                if self.stats_counters_enabled:
+                    stats = read_memory_stats(session, namespace)
                 else:
-                    stats["average_importance"] = 0.0
+                    stats = self._collect_memory_stats(session, namespace)
 
                 # Database info
                 stats["database_type"] = self.database_type
@@ -678,10 +1439,123 @@ class SQLAlchemyDatabaseManager:
             except SQLAlchemyError as e:
                 raise DatabaseError(f"Failed to get memory stats: {e}")
 
+    def reconcile_memory_stats(self, namespace: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Recompute the memory_stats counters from the memory tables
+
+        Args:
+            namespace: Only reconcile this namespace (all namespaces if None)
+
+        Returns:
+            Namespaces checked and the namespaces whose counters drifted
+        """
+        self.flush_writes(namespace)
+        try:
+            return reconcile_memory_stats(self.engine, namespace)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Failed to reconcile memory stats: {e}")
+
+    def enable_stats_reconcile(
+        self, interval_seconds: float = 24 * 3600
+    ) -> MemoryStatsReconciler:
+        """Periodically repair memory_stats drift from writers that bypass the manager"""
+        if self.stats_reconciler is None:
+            self.stats_reconciler = MemoryStatsReconciler(
+                self.engine, interval_seconds=interval_seconds
+            )
+            self.stats_reconciler.start()
+        return self.stats_reconciler
+
+    @staticmethod
+    def _collect_memory_stats(session, namespace: str) -> Dict[str, Any]:
+        """Compute memory counts, categories and average importance"""
+        stats = {}
+
+        # Basic counts
+        stats["chat_history_count"] = (
+            session.query(ChatHistory)
+            .filter(ChatHistory.namespace == namespace)
+            .count()
+        )
+
+        stats["short_term_count"] = (
+            session.query(ShortTermMemory)
+            .filter(ShortTermMemory.namespace == namespace)
+            .count()
+        )
+
+        stats["long_term_count"] = (
+            session.query(LongTermMemory)
+            .filter(LongTermMemory.namespace == namespace)
+            .count()
+        )
+
+        # Category breakdown
+        categories = {}
+
+        # Short-term categories
+        short_categories = (
+            session.query(
+                ShortTermMemory.category_primary,
+                func.count(ShortTermMemory.memory_id).label("count"),
+            )
+            .filter(ShortTermMemory.namespace == namespace)
+            .group_by(ShortTermMemory.category_primary)
+            .all()
+        )
+
+        for cat, count in short_categories:
+            categories[cat] = categories.get(cat, 0) + count
+
+        # Long-term categories
+        long_categories = (
+            session.query(
+                LongTermMemory.category_primary,
+                func.count(LongTermMemory.memory_id).label("count"),
+            )
+            .filter(LongTermMemory.namespace == namespace)
+            .group_by(LongTermMemory.category_primary)
+            .all()
+        )
+
+        for cat, count in long_categories:
+            categories[cat] = categories.get(cat, 0) + count
+
+        stats["memories_by_category"] = categories
+
+        # Average importance
+        short_avg = (
+            session.query(func.avg(ShortTermMemory.importance_score))
+            .filter(ShortTermMemory.namespace == namespace)
+            .scalar()
+            or 0
+        )
+
+        long_avg = (
+            session.query(func.avg(LongTermMemory.importance_score))
+            .filter(LongTermMemory.namespace == namespace)
+            .scalar()
+            or 0
+        )
+
+        total_memories = stats["short_term_count"] + stats["long_term_count"]
+        if total_memories > 0:
+            # Weight averages by count
+            total_avg = (
+                (short_avg * stats["short_term_count"])
+                + (long_avg * stats["long_term_count"])
+            ) / total_memories
+            stats["average_importance"] = float(total_avg) if total_avg else 0.0
+        else:
+            stats["average_importance"] = 0.0
+
+        return stats
+
     def clear_memory(
         self, namespace: str = "default", memory_type: Optional[str] = None
     ):
         """Clear memory data"""
+        self.flush_writes(namespace)
         with self.SessionLocal() as session:
             try:
                 if memory_type == "short_term":
@@ -707,7 +1581,29 @@ class SQLAlchemyDatabaseManager:
                         ChatHistory.namespace == namespace
                     ).delete()
 
+                if memory_type in (None, "long_term") and self.memory_edges_enabled:
+                    session.execute(
+                        EDGES_TABLE.delete().where(EDGES_TABLE.c.namespace == namespace)
+                    )
+                if memory_type in (None, "short_term") and self.user_profiles_enabled:
+                    delete_user_profile(session, namespace)
+
+                if self.stats_counters_enabled:
+                    reset_memory_stats(
+                        session,
+                        namespace,
+                        (
+                            [memory_type]
+                            if memory_type
+                            else ["short_term", "long_term", "chat_history"]
+                        ),
+                    )
                 session.commit()
+                self._record_write(namespace)
+                self._invalidate_user_profile(namespace)
+
+                if memory_type in (None, "long_term"):
+                    self.recent_memories.reset(namespace)
 
             except SQLAlchemyError as e:
                 session.rollback()
@@ -734,7 +1630,7 @@ class SQLAlchemyDatabaseManager:
             conn.commit()
             return result
 
-    def _get_connection(self):
+    def _get_connection(self, read_only: bool = False, namespace: Optional[str] = None):
         """
         Compatibility method for legacy code that expects raw database connections.
 
@@ -742,6 +1638,10 @@ class SQLAlchemyDatabaseManager:
         automatic parameter translation support.
 
         This is used by memory.py for direct SQL queries.
+
+        Args:
+            read_only: The caller only reads, so a read replica may serve it
+            namespace: Namespace read, for read-your-writes routing
         """
         from contextlib import contextmanager
 
@@ -800,7 +1700,14 @@ class SQLAlchemyDatabaseManager:
                     """Delegate unknown attributes to the underlying connection"""
                     return getattr(self._conn, name)
 
-            conn = self.engine.connect()
+            # Raw queries must observe rows still held by the write buffer;
+            # only the namespace read needs to be committed
+            self.flush_writes(namespace)
+
+            if read_only:
+                conn = self.replica_router.read_engine(namespace).connect()
+            else:
+                conn = self.engine.connect()
             try:
                 yield TranslatingConnection(conn, self.query_translator)
             finally:
@@ -810,12 +1717,67 @@ class SQLAlchemyDatabaseManager:
 
     def close(self):
         """Close database connections"""
+        buffer_error = None
+        if self.write_buffer is not None:
+            try:
+                self.write_buffer.close()
+            except DatabaseError as e:
+                # Finish shutting down before reporting the lost rows
+                buffer_error = e
+
+        if self.access_recorder is not None:
+            self.access_recorder.close()
+
+        if self.change_notifier is not None:
+            self.change_notifier.stop()
+
+        if self.retention is not None:
+            self.retention.stop()
+
+        if self.search_index_maintenance is not None:
+            self.search_index_maintenance.stop()
+
+        if self.stats_reconciler is not None:
+            self.stats_reconciler.stop()
+
         if self._search_service and hasattr(self._search_service, "session"):
             self._search_service.session.close()
 
+        if self.shared_engine:
+            # Engines are disposed when their last manager closes
+            self._release_engines()
+            if buffer_error is not None:
+                raise buffer_error
+            return
+
+        if self.sqlite_maintenance is not None:
+            self.sqlite_maintenance.stop()
+
+        if getattr(self, "replica_router", None) is not None:
+            self.replica_router.dispose()
+
         if hasattr(self, "engine"):
             self.engine.dispose()
 
+        if buffer_error is not None:
+            raise buffer_error
+
+    def get_pool_metrics(self) -> Dict[str, Any]:
+        """
+        Get connection pool occupancy and checkout wait statistics
+
+        Returns:
+            Pool size, checked-out/checked-in connections, overflow in use,
+            checkout counts, timeouts and wait times (ms)
+        """
+        metrics = get_pool_metrics(self.engine)
+        if self.replica_router.replicas:
+            metrics["replicas"] = [
+                get_pool_metrics(engine) for engine in self.replica_router.replicas
+            ]
+            metrics["routing"] = self.replica_router.get_stats()
+        return metrics
+
     def get_database_info(self) -> Dict[str, Any]:
         """Get database information and capabilities"""
         base_info = {
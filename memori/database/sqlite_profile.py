@@ -0,0 +1,155 @@
+"""
+SQLite performance profile for the SQLAlchemy engine
+
+Applies connection PRAGMAs to every pooled SQLite connection through a
+SQLAlchemy ``connect`` event and runs periodic maintenance (``PRAGMA optimize``
+and WAL checkpoints) on a background thread.
+"""
+
+import threading
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional, Union
+
+from loguru import logger
+from sqlalchemy import event, text
+
+
+@dataclass
+class SQLiteProfile:
+    """Connection PRAGMAs and maintenance schedule for SQLite"""
+
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    mmap_size: int = 256 * 1024 * 1024  # bytes
+    cache_size: int = -64000  # negative values are KiB (64 MB)
+    temp_store: str = "MEMORY"
+    busy_timeout: int = 5000  # milliseconds
+    optimize_interval_seconds: int = 3600  # 0 disables periodic PRAGMA optimize
+    checkpoint_interval_seconds: int = 300  # 0 disables periodic checkpoints
+    checkpoint_mode: str = "PASSIVE"  # PASSIVE, FULL, RESTART or TRUNCATE
+
+    @classmethod
+    def from_config(
+        cls, config: Union["SQLiteProfile", Dict[str, Any], bool, None]
+    ) -> Optional["SQLiteProfile"]:
+        """
+        Build a profile from a user-supplied value
+
+        ``None``/``True`` selects the defaults, ``False`` disables the
+        profile and a dict overrides individual fields.
+        """
+        if config is False:
+            return None
+        if config is None or config is True:
+            return cls()
+        if isinstance(config, cls):
+            return config
+        known = {f.name for f in fields(cls)}
+        unknown = set(config) - known
+        if unknown:
+            raise ValueError(f"Unknown SQLite profile options: {sorted(unknown)}")
+        return cls(**config)
+
+    def pragmas(self) -> List[str]:
+        """PRAGMA statements executed on every new connection"""
+        return [
+            f"PRAGMA journal_mode = {self.journal_mode}",
+            f"PRAGMA synchronous = {self.synchronous}",
+            f"PRAGMA mmap_size = {int(self.mmap_size)}",
+            f"PRAGMA cache_size = {int(self.cache_size)}",
+            f"PRAGMA temp_store = {self.temp_store}",
+            f"PRAGMA busy_timeout = {int(self.busy_timeout)}",
+        ]
+
+
+class SQLiteMaintenance:
+    """Background PRAGMA optimize / WAL checkpoint scheduler"""
+
+    def __init__(self, engine, profile: SQLiteProfile):
+        self.engine = engine
+        self.profile = profile
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        intervals = [
+            i
+            for i in (
+                self.profile.optimize_interval_seconds,
+                self.profile.checkpoint_interval_seconds,
+            )
+            if i
+        ]
+        if not intervals or self._thread is not None:
+            return
+        self._tick = min(intervals)
+        self._thread = threading.Thread(
+            target=self._run, name="memori-sqlite-maintenance", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        elapsed = 0
+        while not self._stop.wait(self._tick):
+            elapsed += self._tick
+            checkpoint = self.profile.checkpoint_interval_seconds
+            optimize = self.profile.optimize_interval_seconds
+            if checkpoint and elapsed % checkpoint < self._tick:
+                self.checkpoint()
+            if optimize and elapsed % optimize < self._tick:
+                self.optimize()
+
+    def checkpoint(self) -> Optional[tuple]:
+        """Run a WAL checkpoint; returns (busy, log_frames, checkpointed_frames)"""
+        if self.profile.journal_mode.upper() != "WAL":
+            return None
+        try:
+            with self.engine.connect() as conn:
+                result = conn.execute(
+                    text(f"PRAGMA wal_checkpoint({self.profile.checkpoint_mode})")
+                ).fetchone()
+                conn.commit()
+            logger.debug(f"SQLite WAL checkpoint completed: {tuple(result)}")
+            return tuple(result)
+        except Exception as e:
+            logger.warning(f"SQLite WAL checkpoint failed: {e}")
+            return None
+
+    def optimize(self):
+        """Let SQLite refresh planner statistics where they are stale"""
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("PRAGMA optimize"))
+                conn.commit()
+            logger.debug("SQLite PRAGMA optimize completed")
+        except Exception as e:
+            logger.warning(f"SQLite PRAGMA optimize failed: {e}")
+
+
+def apply_sqlite_profile(engine, profile: SQLiteProfile) -> SQLiteMaintenance:
+    """
+    Apply a profile to every connection the engine opens
+
+    Must be called before the engine opens its first connection.
+
+    Returns:
+        The (not yet started) maintenance scheduler for the engine
+    """
+    statements = profile.pragmas()
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    return SQLiteMaintenance(engine, profile)
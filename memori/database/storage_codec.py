@@ -0,0 +1,426 @@
+"""
+Compact storage codec for processed_data
+
+``processed_data`` holds the full ``ProcessedLongTermMemory`` dump, which
+repeats the memory's content and summary already stored in their own
+columns. With a codec enabled the column stores a small JSON envelope instead:
+
+    {"_codec": "zlib+json", "stripped": ["content", "summary"],
+     "data": "<base64 compressed payload>"}
+
+Stripped fields are rehydrated from the row's columns on read, and the
+payload is only decompressed when the processed data is actually accessed.
+The envelope is valid JSON, so the column type is unchanged on every backend
+and rows written with and without a codec can be mixed freely.
+"""
+
+import base64
+import importlib.util
+import json
+import zlib
+from typing import Any, Callable, Dict, Mapping, Optional, Union
+
+from loguru import logger
+from sqlalchemy import bindparam, select, update
+
+from ..utils.exceptions import DatabaseError
+from .models import LongTermMemory, ShortTermMemory
+
+CODEC_KEY = "_codec"
+
+# processed_data field -> column holding the same value (present on both tables)
+STRIPPABLE_FIELDS = {
+    "content": "searchable_content",
+    "summary": "summary",
+}
+
+COMPRESSIONS = ("none", "zlib", "zstd")
+SERIALIZERS = ("json", "msgpack")
+
+MIGRATED_TABLES = (LongTermMemory.__table__, ShortTermMemory.__table__)
+
+
+def _require(module: str, package: str):
+    if importlib.util.find_spec(module) is None:
+        raise DatabaseError(
+            f"The {package} package is required for this storage codec.\n"
+            "Install it with: pip install memorisdk[compact]"
+        )
+
+
+class ProcessedDataCodec:
+    """
+    Encodes processed_data into a compact envelope and back
+
+    Args:
+        compression: none, zlib or zstd (requires the zstandard package)
+        serializer: json or msgpack (requires the msgpack package)
+        level: Compression level (codec default if None)
+    """
+
+    def __init__(
+        self,
+        compression: str = "zlib",
+        serializer: str = "json",
+        level: Optional[int] = None,
+    ):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"compression must be one of {COMPRESSIONS}")
+        if serializer not in SERIALIZERS:
+            raise ValueError(f"serializer must be one of {SERIALIZERS}")
+        if compression == "zstd":
+            _require("zstandard", "zstandard")
+        if serializer == "msgpack":
+            _require("msgpack", "msgpack")
+        self.compression = compression
+        self.serializer = serializer
+        self.level = level
+
+    @classmethod
+    def from_spec(
+        cls, spec: Union[str, "ProcessedDataCodec", None]
+    ) -> Optional["ProcessedDataCodec"]:
+        """
+        Build a codec from a spec such as "zlib", "zstd+msgpack" or "json"
+
+        "json" and "msgpack" alone strip duplicated fields without compressing.
+        None, "" and "none" disable the codec.
+        """
+        if spec is None or isinstance(spec, ProcessedDataCodec):
+            return spec
+        spec = spec.strip().lower()
+        if spec in ("", "none", "off"):
+            return None
+        compression, serializer = "none", "json"
+        for part in spec.split("+"):
+            if part in COMPRESSIONS:
+                compression = part
+            elif part in SERIALIZERS:
+                serializer = part
+            else:
+                raise ValueError(f"Unknown storage codec '{spec}'")
+        return cls(compression=compression, serializer=serializer)
+
+    @property
+    def name(self) -> str:
+        if self.compression == "none":
+            return self.serializer
+        return f"{self.compression}+{self.serializer}"
+
+    def encode(self, data: Dict[str, Any], row: Mapping[str, Any]) -> Dict[str, Any]:
+        """Encode processed_data for a row, stripping fields the row already holds"""
+        payload = dict(data)
+        stripped = []
+        for field, column in STRIPPABLE_FIELDS.items():
+            if field in payload and payload[field] == row.get(column):
+                del payload[field]
+                stripped.append(field)
+
+        envelope: Dict[str, Any] = {CODEC_KEY: self.name, "stripped": stripped}
+        if self.compression == "none" and self.serializer == "json":
+            envelope["data"] = payload
+            return envelope
+
+        raw = _serialize(payload, self.serializer)
+        if self.compression == "zlib":
+            raw = zlib.compress(raw, 6 if self.level is None else self.level)
+        elif self.compression == "zstd":
+            import zstandard
+
+            raw = zstandard.ZstdCompressor(level=self.level or 3).compress(raw)
+        envelope["data"] = base64.b64encode(raw).decode("ascii")
+        return envelope
+
+
+def _serialize(payload: Dict[str, Any], serializer: str) -> bytes:
+    if serializer == "msgpack":
+        import msgpack
+
+        return msgpack.packb(payload, use_bin_type=True)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def _decode_payload(envelope: Dict[str, Any]) -> Dict[str, Any]:
+    data = envelope.get("data")
+    if isinstance(data, dict):
+        return dict(data)
+
+    compression, _, serializer = envelope[CODEC_KEY].rpartition("+")
+    raw = base64.b64decode(data)
+    if compression == "zlib":
+        raw = zlib.decompress(raw)
+    elif compression == "zstd":
+        _require("zstandard", "zstandard")
+        import zstandard
+
+        raw = zstandard.ZstdDecompressor().decompress(raw)
+
+    if serializer == "msgpack":
+        _require("msgpack", "msgpack")
+        import msgpack
+
+        return msgpack.unpackb(raw, raw=False)
+    return json.loads(raw)
+
+
+def _as_envelope(value: Any) -> Optional[Dict[str, Any]]:
+    if isinstance(value, LazyProcessedData):
+        return None
+    if isinstance(value, str):
+        # Cheap check before parsing raw SQL results
+        if f'"{CODEC_KEY}"' not in value:
+            return None
+        value = json.loads(value)
+    if isinstance(value, dict) and CODEC_KEY in value:
+        return value
+    return None
+
+
+def is_encoded(value: Any) -> bool:
+    return _as_envelope(value) is not None
+
+
+class LazyProcessedData(dict):
+    """
+    processed_data dict that decodes its payload on first access
+
+    Rehydrated fields are present from the start; the compressed remainder
+    is only decoded when the dict is read, iterated or serialized.
+    """
+
+    def __init__(self, envelope: Dict[str, Any], row: Mapping[str, Any]):
+        envelope.setdefault("stripped", [])
+        super().__init__(
+            {field: row.get(STRIPPABLE_FIELDS[field]) for field in envelope["stripped"]}
+        )
+        self._envelope: Optional[Dict[str, Any]] = envelope
+        if not dict.__len__(self):
+            # An empty dict subclass is serialized as {} by the C JSON encoder
+            # without calling items(), so decode now
+            self._materialize()
+
+    def _materialize(self):
+        if self._envelope is not None:
+            envelope, self._envelope = self._envelope, None
+            payload = _decode_payload(envelope)
+            payload.update(dict.items(self))
+            dict.clear(self)
+            dict.update(self, payload)
+
+    @property
+    def is_decoded(self) -> bool:
+        return self._envelope is None
+
+    def __getitem__(self, key):
+        # Rehydrated fields are served without decoding the payload
+        if self._envelope is None or key not in self._envelope["stripped"]:
+            self._materialize()
+        return dict.__getitem__(self, key)
+
+    def __contains__(self, key):
+        self._materialize()
+        return dict.__contains__(self, key)
+
+    def __iter__(self):
+        self._materialize()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self._materialize()
+        return dict.__len__(self)
+
+    def __eq__(self, other):
+        self._materialize()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self):
+        self._materialize()
+        return dict.__repr__(self)
+
+    def __reduce__(self):
+        self._materialize()
+        return (dict, (dict(dict.items(self)),))
+
+    def get(self, key, default=None):
+        if self._envelope is None or key not in self._envelope["stripped"]:
+            self._materialize()
+        return dict.get(self, key, default)
+
+    def keys(self):
+        self._materialize()
+        return dict.keys(self)
+
+    def values(self):
+        self._materialize()
+        return dict.values(self)
+
+    def items(self):
+        self._materialize()
+        return dict.items(self)
+
+    def copy(self):
+        self._materialize()
+        return dict(dict.items(self))
+
+
+def lazy_processed_data(value: Any, row: Mapping[str, Any]) -> Any:
+    """
+    Wrap an encoded processed_data value for lazy decoding
+
+    Values written without a codec are returned unchanged.
+    """
+    envelope = _as_envelope(value)
+    if envelope is None:
+        return value
+    return LazyProcessedData(envelope, row)
+
+
+def decode_processed_data(value: Any, row: Mapping[str, Any]) -> Any:
+    """Fully decode a processed_data value (unencoded values are returned as is)"""
+    envelope = _as_envelope(value)
+    if envelope is None:
+        return value
+    data = LazyProcessedData(envelope, row)
+    return data.copy()
+
+
+def _row_columns(table):
+    return [table.c[column] for column in set(STRIPPABLE_FIELDS.values())]
+
+
+def migrate_processed_data(
+    engine,
+    codec: Union[str, ProcessedDataCodec, None],
+    batch_size: int = 500,
+    progress: Optional[Callable[[str, int], None]] = None,
+) -> Dict[str, int]:
+    """
+    Re-encode stored processed_data with a codec, in keyset batches
+
+    Passing None (or "none") decodes rows back to plain JSON.
+
+    Returns:
+        Rows rewritten per table
+    """
+    codec = ProcessedDataCodec.from_spec(codec)
+    target = codec.name if codec is not None else None
+    migrated: Dict[str, int] = {}
+
+    for table in MIGRATED_TABLES:
+        pk = table.c.memory_id
+        statement = (
+            update(table)
+            .where(pk == bindparam("b_memory_id"))
+            .values(processed_data=bindparam("b_processed_data"))
+        )
+        migrated[table.name] = 0
+        last_id = None
+        while True:
+            query = select(pk, table.c.processed_data, *_row_columns(table))
+            if last_id is not None:
+                query = query.where(pk > last_id)
+            query = query.order_by(pk).limit(batch_size)
+
+            with engine.begin() as conn:
+                rows = [dict(row._mapping) for row in conn.execute(query)]
+                if not rows:
+                    break
+                updates = []
+                for row in rows:
+                    value = row["processed_data"]
+                    envelope = _as_envelope(value)
+                    current = envelope[CODEC_KEY] if envelope else None
+                    if current == target:
+                        continue
+                    data = decode_processed_data(value, row)
+                    if isinstance(data, str):
+                        data = json.loads(data)
+                    if codec is not None:
+                        data = codec.encode(data, row)
+                    updates.append(
+                        {"b_memory_id": row["memory_id"], "b_processed_data": data}
+                    )
+                if updates:
+                    conn.execute(statement, updates)
+
+            migrated[table.name] += len(updates)
+            last_id = rows[-1]["memory_id"]
+            if progress is not None:
+                progress(table.name, migrated[table.name])
+
+        logger.info(
+            f"Re-encoded {migrated[table.name]} {table.name} rows with codec {target}"
+        )
+    return migrated
+
+
+def storage_size_report(
+    engine,
+    codec: Union[str, ProcessedDataCodec, None] = "zlib",
+    sample_size: int = 500,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Measure processed_data storage per table
+
+    Sizes are measured on the serialized column value. ``projected_bytes`` is
+    the size the sampled rows would take with ``codec``, scaled to the table.
+
+    Returns:
+        Per table: rows, encoded_rows, stored_bytes, avg_bytes and, when a
+        codec is given, projected_bytes and projected_ratio
+    """
+    codec = ProcessedDataCodec.from_spec(codec)
+    report: Dict[str, Dict[str, Any]] = {}
+
+    for table in MIGRATED_TABLES:
+        pk = table.c.memory_id
+        rows = encoded = stored = sampled = sampled_stored = projected = 0
+        last_id = None
+        while True:
+            query = select(pk, table.c.processed_data, *_row_columns(table))
+            if last_id is not None:
+                query = query.where(pk > last_id)
+            query = query.order_by(pk).limit(1000)
+
+            with engine.connect() as conn:
+                batch = [dict(row._mapping) for row in conn.execute(query)]
+            if not batch:
+                break
+            for row in batch:
+                value = row["processed_data"]
+                size = len(
+                    value.encode()
+                    if isinstance(value, str)
+                    else json.dumps(value).encode()
+                )
+                rows += 1
+                stored += size
+                if is_encoded(value):
+                    encoded += 1
+                if codec is not None and sampled < sample_size:
+                    data = decode_processed_data(value, row)
+                    if isinstance(data, str):
+                        data = json.loads(data)
+                    projected += len(json.dumps(codec.encode(data, row)).encode())
+                    sampled_stored += size
+                    sampled += 1
+            last_id = batch[-1]["memory_id"]
+
+        table_report: Dict[str, Any] = {
+            "rows": rows,
+            "encoded_rows": encoded,
+            "stored_bytes": stored,
+            "avg_bytes": round(stored / rows, 1) if rows else 0,
+        }
+        if codec is not None:
+            ratio = projected / sampled_stored if sampled_stored else 1.0
+            table_report["codec"] = codec.name
+            table_report["projected_bytes"] = int(stored * ratio)
+            table_report["projected_ratio"] = round(ratio, 3)
+        report[table.name] = table_report
+    return report
@@ -0,0 +1,241 @@
+"""
+Materialized user context profiles
+
+Conscious mode used to rebuild the user's context from every short-term row
+of the namespace on each injection. ``user_context_profiles`` instead holds
+one row per namespace: a UserContextProfile with the most important promoted
+facts, and the context lines rendered from them. Promotion merges its new
+facts into the row in the transaction that copies them to short-term memory,
+so injection reads a single row by primary key (and the manager caches the
+rendered lines), however many facts the user has accumulated.
+
+Only the ``max_facts`` most important distinct facts are kept, which bounds
+both the merge and the injected prompt. Profiles are derived data:
+``rebuild_user_profiles`` recomputes them from short-term memory.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, insert, select, update
+
+from ..utils.pydantic_models import ProfileFact, UserContextProfile
+from .models import ShortTermMemory, UserProfile
+
+PROFILES_TABLE = UserProfile.__table__
+
+# Facts kept per profile
+DEFAULT_MAX_FACTS = 50
+
+# Category of the short-term rows written by conscious promotion
+PROMOTED_CATEGORY = "conscious_context"
+
+# Cached context is re-read after this long, picking up promotions made by
+# other processes (local promotions invalidate it immediately)
+PROMPT_CACHE_SECONDS = 60.0
+
+
+def _fact_key(content: str) -> str:
+    return content.lower().strip()
+
+
+def profile_facts(memory_rows: Iterable[Dict[str, Any]]) -> List[ProfileFact]:
+    """Facts of short_term_memory rows given as column dicts"""
+    facts = []
+    for row in memory_rows:
+        content = row.get("searchable_content") or row.get("summary") or ""
+        if not content.strip():
+            continue
+        importance = row.get("importance_score")
+        facts.append(
+            ProfileFact(
+                memory_id=row["memory_id"],
+                content=content,
+                category=row.get("category_primary") or PROMOTED_CATEGORY,
+                importance_score=0.5 if importance is None else importance,
+                created_at=row.get("created_at"),
+            )
+        )
+    return facts
+
+
+def merge_facts(
+    profile: UserContextProfile, facts: List[ProfileFact], max_facts: int
+) -> bool:
+    """
+    Add facts to a profile, keeping its ``max_facts`` most important ones
+
+    Facts repeating the content of a known fact (case-insensitive) are dropped.
+
+    Returns:
+        True if the profile's facts changed
+    """
+    known = {_fact_key(fact.content) for fact in profile.facts}
+    added = []
+    for fact in facts:
+        key = _fact_key(fact.content)
+        if key not in known:
+            known.add(key)
+            added.append(fact)
+    if not added:
+        return False
+
+    merged = sorted(
+        profile.facts + added,
+        key=lambda fact: (fact.importance_score, fact.created_at or datetime.min),
+        reverse=True,
+    )[:max_facts]
+    changed = [fact.memory_id for fact in merged] != [
+        fact.memory_id for fact in profile.facts
+    ]
+    profile.facts = merged
+    return changed
+
+
+def render_profile(profile: UserContextProfile) -> str:
+    """Context lines injected by conscious mode, one per fact"""
+    return "".join(
+        f"[{fact.category.upper()}] {fact.content}\n" for fact in profile.facts
+    )
+
+
+def load_profile(row: Optional[Dict[str, Any]]) -> Optional[UserContextProfile]:
+    """Profile stored in a user_context_profiles row"""
+    if row is None:
+        return None
+    return UserContextProfile.model_validate(row["profile_json"])
+
+
+def read_profile_row(conn, namespace: str, for_update: bool = False):
+    """The namespace's profile row as a dict, or None"""
+    query = select(PROFILES_TABLE).where(PROFILES_TABLE.c.namespace == namespace)
+    if for_update:
+        # Serializes concurrent promotions on PostgreSQL/MySQL; SQLite
+        # writers are serialized already
+        query = query.with_for_update()
+    row = conn.execute(query).first()
+    return dict(row._mapping) if row is not None else None
+
+
+def _write_profile(
+    conn,
+    namespace: str,
+    profile: UserContextProfile,
+    previous: Optional[Dict[str, Any]],
+):
+    profile.last_updated = datetime.now()
+    profile.version = previous["version"] + 1 if previous is not None else 1
+    values = {
+        "profile_json": profile.model_dump(mode="json"),
+        "rendered_context": render_profile(profile),
+        "fact_count": len(profile.facts),
+        "version": profile.version,
+        "updated_at": profile.last_updated,
+    }
+    if previous is None:
+        conn.execute(insert(PROFILES_TABLE).values(namespace=namespace, **values))
+    else:
+        conn.execute(
+            update(PROFILES_TABLE)
+            .where(PROFILES_TABLE.c.namespace == namespace)
+            .values(**values)
+        )
+
+
+def update_user_profile(
+    conn,
+    namespace: str,
+    memory_rows: Iterable[Dict[str, Any]],
+    max_facts: int = DEFAULT_MAX_FACTS,
+) -> bool:
+    """
+    Merge newly promoted short-term memories into the namespace's profile
+
+    Runs in the caller's transaction, through a Connection or Session.
+
+    Returns:
+        True if the profile was written
+    """
+    facts = profile_facts(memory_rows)
+    if not facts:
+        return False
+    previous = read_profile_row(conn, namespace, for_update=True)
+    profile = load_profile(previous) or UserContextProfile()
+    if not merge_facts(profile, facts, max_facts):
+        return False
+    _write_profile(conn, namespace, profile, previous)
+    return True
+
+
+def delete_user_profile(conn, namespace: str) -> int:
+    """Drop a namespace's profile (its short-term memory was cleared)"""
+    result = conn.execute(
+        delete(PROFILES_TABLE).where(PROFILES_TABLE.c.namespace == namespace)
+    )
+    return result.rowcount or 0
+
+
+def build_user_profiles(
+    conn, namespace: Optional[str] = None, max_facts: int = DEFAULT_MAX_FACTS
+) -> int:
+    """
+    Recompute profiles from promoted short-term memories through a Connection
+
+    Reads at most ``max_facts`` rows per namespace, most important first.
+
+    Returns:
+        Number of profiles written
+    """
+    table = ShortTermMemory.__table__
+    promoted = table.c.category_primary == PROMOTED_CATEGORY
+    if namespace is not None:
+        namespaces = [namespace]
+        delete_user_profile(conn, namespace)
+    else:
+        namespaces = [
+            value
+            for (value,) in conn.execute(
+                select(table.c.namespace).where(promoted).distinct()
+            )
+        ]
+        conn.execute(delete(PROFILES_TABLE))
+
+    written = 0
+    for name in namespaces:
+        rows = conn.execute(
+            select(
+                table.c.memory_id,
+                table.c.searchable_content,
+                table.c.summary,
+                table.c.category_primary,
+                table.c.importance_score,
+                table.c.created_at,
+            )
+            .where(table.c.namespace == name, promoted)
+            .order_by(table.c.importance_score.desc(), table.c.created_at.desc())
+            .limit(max_facts)
+        )
+        profile = UserContextProfile()
+        merge_facts(
+            profile, profile_facts(dict(row._mapping) for row in rows), max_facts
+        )
+        if profile.facts:
+            _write_profile(conn, name, profile, None)
+            written += 1
+    return written
+
+
+def rebuild_user_profiles(
+    engine, namespace: Optional[str] = None, max_facts: int = DEFAULT_MAX_FACTS
+) -> int:
+    """
+    Recompute profiles from short-term memory
+
+    Used when the table is first created, and to repair profiles of
+    namespaces written without the manager.
+
+    Returns:
+        Number of profiles written
+    """
+    with engine.begin() as conn:
+        return build_user_profiles(conn, namespace, max_facts)
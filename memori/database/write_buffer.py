@@ -0,0 +1,349 @@
+"""
+Write-behind buffer for chat history and long-term memory inserts
+
+Coalesces inserts coming from many requests into a single transaction that is
+committed every ``flush_interval_ms`` milliseconds or as soon as
+``max_batch_rows`` rows are pending, whichever happens first.
+
+Guarantees:
+    - Durability on flush: once ``flush()`` returns, every row that was
+      enqueued before the call has been committed (or ``flush()`` raised).
+    - Read-your-writes: rows are visible through ``pending_chat_history()``
+      until they are committed, so the recording session never misses its
+      own conversations.
+    - Flush on shutdown: ``close()`` stops accepting rows and flushes, and
+      every live buffer is flushed at interpreter exit (see
+      ``BackgroundFlusher``).
+    - No silent loss: rows that fail to commit are requeued and retried up
+      to ``max_attempts`` times. A failure of a background flush is raised
+      by the next ``flush()``.
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..utils.exceptions import DatabaseError
+from .background_flusher import BackgroundFlusher
+from .models import ChatHistory, LongTermMemory
+
+
+class WriteBehindBuffer(BackgroundFlusher):
+    """Group-commit buffer for chat history and long-term memory rows"""
+
+    thread_name = "memori-write-buffer"
+
+    def __init__(
+        self,
+        session_factory: Callable,
+        flush_interval_ms: int = 50,
+        max_batch_rows: int = 100,
+        max_attempts: int = 3,
+        on_flush: Optional[
+            Callable[[Any, Dict[str, List[Dict[str, Any]]]], None]
+        ] = None,
+        on_commit: Optional[Callable[[Dict[str, List[Dict[str, Any]]]], None]] = None,
+    ):
+        """
+        Args:
+            session_factory: Callable returning a new SQLAlchemy session
+            flush_interval_ms: Maximum time a row may wait before being committed
+            max_batch_rows: Number of pending rows that triggers an early flush
+            max_attempts: Number of commit attempts before a row is dropped
+            on_flush: Optional hook called inside the flush transaction with
+                the session and the rows being written
+            on_commit: Optional hook called with the rows once they are committed
+        """
+        super().__init__(flush_interval_ms, max_batch_rows)
+        self._session_factory = session_factory
+        self.max_batch_rows = self.max_pending
+        self.max_attempts = max(max_attempts, 1)
+        self._on_flush = on_flush
+        self._on_commit = on_commit
+
+        self._chat_rows: List[Dict[str, Any]] = []
+        self._memory_rows: List[Dict[str, Any]] = []
+        # Rows handed to an in-progress flush stay readable until committed
+        self._inflight_chat_rows: List[Dict[str, Any]] = []
+        self._inflight_memory_rows: List[Dict[str, Any]] = []
+        # id(row) -> failed commit attempts, for requeued rows
+        self._attempts: Dict[int, int] = {}
+        # Failure of a background flush, raised by the next flush()
+        self._error: Optional[DatabaseError] = None
+
+        self._stats = {
+            "flushes": 0,
+            "rows_written": 0,
+            "failed_rows": 0,
+            "dropped_rows": 0,
+            "largest_batch": 0,
+        }
+
+    # Enqueueing
+
+    def add_chat_history(self, row: Dict[str, Any]):
+        """Enqueue a chat_history row"""
+        self._enqueue(self._chat_rows, row)
+
+    def add_long_term_memory(self, row: Dict[str, Any]):
+        """Enqueue a long_term_memory row"""
+        self._enqueue(self._memory_rows, row)
+
+    def _enqueue(self, target: List[Dict[str, Any]], row: Dict[str, Any]):
+        with self._condition:
+            if self._closed:
+                raise DatabaseError("Write buffer is closed")
+            target.append(row)
+            self._mark_pending()
+
+        self._ensure_worker()
+
+    def _pending_count(self) -> int:
+        return len(self._chat_rows) + len(self._memory_rows)
+
+    # Read-your-writes
+
+    def pending_chat_history(
+        self, namespace: str, session_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Return uncommitted chat_history rows for a namespace/session"""
+        with self._condition:
+            rows = self._inflight_chat_rows + self._chat_rows
+            return [
+                dict(row)
+                for row in rows
+                if row["namespace"] == namespace
+                and (session_id is None or row["session_id"] == session_id)
+            ]
+
+    def has_pending(self, namespace: Optional[str] = None) -> bool:
+        """Check whether uncommitted rows exist (optionally for one namespace)"""
+        with self._condition:
+            rows = (
+                self._inflight_chat_rows
+                + self._chat_rows
+                + self._inflight_memory_rows
+                + self._memory_rows
+            )
+            if namespace is None:
+                return bool(rows)
+            return any(row["namespace"] == namespace for row in rows)
+
+    # Flushing
+
+    def flush(self, namespace: Optional[str] = None) -> int:
+        """
+        Commit pending rows.
+
+        Returns once all rows enqueued before the call (for ``namespace``,
+        if given) are durable.
+
+        Args:
+            namespace: Only commit this namespace's rows
+
+        Returns:
+            Number of rows written by this call
+
+        Raises:
+            DatabaseError: If some rows could not be written, or a background
+                flush failed since the last call
+        """
+        written, failed = self._flush_once(namespace)
+        with self._condition:
+            error, self._error = self._error, None
+        if failed:
+            raise DatabaseError(
+                f"Write buffer failed to persist {failed} row(s)"
+                + (f": {error}" if error is not None else "")
+            )
+        if error is not None:
+            raise error
+        return written
+
+    @staticmethod
+    def _take(rows: List[Dict[str, Any]], namespace: Optional[str]):
+        """Split rows into (taken, kept) by namespace"""
+        if namespace is None:
+            return rows, []
+        taken, kept = [], []
+        for row in rows:
+            (taken if row["namespace"] == namespace else kept).append(row)
+        return taken, kept
+
+    def _flush_once(self, namespace: Optional[str] = None):
+        """Write one batch; returns (rows_written, rows_failed)"""
+        with self._flush_lock:
+            with self._condition:
+                chat_rows, self._chat_rows = self._take(self._chat_rows, namespace)
+                memory_rows, self._memory_rows = self._take(
+                    self._memory_rows, namespace
+                )
+                self._inflight_chat_rows = chat_rows
+                self._inflight_memory_rows = memory_rows
+                if not self._pending_count():
+                    self._oldest_pending = None
+
+            if not chat_rows and not memory_rows:
+                return 0, 0
+
+            try:
+                written, failed_rows, error = self._write_batch(chat_rows, memory_rows)
+            except Exception as e:
+                # Nothing of the batch is known to be committed
+                written, error = 0, str(e)
+                failed_rows = {"chat_history": chat_rows, "long_term": memory_rows}
+            finally:
+                with self._condition:
+                    self._inflight_chat_rows = []
+                    self._inflight_memory_rows = []
+            failed = len(failed_rows["chat_history"]) + len(failed_rows["long_term"])
+            if failed:
+                self._requeue(failed_rows, error)
+
+            batch_size = len(chat_rows) + len(memory_rows)
+            self._stats["flushes"] += 1
+            self._stats["rows_written"] += written
+            self._stats["failed_rows"] += failed
+            self._stats["largest_batch"] = max(self._stats["largest_batch"], batch_size)
+            logger.debug(
+                f"Write buffer flushed {written} row(s) in one transaction"
+                + (f", {failed} failed" if failed else "")
+            )
+            return written, failed
+
+    def _requeue(self, failed_rows: Dict[str, List[Dict[str, Any]]], error: str):
+        """Put failed rows back in front of the queue, dropping exhausted ones"""
+        dropped = 0
+        with self._condition:
+            for key, target in (
+                ("chat_history", self._chat_rows),
+                ("long_term", self._memory_rows),
+            ):
+                retry = []
+                for row in failed_rows[key]:
+                    attempts = self._attempts.pop(id(row), 0) + 1
+                    if attempts < self.max_attempts:
+                        self._attempts[id(row)] = attempts
+                        retry.append(row)
+                    else:
+                        dropped += 1
+                target[:0] = retry
+            if self._oldest_pending is None and self._pending_count():
+                # Retried after a full flush interval
+                self._oldest_pending = time.monotonic()
+            if dropped:
+                self._stats["dropped_rows"] += dropped
+                self._error = DatabaseError(
+                    f"Write buffer dropped {dropped} row(s) after "
+                    f"{self.max_attempts} attempt(s): {error}"
+                )
+        if dropped:
+            logger.error(f"Write buffer dropped {dropped} row(s): {error}")
+
+    def _write_batch(self, chat_rows, memory_rows):
+        """
+        Insert a batch in a single transaction, isolating bad rows on failure
+
+        Returns:
+            (rows written, failed rows by kind, last error message)
+        """
+        with self._session_factory() as session:
+            try:
+                if chat_rows:
+                    session.execute(insert(ChatHistory), chat_rows)
+                if memory_rows:
+                    session.execute(insert(LongTermMemory), memory_rows)
+                if self._on_flush:
+                    self._on_flush(
+                        session, {"chat_history": chat_rows, "long_term": memory_rows}
+                    )
+                session.commit()
+                self._committed({"chat_history": chat_rows, "long_term": memory_rows})
+                self._forget_attempts(chat_rows + memory_rows)
+                return (
+                    len(chat_rows) + len(memory_rows),
+                    {"chat_history": [], "long_term": []},
+                    None,
+                )
+            except SQLAlchemyError as e:
+                session.rollback()
+                logger.warning(
+                    f"Batched write failed ({e}), retrying rows individually"
+                )
+
+        # Row-by-row retry so one bad row cannot hold back the whole batch
+        written = 0
+        failed: Dict[str, List[Dict[str, Any]]] = {"chat_history": [], "long_term": []}
+        error = None
+        for model, rows, key in (
+            (ChatHistory, chat_rows, "chat_history"),
+            (LongTermMemory, memory_rows, "long_term"),
+        ):
+            for row in rows:
+                with self._session_factory() as session:
+                    try:
+                        # merge keeps the INSERT OR REPLACE behaviour of the
+                        # unbuffered chat history path, so retries are idempotent
+                        session.merge(model(**row))
+                        if self._on_flush:
+                            self._on_flush(session, {key: [row]})
+                        session.commit()
+                        self._committed({key: [row]})
+                        self._forget_attempts([row])
+                        written += 1
+                    except SQLAlchemyError as e:
+                        session.rollback()
+                        failed[key].append(row)
+                        error = f"{model.__tablename__}: {e}"
+                        logger.warning(f"Write buffer failed to persist {error}")
+        return written, failed, error
+
+    def _forget_attempts(self, rows: List[Dict[str, Any]]):
+        if not self._attempts:
+            return
+        with self._condition:
+            for row in rows:
+                self._attempts.pop(id(row), None)
+
+    def _committed(self, rows: Dict[str, List[Dict[str, Any]]]):
+        if self._on_commit is None:
+            return
+        try:
+            self._on_commit(rows)
+        except Exception as e:
+            logger.error(f"Write buffer commit hook failed: {e}")
+
+    # Background flushing
+
+    def _flush_pending(self):
+        self._flush_once()
+
+    def _on_flush_error(self, error: Exception):
+        super()._on_flush_error(error)
+        with self._condition:
+            self._error = DatabaseError(f"Write buffer flush failed: {error}")
+
+    def _final_flush(self):
+        # Failed rows are requeued, so retry until they commit or are dropped
+        for _ in range(self.max_attempts):
+            _, failed = self._flush_once()
+            if not failed:
+                break
+        with self._condition:
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer statistics"""
+        with self._condition:
+            pending = self._pending_count()
+        return {
+            **self._stats,
+            "pending_rows": pending,
+            "flush_interval_ms": int(self.flush_interval * 1000),
+            "max_batch_rows": self.max_batch_rows,
+        }
@@ -16,23 +16,15 @@ Usage:
     response = completion(model="gpt-4o", messages=[...])
 """
 
+import importlib.util
 from typing import Optional
 
 from loguru import logger
 
-try:
-    import litellm
-
-    LITELLM_AVAILABLE = True
-
-    # Check for modifying input callbacks (for context injection)
-    HAS_MODIFYING_ROUTER = hasattr(litellm, "Router") and hasattr(
-        litellm.Router, "pre_call_hook"
-    )
-
-except ImportError:
-    LITELLM_AVAILABLE = False
-    HAS_MODIFYING_ROUTER = False
+# litellm itself is imported when callbacks are registered; importing it takes
+# seconds and most processes that import memori never call it
+LITELLM_AVAILABLE = importlib.util.find_spec("litellm") is not None
+if not LITELLM_AVAILABLE:
     logger.warning("LiteLLM not available - native callback system disabled")
 
 
@@ -72,6 +64,8 @@ class LiteLLMCallbackManager:
             return True
 
         try:
+            import litellm
+
             # Store original callbacks for restoration
             self._original_callbacks = getattr(litellm, "success_callback", [])
 
@@ -115,6 +109,8 @@ class LiteLLMCallbackManager:
             return True
 
         try:
+            import litellm
+
             # Remove our callback
             if hasattr(litellm, "success_callback") and isinstance(
                 litellm.success_callback, list
@@ -242,6 +238,8 @@ class LiteLLMCallbackManager:
     def _setup_context_injection(self):
         """Set up context injection by wrapping LiteLLM's completion function."""
         try:
+            import litellm
+
             if self._original_completion is not None:
                 # Already set up
                 return
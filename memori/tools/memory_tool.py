@@ -3,7 +3,7 @@ Memory Tool - A tool/function for manual integration with any LLM library
 """
 
 import json
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, List
 
 from loguru import logger
 
@@ -29,6 +29,7 @@ class MemoryTool:
         """
         self.memori = memori_instance
         self.tool_name = "memori_memory"
+        self.multi_search_tool_name = "memori_memory_multi_search"
         self.description = "Access and manage AI conversation memory"
 
     def get_tool_schema(self) -> Dict[str, Any]:
@@ -53,6 +54,36 @@ class MemoryTool:
             },
         }
 
+    def get_multi_search_tool_schema(self) -> Dict[str, Any]:
+        """
+        Get the schema of the multi-query search tool
+
+        Lets the model ask for several lookups (user profile, current project,
+        a topic) in one call, answered with one database round trip.
+
+        Returns:
+            Tool schema compatible with OpenAI function calling format
+        """
+        return {
+            "name": self.multi_search_tool_name,
+            "description": "Search conversation memory for several independent queries at once",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "queries": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Search queries, e.g. the user's profile, their current project and the topic being discussed",
+                    },
+                    "max_results": {
+                        "type": "integer",
+                        "description": "Maximum memories returned per query",
+                    },
+                },
+                "required": ["queries"],
+            },
+        }
+
     def execute(self, query: str = None, **kwargs) -> str:
         """
         Execute a memory search/retrieve action
@@ -64,6 +95,12 @@ class MemoryTool:
         Returns:
             String result of the memory search
         """
+        # Calls of the multi-search tool carry a list of queries
+        if query is None and kwargs.get("queries") is not None:
+            return self.execute_many(
+                kwargs["queries"], max_results=kwargs.get("max_results", 5)
+            )
+
         # Accept query as direct parameter or from kwargs
         if query is None:
             query = kwargs.get("query", "")
@@ -154,6 +191,46 @@ class MemoryTool:
         except Exception as e:
             return f"Error searching memories: {str(e)}"
 
+    def execute_many(self, queries: List[str], max_results: int = 5) -> str:
+        """
+        Execute several memory searches in one database round trip
+
+        Args:
+            queries: Search query strings
+            max_results: Maximum results per query
+
+        Returns:
+            String with one section of results per query
+        """
+        if isinstance(queries, str):
+            queries = [queries]
+        queries = [query for query in queries or [] if query and query.strip()]
+        if not queries:
+            return "Error: At least one query is required for memory search"
+
+        try:
+            results = self.memori.search_memories_many(queries, limit=max_results)
+        except Exception as e:
+            return f"Error searching memories: {str(e)}"
+
+        sections = []
+        for query, rows in zip(queries, results):
+            if not rows:
+                sections.append(f"No relevant memories found for query: '{query}'")
+                continue
+            section = f"🔍 Memory Search Results for: '{query}'\n\n"
+            for i, result in enumerate(rows, 1):
+                summary = (
+                    result.get("summary") or result.get("searchable_content", "")[:100]
+                )
+                category = result.get("category_primary") or "unknown"
+                importance = result.get("importance_score") or 0.0
+                created_at = result.get("created_at", "")
+                section += f"{i}. [{category.upper()}] {summary}\n"
+                section += f"   📊 Importance: {importance:.2f} | 📅 {created_at}\n\n"
+            sections.append(section.strip())
+        return "\n\n".join(sections)
+
     def _format_dict_to_string(self, result_dict: Dict[str, Any]) -> str:
         """Helper method to format dictionary results to readable strings"""
         if result_dict.get("error"):
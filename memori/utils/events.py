@@ -0,0 +1,125 @@
+"""
+In-process event bus for memory write notifications
+
+Producers (the database manager) publish events when memories are written;
+consumers (the conscious agent) subscribe to react immediately instead of
+polling the database.
+"""
+
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+
+from loguru import logger
+
+# Topics
+MEMORY_PROMOTION_ELIGIBLE = "memory.promotion_eligible"
+
+
+@dataclass
+class MemoryEvent:
+    """A single memory write notification"""
+
+    topic: str
+    namespace: str
+    memory_id: str
+    remote: bool = False  # True when relayed from another process
+    payload: Dict[str, Any] = field(default_factory=dict)
+
+
+class MemoryEventBus:
+    """
+    Thread-safe publish/subscribe bus.
+
+    Callbacks run synchronously in the publishing thread and must be cheap;
+    they typically enqueue work and wake a background loop. Bound methods are
+    held weakly so subscribing does not keep their owner alive.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, List[Any]] = {}
+
+    def subscribe(
+        self, topic: str, callback: Callable[[MemoryEvent], None]
+    ) -> Callable[[], None]:
+        """
+        Subscribe to a topic.
+
+        Returns:
+            Function that removes the subscription
+        """
+        if hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback  # noqa: E731 - plain functions are held strongly
+
+        with self._lock:
+            self._subscribers.setdefault(topic, []).append(ref)
+
+        def unsubscribe():
+            with self._lock:
+                refs = self._subscribers.get(topic, [])
+                if ref in refs:
+                    refs.remove(ref)
+
+        return unsubscribe
+
+    def publish(
+        self,
+        topic: str,
+        namespace: str,
+        memory_id: str,
+        remote: bool = False,
+        **payload: Any,
+    ) -> int:
+        """
+        Publish an event to every live subscriber of a topic.
+
+        Returns:
+            Number of subscribers notified
+        """
+        event = MemoryEvent(
+            topic=topic,
+            namespace=namespace,
+            memory_id=memory_id,
+            remote=remote,
+            payload=payload,
+        )
+
+        with self._lock:
+            refs = list(self._subscribers.get(topic, []))
+
+        delivered = 0
+        dead = []
+        for ref in refs:
+            callback = ref()
+            if callback is None:
+                dead.append(ref)
+                continue
+            try:
+                callback(event)
+                delivered += 1
+            except Exception as e:
+                logger.error(f"Memory event subscriber failed for {topic}: {e}")
+
+        if dead:
+            with self._lock:
+                refs = self._subscribers.get(topic, [])
+                for ref in dead:
+                    if ref in refs:
+                        refs.remove(ref)
+
+        return delivered
+
+    def subscriber_count(self, topic: str) -> int:
+        """Get the number of live subscribers for a topic"""
+        with self._lock:
+            return sum(
+                1 for ref in self._subscribers.get(topic, []) if ref() is not None
+            )
+
+
+# Process-wide default bus
+memory_events = MemoryEventBus()
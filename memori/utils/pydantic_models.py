@@ -304,6 +304,16 @@ class ProcessedLongTermMemory(BaseModel):
         )
 
 
+class ProfileFact(BaseModel):
+    """A promoted conscious memory held by a user context profile"""
+
+    memory_id: str
+    content: str
+    category: str = "conscious_context"
+    importance_score: float = 0.5
+    created_at: Optional[datetime] = None
+
+
 class UserContextProfile(BaseModel):
     """Permanent user context for conscious ingestion"""
 
@@ -341,6 +351,9 @@ class UserContextProfile(BaseModel):
     time_constraints: Optional[str] = None
     technology_preferences: List[str] = Field(default_factory=list)
 
+    # Promoted conscious memories, most important first
+    facts: List[ProfileFact] = Field(default_factory=list)
+
     # Metadata
     last_updated: datetime = Field(default_factory=datetime.now)
     version: int = 1
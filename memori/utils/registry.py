@@ -0,0 +1,92 @@
+"""
+Process-wide registry of shared, reference-counted resources
+
+Memori instances in one process share database engines (keyed by connection
+URL and pool options) and LLM clients (keyed by provider configuration)
+instead of each opening their own pools. Each acquire takes a reference and
+each release drops one. The resource is disposed when the last reference goes.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from loguru import logger
+
+
+class SharedResourceRegistry:
+    """Reference-counted resources keyed by configuration"""
+
+    def __init__(self, name: str, dispose: Optional[Callable[[Any], None]] = None):
+        self.name = name
+        self._dispose = dispose
+        self._lock = threading.RLock()
+        self._resources: Dict[Hashable, Any] = {}
+        self._refcounts: Dict[Hashable, int] = {}
+        self._created = 0
+        self._reused = 0
+
+    def acquire(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the resource for key, creating it with factory on first use"""
+        with self._lock:
+            if key in self._resources:
+                self._refcounts[key] += 1
+                self._reused += 1
+                return self._resources[key]
+
+            # Created under the lock so concurrent first users share one resource
+            resource = factory()
+            self._resources[key] = resource
+            self._refcounts[key] = 1
+            self._created += 1
+            logger.debug(f"Created shared {self.name} ({len(self._resources)} live)")
+            return resource
+
+    def release(self, key: Hashable) -> bool:
+        """
+        Drop one reference to key's resource
+
+        Returns:
+            True if this was the last reference and the resource was disposed
+        """
+        with self._lock:
+            if key not in self._refcounts:
+                return False
+            self._refcounts[key] -= 1
+            if self._refcounts[key] > 0:
+                return False
+            resource = self._resources.pop(key)
+            del self._refcounts[key]
+
+        self._dispose_resource(resource)
+        logger.debug(f"Disposed shared {self.name}")
+        return True
+
+    def refcount(self, key: Hashable) -> int:
+        with self._lock:
+            return self._refcounts.get(key, 0)
+
+    def clear(self):
+        """Dispose every resource regardless of references (tests, shutdown)"""
+        with self._lock:
+            resources = list(self._resources.values())
+            self._resources.clear()
+            self._refcounts.clear()
+        for resource in resources:
+            self._dispose_resource(resource)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "live": len(self._resources),
+                "references": sum(self._refcounts.values()),
+                "created": self._created,
+                "reused": self._reused,
+            }
+
+    def _dispose_resource(self, resource: Any):
+        if self._dispose is None:
+            return
+        try:
+            self._dispose(resource)
+        except Exception as e:
+            logger.warning(f"Failed to dispose shared {self.name}: {e}")
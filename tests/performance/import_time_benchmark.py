@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Import Time Benchmark
+Measures cold-start cost in fresh interpreters: importing memori, importing the
+CLI, and constructing Memori against an initialized SQLite database. Fails if a
+provider SDK (litellm, openai, anthropic) is imported before it is used, or if
+a median exceeds its budget.
+
+Usage:
+    python tests/performance/import_time_benchmark.py [--runs 5] [--budget-scale 1.0]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+
+HEAVY_MODULES = ("litellm", "openai", "anthropic")
+
+# Each scenario prints {"seconds": ..., "loaded": [...heavy modules imported]}
+SCENARIOS = {
+    "import memori": ("import memori", 0.05),
+    "import memori.cli": ("import memori.cli", 0.05),
+    "from memori import Memori": ("from memori import Memori", 1.0),
+    "Memori() warm schema": (
+        "from memori import Memori\n"
+        "Memori(database_connect=DATABASE, openai_api_key='sk-benchmark')",
+        1.5,
+    ),
+}
+
+RUNNER = """
+import json, sys, time
+DATABASE = {database!r}
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+heavy = {heavy!r}
+print(json.dumps({{
+    "seconds": elapsed,
+    "loaded": [name for name in heavy if name in sys.modules],
+}}))
+"""
+
+
+def run_scenario(code: str, database: str) -> dict:
+    script = RUNNER.format(database=database, code=code, heavy=HEAVY_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=str(REPO_ROOT),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget-scale",
+        type=float,
+        default=1.0,
+        help="Multiply every time budget (for slow CI machines)",
+    )
+    args = parser.parse_args()
+
+    database = f"sqlite:///{tempfile.mkdtemp(prefix='memori_bench_')}/bench.db"
+    # Create the schema once so construction measures the skip-if-current path
+    run_scenario(SCENARIOS["Memori() warm schema"][0], database)
+
+    print(f"\n{'='*60}")
+    print("🧪 Import time benchmark")
+    print(f"Runs per scenario: {args.runs}  Python: {sys.version.split()[0]}")
+    print(f"{'='*60}")
+
+    failures = []
+    for label, (code, budget) in SCENARIOS.items():
+        budget *= args.budget_scale
+        runs = [run_scenario(code, database) for _ in range(args.runs)]
+        median = statistics.median(run["seconds"] for run in runs)
+        loaded = sorted({name for run in runs for name in run["loaded"]})
+
+        ok = median <= budget and not loaded
+        print(
+            f"{'✅' if ok else '❌'} {label:<28} median {median * 1000:8.1f} ms "
+            f"(budget {budget * 1000:.0f} ms)"
+        )
+        if loaded:
+            print(f"   imported eagerly: {', '.join(loaded)}")
+            failures.append(f"{label} imported {', '.join(loaded)}")
+        if median > budget:
+            failures.append(f"{label} took {median * 1000:.1f} ms")
+
+    if failures:
+        print("\n❌ Import time regression:")
+        for failure in failures:
+            print(f"   {failure}")
+        sys.exit(1)
+    print("\n📈 All scenarios within budget")
+
+
+if __name__ == "__main__":
+    main()
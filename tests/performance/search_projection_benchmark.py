@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Search Projection Benchmark
+Compares rows per second for the retrieval read paths: ORM entity hydration
+(the previous implementation, reproduced here as a baseline) against the Core
+column projections used by SearchService and get_chat_history. The Core
+search paths also compute the composite ranking score of every matching row in
+SQL, which the baseline does not. A last scenario compares separate searches
+with one search_memories_many batch.
+
+Usage:
+    python tests/performance/search_projection_benchmark.py [--rows 2000] [--limit 200] [--seconds 3]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the memori package to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+
+def seed(manager, rows: int):
+    from sqlalchemy import insert
+
+    from memori.database.models import LongTermMemory, ShortTermMemory
+
+    now = datetime.now()
+    entities = {"people": ["alice", "bob"], "technologies": ["python", "sqlite"]}
+    for model in (ShortTermMemory, LongTermMemory):
+        batch = []
+        for i in range(rows):
+            content = f"benchmark memory {i} about python performance " * 4
+            row = {
+                "memory_id": str(uuid.uuid4()),
+                "processed_data": {
+                    "content": content,
+                    "summary": f"summary {i}",
+                    "entities": entities,
+                    "keywords": ["benchmark", "python", "memory"],
+                },
+                "importance_score": (i % 10) / 10,
+                "category_primary": "fact",
+                "namespace": "bench",
+                "created_at": now - timedelta(minutes=i),
+                "searchable_content": content,
+                "summary": f"summary {i}",
+            }
+            if model is LongTermMemory:
+                row["entities_json"] = entities
+                row["keywords_json"] = ["benchmark", "python", "memory"]
+            batch.append(row)
+        with manager.engine.begin() as conn:
+            conn.execute(insert(model.__table__), batch)
+
+    for i in range(rows):
+        manager.store_chat_history(
+            chat_id=str(uuid.uuid4()),
+            user_input=f"benchmark question {i}",
+            ai_output="benchmark answer " * 20,
+            model="benchmark",
+            timestamp=now - timedelta(seconds=i),
+            session_id="bench-session",
+            namespace="bench",
+            metadata={"turn": i},
+        )
+
+
+def orm_search(session, limit: int):
+    """Previous LIKE fallback: hydrate entities, copy attributes into dicts"""
+    from sqlalchemy import and_, desc, or_
+
+    from memori.database.models import LongTermMemory, ShortTermMemory
+
+    results = []
+    for memory_type, model in (
+        ("short_term", ShortTermMemory),
+        ("long_term", LongTermMemory),
+    ):
+        rows = (
+            session.query(model)
+            .filter(
+                and_(
+                    model.namespace == "bench",
+                    or_(
+                        model.searchable_content.like("%python%"),
+                        model.summary.like("%python%"),
+                    ),
+                )
+            )
+            .order_by(desc(model.importance_score), desc(model.created_at))
+            .limit(limit)
+            .all()
+        )
+        for result in rows:
+            results.append(
+                {
+                    "memory_id": result.memory_id,
+                    "memory_type": memory_type,
+                    "processed_data": result.processed_data,
+                    "importance_score": result.importance_score,
+                    "created_at": result.created_at,
+                    "summary": result.summary,
+                    "searchable_content": result.searchable_content,
+                    "category_primary": result.category_primary,
+                    "search_score": 0.4,
+                    "search_strategy": "sqlite_like_fallback",
+                }
+            )
+    return results
+
+
+def orm_chat_history(session, limit: int):
+    """Previous get_chat_history: hydrate entities, copy attributes into dicts"""
+    from memori.database.models import ChatHistory
+
+    rows = (
+        session.query(ChatHistory)
+        .filter(ChatHistory.namespace == "bench")
+        .order_by(ChatHistory.timestamp.desc())
+        .limit(limit)
+        .all()
+    )
+    return [
+        {
+            "chat_id": result.chat_id,
+            "user_input": result.user_input,
+            "ai_output": result.ai_output,
+            "model": result.model,
+            "timestamp": result.timestamp,
+            "session_id": result.session_id,
+            "namespace": result.namespace,
+            "tokens_used": result.tokens_used,
+            "metadata": result.metadata_json or {},
+        }
+        for result in rows
+    ]
+
+
+def measure(fn, seconds: float) -> float:
+    """Rows per second over repeated calls"""
+    fn()  # Warm up statement caches
+    rows = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        rows += len(fn())
+    return rows / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    from memori.database.sqlalchemy_manager import SQLAlchemyDatabaseManager
+
+    tmp_dir = tempfile.mkdtemp(prefix="memori_bench_")
+    manager = SQLAlchemyDatabaseManager(f"sqlite:///{tmp_dir}/bench.db")
+    manager.initialize_schema()
+    seed(manager, args.rows)
+
+    print(f"\n{'='*60}")
+    print("🧪 Search projection benchmark")
+    print(
+        f"Rows per table: {args.rows}  Limit: {args.limit}  Duration: {args.seconds}s"
+    )
+    print(f"{'='*60}")
+
+    def core_search():
+        service = manager._get_search_service("bench")
+        try:
+            return service._search_like_fallback(
+                "python", "bench", None, args.limit, True, True
+            )
+        finally:
+            service.session.close()
+
+    def core_recent():
+        service = manager._get_search_service("bench")
+        try:
+            return service._get_recent_memories("bench", None, args.limit * 2, None)
+        finally:
+            service.session.close()
+
+    def baseline(fn):
+        def run():
+            with manager.SessionLocal() as session:
+                return fn(session, args.limit)
+
+        return run
+
+    scenarios = (
+        ("LIKE search", baseline(orm_search), core_search),
+        ("recent memories", None, core_recent),
+        (
+            "chat history",
+            baseline(orm_chat_history),
+            lambda: manager.get_chat_history("bench", limit=args.limit),
+        ),
+    )
+    for label, orm_fn, core_fn in scenarios:
+        core_rate = measure(core_fn, args.seconds)
+        if orm_fn is None:
+            print(f"{label:>16}: core {core_rate:10.0f} rows/s")
+            continue
+        orm_rate = measure(orm_fn, args.seconds)
+        print(
+            f"{label:>16}: ORM {orm_rate:10.0f} rows/s  core {core_rate:10.0f} rows/s  "
+            f"x{core_rate / orm_rate:.2f}"
+        )
+
+    queries = ["python", "summary 1", "performance", "benchmark memory 7"]
+
+    def sequential():
+        return [
+            row
+            for query in queries
+            for row in manager.search_memories(query, "bench", limit=10)
+        ]
+
+    def batched():
+        return [
+            row
+            for rows in manager.search_memories_many(queries, "bench", limit=10)
+            for row in rows
+        ]
+
+    sequential_rate = measure(sequential, args.seconds)
+    batched_rate = measure(batched, args.seconds)
+    print(
+        f"{len(queries)}-query search: separate {sequential_rate:7.0f} rows/s  "
+        f"batched {batched_rate:7.0f} rows/s  x{batched_rate / sequential_rate:.2f}"
+    )
+
+    manager.close()
+
+
+if __name__ == "__main__":
+    main()
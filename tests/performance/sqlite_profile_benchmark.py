@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+SQLite Profile Benchmark
+Compares concurrent chat-history throughput with SQLite defaults (rollback
+journal) against the WAL profile applied by the SQLAlchemy database manager.
+
+Usage:
+    python tests/performance/sqlite_profile_benchmark.py [--writers 4] [--readers 4] [--seconds 5]
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+# Add the memori package to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+
+def run_workload(sqlite_profile, writers: int, readers: int, seconds: float):
+    """Run concurrent writers and readers; returns (writes, reads, errors)"""
+    from memori.database.sqlalchemy_manager import SQLAlchemyDatabaseManager
+
+    tmp_dir = tempfile.mkdtemp(prefix="memori_bench_")
+    manager = SQLAlchemyDatabaseManager(
+        f"sqlite:///{tmp_dir}/bench.db", sqlite_profile=sqlite_profile
+    )
+    manager.initialize_schema()
+
+    counts = {"writes": 0, "reads": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def writer(worker_id: int):
+        while time.perf_counter() < deadline:
+            try:
+                manager.store_chat_history(
+                    chat_id=str(uuid.uuid4()),
+                    user_input=f"benchmark question from writer {worker_id}",
+                    ai_output="benchmark answer " * 20,
+                    model="benchmark",
+                    timestamp=datetime.now(),
+                    session_id=f"session-{worker_id}",
+                )
+                with lock:
+                    counts["writes"] += 1
+            except Exception:
+                with lock:
+                    counts["errors"] += 1
+
+    def reader(worker_id: int):
+        while time.perf_counter() < deadline:
+            try:
+                manager.get_chat_history(limit=20)
+                with lock:
+                    counts["reads"] += 1
+            except Exception:
+                with lock:
+                    counts["errors"] += 1
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    manager.close()
+    return counts["writes"], counts["reads"], counts["errors"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"\n{'='*60}")
+    print("🧪 SQLite profile benchmark")
+    print(
+        f"Writers: {args.writers}  Readers: {args.readers}  Duration: {args.seconds}s"
+    )
+    print(f"{'='*60}")
+
+    results = {}
+    for label, profile in (("defaults", False), ("WAL profile", None)):
+        writes, reads, errors = run_workload(
+            profile, args.writers, args.readers, args.seconds
+        )
+        results[label] = (writes, reads, errors)
+        print(
+            f"{label:>12}: {writes / args.seconds:8.1f} writes/s "
+            f"{reads / args.seconds:8.1f} reads/s  errors: {errors}"
+        )
+
+    base_writes, base_reads, _ = results["defaults"]
+    wal_writes, wal_reads, _ = results["WAL profile"]
+    if base_writes and base_reads:
+        print(
+            f"\n📈 Speedup: writes x{wal_writes / base_writes:.2f}, "
+            f"reads x{wal_reads / base_reads:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Shared fixtures: database managers on temporary SQLite databases"""
+
+import pytest
+
+from memori.database.sqlalchemy_manager import SQLAlchemyDatabaseManager
+from memori.utils.pydantic_models import ProcessedLongTermMemory
+
+
+@pytest.fixture
+def make_manager(tmp_path):
+    """Factory for initialized managers; every manager is closed after the test"""
+    managers = []
+
+    def factory(name: str = "memori.db", **options) -> SQLAlchemyDatabaseManager:
+        manager = SQLAlchemyDatabaseManager(f"sqlite:///{tmp_path / name}", **options)
+        manager.initialize_schema()
+        managers.append(manager)
+        return manager
+
+    yield factory
+    for manager in managers:
+        manager.close()
+
+
+@pytest.fixture
+def make_memory():
+    """Factory for ProcessedLongTermMemory objects"""
+
+    def factory(content: str, classification: str = "personal", **fields):
+        return ProcessedLongTermMemory(
+            content=content,
+            summary=fields.pop("summary", content),
+            classification=classification,
+            importance=fields.pop("importance", "medium"),
+            conversation_id=fields.pop("conversation_id", "chat-1"),
+            classification_reason="test",
+            **fields,
+        )
+
+    return factory
@@ -0,0 +1,47 @@
+"""Async search: results come from the asyncio manager, not the sync one"""
+
+import asyncio
+
+import pytest
+
+from memori import Memori
+
+
+@pytest.fixture
+def memori(tmp_path, make_memory):
+    pytest.importorskip("aiosqlite")
+    memori = Memori(
+        database_connect=f"sqlite:///{tmp_path / 'memori.db'}",
+        openai_api_key="sk-test",
+    )
+    for content in ("I play the cello", "Orchestra rehearsal is on Tuesdays"):
+        memori.db_manager.store_long_term_memory_enhanced(
+            make_memory(content), "chat-1", "default"
+        )
+    yield memori
+    memori.close()
+
+
+def test_async_search_skips_the_sync_manager(memori, monkeypatch):
+    sync_calls = []
+    monkeypatch.setattr(
+        memori.db_manager,
+        "search_memories",
+        lambda *args, **kwargs: sync_calls.append(args) or [],
+    )
+
+    async def search():
+        try:
+            return (
+                await memori.asearch_memories("cello"),
+                await memori.aretrieve_context("cello"),
+            )
+        finally:
+            await memori.aclose()
+
+    results, context = asyncio.run(search())
+    assert [row["summary"] for row in results] == ["I play the cello"]
+    assert [row["memory_id"] for row in context] == [
+        row["memory_id"] for row in results
+    ]
+    assert sync_calls == []
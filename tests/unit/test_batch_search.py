@@ -0,0 +1,50 @@
+"""Batch search: one result list per query, matching individual searches"""
+
+import pytest
+
+QUERIES = ["live", "cello", "Tuesdays", "nothingmatches", "cello"]
+
+
+@pytest.fixture
+def manager(make_manager, make_memory):
+    manager = make_manager()
+    for content in (
+        "I live in Lisbon",
+        "I play the cello",
+        "My cello teacher lives nearby",
+        "Orchestra rehearsal is on Tuesdays",
+    ):
+        manager.store_long_term_memory_enhanced(
+            make_memory(content), "chat-1", "default"
+        )
+    manager.store_long_term_memory_enhanced(
+        make_memory("I play the cello"), "chat-1", "other"
+    )
+    return manager
+
+
+def memory_ids(results):
+    return [row["memory_id"] for row in results]
+
+
+def test_results_match_individual_searches(manager):
+    batched = manager.search_memories_many(QUERIES, "default")
+
+    assert len(batched) == len(QUERIES)
+    for query, results in zip(QUERIES, batched):
+        assert memory_ids(results) == memory_ids(manager.search_memories(query))
+    assert batched[3] == []
+    # Repeated queries get their own, identical, lists
+    assert memory_ids(batched[1]) == memory_ids(batched[4])
+
+
+def test_limit_and_namespace_apply_per_query(manager):
+    batched = manager.search_memories_many(["cello", "live"], "default", limit=1)
+    assert [len(results) for results in batched] == [1, 1]
+
+    (other,) = manager.search_memories_many(["cello"], "other")
+    assert [row["searchable_content"] for row in other] == ["I play the cello"]
+
+
+def test_empty_batch(manager):
+    assert manager.search_memories_many([], "default") == []
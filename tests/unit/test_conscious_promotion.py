@@ -0,0 +1,89 @@
+"""Conscious promotion: idempotent batches and incremental promotion"""
+
+import asyncio
+
+from sqlalchemy import func, select
+
+from memori.agents.conscious_agent import ConsciouscAgent
+from memori.database.models import LongTermMemory, ShortTermMemory
+
+
+def promoted_count(manager, namespace="default"):
+    query = (
+        select(func.count())
+        .select_from(ShortTermMemory)
+        .where(
+            ShortTermMemory.namespace == namespace,
+            ShortTermMemory.category_primary == "conscious_context",
+        )
+    )
+    with manager.engine.connect() as conn:
+        return conn.execute(query).scalar()
+
+
+def store_conscious(manager, make_memory, content, namespace="default"):
+    return manager.store_long_term_memory_enhanced(
+        make_memory(content, classification="conscious-info"), "chat-1", namespace
+    )
+
+
+def test_promotion_is_idempotent(make_manager, make_memory):
+    manager = make_manager()
+    store_conscious(manager, make_memory, "I live in Lisbon")
+    store_conscious(manager, make_memory, "I work as a nurse")
+    manager.store_long_term_memory_enhanced(
+        make_memory("Talked about the weather"), "chat-1", "default"
+    )
+    agent = ConsciouscAgent()
+
+    candidates = agent._get_promotion_candidates(manager, "default")
+    assert len(candidates) == 2
+    assert agent.promote_memories(manager, "default", candidates) == 2
+    # Promoting the same candidates again copies nothing
+    assert agent.promote_memories(manager, "default", candidates) == 0
+    assert promoted_count(manager) == 2
+
+    assert manager.get_memory_stats("default")["short_term_count"] == 2
+    profile = manager.get_user_profile("default")
+    assert sorted(fact.content for fact in profile.facts) == [
+        "I live in Lisbon",
+        "I work as a nurse",
+    ]
+
+
+def test_duplicate_candidates_are_promoted_once(make_manager, make_memory):
+    manager = make_manager()
+    store_conscious(manager, make_memory, "My name is Ana")
+    store_conscious(manager, make_memory, "My name is Ana")
+    agent = ConsciouscAgent(batch_size=1)
+
+    candidates = agent._get_promotion_candidates(manager, "default")
+    assert agent.promote_memories(manager, "default", candidates) == 1
+    assert promoted_count(manager) == 1
+    # Every candidate is marked processed, including the skipped duplicate
+    assert agent._get_promotion_candidates(manager, "default", True) == []
+
+
+def test_promote_pending_only_reads_queued_ids(make_manager, make_memory):
+    manager = make_manager()
+    queued = store_conscious(manager, make_memory, "I have two cats")
+    store_conscious(manager, make_memory, "I am vegetarian")
+    agent = ConsciouscAgent()
+
+    agent.enqueue_promotion("default", queued)
+    assert asyncio.run(agent.promote_pending(manager, "default"))
+    assert not agent.has_pending_promotions("default")
+    assert promoted_count(manager) == 1
+
+    # Re-announcing a promoted memory is a no-op
+    agent.enqueue_promotion("default", queued)
+    assert not asyncio.run(agent.promote_pending(manager, "default"))
+    assert promoted_count(manager) == 1
+
+    with manager.engine.connect() as conn:
+        processed = conn.execute(
+            select(LongTermMemory.searchable_content).where(
+                LongTermMemory.conscious_processed.is_(True)
+            )
+        ).all()
+    assert [row[0] for row in processed] == ["I have two cats"]
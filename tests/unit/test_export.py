@@ -0,0 +1,107 @@
+"""Keyset-paginated iteration and JSONL export/import"""
+
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from memori.database.storage_codec import is_encoded
+
+BASE_TIME = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def store_chats(
+    manager, count, namespace="default", session_id="session-1", same_time=False
+):
+    chat_ids = []
+    for i in range(count):
+        chat_id = f"{namespace}-{session_id}-{i:03d}"
+        manager.store_chat_history(
+            chat_id=chat_id,
+            user_input=f"question {i}",
+            ai_output=f"answer {i}",
+            model="test-model",
+            timestamp=BASE_TIME if same_time else BASE_TIME + timedelta(minutes=i),
+            session_id=session_id,
+            namespace=namespace,
+        )
+        chat_ids.append(chat_id)
+    return chat_ids
+
+
+@pytest.mark.parametrize("same_time", [False, True])
+def test_iteration_visits_every_row_once(make_manager, same_time):
+    manager = make_manager()
+    chat_ids = store_chats(manager, 7, same_time=same_time)
+    store_chats(manager, 3, namespace="other")
+
+    # Pages of 2 split runs of equal timestamps across page boundaries
+    rows = list(manager.iter_chat_history("default", batch_size=2))
+    assert [row["chat_id"] for row in rows] == chat_ids
+
+    newest = manager.iter_chat_history("default", batch_size=3, newest_first=True)
+    assert [row["chat_id"] for row in newest] == chat_ids[::-1]
+
+
+def test_iteration_filters_by_session(make_manager):
+    manager = make_manager()
+    first = store_chats(manager, 3, session_id="a")
+    store_chats(manager, 2, namespace="default", session_id="b", same_time=True)
+
+    rows = manager.iter_chat_history("default", session_id="a", batch_size=1)
+    assert [row["chat_id"] for row in rows] == first
+
+
+def test_export_import_round_trip(make_manager, make_memory):
+    source = make_manager("source.db", storage_codec="zlib")
+    chat_ids = store_chats(source, 4)
+    memory = make_memory("I live in Lisbon")
+    memory_id = source.store_long_term_memory_enhanced(memory, chat_ids[0], "default")
+    store_chats(source, 2, namespace="other")
+
+    output = io.StringIO()
+    written = source.export_jsonl(output, namespace="default", batch_size=3)
+    assert written == {
+        "chat_history": 4,
+        "long_term_memory": 1,
+        "short_term_memory": 0,
+    }
+    lines = output.getvalue().splitlines()
+    assert json.loads(lines[0])["format"] == "memori-jsonl"
+    # processed_data is exported decoded
+    exported = [json.loads(line) for line in lines[1:]]
+    (memory_line,) = [e for e in exported if e["table"] == "long_term_memory"]
+    assert memory_line["row"]["processed_data"] == memory.model_dump(mode="json")
+
+    target = make_manager("target.db")
+    result = target.import_jsonl(io.StringIO(output.getvalue()), batch_size=2)
+    assert result["rows"]["chat_history"] == 4
+    assert result["namespaces"] == ["default"]
+
+    history = target.iter_chat_history("default")
+    assert [row["chat_id"] for row in history] == chat_ids
+    (row,) = target.iter_memories("default")
+    assert row["memory_id"] == memory_id
+    assert not is_encoded(row["processed_data"])
+    assert row["processed_data"] == memory.model_dump(mode="json")
+    assert target.get_memory_stats("default")["long_term_count"] == 1
+
+
+def test_import_skips_or_replaces_existing_rows(make_manager):
+    manager = make_manager()
+    store_chats(manager, 3)
+    output = io.StringIO()
+    manager.export_jsonl(output, namespace="default")
+
+    skipped = manager.import_jsonl(io.StringIO(output.getvalue()))
+    assert skipped["rows"]["chat_history"] == 0
+    replaced = manager.import_jsonl(io.StringIO(output.getvalue()), replace=True)
+    assert replaced["rows"]["chat_history"] == 3
+    assert len(list(manager.iter_chat_history("default"))) == 3
+
+
+def test_import_rejects_files_without_header(make_manager):
+    manager = make_manager()
+    with pytest.raises(ValueError):
+        manager.import_jsonl(io.StringIO('{"table": "chat_history", "row": {}}\n'))
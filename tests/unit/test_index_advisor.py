@@ -0,0 +1,66 @@
+"""Index advisor: hot-query plans, retired indexes and redundant-index report"""
+
+from sqlalchemy import inspect, text
+
+from memori.database.index_advisor import create_missing_indexes, redundant_indexes
+
+
+def index_names(engine, table):
+    return {index["name"] for index in inspect(engine).get_indexes(table)}
+
+
+def test_hot_queries_use_indexes(make_manager):
+    manager = make_manager()
+    reports = manager.advise_indexes("default")
+
+    for report in reports:
+        assert "error" not in report, report["query"]
+        assert report["full_scans"] == [], report["query"]
+        assert report["sorts"] == [], report["query"]
+    assert reports[-1]["query"] == "redundant_indexes"
+    assert reports[-1]["redundant"] == []
+
+
+def test_retired_indexes_are_dropped(make_manager):
+    manager = make_manager()
+    with manager.engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE INDEX idx_chat_namespace_timestamp "
+                "ON chat_history (namespace, timestamp)"
+            )
+        )
+        conn.execute(
+            text("CREATE INDEX idx_long_term_namespace ON long_term_memory (namespace)")
+        )
+
+    create_missing_indexes(manager.engine)
+    assert "idx_chat_namespace_timestamp" not in index_names(
+        manager.engine, "chat_history"
+    )
+    assert "idx_long_term_namespace" not in index_names(
+        manager.engine, "long_term_memory"
+    )
+
+
+def test_prefix_indexes_are_reported(make_manager):
+    manager = make_manager()
+    with manager.engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE INDEX idx_custom_session "
+                "ON chat_history (namespace, session_id)"
+            )
+        )
+
+    assert redundant_indexes(manager.engine) == [
+        {
+            "table": "chat_history",
+            "index": "idx_custom_session",
+            "columns": ["namespace", "session_id"],
+            "covered_by": "idx_chat_namespace_session_timestamp",
+        }
+    ]
+    assert manager.advise_indexes("default")[-1]["redundant"][0]["index"] == (
+        "idx_custom_session"
+    )
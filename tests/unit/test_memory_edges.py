@@ -0,0 +1,74 @@
+"""Memory edges: superseded/duplicate exclusion and related-memory expansion"""
+
+import pytest
+from sqlalchemy import delete, func, select
+
+from memori.database.models import MemoryEdge
+
+
+@pytest.fixture
+def manager(make_manager):
+    return make_manager()
+
+
+@pytest.fixture
+def store(manager, make_memory):
+    def factory(content, **fields):
+        return manager.store_long_term_memory_enhanced(
+            make_memory(content, **fields), "chat-1", "default"
+        )
+
+    return factory
+
+
+def contents(results):
+    return [row["searchable_content"] for row in results]
+
+
+def test_superseded_and_duplicate_memories_are_hidden(manager, store):
+    old = store("I live in Porto")
+    store("I live in Lisbon", supersedes=[old])
+    original = store("My dog is called Rex")
+    store("My dog is called Rex!", duplicate_of=original)
+
+    assert contents(manager.search_memories("live")) == ["I live in Lisbon"]
+    assert contents(manager.search_memories("dog")) == ["My dog is called Rex"]
+
+
+def test_related_memories_are_expanded(manager, store):
+    cello = store("I play the cello")
+    concert = store("The concert is in May", related_memories=[cello])
+    store("Orchestra rehearsal is on Tuesdays", related_memories=[concert])
+
+    assert contents(manager.search_memories("Tuesdays", expand_hops=0)) == [
+        "Orchestra rehearsal is on Tuesdays"
+    ]
+
+    results = manager.search_memories("Tuesdays", expand_hops=2)
+    assert contents(results) == [
+        "Orchestra rehearsal is on Tuesdays",
+        "The concert is in May",
+        "I play the cello",
+    ]
+    assert [row.get("hops") for row in results[1:]] == [1, 2]
+    assert all(row["search_strategy"] == "related_expansion" for row in results[1:])
+
+    with pytest.raises(ValueError):
+        manager.search_memories("Tuesdays", expand_hops=5)
+
+
+def test_rebuild_restores_edges(manager, store):
+    first = store("I play the cello")
+    store("The concert is in May", related_memories=[first])
+
+    def edge_count():
+        with manager.engine.connect() as conn:
+            return conn.execute(select(func.count()).select_from(MemoryEdge)).scalar()
+
+    stored = edge_count()
+    assert stored == 2  # related edges go both ways
+    with manager.engine.begin() as conn:
+        conn.execute(delete(MemoryEdge))
+
+    assert manager.rebuild_memory_edges("default") == stored
+    assert edge_count() == stored
@@ -0,0 +1,106 @@
+"""MemoriPool: tenant handles and promotion of tenant memories"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from memori import MemoriPool
+from memori.database.models import ChatHistory, ShortTermMemory
+from memori.utils.pydantic_models import ProcessedLongTermMemory
+
+
+@pytest.fixture
+def make_pool(tmp_path):
+    pools = []
+
+    def factory(**options):
+        pool = MemoriPool(
+            database_connect=f"sqlite:///{tmp_path / 'pool.db'}",
+            openai_api_key="sk-test",
+            **options,
+        )
+        pools.append(pool)
+        return pool
+
+    yield factory
+    for pool in pools:
+        pool.close()
+
+
+def conscious_memory(content):
+    return ProcessedLongTermMemory(
+        content=content,
+        summary=content,
+        classification="conscious-info",
+        importance="high",
+        conversation_id="chat-1",
+        classification_reason="test",
+        promotion_eligible=True,
+    )
+
+
+def test_handles_are_cached_and_evicted(make_pool):
+    pool = make_pool(max_tenants=2)
+    first = pool.for_namespace("tenant-1", user_id="1")
+    assert pool.for_namespace("tenant-1", user_id="1") is first
+
+    pool.for_namespace("tenant-2")
+    pool.for_namespace("tenant-3")
+    assert pool.get_stats()["tenants"] == 2
+    assert pool.get_stats()["evictions"] == 1
+    assert pool.for_namespace("tenant-1", user_id="1") is not first
+
+
+@pytest.mark.parametrize("write_buffer", [False, True])
+def test_flush_drains_tenant_promotions(make_pool, write_buffer):
+    pool = make_pool(conscious_ingest=True, write_buffer=write_buffer)
+    tenant = pool.for_namespace("tenant-1")
+    assert pool.flush(10)
+
+    tenant.db_manager.store_long_term_memory_enhanced(
+        conscious_memory("The user is named Ada"), "chat-1", "tenant-1"
+    )
+    assert pool.flush(10)
+
+    with tenant.db_manager.engine.connect() as conn:
+        promoted = conn.execute(
+            select(ShortTermMemory.namespace, ShortTermMemory.searchable_content)
+        ).all()
+    assert [tuple(row) for row in promoted] == [("tenant-1", "The user is named Ada")]
+    assert not pool.core.conscious_agent.has_pending_promotions("tenant-1")
+
+
+def test_async_writes_go_to_the_tenant_shard(tmp_path):
+    shards = {
+        "a": f"sqlite:///{tmp_path / 'a.db'}",
+        "b": f"sqlite:///{tmp_path / 'b.db'}",
+    }
+    pool = MemoriPool(
+        database_connect=shards["a"],
+        openai_api_key="sk-test",
+        shards=shards,
+        shard_overrides={"default": "b", "tenant-a": "a", "tenant-b": "b"},
+    )
+    sharded = pool.core.db_manager
+
+    async def record():
+        tenants = [pool.for_namespace(name) for name in ("tenant-a", "tenant-b")]
+        for tenant in tenants:
+            # Only the chat history row matters here
+            tenant.memory_agent = None
+            await tenant.arecord_conversation(f"hello from {tenant.namespace}", "hi")
+        history = [await tenant.aget_conversation_history() for tenant in tenants]
+        await pool.core.aclose()
+        return history
+
+    try:
+        history = asyncio.run(record())
+        assert [len(rows) for rows in history] == [1, 1]
+        for name, shard in (("tenant-a", "a"), ("tenant-b", "b")):
+            with sharded.shards[shard].engine.connect() as conn:
+                namespaces = conn.execute(select(ChatHistory.namespace)).scalars()
+                assert list(namespaces) == [name]
+            assert len(sharded.get_chat_history(name)) == 1
+    finally:
+        pool.close()
@@ -0,0 +1,106 @@
+"""Retention: expiry sweeps, capacity eviction and their counter updates"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+
+from memori.database.models import LongTermMemory, ShortTermMemory
+from memori.database.retention import RetentionConfig
+from memori.database.sharding import ShardedDatabaseManager
+
+NO_CAPACITY = RetentionConfig(max_short_term_memories=None, max_long_term_memories=None)
+
+
+def insert_short_term(
+    manager, namespace, prefix, count, expired=False, permanent=False
+):
+    now = datetime.now()
+    rows = [
+        {
+            "memory_id": f"{prefix}-{i}",
+            "processed_data": {},
+            "importance_score": 0.5,
+            "category_primary": "fact",
+            "retention_type": "short_term",
+            "namespace": namespace,
+            "created_at": now,
+            "expires_at": now - timedelta(days=1) if expired else None,
+            "searchable_content": f"{prefix} {i}",
+            "summary": f"{prefix} {i}",
+            "is_permanent_context": permanent,
+        }
+        for i in range(count)
+    ]
+    with manager.engine.begin() as conn:
+        conn.execute(insert(ShortTermMemory), rows)
+    # Rows inserted behind the manager's back: bring the counters in line
+    manager.reconcile_memory_stats(namespace)
+
+
+def store_long_term(manager, make_memory, namespace, importances):
+    for i, importance in enumerate(importances):
+        manager.store_long_term_memory_enhanced(
+            make_memory(f"{namespace} fact {i}", importance=importance),
+            "chat-1",
+            namespace,
+        )
+
+
+def test_expired_rows_are_swept(make_manager):
+    manager = make_manager()
+    insert_short_term(manager, "default", "expired", 3, expired=True)
+    insert_short_term(manager, "default", "context", 1, expired=True, permanent=True)
+    insert_short_term(manager, "default", "live", 2)
+
+    report = manager.run_retention(NO_CAPACITY)
+    assert report["expired_short_term"] == 3
+
+    with manager.engine.connect() as conn:
+        left = conn.execute(select(ShortTermMemory.memory_id)).scalars().all()
+    assert sorted(left) == ["context-0", "live-0", "live-1"]
+    assert manager.get_memory_stats("default")["short_term_count"] == 3
+    # The sweep kept the counters exact
+    assert manager.reconcile_memory_stats("default")["corrected"] == []
+
+
+def test_capacity_evicts_least_important_first(make_manager, make_memory):
+    manager = make_manager()
+    store_long_term(manager, make_memory, "default", ["low", "high", "low", "critical"])
+
+    config = RetentionConfig(max_short_term_memories=None, max_long_term_memories=2)
+    report = manager.run_retention(config)
+    assert report["evicted_long_term"] == 2
+
+    with manager.engine.connect() as conn:
+        kept = conn.execute(select(LongTermMemory.memory_importance)).scalars().all()
+    assert sorted(kept) == ["critical", "high"]
+    assert manager.get_memory_stats("default")["long_term_count"] == 2
+    assert manager.reconcile_memory_stats("default")["corrected"] == []
+
+
+def test_sharded_retention_sweeps_every_shard(tmp_path, make_memory):
+    manager = ShardedDatabaseManager(
+        {
+            "a": f"sqlite:///{tmp_path / 'a.db'}",
+            "b": f"sqlite:///{tmp_path / 'b.db'}",
+        },
+        overrides={"tenant-a": "a", "tenant-b": "b"},
+    )
+    try:
+        manager.initialize_schema()
+        for namespace in ("tenant-a", "tenant-b"):
+            shard = manager.manager_for(namespace)
+            insert_short_term(shard, namespace, namespace, 2, expired=True)
+            store_long_term(manager, make_memory, namespace, ["low", "high", "low"])
+
+        config = RetentionConfig(max_short_term_memories=None, max_long_term_memories=1)
+        report = manager.run_retention(config)
+        assert report["expired_short_term"] == 4
+        assert report["evicted_long_term"] == 4
+
+        for namespace in ("tenant-a", "tenant-b"):
+            stats = manager.get_memory_stats(namespace)
+            assert stats["short_term_count"] == 0
+            assert stats["long_term_count"] == 1
+    finally:
+        manager.close()
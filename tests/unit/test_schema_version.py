@@ -0,0 +1,63 @@
+"""Schema fingerprint: recorded only once every setup step succeeded"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, inspect
+
+import memori.database.sqlalchemy_manager as sqlalchemy_manager
+from memori.database.async_manager import AsyncSQLAlchemyDatabaseManager
+from memori.database.schema_version import schema_is_current
+
+
+def failing_setup(conn):
+    raise RuntimeError("fts5 unavailable")
+
+
+def has_search_index(engine):
+    return inspect(engine).has_table("memory_search_fts")
+
+
+def test_startup_skips_ddl_once_recorded(make_manager):
+    manager = make_manager()
+    assert schema_is_current(manager.engine)
+    assert has_search_index(manager.engine)
+
+
+def test_failed_setup_is_retried_on_next_start(make_manager, monkeypatch):
+    with monkeypatch.context() as patch:
+        patch.setattr(sqlalchemy_manager, "setup_sqlite_search_index", failing_setup)
+        manager = make_manager()
+        assert not schema_is_current(manager.engine)
+        assert not has_search_index(manager.engine)
+
+    restarted = make_manager()
+    assert has_search_index(restarted.engine)
+    assert schema_is_current(restarted.engine)
+
+
+def test_async_failed_setup_is_retried_on_next_start(tmp_path, monkeypatch):
+    pytest.importorskip("aiosqlite")
+    path = tmp_path / "memori.db"
+
+    async def initialize():
+        manager = AsyncSQLAlchemyDatabaseManager(f"sqlite+aiosqlite:///{path}")
+        try:
+            await manager.initialize_schema()
+        finally:
+            await manager.close()
+
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        with monkeypatch.context() as patch:
+            patch.setattr(
+                sqlalchemy_manager, "setup_sqlite_search_index", failing_setup
+            )
+            asyncio.run(initialize())
+            assert not schema_is_current(engine)
+
+        asyncio.run(initialize())
+        assert has_search_index(engine)
+        assert schema_is_current(engine)
+    finally:
+        engine.dispose()
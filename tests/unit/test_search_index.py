@@ -0,0 +1,84 @@
+"""Search index maintenance: MySQL optimizes FULLTEXT entries, not whole tables"""
+
+import pytest
+
+import memori.database.search_index as search_index
+from memori.database.search_index import (
+    SearchIndexMaintenance,
+    optimize_mysql_fulltext,
+    rebuild_search_index,
+)
+
+
+class RecordingResult:
+    def one(self):
+        return ("OFF", 2000)
+
+    def fetchall(self):
+        return []
+
+
+class RecordingConnection:
+    def __init__(self, statements, fail_on=None):
+        self.statements = statements
+        self.fail_on = fail_on
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append((sql, params))
+        if self.fail_on and sql.startswith(self.fail_on):
+            raise RuntimeError("lock wait timeout")
+        return RecordingResult()
+
+    def commit(self):
+        pass
+
+
+class RecordingEngine:
+    def __init__(self):
+        self.statements = []
+
+    def connect(self):
+        return RecordingConnection(self.statements)
+
+
+def test_optimize_restores_the_global_settings():
+    statements = []
+    conn = RecordingConnection(statements, fail_on="OPTIMIZE")
+
+    with pytest.raises(RuntimeError):
+        optimize_mysql_fulltext(conn, "long_term_memory", words=500)
+
+    assert statements[1] == (
+        "SET GLOBAL innodb_optimize_fulltext_only = ON, "
+        "innodb_ft_num_word_optimize = :words",
+        {"words": 500},
+    )
+    assert statements[2][0] == "OPTIMIZE TABLE long_term_memory"
+    assert statements[3][1] == {"fulltext_only": "OFF", "words": 2000}
+
+
+@pytest.mark.parametrize("namespace", [None, "tenant-1"])
+def test_mysql_rebuild_optimizes_fulltext_only(namespace):
+    engine = RecordingEngine()
+
+    assert rebuild_search_index(engine, "mysql", namespace) == {}
+    optimized = [sql for sql, _ in engine.statements if sql.startswith("OPTIMIZE")]
+    assert optimized == [
+        f"OPTIMIZE TABLE {table.name}" for table, _ in search_index.INDEXED_TABLES
+    ]
+    assert sum("fulltext_only = ON" in sql for sql, _ in engine.statements) == 2
+
+
+def test_mysql_maintenance_optimizes_fulltext_only():
+    engine = RecordingEngine()
+
+    results = SearchIndexMaintenance(engine, "mysql").run_once()
+    assert set(results.values()) == {"ok"}
+    assert sum("fulltext_only = ON" in sql for sql, _ in engine.statements) == 2
@@ -0,0 +1,79 @@
+"""MemoriSettings: every setting reaches the Memori constructor"""
+
+import inspect
+
+import pytest
+
+from memori import Memori, MemoriSettings
+
+
+def test_memori_options_are_constructor_arguments():
+    options = MemoriSettings().memori_options()
+    parameters = inspect.signature(Memori.__init__).parameters
+
+    assert sorted(set(options) - set(parameters)) == []
+
+
+def test_from_settings_configures_the_manager(tmp_path):
+    settings = MemoriSettings(
+        database={
+            "connection_string": f"sqlite:///{tmp_path / 'memori.db'}",
+            "pool_size": 7,
+            "pool_recycle": 120,
+            "write_buffer_enabled": True,
+            "storage_codec": "zlib",
+            "related_memory_hops": 2,
+        },
+        memory={"namespace": "project", "profile_max_facts": 10},
+    )
+    memori = Memori.from_settings(settings, openai_api_key="sk-test")
+    try:
+        manager = memori.db_manager
+        assert memori.namespace == "project"
+        assert manager.pool_options["pool_size"] == 7
+        assert manager.pool_options["pool_recycle"] == 120
+        assert manager.write_buffer is not None
+        assert manager.storage_codec.name == "zlib+json"
+        assert manager.related_memory_hops == 2
+        assert manager.profile_max_facts == 10
+    finally:
+        memori.close()
+
+
+def test_overrides_take_precedence(tmp_path):
+    settings = MemoriSettings(memory={"namespace": "from-settings"})
+    memori = Memori.from_settings(
+        settings,
+        database_connect=f"sqlite:///{tmp_path / 'memori.db'}",
+        namespace="override",
+        openai_api_key="sk-test",
+    )
+    try:
+        assert memori.namespace == "override"
+        assert memori.db_manager.write_buffer is None
+    finally:
+        memori.close()
+
+
+@pytest.mark.parametrize("auto_cleanup", [True, False])
+def test_from_settings_applies_retention(tmp_path, auto_cleanup):
+    settings = MemoriSettings(
+        database={"connection_string": f"sqlite:///{tmp_path / 'memori.db'}"},
+        memory={
+            "auto_cleanup": auto_cleanup,
+            "cleanup_interval_hours": 6,
+            "max_short_term_memories": 200,
+            "max_long_term_memories": 3000,
+        },
+    )
+    memori = Memori.from_settings(settings, openai_api_key="sk-test")
+    try:
+        retention = memori.db_manager.retention
+        if not auto_cleanup:
+            assert retention is None
+            return
+        assert retention.config.interval_seconds == 6 * 3600
+        assert retention.config.max_short_term_memories == 200
+        assert retention.config.max_long_term_memories == 3000
+    finally:
+        memori.close()
@@ -0,0 +1,97 @@
+"""Storage codec: processed_data round trips through the compact envelope"""
+
+import json
+
+import pytest
+from sqlalchemy import select
+
+from memori.database.models import LongTermMemory
+from memori.database.storage_codec import (
+    CODEC_KEY,
+    LazyProcessedData,
+    ProcessedDataCodec,
+    decode_processed_data,
+    is_encoded,
+    lazy_processed_data,
+    migrate_processed_data,
+)
+
+ROW = {"searchable_content": "I live in Lisbon", "summary": "Lives in Lisbon"}
+
+DATA = {
+    "content": "I live in Lisbon",
+    "summary": "Lives in Lisbon",
+    "classification": "personal",
+    "entities": ["Lisbon"],
+    "importance_score": 0.7,
+}
+
+
+def make_codec(spec):
+    if "zstd" in spec:
+        pytest.importorskip("zstandard")
+    if "msgpack" in spec:
+        pytest.importorskip("msgpack")
+    return ProcessedDataCodec.from_spec(spec)
+
+
+@pytest.mark.parametrize("spec", ["json", "zlib", "zlib+msgpack", "zstd+msgpack"])
+def test_round_trip(spec):
+    codec = make_codec(spec)
+    envelope = codec.encode(DATA, ROW)
+
+    assert envelope[CODEC_KEY] == codec.name
+    assert envelope["stripped"] == ["content", "summary"]
+    # The envelope survives a JSON column
+    stored = json.loads(json.dumps(envelope))
+    assert decode_processed_data(stored, ROW) == DATA
+
+
+def test_fields_differing_from_columns_are_kept():
+    codec = ProcessedDataCodec.from_spec("zlib")
+    row = dict(ROW, summary="Edited summary")
+
+    envelope = codec.encode(DATA, row)
+    assert envelope["stripped"] == ["content"]
+    assert decode_processed_data(envelope, row) == DATA
+
+
+def test_lazy_decoding_serves_stripped_fields_first():
+    envelope = ProcessedDataCodec.from_spec("zlib").encode(DATA, ROW)
+    data = lazy_processed_data(json.dumps(envelope), ROW)
+
+    assert isinstance(data, LazyProcessedData)
+    assert data["content"] == "I live in Lisbon"
+    assert not data.is_decoded
+    assert data["entities"] == ["Lisbon"]
+    assert data.is_decoded
+    assert json.loads(json.dumps(data)) == DATA
+
+
+def test_unencoded_values_pass_through():
+    assert lazy_processed_data(DATA, ROW) is DATA
+    assert decode_processed_data("plain", ROW) == "plain"
+
+
+def test_unknown_spec_is_rejected():
+    with pytest.raises(ValueError):
+        ProcessedDataCodec.from_spec("lz4")
+    assert ProcessedDataCodec.from_spec("none") is None
+
+
+def test_manager_stores_and_migrates_encoded_rows(make_manager, make_memory):
+    manager = make_manager(storage_codec="zlib")
+    memory = make_memory("I live in Lisbon", summary="Lives in Lisbon")
+    manager.store_long_term_memory_enhanced(memory, "chat-1", "default")
+
+    def stored_value():
+        with manager.engine.connect() as conn:
+            return conn.execute(select(LongTermMemory.processed_data)).scalar()
+
+    assert is_encoded(stored_value())
+    (row,) = manager.iter_memories("default")
+    assert row["processed_data"] == memory.model_dump(mode="json")
+
+    assert migrate_processed_data(manager.engine, None)["long_term_memory"] == 1
+    assert not is_encoded(stored_value())
+    assert stored_value() == memory.model_dump(mode="json")
@@ -0,0 +1,138 @@
+"""Write-behind buffer: read-your-writes, flushing and failure handling"""
+
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from memori.database.models import Base, ChatHistory
+from memori.database.write_buffer import WriteBehindBuffer
+from memori.utils.exceptions import DatabaseError
+
+# Long enough that the background worker never flushes during a test
+SLOW_FLUSH_MS = 60000
+
+
+def store_chat(manager, namespace="default", session_id="session-1", text="hello"):
+    chat_id = str(uuid.uuid4())
+    manager.store_chat_history(
+        chat_id=chat_id,
+        user_input=text,
+        ai_output="reply",
+        model="test-model",
+        timestamp=datetime.now(),
+        session_id=session_id,
+        namespace=namespace,
+    )
+    return chat_id
+
+
+def committed_chats(engine, namespace=None):
+    query = select(func.count()).select_from(ChatHistory)
+    if namespace is not None:
+        query = query.where(ChatHistory.namespace == namespace)
+    with engine.connect() as conn:
+        return conn.execute(query).scalar()
+
+
+def chat_row(chat_id, namespace="default"):
+    return {
+        "chat_id": chat_id,
+        "user_input": "hello",
+        "ai_output": "reply",
+        "model": "test-model",
+        "timestamp": datetime.now(),
+        "session_id": "session-1",
+        "namespace": namespace,
+        "tokens_used": 0,
+        "metadata_json": {},
+    }
+
+
+@pytest.fixture
+def buffered_manager(make_manager):
+    return make_manager(write_buffer=True, write_buffer_flush_interval_ms=SLOW_FLUSH_MS)
+
+
+def test_history_includes_uncommitted_rows(buffered_manager):
+    manager = buffered_manager
+    first = store_chat(manager, text="first")
+    second = store_chat(manager, text="second")
+
+    assert committed_chats(manager.engine) == 0
+    history = manager.get_chat_history("default", "session-1")
+    assert {row["chat_id"] for row in history} == {first, second}
+
+
+def test_flush_writes_commits_only_the_namespace(buffered_manager):
+    manager = buffered_manager
+    store_chat(manager, namespace="alpha")
+    store_chat(manager, namespace="beta")
+
+    assert manager.flush_writes("alpha") == 1
+    assert committed_chats(manager.engine, "alpha") == 1
+    assert committed_chats(manager.engine, "beta") == 0
+    assert manager.write_buffer.has_pending("beta")
+
+
+def test_background_flush_after_interval(make_manager):
+    manager = make_manager(write_buffer=True, write_buffer_flush_interval_ms=20)
+    store_chat(manager)
+
+    deadline = time.monotonic() + 5
+    while committed_chats(manager.engine) == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert committed_chats(manager.engine) == 1
+
+
+def test_close_flushes_pending_rows(buffered_manager, make_manager):
+    manager = buffered_manager
+    chat_ids = {store_chat(manager) for _ in range(3)}
+    manager.close()
+
+    reopened = make_manager()
+    history = reopened.get_chat_history("default", limit=10)
+    assert {row["chat_id"] for row in history} == chat_ids
+
+
+def test_enqueue_after_close_is_rejected(buffered_manager):
+    buffer = buffered_manager.write_buffer
+    buffer.close()
+
+    with pytest.raises(DatabaseError):
+        buffer.add_chat_history(chat_row("late"))
+
+
+def test_failed_rows_are_retried_then_reported(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'buffer.db'}")
+    buffer = WriteBehindBuffer(
+        sessionmaker(bind=engine),
+        flush_interval_ms=SLOW_FLUSH_MS,
+        max_attempts=2,
+    )
+    buffer.add_chat_history(chat_row("chat-1"))
+
+    # No tables yet: the row is kept for another attempt
+    with pytest.raises(DatabaseError):
+        buffer.flush()
+    assert buffer.has_pending()
+
+    Base.metadata.create_all(engine)
+    assert buffer.flush() == 1
+    assert committed_chats(engine) == 1
+
+    # A row failing every attempt is dropped and reported
+    Base.metadata.drop_all(engine)
+    buffer.add_chat_history(chat_row("chat-2"))
+    with pytest.raises(DatabaseError):
+        buffer.flush()
+    with pytest.raises(DatabaseError, match="dropped 1 row"):
+        buffer.flush()
+    assert not buffer.has_pending()
+    assert buffer.get_stats()["dropped_rows"] == 1
+
+    buffer.close()
+    engine.dispose()